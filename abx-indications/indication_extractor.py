@@ -20,6 +20,7 @@ Usage:
 
 import json
 import logging
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -43,6 +44,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+HAI_DETECTION_PATH = Path(__file__).parent.parent / "hai-detection"
+
 
 @dataclass
 class IndicationExtraction:
@@ -228,9 +231,12 @@ class IndicationExtractor:
             model = self.model or self.DEFAULT_MODEL
             base_url = self.base_url or "http://localhost:11434"
 
-            # Import here to avoid circular imports
+            # hai-detection is not an installed package; load its client the
+            # way the validation runner does
+            if str(HAI_DETECTION_PATH) not in sys.path:
+                sys.path.insert(0, str(HAI_DETECTION_PATH))
             try:
-                from hai_detection.hai_src.llm import OllamaClient
+                from hai_src.llm import OllamaClient
                 self._llm_client = OllamaClient(
                     model=model,
                     base_url=base_url,
@@ -259,20 +265,7 @@ class IndicationExtractor:
         Returns:
             IndicationExtraction with extracted indication
         """
-        # Prepare notes
-        if isinstance(notes, list):
-            notes_text = "\n\n---\n\n".join(notes)
-            notes_count = len(notes)
-        else:
-            notes_text = notes
-            notes_count = 1
-
-        # Build prompt
-        prompt = INDICATION_EXTRACTION_PROMPT.format(
-            antibiotic=antibiotic,
-            order_date=order_date or "Unknown",
-            notes=notes_text[:20000],  # Limit context
-        )
+        prompt, notes_count = self._build_prompt(notes, antibiotic, order_date)
 
         try:
             # Call LLM
@@ -289,12 +282,79 @@ class IndicationExtractor:
 
         except Exception as e:
             logger.error(f"Indication extraction failed: {e}")
-            return IndicationExtraction(
-                primary_indication="empiric_unknown",
-                indication_confidence="unclear",
-                indication_not_documented=True,
-                notes_reviewed_count=notes_count,
-            )
+            return self._unknown_extraction(notes_count)
+
+    def extract_batch(
+        self,
+        orders: list[tuple[list[str] | str, str, str | None]],
+    ) -> list[IndicationExtraction]:
+        """Extract indications for many orders in one LLM batch.
+
+        Clients with generate_structured_batch keep several requests in
+        flight at once; others are called one order at a time.
+
+        Args:
+            orders: (notes, antibiotic, order_date) per order
+
+        Returns:
+            IndicationExtraction per order, in order
+        """
+        client = self.llm_client
+        if not hasattr(client, "generate_structured_batch"):
+            return [self.extract(*order) for order in orders]
+
+        built = [self._build_prompt(*order) for order in orders]
+        batch = client.generate_structured_batch(
+            [prompt for prompt, _ in built],
+            output_schema=INDICATION_EXTRACTION_SCHEMA,
+            temperature=0.0,
+            profile_context="indication_extraction",
+        )
+
+        extractions = []
+        for (_, notes_count), data, error in zip(built, batch.data, batch.errors):
+            if error is None:
+                try:
+                    extractions.append(self._parse_response(data, notes_count))
+                    continue
+                except Exception as e:
+                    error = e
+            logger.error(f"Indication extraction failed: {error}")
+            extractions.append(self._unknown_extraction(notes_count))
+        return extractions
+
+    @staticmethod
+    def _build_prompt(
+        notes: list[str] | str,
+        antibiotic: str,
+        order_date: str | None,
+    ) -> tuple[str, int]:
+        """Extraction prompt and the number of notes it covers."""
+        # Prepare notes
+        if isinstance(notes, list):
+            notes_text = "\n\n---\n\n".join(notes)
+            notes_count = len(notes)
+        else:
+            notes_text = notes
+            notes_count = 1
+
+        # Build prompt
+        prompt = INDICATION_EXTRACTION_PROMPT.format(
+            antibiotic=antibiotic,
+            order_date=order_date or "Unknown",
+            notes=notes_text[:20000],  # Limit context
+        )
+        return prompt, notes_count
+
+    @staticmethod
+    def _unknown_extraction(notes_count: int) -> IndicationExtraction:
+        """Result when the LLM call or its parsing fails."""
+        return IndicationExtraction(
+            primary_indication="empiric_unknown",
+            indication_confidence="unclear",
+            indication_not_documented=True,
+            notes_reviewed_count=notes_count,
+        )
 
     def _parse_response(
         self,
@@ -346,7 +406,7 @@ class IndicationExtractor:
 
 
 class _SimpleLLMClient:
-    """Simple LLM client for when hai_detection is not available."""
+    """Simple LLM client for when hai-detection is not available."""
 
     def __init__(self, model: str, base_url: str):
         self.model = model
@@ -5,14 +5,24 @@ antibiotic usage duration and indication monitoring.
 """
 
 import logging
+import sys
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import config
+
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir_client import get_shared_fhir_client
+
 from .models import Patient, MedicationOrder
 
 logger = logging.getLogger(__name__)
@@ -519,20 +529,12 @@ class HAPIFHIRClient(FHIRClient):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or config.FHIR_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request to FHIR server."""
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(resource_path, params)
 
 
 class EpicFHIRClient(FHIRClient):
@@ -551,11 +553,8 @@ class EpicFHIRClient(FHIRClient):
         self.access_token: str | None = None
         self.token_expires_at: datetime | None = None
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
         # Load private key
         self.private_key: str | None = None
@@ -616,13 +615,11 @@ class EpicFHIRClient(FHIRClient):
         """GET request with OAuth authentication."""
         token = self._get_access_token()
 
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
+        return self.client.get(
+            resource_path,
+            params,
             headers={"Authorization": f"Bearer {token}"},
         )
-        response.raise_for_status()
-        return response.json()
 
 
 def get_fhir_client() -> FHIRClient:
@@ -21,6 +21,8 @@ from .models import (
 )
 from .config import config
 
+from common.sqlite_pool import get_connection_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,10 +45,10 @@ def _log_indication_activity(
     interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import get_metrics_store, ModuleSource
 
-        store = MetricsStore()
-        store.log_activity(
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.ABX_INDICATIONS,
             provider_id=provider_id,
@@ -67,6 +69,9 @@ def _log_indication_activity(
 class IndicationDatabase:
     """SQLite database for indication tracking."""
 
+    # Bump when _run_migrations changes so existing databases pick it up
+    SCHEMA_VERSION = 2
+
     def __init__(self, db_path: str | None = None):
         """Initialize database connection.
 
@@ -74,6 +79,7 @@ class IndicationDatabase:
             db_path: Path to SQLite database. Uses config default if None.
         """
         self.db_path = db_path or config.INDICATION_DB_PATH
+        self._db = get_connection_manager(Path(self.db_path).expanduser())
         self._ensure_db_exists()
 
     def _ensure_db_exists(self) -> None:
@@ -89,12 +95,14 @@ class IndicationDatabase:
             logger.warning(f"Schema file not found: {schema_path}")
             return
 
-        with self._get_connection() as conn:
-            conn.executescript(schema)
-            conn.commit()
-
-            # Run migrations for existing databases
-            self._run_migrations(conn)
+        # Migrations for existing databases run with the DDL, once per
+        # schema/migration version
+        self._db.ensure_schema(
+            "indication_db",
+            schema,
+            migrate=self._run_migrations,
+            version=self.SCHEMA_VERSION,
+        )
 
     def _run_migrations(self, conn) -> None:
         """Add new columns to existing databases."""
@@ -178,10 +186,11 @@ class IndicationDatabase:
 
     @contextmanager
     def _get_connection(self):
-        """Get database connection with context manager."""
-        db_path = Path(self.db_path).expanduser()
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
+        """Get this thread's pooled connection with context manager.
+
+        Uncommitted work is rolled back on exit; the connection stays open.
+        """
+        conn = self._db.connect()
         try:
             yield conn
         finally:
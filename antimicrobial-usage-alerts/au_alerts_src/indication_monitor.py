@@ -201,9 +201,18 @@ class IndicationMonitor:
         )
         logger.info(f"Found {len(orders)} antibiotic orders in past {since_hours}h")
 
+        # Extract indications for all orders as one LLM batch, then assess
+        # each order with its prefetched result
+        taxonomy_results = self._extract_taxonomy_batch(orders)
+
         assessments = []
-        for order in orders:
-            assessment = self._assess_order(order)
+        for i, order in enumerate(orders):
+            if taxonomy_results is None:
+                assessment = self._assess_order(order)
+            else:
+                assessment = self._assess_order(
+                    order, taxonomy_result=taxonomy_results[i], taxonomy_prefetched=True,
+                )
             if assessment:
                 assessments.append(assessment)
 
@@ -261,7 +270,12 @@ class IndicationMonitor:
         logger.info(f"Found {len(new_alerts)} new alerts")
         return new_alerts
 
-    def _assess_order(self, order: MedicationOrder) -> IndicationAssessment | None:
+    def _assess_order(
+        self,
+        order: MedicationOrder,
+        taxonomy_result=None,
+        taxonomy_prefetched: bool = False,
+    ) -> IndicationAssessment | None:
         """Assess a single medication order.
 
         Uses taxonomy-based extraction (JC-compliant) as primary, with ICD-10 fallback.
@@ -273,6 +287,9 @@ class IndicationMonitor:
 
         Args:
             order: The medication order to assess.
+            taxonomy_result: Taxonomy extraction already run for this order
+                (see _extract_taxonomy_batch).
+            taxonomy_prefetched: Use taxonomy_result instead of extracting.
 
         Returns:
             IndicationAssessment or None if assessment fails.
@@ -332,7 +349,8 @@ class IndicationMonitor:
         if self.use_taxonomy_first and self.taxonomy_extractor:
             logger.debug(f"Attempting taxonomy extraction for {order.fhir_id}")
             try:
-                taxonomy_result = self._extract_with_taxonomy(order, patient)
+                if not taxonomy_prefetched:
+                    taxonomy_result = self._extract_with_taxonomy(order, patient)
                 if taxonomy_result:
                     clinical_syndrome = taxonomy_result.primary_indication
                     clinical_syndrome_display = taxonomy_result.primary_indication_display
@@ -577,19 +595,9 @@ class IndicationMonitor:
         if not self.taxonomy_extractor:
             return None
 
-        # Get recent notes
-        notes = self.fhir_client.get_recent_notes(
-            patient_id=order.patient_id,
-            since_hours=48,
-        )
-
-        if not notes:
-            logger.debug(f"No notes found for patient {patient.mrn}")
-            return None
-
-        # Extract note texts
-        note_texts = [n.get("text", "") for n in notes if n.get("text")]
+        note_texts = self._taxonomy_notes(order)
         if not note_texts:
+            logger.debug(f"No notes found for patient {patient.mrn}")
             return None
 
         # Use taxonomy extractor
@@ -599,6 +607,58 @@ class IndicationMonitor:
             order_date=order.start_date.isoformat() if order.start_date else None,
         )
 
+    def _extract_taxonomy_batch(self, orders: list[MedicationOrder]) -> list | None:
+        """Run taxonomy extraction for many orders as one LLM batch.
+
+        The extractor keeps several requests in flight instead of waiting
+        on each order in turn.
+
+        Args:
+            orders: Orders to extract indications for.
+
+        Returns:
+            IndicationExtraction (or None without notes) per order, in
+            order; None if taxonomy extraction is off or the batch failed,
+            in which case orders are extracted one at a time.
+        """
+        if not (self.use_taxonomy_first and self.taxonomy_extractor and orders):
+            return None
+        if not hasattr(self.taxonomy_extractor, "extract_batch"):
+            return None
+
+        try:
+            batch = []
+            positions = []
+            for i, order in enumerate(orders):
+                note_texts = self._taxonomy_notes(order)
+                if not note_texts:
+                    continue
+                batch.append((
+                    note_texts,
+                    order.medication_name,
+                    order.start_date.isoformat() if order.start_date else None,
+                ))
+                positions.append(i)
+
+            results: list = [None] * len(orders)
+            extractions = self.taxonomy_extractor.extract_batch(batch) if batch else []
+            for i, extraction in zip(positions, extractions):
+                results[i] = extraction
+        except Exception as e:
+            logger.warning(f"Batched taxonomy extraction failed, extracting per order: {e}")
+            return None
+
+        logger.info(f"Extracted indications for {len(batch)}/{len(orders)} orders with notes")
+        return results
+
+    def _taxonomy_notes(self, order: MedicationOrder) -> list[str]:
+        """Texts of the patient's notes from the last 48 hours."""
+        notes = self.fhir_client.get_recent_notes(
+            patient_id=order.patient_id,
+            since_hours=48,
+        )
+        return [n.get("text", "") for n in notes or [] if n.get("text")]
+
     def _taxonomy_to_classification(self, taxonomy_result) -> str | None:
         """Map taxonomy extraction to legacy A/S/N/P/FN classification.
 
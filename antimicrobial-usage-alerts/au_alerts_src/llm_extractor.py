@@ -7,12 +7,21 @@ clinical notes when ICD-10 classification results in N or U.
 import json
 import logging
 import time
+from collections import Counter
 from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import config
+from common.context_packer import (
+    ContextChunk,
+    context_token_budget,
+    estimate_tokens,
+    pack_chunks,
+    split_text,
+)
+from common.llm_cache import cached_call
 from .models import IndicationExtraction, EvidenceSource
 
 logger = logging.getLogger(__name__)
@@ -55,6 +64,9 @@ INFECTION_KEYWORDS = {
     "initiated",
 }
 
+# Score added to every chunk of a high-priority note type
+HIGH_PRIORITY_PRIOR = 1.0
+
 
 class NoteWithMetadata:
     """Clinical note with associated metadata."""
@@ -90,6 +102,12 @@ class IndicationExtractor:
 
     PROMPT_VERSION = "indication_extraction_v2"
 
+    # Ollama context window and reply length; the note budget is what's left
+    NUM_CTX = 8192
+    NUM_PREDICT = 1024
+    # Ollama options, sent with every request and part of the cache key
+    LLM_OPTIONS = {"temperature": 0.0, "num_predict": NUM_PREDICT, "num_ctx": NUM_CTX}
+
     def __init__(
         self,
         model: str | None = None,
@@ -193,7 +211,7 @@ Respond with JSON containing:
         )
 
         # Combine notes with metadata headers
-        combined_notes = self._prepare_notes_with_metadata(filtered_notes)
+        combined_notes = self._prepare_notes_with_metadata(filtered_notes, medication)
 
         # Build prompt
         prompt = self._prompt_template.format(
@@ -286,50 +304,82 @@ Respond with JSON containing:
     def _prepare_notes_with_metadata(
         self,
         notes: list[NoteWithMetadata],
-        max_chars: int = 24000,
+        medication: str = "",
+        max_tokens: int | None = None,
     ) -> str:
         """Prepare notes with metadata headers for LLM input.
 
+        Notes are split into paragraph chunks, ranked by BM25 over the
+        medication name and infection keywords (high-priority note types
+        first), and the best chunks packed into the context window left
+        after the prompt and reply.
+
         Args:
             notes: List of notes with metadata.
-            max_chars: Maximum characters to include.
+            medication: The antibiotic name, scored alongside infection keywords.
+            max_tokens: Hard cap on note tokens. NOTE_CONTEXT_MAX_TOKENS if None.
 
         Returns:
-            Combined and truncated note text with metadata headers.
+            Packed note text with metadata headers.
         """
-        # Format each note with its metadata header
-        formatted = [note.format_for_llm() for note in notes]
-
-        # Join notes with separators
-        combined = "\n\n---\n\n".join(formatted)
+        search_terms = INFECTION_KEYWORDS | self._medication_terms(medication)
 
-        # Truncate if needed
-        if len(combined) > max_chars:
-            combined = combined[:max_chars] + "\n\n[Note truncated...]"
-
-        return combined
+        chunks = []
+        for index, note in enumerate(notes):
+            group = note.format_for_llm().split("\n", 1)[0]
+            note_type_lower = (note.note_type or "").lower()
+            prior = HIGH_PRIORITY_PRIOR if any(
+                hp in note_type_lower for hp in HIGH_PRIORITY_NOTE_TYPES
+            ) else 0.0
+            for offset, text in split_text(note.text):
+                text_lower = text.lower()
+                chunks.append(ContextChunk(
+                    text=text,
+                    group=group,
+                    position=(index, offset),
+                    prior=prior,
+                    terms=Counter({
+                        term: text_lower.count(term)
+                        for term in search_terms if term in text_lower
+                    }),
+                ))
+
+        budget = context_token_budget(
+            num_ctx=self.NUM_CTX,
+            reserved_tokens=estimate_tokens(self._prompt_template),
+            output_tokens=self.NUM_PREDICT,
+            max_tokens=max_tokens,
+        )
+        packed = pack_chunks(chunks, budget)
+        logger.info(f"Notes context for {medication or 'extraction'}: {packed.summary()}")
+        return packed.text
 
-    def _prepare_notes(self, notes: list[str], max_chars: int = 24000) -> str:
-        """Prepare notes for LLM input with truncation.
+    def _prepare_notes(self, notes: list[str], medication: str = "", max_tokens: int | None = None) -> str:
+        """Prepare plain note texts for LLM input within the token budget.
 
         Args:
             notes: List of note texts.
-            max_chars: Maximum characters to include.
+            medication: The antibiotic name, used for ranking.
+            max_tokens: Hard cap on note tokens. NOTE_CONTEXT_MAX_TOKENS if None.
 
         Returns:
-            Combined and truncated note text.
+            Packed note text.
         """
-        # Join notes with separators
-        combined = "\n\n---\n\n".join(notes)
-
-        # Truncate if needed
-        if len(combined) > max_chars:
-            combined = combined[:max_chars] + "\n\n[Note truncated...]"
+        return self._prepare_notes_with_metadata(
+            [NoteWithMetadata(text=n, note_type=f"Note {i + 1}") for i, n in enumerate(notes)],
+            medication,
+            max_tokens,
+        )
 
-        return combined
+    @staticmethod
+    def _medication_terms(medication: str) -> set[str]:
+        """Medication name and its base drug name, lowercased."""
+        med_lower = medication.lower()
+        med_parts = med_lower.split()
+        return {med_lower, med_parts[0]} if med_parts else set()
 
     def _call_llm(self, prompt: str) -> dict:
-        """Call the LLM API.
+        """Call the LLM API, reusing the cached response for an identical prompt.
 
         Args:
             prompt: The prompt to send.
@@ -340,6 +390,16 @@ Respond with JSON containing:
         Raises:
             Exception on API or parsing errors.
         """
+        return cached_call(
+            lambda: self._request_llm(prompt),
+            model=self.model,
+            prompt=prompt,
+            prompt_version=self.PROMPT_VERSION,
+            options=self.LLM_OPTIONS,
+        )
+
+    def _request_llm(self, prompt: str) -> dict:
+        """Send a prompt to the Ollama chat API and parse the JSON reply."""
         response = requests.post(
             f"{self.base_url}/api/chat",
             json={
@@ -349,11 +409,7 @@ Respond with JSON containing:
                 ],
                 "stream": False,
                 "format": "json",
-                "options": {
-                    "temperature": 0.0,  # Deterministic
-                    "num_predict": 1024,
-                    "num_ctx": 8192,
-                },
+                "options": self.LLM_OPTIONS,
             },
             timeout=120,  # Increased for larger context
         )
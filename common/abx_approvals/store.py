@@ -37,10 +37,10 @@ def _log_abx_activity(
     interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import get_metrics_store, ModuleSource
 
-        store = MetricsStore()
-        store.log_activity(
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.ABX_APPROVALS,
             provider_id=provider_id,
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import get_connection_manager
 from .models import (
     AlertType,
     AlertStatus,
@@ -40,10 +41,10 @@ def _log_asp_activity(
     interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ActivityType, ModuleSource
+        from common.metrics_store import get_metrics_store, ActivityType, ModuleSource
 
-        store = MetricsStore()
-        store.log_activity(
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.ASP_ALERTS,
             provider_id=provider_id,
@@ -83,22 +84,20 @@ class AlertStore:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
+        self._db = get_connection_manager(self.db_path)
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
+        """Initialize database schema (once per process)."""
         schema_path = Path(__file__).parent / "schema.sql"
         with open(schema_path) as f:
             schema = f.read()
 
-        with self._connect() as conn:
-            conn.executescript(schema)
+        self._db.ensure_schema("alert_store", schema)
 
     def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled connection with row factory."""
+        return self._db.connect()
 
     def _generate_id(self) -> str:
         """Generate a unique alert ID."""
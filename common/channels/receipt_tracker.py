@@ -8,12 +8,13 @@ delivery analytics.
 import json
 import logging
 import os
-import sqlite3
 from datetime import datetime, date, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import get_connection_manager
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = os.path.expanduser("~/.aegis/notification_receipts.db")
@@ -95,16 +96,14 @@ class ReceiptTracker:
         self._ensure_db()
 
     def _ensure_db(self):
-        """Create database and tables if they don't exist."""
+        """Create database and tables if they don't exist (once per process)."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(RECEIPT_SCHEMA)
+        self._db = get_connection_manager(self.db_path)
+        self._db.ensure_schema("receipt_tracker", RECEIPT_SCHEMA)
 
     def _connect(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled database connection."""
+        return self._db.connect()
 
     def record_send(
         self,
@@ -0,0 +1,35 @@
+"""Token-budgeted context packing for LLM prompts.
+
+Notes used to be joined in date order and cut at a character limit, so a
+relevant assessment in an older note was dropped while boilerplate from
+newer ones survived. The packer splits notes into chunks, scores each with
+BM25 over a keyword set plus section/note-type priors, and fills a token
+budget derived from the model's context window with the best chunks:
+- Budget = min(NOTE_CONTEXT_MAX_TOKENS, num_ctx - prompt - output reserve)
+- Exact repeated chunks are dropped before scoring
+- Per-call token accounting via PackedContext.summary()
+"""
+
+from .packer import (
+    CHARS_PER_TOKEN,
+    ContextChunk,
+    PackedContext,
+    bm25_score,
+    context_token_budget,
+    estimate_tokens,
+    max_context_tokens,
+    pack_chunks,
+    split_text,
+)
+
+__all__ = [
+    "CHARS_PER_TOKEN",
+    "ContextChunk",
+    "PackedContext",
+    "bm25_score",
+    "context_token_budget",
+    "estimate_tokens",
+    "max_context_tokens",
+    "pack_chunks",
+    "split_text",
+]
@@ -0,0 +1,250 @@
+"""Token-budgeted, relevance-ranked packing of note chunks."""
+
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token for clinical English
+CHARS_PER_TOKEN = 4
+
+# docs/AEGIS_OPTIMIZATION_GUIDE.md: ~24K tokens of notes today, target <8K
+DEFAULT_MAX_CONTEXT_TOKENS = 7500
+DEFAULT_OUTPUT_RESERVE_TOKENS = 1024
+
+# Chunks longer than this are split at paragraph/whitespace boundaries so
+# one long note cannot crowd everything else out of the budget
+MAX_CHUNK_TOKENS = 400
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+GROUP_SEPARATOR = "\n\n---\n\n"
+CHUNK_SEPARATOR = "\n\n"
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str | int) -> int:
+    """Estimate LLM tokens for a text or a character count."""
+    chars = text if isinstance(text, int) else len(text)
+    return -(-chars // CHARS_PER_TOKEN)
+
+
+def max_context_tokens() -> int:
+    """Hard cap on note-context tokens (NOTE_CONTEXT_MAX_TOKENS)."""
+    return int(os.getenv("NOTE_CONTEXT_MAX_TOKENS", str(DEFAULT_MAX_CONTEXT_TOKENS)))
+
+
+def context_token_budget(
+    num_ctx: int | None = None,
+    reserved_tokens: int = 0,
+    output_tokens: int = DEFAULT_OUTPUT_RESERVE_TOKENS,
+    max_tokens: int | None = None,
+) -> int:
+    """Tokens available for note context in one prompt.
+
+    Args:
+        num_ctx: Model context window. Only the cap applies if None.
+        reserved_tokens: Prompt template, instructions and other fields.
+        output_tokens: Room left for the model's reply.
+        max_tokens: Hard cap. Defaults to max_context_tokens().
+
+    Returns:
+        The smaller of the cap and what the context window leaves over.
+    """
+    budget = max_tokens if max_tokens is not None else max_context_tokens()
+    if num_ctx:
+        budget = min(budget, num_ctx - reserved_tokens - output_tokens)
+    return max(budget, 0)
+
+
+@dataclass
+class ContextChunk:
+    """One candidate piece of prompt context.
+
+    Attributes:
+        text: Chunk text.
+        group: Header of the source note, rendered once per note.
+        label: Section label (e.g. "Assessment/Plan"), or "" for body text.
+        position: (note index, offset) used to render chunks in note order.
+        prior: Weight added to the BM25 score (section, note type, recency).
+        terms: Keyword occurrence counts in the text.
+    """
+    text: str
+    group: str
+    label: str = ""
+    position: tuple[int, int] = (0, 0)
+    prior: float = 0.0
+    terms: Counter = field(default_factory=Counter)
+    score: float = 0.0
+
+    def rendered(self) -> str:
+        return f"{self.label}:\n{self.text}" if self.label else self.text
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(len(self.rendered()) + len(CHUNK_SEPARATOR))
+
+
+@dataclass
+class PackedContext:
+    """Packed prompt context and what it cost."""
+    text: str
+    tokens: int
+    token_budget: int
+    source_tokens: int
+    chunks_total: int
+    chunks_packed: int
+    groups_total: int
+    groups_packed: int
+    duplicates_dropped: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens": self.tokens,
+            "token_budget": self.token_budget,
+            "source_tokens": self.source_tokens,
+            "chunks_total": self.chunks_total,
+            "chunks_packed": self.chunks_packed,
+            "notes_total": self.groups_total,
+            "notes_packed": self.groups_packed,
+            "duplicates_dropped": self.duplicates_dropped,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"~{self.tokens}/{self.token_budget} tokens from {self.groups_packed}/"
+            f"{self.groups_total} notes ({self.chunks_packed}/{self.chunks_total} chunks "
+            f"of ~{self.source_tokens} tokens, {self.duplicates_dropped} duplicate, "
+            f"{self.elapsed_ms:.1f} ms)"
+        )
+
+
+def split_text(text: str, max_chars: int = MAX_CHUNK_TOKENS * CHARS_PER_TOKEN) -> list[tuple[int, str]]:
+    """Split text into (offset, piece) chunks of at most max_chars.
+
+    Consecutive paragraphs are merged while they fit; a paragraph longer
+    than max_chars is cut at the last whitespace before the limit.
+    """
+    pieces: list[tuple[int, str]] = []
+    start, current = 0, ""
+    pos = 0
+    for para in _PARAGRAPH_BREAK.split(text):
+        offset = text.find(para, pos)
+        pos = offset + len(para)
+        para = para.strip()
+        if not para:
+            continue
+        if current and len(current) + 2 + len(para) <= max_chars:
+            current = f"{current}\n\n{para}"
+            continue
+        if current:
+            pieces.append((start, current))
+        while len(para) > max_chars:
+            cut = para.rfind(" ", 0, max_chars)
+            cut = cut if cut > max_chars // 2 else max_chars
+            pieces.append((offset, para[:cut].strip()))
+            para, offset = para[cut:].strip(), offset + cut
+        start, current = offset, para
+    if current:
+        pieces.append((start, current))
+    return pieces
+
+
+def bm25_score(chunks: list[ContextChunk]) -> None:
+    """Set each chunk's score to its prior plus BM25 over its keyword terms.
+
+    Document frequencies come from the chunks themselves, so a keyword on
+    every note (e.g. the device name) counts for less than one that
+    appears in a single assessment.
+    """
+    if not chunks:
+        return
+    n = len(chunks)
+    doc_freq: Counter = Counter()
+    for chunk in chunks:
+        doc_freq.update(chunk.terms.keys())
+    avg_len = sum(chunk.tokens for chunk in chunks) / n
+
+    for chunk in chunks:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * chunk.tokens / avg_len)
+        score = 0.0
+        for term, tf in chunk.terms.items():
+            idf = math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        chunk.score = chunk.prior + score
+
+
+def pack_chunks(chunks: list[ContextChunk], token_budget: int) -> PackedContext:
+    """Fill a token budget with the highest-scoring chunks.
+
+    Exact repeats (whitespace and case ignored) are dropped first. Chunks
+    are then taken by descending score, skipping any that no longer fit,
+    and rendered grouped by note in their original order. The estimated
+    token count of the result never exceeds token_budget.
+
+    Args:
+        chunks: Candidate chunks with terms and priors set.
+        token_budget: Maximum estimated tokens of the packed text.
+
+    Returns:
+        PackedContext with the text and token accounting.
+    """
+    start_time = time.perf_counter()
+    groups_total = len({chunk.group for chunk in chunks})
+
+    unique: list[ContextChunk] = []
+    seen: set[str] = set()
+    for chunk in sorted(chunks, key=lambda c: c.position):
+        key = _WHITESPACE.sub(" ", chunk.text).strip().lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(chunk)
+
+    bm25_score(unique)
+    source_tokens = sum(chunk.tokens for chunk in unique)
+
+    selected: list[ContextChunk] = []
+    groups_used: set[str] = set()
+    used = 0
+    for chunk in sorted(unique, key=lambda c: (-c.score, c.position)):
+        cost = chunk.tokens
+        if chunk.group not in groups_used:
+            cost += estimate_tokens(len(chunk.group) + 1 + len(GROUP_SEPARATOR))
+        if used + cost > token_budget:
+            continue
+        selected.append(chunk)
+        groups_used.add(chunk.group)
+        used += cost
+
+    by_group: dict[str, list[ContextChunk]] = {}
+    for chunk in sorted(selected, key=lambda c: c.position):
+        by_group.setdefault(chunk.group, []).append(chunk)
+    text = GROUP_SEPARATOR.join(
+        f"{group}\n" + CHUNK_SEPARATOR.join(chunk.rendered() for chunk in group_chunks)
+        for group, group_chunks in by_group.items()
+    )
+
+    return PackedContext(
+        text=text,
+        tokens=estimate_tokens(text),
+        token_budget=token_budget,
+        source_tokens=source_tokens,
+        chunks_total=len(unique),
+        chunks_packed=len(selected),
+        groups_total=groups_total,
+        groups_packed=len(by_group),
+        duplicates_dropped=len(chunks) - len(unique),
+        elapsed_ms=(time.perf_counter() - start_time) * 1000,
+    )
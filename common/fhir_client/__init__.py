@@ -0,0 +1,25 @@
+"""Shared FHIR client with connection pooling, request coalescing and caching.
+
+Provides one pooled client per FHIR server for all AEGIS modules:
+- Tuned connection pool with retries on transient gateway errors
+- Identical concurrent GETs coalesced into one request
+- LRU + TTL cache for resource reads with ETag revalidation
+- Hit/miss counters, reported per monitor cycle
+"""
+
+from .cache import CachedResource, ResourceCache
+from .client import (
+    DEFAULT_TTL_BY_TYPE,
+    PooledFHIRClient,
+    end_fhir_cycle,
+    get_shared_fhir_client,
+)
+
+__all__ = [
+    "CachedResource",
+    "ResourceCache",
+    "DEFAULT_TTL_BY_TYPE",
+    "PooledFHIRClient",
+    "end_fhir_cycle",
+    "get_shared_fhir_client",
+]
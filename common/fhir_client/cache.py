@@ -0,0 +1,107 @@
+"""LRU + TTL cache for FHIR resource reads."""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CachedResource:
+    """A cached FHIR resource body with its validator.
+
+    The raw JSON body is stored rather than the parsed dict so every caller
+    gets its own copy and cannot mutate the cached resource.
+    """
+
+    body: bytes
+    etag: str | None
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class ResourceCache:
+    """Thread-safe LRU cache keyed by (resource type, id).
+
+    Entries are kept past their TTL so the ETag can be used for a cheap
+    If-None-Match revalidation; only LRU eviction removes them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        default_ttl: float = 300.0,
+        ttl_by_type: dict[str, float] | None = None,
+    ):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum number of resources held.
+            default_ttl: Seconds before an entry must be revalidated.
+            ttl_by_type: Per resource type TTL overrides.
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttl_by_type = ttl_by_type or {}
+        self._entries: OrderedDict[tuple[str, str], CachedResource] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, resource_type: str) -> float:
+        return self.ttl_by_type.get(resource_type, self.default_ttl)
+
+    def get(self, resource_type: str, resource_id: str) -> CachedResource | None:
+        """Get an entry (fresh or stale) and mark it recently used."""
+        key = (resource_type, resource_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        resource_type: str,
+        resource_id: str,
+        body: bytes,
+        etag: str | None = None,
+    ) -> None:
+        """Store a resource body, evicting the least recently used if full."""
+        if self.max_entries <= 0:
+            return
+        key = (resource_type, resource_id)
+        entry = CachedResource(
+            body=body,
+            etag=etag,
+            expires_at=time.monotonic() + self.ttl_for(resource_type),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, resource_type: str, resource_id: str) -> None:
+        """Extend an entry's TTL after a 304 Not Modified."""
+        with self._lock:
+            entry = self._entries.get((resource_type, resource_id))
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl_for(resource_type)
+
+    def invalidate(self, resource_type: str, resource_id: str | None = None) -> None:
+        """Drop one resource, or every resource of a type."""
+        with self._lock:
+            if resource_id is not None:
+                self._entries.pop((resource_type, resource_id), None)
+                return
+            for key in [k for k in self._entries if k[0] == resource_type]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
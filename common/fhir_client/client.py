@@ -0,0 +1,379 @@
+"""Pooled FHIR client shared by all AEGIS modules.
+
+Every monitor cycle reads the same Patient, Encounter and MedicationRequest
+resources many times (once per alert, per rule, per note lookup). This
+client sits in front of the FHIR server and:
+
+- Reuses connections through one tuned requests.Session per server
+- Coalesces identical GETs that are in flight at the same time, so N
+  threads asking for the same URL produce one HTTP request
+- Caches reads of common resource types (``Patient/123``) in an LRU with a
+  per-type TTL, revalidating expired entries with If-None-Match so the
+  server can answer 304 Not Modified instead of re-sending the resource
+- Counts cache hits, misses and revalidations; each monitor's cycle
+  reports the change since its own previous cycle
+
+Modules obtain a shared instance per base URL:
+
+    from common.fhir_client import get_shared_fhir_client
+
+    client = get_shared_fhir_client("http://localhost:8081/fhir")
+    patient = client.read("Patient", "123")
+    bundle = client.get("MedicationRequest", {"patient": "123", "status": "active"})
+    ...
+    client.end_cycle("drug-bug")  # logs the counters since drug-bug's last cycle
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import ResourceCache
+
+logger = logging.getLogger(__name__)
+
+# Resource types whose reads are cached, with their TTL in seconds.
+# Demographics and reference data rarely change within a cycle; orders and
+# encounters change more often so they are revalidated sooner.
+DEFAULT_TTL_BY_TYPE: dict[str, float] = {
+    "Patient": 900,
+    "Encounter": 120,
+    "MedicationRequest": 60,
+    "Medication": 3600,
+    "Location": 3600,
+    "Practitioner": 3600,
+    "Organization": 3600,
+}
+
+_READ_PATH = re.compile(r"^/?([A-Z][A-Za-z]+)/([A-Za-z0-9\-.]{1,64})/?$")
+
+
+class _InFlight:
+    """An HTTP request other threads can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.body: bytes | None = None
+        self.error: Exception | None = None
+
+
+class PooledFHIRClient:
+    """Connection-pooled, caching FHIR client."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30,
+        headers: dict[str, str] | None = None,
+        pool_maxsize: int = 20,
+        max_retries: int = 2,
+        cache_size: int = 2048,
+        ttl_by_type: dict[str, float] | None = None,
+    ):
+        """Initialize client.
+
+        Args:
+            base_url: FHIR server base URL.
+            timeout: Default request timeout in seconds.
+            headers: Headers sent with every request.
+            pool_maxsize: Connections kept open to the server.
+            max_retries: Retries for GETs failing with 502/503/504.
+            cache_size: Maximum cached resources (0 disables the cache).
+            ttl_by_type: Cacheable resource types and their TTL in seconds.
+                Defaults to DEFAULT_TTL_BY_TYPE.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.ttl_by_type = dict(DEFAULT_TTL_BY_TYPE if ttl_by_type is None else ttl_by_type)
+        self.cache = ResourceCache(max_entries=cache_size, ttl_by_type=self.ttl_by_type)
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/fhir+json",
+            "Content-Type": "application/fhir+json",
+        })
+        if headers:
+            self.session.headers.update(headers)
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._inflight: dict[tuple, _InFlight] = {}
+        self._inflight_lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self._cycle_marks: dict[str | None, Counter] = {}  # Counters at each label's last cycle end
+        self._stats_lock = threading.Lock()
+
+    # --- Requests ---
+
+    def get(
+        self,
+        resource_path: str,
+        params: dict | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """GET a resource path or absolute URL and return the parsed JSON.
+
+        Plain reads of cacheable types (``Patient/123`` without params) are
+        served from the cache.
+
+        Raises:
+            requests.HTTPError: On non-2xx responses.
+        """
+        if not params and not resource_path.startswith(("http://", "https://")):
+            match = _READ_PATH.match(resource_path)
+            if match and match.group(1) in self.ttl_by_type:
+                return self.read(match.group(1), match.group(2), headers=headers, timeout=timeout)
+
+        url = self._url(resource_path)
+        key = ("GET", url, _freeze(params), _freeze(headers))
+        body = self._coalesce(key, lambda: self._send(url, params, headers, timeout).content)
+        return json.loads(body)
+
+    def read(
+        self,
+        resource_type: str,
+        resource_id: str,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """Read one resource by type and id, using the cache when possible.
+
+        Raises:
+            requests.HTTPError: On non-2xx responses (e.g. 404 Not Found).
+        """
+        cacheable = resource_type in self.ttl_by_type and self.cache.max_entries > 0
+        entry = self.cache.get(resource_type, resource_id) if cacheable else None
+        if entry is not None and not entry.expired:
+            self._count("hits", resource_type)
+            return json.loads(entry.body)
+
+        url = self._url(f"{resource_type}/{resource_id}")
+
+        def fetch() -> bytes:
+            request_headers = dict(headers or {})
+            if entry is not None and entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            response = self._send(url, None, request_headers, timeout)
+            if response.status_code == 304 and entry is not None:
+                self._count("revalidated", resource_type)
+                self.cache.touch(resource_type, resource_id)
+                return entry.body
+            self._count("misses", resource_type)
+            if cacheable:
+                self.cache.put(
+                    resource_type, resource_id, response.content,
+                    etag=response.headers.get("ETag"),
+                )
+            return response.content
+
+        key = ("READ", url, _freeze(headers))
+        return json.loads(self._coalesce(key, fetch))
+
+    def post(
+        self,
+        resource_path: str,
+        data: dict | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """POST a resource (or search via POST) and return the parsed JSON."""
+        self._count("requests")
+        try:
+            response = self.session.post(
+                self._url(resource_path),
+                json=data,
+                headers=headers,
+                timeout=timeout or self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            self._count("errors")
+            raise
+        return response.json() if response.content else {}
+
+    def invalidate(self, resource_type: str, resource_id: str | None = None) -> None:
+        """Drop cached reads after a write to the server."""
+        self.cache.invalidate(resource_type, resource_id)
+
+    # --- Statistics ---
+
+    def stats(self) -> dict[str, Any]:
+        """Counters accumulated since the client was created."""
+        with self._stats_lock:
+            counts = dict(self._stats)
+        return self._summarize(counts)
+
+    def _summarize(self, counts: dict[str, int]) -> dict[str, Any]:
+        by_type: dict[str, dict[str, int]] = {}
+        for key, value in sorted(counts.items()):
+            if ":" in key:
+                name, resource_type = key.split(":", 1)
+                by_type.setdefault(resource_type, {})[name] = value
+        hits = counts.get("hits", 0)
+        lookups = hits + counts.get("misses", 0) + counts.get("revalidated", 0)
+        return {
+            "requests": counts.get("requests", 0),
+            "hits": hits,
+            "misses": counts.get("misses", 0),
+            "revalidated": counts.get("revalidated", 0),
+            "coalesced": counts.get("coalesced", 0),
+            "errors": counts.get("errors", 0),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "by_type": by_type,
+            "cached_resources": len(self.cache),
+        }
+
+    def end_cycle(self, label: str | None = None) -> dict[str, Any]:
+        """Log the counters since this label's previous end_cycle().
+
+        Call at the end of each monitor cycle. The shared counters are not
+        reset, so monitors in one process don't clear each other's cycles;
+        each label gets the change since its own last call.
+
+        Returns:
+            The cycle's counters.
+        """
+        with self._stats_lock:
+            counts = Counter(self._stats)
+            previous = self._cycle_marks.get(label, Counter())
+            self._cycle_marks[label] = counts
+        stats = self._summarize(dict(counts - previous))
+        if stats["requests"] or stats["hits"]:
+            logger.info(
+                f"FHIR cycle{f' [{label}]' if label else ''}: "
+                f"{stats['requests']} requests, {stats['hits']} cache hits, "
+                f"{stats['misses']} misses, {stats['revalidated']} revalidated (304), "
+                f"{stats['coalesced']} coalesced, hit rate {stats['hit_rate']:.0%}"
+            )
+        return stats
+
+    # --- Internals ---
+
+    def _url(self, resource_path: str) -> str:
+        if resource_path.startswith(("http://", "https://")):
+            return resource_path
+        return f"{self.base_url}/{resource_path.lstrip('/')}"
+
+    def _send(
+        self,
+        url: str,
+        params: dict | None,
+        headers: dict[str, str] | None,
+        timeout: float | None,
+    ) -> requests.Response:
+        """Issue one GET, raising for error statuses (304 is returned)."""
+        self._count("requests")
+        try:
+            response = self.session.get(
+                url, params=params, headers=headers, timeout=timeout or self.timeout
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+        except requests.RequestException:
+            self._count("errors")
+            raise
+        return response
+
+    def _coalesce(self, key: tuple, fetch: Callable[[], bytes]) -> bytes:
+        """Run fetch once for all threads requesting the same key at once."""
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlight()
+                self._inflight[key] = call
+
+        if not leader:
+            self._count("coalesced")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.body
+
+        try:
+            call.body = fetch()
+            return call.body
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def _count(self, name: str, resource_type: str | None = None) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+            if resource_type:
+                self._stats[f"{name}:{resource_type}"] += 1
+
+
+def _freeze(mapping: dict | None) -> tuple:
+    """Hashable form of params/headers for coalescing keys."""
+    if not mapping:
+        return ()
+    items = mapping.items() if isinstance(mapping, dict) else mapping
+    return tuple(sorted((str(k), str(v)) for k, v in items))
+
+
+_shared_clients: dict[tuple, PooledFHIRClient] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_fhir_client(
+    base_url: str,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> PooledFHIRClient:
+    """Get the process-wide client for a FHIR server.
+
+    Clients are shared per base URL (and static headers) so every module in
+    the process uses the same connection pool and cache. Pool and cache
+    sizes come from FHIR_POOL_MAXSIZE, FHIR_CACHE_SIZE and
+    FHIR_REQUEST_TIMEOUT.
+
+    Args:
+        base_url: FHIR server base URL.
+        headers: Static headers (e.g. a long-lived Authorization token).
+            Per-request tokens should be passed to get() instead.
+        timeout: Default request timeout for a newly created client.
+    """
+    key = (base_url.rstrip("/"), _freeze(headers))
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = PooledFHIRClient(
+                base_url,
+                timeout=timeout or float(os.getenv("FHIR_REQUEST_TIMEOUT", "30")),
+                headers=headers,
+                pool_maxsize=int(os.getenv("FHIR_POOL_MAXSIZE", "20")),
+                cache_size=int(os.getenv("FHIR_CACHE_SIZE", "2048")),
+            )
+            _shared_clients[key] = client
+        return client
+
+
+def end_fhir_cycle(label: str | None = None) -> dict[str, dict[str, Any]]:
+    """End the cycle on every shared client, returning stats by base URL."""
+    with _shared_lock:
+        clients = list(_shared_clients.values())
+    return {client.base_url: client.end_cycle(label) for client in clients}
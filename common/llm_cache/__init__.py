@@ -0,0 +1,28 @@
+"""Content-addressed cache for deterministic LLM extraction calls.
+
+Re-classifying a candidate whose notes have not changed re-sends the same
+context to the model. Responses are stored in SQLite keyed by a hash of
+(model, prompt version, output schema, whitespace-normalized prompt), so
+unchanged inputs return immediately:
+- Size-bounded with least-recently-used eviction (LLM_CACHE_MAX_MB)
+- Per-process hit/miss counters and estimated time saved
+- Disabled with LLM_CACHE_ENABLED=false
+"""
+
+from .cache import (
+    LLMResponseCache,
+    cached_call,
+    get_llm_cache,
+    llm_cache_enabled,
+    make_cache_key,
+    normalize_prompt,
+)
+
+__all__ = [
+    "LLMResponseCache",
+    "cached_call",
+    "get_llm_cache",
+    "llm_cache_enabled",
+    "make_cache_key",
+    "normalize_prompt",
+]
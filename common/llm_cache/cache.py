@@ -0,0 +1,337 @@
+"""Content-addressed LLM response cache with SQLite persistence."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from ..sqlite_pool import get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.expanduser("~/.aegis/llm_cache.db")
+DEFAULT_MAX_MB = 256
+
+# Bump to invalidate every cached response (e.g. after changing normalization)
+KEY_VERSION = 1
+
+_LINE_EDGE_SPACE = re.compile(r"[ \t]*\n[ \t]*")
+_INNER_SPACE = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(text: str) -> str:
+    """Normalize whitespace so cosmetic differences share a cache entry.
+
+    Line endings are unified, runs of spaces/tabs collapse to one space,
+    indentation and trailing whitespace are dropped and runs of blank
+    lines collapse to one.
+    Case and wording are kept: they change what the model sees.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _INNER_SPACE.sub(" ", text)
+    text = _LINE_EDGE_SPACE.sub("\n", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return text.strip()
+
+
+def make_cache_key(
+    model: str,
+    prompt: str,
+    prompt_version: str = "",
+    schema: dict[str, Any] | None = None,
+    system_prompt: str | None = None,
+    options: dict[str, Any] | None = None,
+) -> str:
+    """Hash everything that determines a deterministic LLM response.
+
+    Args:
+        model: Model name (including tag/quantization).
+        prompt: User prompt containing the note context.
+        prompt_version: Caller's prompt template version or namespace.
+        schema: JSON schema of the expected output.
+        system_prompt: Optional system prompt.
+        options: Sampling/decoding options that affect the output.
+
+    Returns:
+        Hex sha256 digest.
+    """
+    canonical = json.dumps(
+        {
+            "v": KEY_VERSION,
+            "model": model,
+            "prompt_version": prompt_version,
+            "schema": schema,
+            "system": normalize_prompt(system_prompt) if system_prompt else None,
+            "options": options,
+            "prompt": normalize_prompt(prompt),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """Persistent cache of parsed LLM responses keyed by request content.
+
+    Only deterministic (temperature 0) calls should be cached. Entries are
+    evicted least-recently-used once the stored responses exceed max_bytes.
+    Hit/miss counters are kept per process; entry counts and sizes come
+    from the database.
+    """
+
+    def __init__(self, db_path: str | None = None, max_bytes: int | None = None):
+        """Initialize cache.
+
+        Args:
+            db_path: SQLite file. Defaults to LLM_CACHE_DB_PATH or
+                ~/.aegis/llm_cache.db.
+            max_bytes: Size bound for stored responses. Defaults to
+                LLM_CACHE_MAX_MB megabytes.
+        """
+        self.db_path = str(db_path or os.environ.get("LLM_CACHE_DB_PATH", DEFAULT_DB_PATH))
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._seconds_saved = 0.0
+        self._ensure_db()
+
+    def _ensure_db(self):
+        """Create database and tables if they don't exist (once per process)."""
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        schema_path = Path(__file__).parent / "schema.sql"
+        self._db = get_connection_manager(self.db_path)
+        with open(schema_path) as f:
+            self._db.ensure_schema("llm_cache", f.read())
+
+    def _connect(self):
+        """Get this thread's pooled database connection."""
+        return self._db.connect()
+
+    def get(self, key: str) -> Any | None:
+        """Look up a cached response and mark it recently used."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, compute_seconds FROM llm_response_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    """UPDATE llm_response_cache
+                    SET last_used_at = ?, hit_count = hit_count + 1
+                    WHERE cache_key = ?""",
+                    (time.time(), key),
+                )
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._seconds_saved += row["compute_seconds"]
+        return json.loads(row["response"])
+
+    def put(
+        self,
+        key: str,
+        response: Any,
+        model: str = "",
+        prompt_version: str = "",
+        elapsed_seconds: float = 0.0,
+    ) -> None:
+        """Store a response, evicting old entries if over the size bound.
+
+        Args:
+            key: Key from make_cache_key().
+            response: JSON-serializable parsed response.
+            model: Model name, for inspection.
+            prompt_version: Prompt version, for inspection and clear().
+            elapsed_seconds: How long the uncached call took; each later
+                hit is credited with this much saved time.
+        """
+        body = json.dumps(response, separators=(",", ":"))
+        size = len(body.encode())
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_response_cache
+                (cache_key, model, prompt_version, response, size_bytes,
+                 compute_seconds, created_at, last_used_at, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)""",
+                (key, model, prompt_version, body, size, elapsed_seconds, now, now),
+            )
+            evicted = self._evict(conn)
+
+        with self._lock:
+            self._stores += 1
+            self._evictions += evicted
+
+    def _evict(self, conn) -> int:
+        """Drop least-recently-used entries beyond max_bytes."""
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM llm_response_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        cursor = conn.execute(
+            """DELETE FROM llm_response_cache WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key, SUM(size_bytes) OVER (
+                        ORDER BY last_used_at DESC, created_at DESC
+                    ) AS running
+                    FROM llm_response_cache
+                ) WHERE running > ?
+            )""",
+            (self.max_bytes,),
+        )
+        if cursor.rowcount:
+            logger.debug(f"LLM cache evicted {cursor.rowcount} entries")
+        return cursor.rowcount
+
+    def get_or_call(
+        self,
+        call: Callable[[], Any],
+        model: str,
+        prompt: str,
+        prompt_version: str = "",
+        schema: dict[str, Any] | None = None,
+        system_prompt: str | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> Any:
+        """Return the cached response for a request, calling the LLM on a miss.
+
+        Empty responses are not cached so a failed parse is retried. A
+        locked or corrupt cache database counts as a miss and is logged;
+        the LLM is still called exactly once.
+        """
+        key = make_cache_key(model, prompt, prompt_version, schema, system_prompt, options)
+        try:
+            cached = self.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            logger.info(f"LLM cache hit [{prompt_version or model}] {key[:12]}")
+            return cached
+
+        started = time.perf_counter()
+        response = call()
+        if response:
+            try:
+                self.put(key, response, model, prompt_version, time.perf_counter() - started)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM response cache store failed: {e}")
+        return response
+
+    def clear(self, prompt_version: str | None = None) -> int:
+        """Delete all entries, or only those for one prompt version.
+
+        Returns:
+            Number of entries deleted.
+        """
+        with self._connect() as conn:
+            if prompt_version is None:
+                cursor = conn.execute("DELETE FROM llm_response_cache")
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM llm_response_cache WHERE prompt_version = ?",
+                    (prompt_version,),
+                )
+            return cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Hit-rate counters for this process plus current cache size."""
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT COUNT(*) AS entries,
+                          COALESCE(SUM(size_bytes), 0) AS size_bytes,
+                          COALESCE(SUM(hit_count), 0) AS lifetime_hits
+                FROM llm_response_cache"""
+            ).fetchone()
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "seconds_saved": round(self._seconds_saved, 1),
+                "entries": row["entries"],
+                "size_bytes": row["size_bytes"],
+                "max_bytes": self.max_bytes,
+                "lifetime_hits": row["lifetime_hits"],
+            }
+
+
+_shared_cache: LLMResponseCache | None = None
+_shared_lock = threading.Lock()
+
+
+def llm_cache_enabled() -> bool:
+    """Whether LLM response caching is on (LLM_CACHE_ENABLED, default true)."""
+    return os.environ.get("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Get the process-wide LLM response cache, or None if disabled."""
+    global _shared_cache
+    if not llm_cache_enabled():
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
+
+
+def cached_call(
+    call: Callable[[], Any],
+    model: str,
+    prompt: str,
+    prompt_version: str = "",
+    schema: dict[str, Any] | None = None,
+    system_prompt: str | None = None,
+    options: dict[str, Any] | None = None,
+) -> Any:
+    """Run a deterministic LLM call through the shared cache, if enabled.
+
+    Pass the same options dict that is sent to the model so a change to
+    them (e.g. num_ctx) misses the cache. If the cache database cannot be
+    opened the call is made directly and the failure is logged.
+    """
+    try:
+        cache = get_llm_cache()
+    except sqlite3.Error as e:
+        logger.warning(f"LLM response cache unavailable, calling the LLM directly: {e}")
+        cache = None
+    if cache is None:
+        return call()
+    return cache.get_or_call(
+        call,
+        model=model,
+        prompt=prompt,
+        prompt_version=prompt_version,
+        schema=schema,
+        system_prompt=system_prompt,
+        options=options,
+    )
@@ -0,0 +1,17 @@
+-- Content-addressed LLM response cache
+-- One row per distinct (model, prompt version, schema, normalized prompt)
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key TEXT PRIMARY KEY,        -- sha256 of the canonical request
+    model TEXT,
+    prompt_version TEXT,               -- Caller's prompt/template version or namespace
+    response TEXT NOT NULL,            -- Parsed response as JSON
+    size_bytes INTEGER NOT NULL,
+    compute_seconds REAL NOT NULL DEFAULT 0,  -- Duration of the uncached call
+    created_at REAL NOT NULL,          -- Unix time
+    last_used_at REAL NOT NULL,        -- Unix time, drives LRU eviction
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_lru ON llm_response_cache(last_used_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_version ON llm_response_cache(prompt_version);
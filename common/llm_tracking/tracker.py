@@ -8,6 +8,7 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import get_connection_manager
 from .models import LLMDecisionRecord, DecisionOutcome, LLMOverrideReason
 
 logger = logging.getLogger(__name__)
@@ -23,18 +24,16 @@ class LLMDecisionTracker:
         self._ensure_db()
 
     def _ensure_db(self):
-        """Create database and tables if they don't exist."""
+        """Create database and tables if they don't exist (once per process)."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         schema_path = Path(__file__).parent / "schema.sql"
-        with sqlite3.connect(self.db_path) as conn:
-            with open(schema_path) as f:
-                conn.executescript(f.read())
+        self._db = get_connection_manager(self.db_path)
+        with open(schema_path) as f:
+            self._db.ensure_schema("llm_tracking", f.read())
 
     def _connect(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled database connection."""
+        return self._db.connect()
 
     def record_extraction(
         self,
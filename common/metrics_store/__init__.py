@@ -18,7 +18,8 @@ from .models import (
     InterventionOutcome,
     ProviderSession,
 )
-from .store import MetricsStore
+from .store import MetricsStore, get_metrics_store
+from .activity_sink import ActivitySink
 from .aggregator import MetricsAggregator, LocationScore, ServiceScore, ResolutionPatterns
 from .action_analyzer import ActionAnalyzer
 from .reports import MetricsReporter
@@ -37,6 +38,8 @@ __all__ = [
     "InterventionOutcome",
     "ProviderSession",
     "MetricsStore",
+    "get_metrics_store",
+    "ActivitySink",
     "MetricsAggregator",
     "LocationScore",
     "ServiceScore",
@@ -0,0 +1,223 @@
+"""Background batched writer for provider activity events.
+
+Alert acknowledgements, snoozes, resolutions and reviews each log a
+provider_activity row. Writing that row synchronously puts a SQLite write
+transaction inside every dashboard click and monitor action. The sink
+below takes rows on a bounded queue and a single background thread writes
+them with ``executemany`` in one transaction per batch.
+
+Batches are written every ``flush_interval_ms`` or as soon as
+``batch_size`` rows are waiting, whichever comes first. When the queue is
+full, producers wait briefly and then write their row synchronously, so
+activity is never dropped and a stalled writer slows callers instead of
+growing memory without bound. Pending rows are flushed at interpreter exit.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FlushRequest:
+    """Queue marker asking the writer to report once earlier rows are written."""
+
+    done: threading.Event
+
+
+_STOP = object()
+
+
+class ActivitySink:
+    """Bounded-queue, batching writer for activity rows."""
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[tuple]], None],
+        flush_interval_ms: int | None = None,
+        batch_size: int | None = None,
+        max_queue: int | None = None,
+        put_timeout: float = 0.05,
+    ):
+        """Initialize sink.
+
+        Args:
+            write_batch: Writes a list of rows in one transaction.
+            flush_interval_ms: Max time a row waits before being written.
+                Defaults to METRICS_ACTIVITY_FLUSH_MS or 250.
+            batch_size: Rows per transaction that trigger an immediate
+                write. Defaults to METRICS_ACTIVITY_BATCH_SIZE or 200.
+            max_queue: Queue bound. Defaults to METRICS_ACTIVITY_QUEUE_SIZE
+                or 10000.
+            put_timeout: Seconds a producer waits on a full queue before
+                writing its row synchronously.
+        """
+        self.write_batch = write_batch
+        self.flush_interval = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else int(os.environ.get("METRICS_ACTIVITY_FLUSH_MS", "250"))
+        ) / 1000
+        self.batch_size = batch_size or int(os.environ.get("METRICS_ACTIVITY_BATCH_SIZE", "200"))
+        self.put_timeout = put_timeout
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max_queue or int(os.environ.get("METRICS_ACTIVITY_QUEUE_SIZE", "10000"))
+        )
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "sync_writes": 0,
+            "failed": 0,
+        }
+        atexit.register(self.close)
+
+    def submit(self, row: tuple) -> None:
+        """Queue a row for writing, applying backpressure when full."""
+        if self._closed:
+            self._write_sync(row)
+            return
+
+        self._ensure_worker()
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            logger.warning("Activity queue full; writing activity synchronously")
+            self._write_sync(row)
+            return
+        with self._lock:
+            self._stats["enqueued"] += 1
+
+    def flush(self, timeout: float | None = 5.0) -> bool:
+        """Block until every row queued before this call is written.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        marker = _FlushRequest(threading.Event())
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                logger.error("Activity queue full at shutdown; pending activity may be lost")
+                return
+            thread.join(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Counters since the sink started."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        return stats
+
+    # --- Internals ---
+
+    def _ensure_worker(self) -> None:
+        """Start the writer thread (again, after a fork)."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="metrics-activity-sink", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        batch: list[tuple] = []
+        markers: list[_FlushRequest] = []
+        stop = False
+
+        while not stop:
+            deadline = time.monotonic() + self.flush_interval
+            # Wait for the first row, then gather until full or deadline
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic() if batch else None
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    markers.append(item)
+                    break
+                batch.append(item)
+
+            if batch:
+                self._write(batch)
+                batch = []
+            for marker in markers:
+                marker.done.set()
+            markers = []
+
+        # Drain anything queued after the stop marker
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._write(leftovers)
+
+    def _write(self, batch: list[tuple]) -> None:
+        for attempt in range(2):
+            try:
+                self.write_batch(batch)
+                with self._lock:
+                    self._stats["written"] += len(batch)
+                    self._stats["batches"] += 1
+                return
+            except Exception as e:
+                if attempt == 0:
+                    time.sleep(self.flush_interval)
+                    continue
+                logger.error(f"Failed to write {len(batch)} activity rows: {e}")
+                with self._lock:
+                    self._stats["failed"] += len(batch)
+
+    def _write_sync(self, row: tuple) -> None:
+        try:
+            self.write_batch([row])
+            with self._lock:
+                self._stats["sync_writes"] += 1
+                self._stats["written"] += 1
+        except Exception as e:
+            logger.error(f"Failed to write activity row: {e}")
+            with self._lock:
+                self._stats["failed"] += 1
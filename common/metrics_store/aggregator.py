@@ -18,10 +18,67 @@ from .models import (
     TargetStatus,
     IssueType,
 )
+from ..sqlite_pool import get_connection_manager
 from .store import MetricsStore
 
 logger = logging.getLogger(__name__)
 
+# Source tables feeding daily snapshots, by module. Each entry is
+# (table, day_column, change_columns): a row whose change column is at or
+# after the module's high-water mark makes the day in day_column dirty.
+SNAPSHOT_SOURCES: dict[str, list[tuple[str, str, tuple[str, ...]]]] = {
+    "alerts": [
+        ("alerts", "created_at", ("created_at",)),
+        ("alerts", "acknowledged_at", ("acknowledged_at",)),
+        ("alerts", "resolved_at", ("resolved_at",)),
+    ],
+    "hai": [
+        ("hai_candidates", "created_at", ("created_at", "updated_at")),
+        ("hai_reviews", "reviewed_at", ("reviewed_at",)),
+    ],
+    "adherence": [
+        ("bundle_alerts", "created_at", ("created_at",)),
+        ("bundle_episodes", "completed_at", ("completed_at",)),
+    ],
+    "indication": [
+        ("indication_reviews", "reviewed_at", ("reviewed_at",)),
+        ("indication_candidates", "created_at", ("created_at", "updated_at")),
+    ],
+    "mdro": [
+        ("mdro_cases", "identified_at", ("identified_at",)),
+        ("mdro_reviews", "reviewed_at", ("reviewed_at",)),
+    ],
+    "outbreak": [
+        ("outbreak_alerts", "created_at", ("created_at",)),
+    ],
+    "surgical": [
+        ("surgical_cases", "scheduled_or_time", ("scheduled_or_time", "updated_at")),
+    ],
+    "llm": [
+        ("llm_decisions", "reviewed_at", ("reviewed_at",)),
+    ],
+    "activity": [
+        ("provider_activity", "performed_at", ("performed_at",)),
+    ],
+}
+
+
+def _parse_day(value: str | None) -> date | None:
+    """Parse the YYYY-MM-DD prefix of a stored timestamp."""
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _rows_by_day(cursor, sql: str, lo: str, hi: str, snapshots: dict[date, Any]):
+    """Run a per-day GROUP BY query and yield (day, row) for days in snapshots."""
+    cursor.execute(sql, (lo, hi))
+    for row in cursor.fetchall():
+        day = _parse_day(row[0])
+        if day in snapshots:
+            yield day, row
+
 
 @dataclass
 class LocationScore:
@@ -181,6 +238,10 @@ class MetricsAggregator:
             logger.warning(f"Failed to get LLM tracker: {e}")
             return None
 
+    # =========================================================================
+    # Daily Snapshots
+    # =========================================================================
+
     def create_daily_snapshot(self, snapshot_date: date | None = None) -> DailySnapshot:
         """Create a daily metrics snapshot from all modules.
 
@@ -193,19 +254,7 @@ class MetricsAggregator:
         if snapshot_date is None:
             snapshot_date = date.today() - timedelta(days=1)
 
-        snapshot = DailySnapshot(snapshot_date=snapshot_date)
-
-        # Aggregate from each module
-        self._aggregate_alert_metrics(snapshot, snapshot_date)
-        self._aggregate_hai_metrics(snapshot, snapshot_date)
-        self._aggregate_adherence_metrics(snapshot, snapshot_date)
-        self._aggregate_indication_metrics(snapshot, snapshot_date)
-        self._aggregate_drug_bug_metrics(snapshot, snapshot_date)
-        self._aggregate_mdro_metrics(snapshot, snapshot_date)
-        self._aggregate_outbreak_metrics(snapshot, snapshot_date)
-        self._aggregate_surgical_metrics(snapshot, snapshot_date)
-        self._aggregate_llm_metrics(snapshot, snapshot_date)
-        self._aggregate_activity_metrics(snapshot, snapshot_date)
+        snapshot = self._build_snapshots(snapshot_date, snapshot_date)[snapshot_date]
 
         # Save the snapshot
         self.metrics_store.save_daily_snapshot(snapshot)
@@ -213,435 +262,505 @@ class MetricsAggregator:
         logger.info(f"Created daily snapshot for {snapshot_date}")
         return snapshot
 
-    def _aggregate_alert_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the alert store."""
-        alert_store = self._get_alert_store()
-        if not alert_store:
-            return
+    def backfill(self, start: date, end: date | None = None) -> list[DailySnapshot]:
+        """Create or rebuild snapshots for every day in a date range.
 
-        try:
-            import sqlite3
-            with sqlite3.connect(alert_store.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        Each source database is read once for the whole range, grouped by
+        day, and all snapshots are written in one transaction. Module
+        high-water marks are advanced so a following refresh_snapshots()
+        only picks up later changes.
 
-                date_str = snapshot_date.isoformat()
-
-                # Alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_created = cursor.fetchone()[0]
-
-                # Alerts resolved on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(resolved_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_resolved = cursor.fetchone()[0]
-
-                # Alerts acknowledged on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE date(acknowledged_at) = ?",
-                    (date_str,)
-                )
-                snapshot.alerts_acknowledged = cursor.fetchone()[0]
+        Args:
+            start: First day to fill
+            end: Last day to fill (defaults to yesterday)
 
-                # Average time to acknowledge (for alerts acknowledged on this date)
-                cursor.execute(
-                    """
-                    SELECT AVG(
-                        CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
-                    FROM alerts
-                    WHERE date(acknowledged_at) = ? AND acknowledged_at IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_ack_minutes = round(result, 1) if result else None
-
-                # Average time to resolve (for alerts resolved on this date)
-                cursor.execute(
-                    """
-                    SELECT AVG(
-                        CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS REAL)
-                    )
-                    FROM alerts
-                    WHERE date(resolved_at) = ? AND resolved_at IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.avg_time_to_resolve_minutes = round(result, 1) if result else None
+        Returns:
+            Snapshots in date order
+        """
+        if end is None:
+            end = date.today() - timedelta(days=1)
+        if end < start:
+            return []
 
-        except Exception as e:
-            logger.error(f"Error aggregating alert metrics: {e}")
+        paths = self._source_db_paths()
+        watermarks = self._current_watermarks(paths)
+        snapshots = self._build_snapshots(start, end, paths)
+        result = [snapshots[d] for d in sorted(snapshots)]
 
-    def _aggregate_hai_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the HAI detection module."""
-        hai_db = self._get_hai_db()
-        if not hai_db:
-            return
+        self.metrics_store.save_daily_snapshots(result)
+        self._advance_watermarks(watermarks)
 
-        try:
-            import sqlite3
-            with sqlite3.connect(hai_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        logger.info(f"Backfilled {len(result)} daily snapshots from {start} to {end}")
+        return result
 
-                date_str = snapshot_date.isoformat()
+    def refresh_snapshots(self, through: date | None = None) -> list[DailySnapshot]:
+        """Recompute only the snapshots whose source rows changed.
 
-                # Candidates created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_candidates WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_created = cursor.fetchone()[0]
+        For each module, days touched by rows stamped at or after the
+        module's high-water mark are recomputed. The ``through`` day is
+        always refreshed so every day gets a snapshot even when nothing
+        happened. The first run (no high-water marks yet) rebuilds all
+        history.
 
-                # Candidates reviewed on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM hai_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.hai_candidates_reviewed = cursor.fetchone()[0]
-
-                # Confirmed HAI on this date
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM hai_candidates
-                    WHERE status = 'confirmed'
-                    AND date(created_at) = ?
-                    """,
-                    (date_str,)
-                )
-                snapshot.hai_confirmed = cursor.fetchone()[0]
-
-                # Overrides on this date
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM hai_reviews
-                    WHERE is_override = 1 AND date(reviewed_at) = ?
-                    """,
-                    (date_str,)
-                )
-                snapshot.hai_override_count = cursor.fetchone()[0]
+        Args:
+            through: Last day to refresh (defaults to yesterday)
 
-        except Exception as e:
-            logger.error(f"Error aggregating HAI metrics: {e}")
+        Returns:
+            Recomputed snapshots in date order
+        """
+        if through is None:
+            through = date.today() - timedelta(days=1)
 
-    def _aggregate_adherence_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the guideline adherence module."""
-        adherence_db = self._get_adherence_db()
-        if not adherence_db:
-            return
+        paths = self._source_db_paths()
+        # Read the new marks first so rows written during the refresh are
+        # seen again next time rather than skipped
+        watermarks = self._current_watermarks(paths)
+        dirty = self._dirty_days(paths, self.metrics_store.get_snapshot_watermarks())
+        dirty = {d for d in dirty if d <= through}
+        dirty.add(through)
 
-        try:
-            import sqlite3
-            with sqlite3.connect(adherence_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
+        snapshots = self._build_snapshots(min(dirty), max(dirty), paths)
+        result = [snapshots[d] for d in sorted(dirty)]
 
-                date_str = snapshot_date.isoformat()
+        self.metrics_store.save_daily_snapshots(result)
+        self._advance_watermarks(watermarks)
 
-                # Active bundle episodes
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'"
-                )
-                snapshot.bundle_episodes_active = cursor.fetchone()[0]
+        logger.info(f"Refreshed {len(result)} daily snapshots through {through}")
+        return result
 
-                # Bundle alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM bundle_alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.bundle_alerts_created = cursor.fetchone()[0]
-
-                # Average adherence rate for episodes completed on this date
-                cursor.execute(
-                    """
-                    SELECT AVG(adherence_percentage)
-                    FROM bundle_episodes
-                    WHERE date(completed_at) = ?
-                    AND adherence_percentage IS NOT NULL
-                    """,
-                    (date_str,)
-                )
-                result = cursor.fetchone()[0]
-                snapshot.bundle_adherence_rate = round(result, 1) if result else None
+    def _source_db_paths(self) -> dict[str, str]:
+        """Database path for each snapshot source module that is available."""
+        getters = {
+            "alerts": self._get_alert_store,
+            "hai": self._get_hai_db,
+            "adherence": self._get_adherence_db,
+            "indication": self._get_indication_db,
+            "mdro": self._get_mdro_db,
+            "outbreak": self._get_outbreak_db,
+            "surgical": self._get_surgical_db,
+            "llm": self._get_llm_tracker,
+        }
+        paths = {}
+        for module, getter in getters.items():
+            db = getter()
+            if db is not None:
+                paths[module] = db.db_path
+        paths["activity"] = self.metrics_store.db_path
+        return paths
+
+    def _build_snapshots(
+        self,
+        start: date,
+        end: date,
+        paths: dict[str, str] | None = None,
+    ) -> dict[date, DailySnapshot]:
+        """Aggregate every module for each day in [start, end]."""
+        if paths is None:
+            paths = self._source_db_paths()
+
+        snapshots = {}
+        day = start
+        while day <= end:
+            snapshots[day] = DailySnapshot(snapshot_date=day)
+            day += timedelta(days=1)
+
+        # Half-open range of ISO timestamps so indexed columns can be used
+        lo, hi = start.isoformat(), (end + timedelta(days=1)).isoformat()
+
+        aggregations = (
+            ("alerts", "alert", self._aggregate_alert_metrics),
+            ("hai", "HAI", self._aggregate_hai_metrics),
+            ("adherence", "adherence", self._aggregate_adherence_metrics),
+            ("indication", "indication", self._aggregate_indication_metrics),
+            ("alerts", "drug-bug", self._aggregate_drug_bug_metrics),
+            ("mdro", "MDRO", self._aggregate_mdro_metrics),
+            ("outbreak", "outbreak", self._aggregate_outbreak_metrics),
+            ("surgical", "surgical prophylaxis", self._aggregate_surgical_metrics),
+            ("llm", "LLM", self._aggregate_llm_metrics),
+            ("activity", "activity", self._aggregate_activity_metrics),
+        )
+        for module, label, aggregate in aggregations:
+            db_path = paths.get(module)
+            if not db_path:
+                continue
+            try:
+                cursor = get_connection_manager(db_path).connect().cursor()
+                aggregate(cursor, snapshots, lo, hi)
+            except Exception as e:
+                logger.error(f"Error aggregating {label} metrics: {e}")
 
-        except Exception as e:
-            logger.error(f"Error aggregating adherence metrics: {e}")
+        self._carry_point_in_time_metrics(snapshots, start, end)
+        return snapshots
 
-    def _aggregate_indication_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
-        """Aggregate metrics from the indication monitoring module."""
-        indication_db = self._get_indication_db()
-        if not indication_db:
+    def _carry_point_in_time_metrics(
+        self,
+        snapshots: dict[date, DailySnapshot],
+        start: date,
+        end: date,
+    ) -> None:
+        """Keep previously captured point-in-time counts for past days.
+
+        Active episode and cluster counts describe "now" and cannot be
+        reconstructed for earlier days, so rebuilt history keeps the values
+        recorded when each day was first snapshotted.
+        """
+        cutoff = date.today() - timedelta(days=1)
+        if start >= cutoff:
             return
-
-        try:
-            import sqlite3
-            with sqlite3.connect(indication_db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                date_str = snapshot_date.isoformat()
-
-                # Reviews on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM indication_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.indication_reviews = cursor.fetchone()[0]
-
-                # Classification breakdown for orders on this date
-                cursor.execute(
-                    """
-                    SELECT
-                        SUM(CASE WHEN final_classification IN ('A', 'S', 'P') THEN 1 ELSE 0 END) as appropriate,
-                        SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END) as inappropriate
-                    FROM indication_candidates
-                    WHERE date(created_at) = ?
-                    """,
-                    (date_str,)
+        existing = self.metrics_store.list_daily_snapshots(
+            start_date=start, end_date=min(end, cutoff - timedelta(days=1)),
+            limit=(end - start).days + 1,
+        )
+        for old in existing:
+            snapshot = snapshots.get(old.snapshot_date)
+            if snapshot:
+                snapshot.bundle_episodes_active = old.bundle_episodes_active
+                snapshot.outbreak_clusters_active = old.outbreak_clusters_active
+
+    def _current_watermarks(self, paths: dict[str, str]) -> dict[str, str]:
+        """Latest change timestamp in each module's source tables."""
+        watermarks = {}
+        for module, sources in SNAPSHOT_SOURCES.items():
+            db_path = paths.get(module)
+            if not db_path:
+                continue
+            conn = get_connection_manager(db_path).connect()
+            marks = []
+            for table, _, change_columns in sources:
+                for column in change_columns:
+                    try:
+                        row = conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()
+                    except Exception as e:
+                        logger.debug(f"No high-water mark from {table}.{column}: {e}")
+                        continue
+                    if row and row[0]:
+                        marks.append(str(row[0]))
+            if marks:
+                watermarks[module] = max(marks)
+        return watermarks
+
+    def _advance_watermarks(self, watermarks: dict[str, str]) -> None:
+        """Store new high-water marks, never moving one backwards."""
+        stored = self.metrics_store.get_snapshot_watermarks()
+        self.metrics_store.set_snapshot_watermarks({
+            module: mark for module, mark in watermarks.items()
+            if mark > stored.get(module, "")
+        })
+
+    def _dirty_days(self, paths: dict[str, str], watermarks: dict[str, str]) -> set[date]:
+        """Days with source rows changed at or after each module's high-water mark."""
+        dirty: set[date] = set()
+        for module, sources in SNAPSHOT_SOURCES.items():
+            db_path = paths.get(module)
+            if not db_path:
+                continue
+            # Compare from the start of the mark's day: timestamps are stored
+            # both as "YYYY-MM-DD HH:MM:SS" and ISO "YYYY-MM-DDTHH:MM:SS",
+            # which only sort consistently at day granularity
+            since = watermarks.get(module, "")[:10]
+            conn = get_connection_manager(db_path).connect()
+            for table, day_column, change_columns in sources:
+                changed = " OR ".join(f"{c} >= ?" for c in change_columns)
+                try:
+                    rows = conn.execute(
+                        f"""
+                        SELECT DISTINCT substr({day_column}, 1, 10) FROM {table}
+                        WHERE {day_column} IS NOT NULL AND ({changed})
+                        """,
+                        [since] * len(change_columns),
+                    ).fetchall()
+                except Exception as e:
+                    logger.debug(f"Skipping dirty-day check on {table}: {e}")
+                    continue
+                dirty.update(d for d in (_parse_day(r[0]) for r in rows) if d)
+        return dirty
+
+    def _aggregate_alert_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
+        """Aggregate metrics from the alert store."""
+        # Alerts created per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day, COUNT(*)
+            FROM alerts WHERE created_at >= ? AND created_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].alerts_created = row[1]
+
+        # Alerts resolved per day, with average time to resolve
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(resolved_at, 1, 10) AS day, COUNT(*),
+                AVG(CAST((julianday(resolved_at) - julianday(created_at)) * 24 * 60 AS REAL))
+            FROM alerts WHERE resolved_at >= ? AND resolved_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].alerts_resolved = row[1]
+            snapshots[day].avg_time_to_resolve_minutes = round(row[2], 1) if row[2] else None
+
+        # Alerts acknowledged per day, with average time to acknowledge
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(acknowledged_at, 1, 10) AS day, COUNT(*),
+                AVG(CAST((julianday(acknowledged_at) - julianday(created_at)) * 24 * 60 AS REAL))
+            FROM alerts WHERE acknowledged_at >= ? AND acknowledged_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].alerts_acknowledged = row[1]
+            snapshots[day].avg_time_to_ack_minutes = round(row[2], 1) if row[2] else None
+
+    def _aggregate_hai_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
+        """Aggregate metrics from the HAI detection module."""
+        # Candidates created per day, and how many of those are confirmed
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day, COUNT(*),
+                SUM(CASE WHEN status = 'confirmed' THEN 1 ELSE 0 END)
+            FROM hai_candidates WHERE created_at >= ? AND created_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].hai_candidates_created = row[1]
+            snapshots[day].hai_confirmed = row[2] or 0
+
+        # Reviews and overrides per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(reviewed_at, 1, 10) AS day, COUNT(*),
+                SUM(CASE WHEN is_override = 1 THEN 1 ELSE 0 END)
+            FROM hai_reviews WHERE reviewed_at >= ? AND reviewed_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].hai_candidates_reviewed = row[1]
+            snapshots[day].hai_override_count = row[2] or 0
+
+    def _aggregate_adherence_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
+        """Aggregate metrics from the guideline adherence module."""
+        # Active bundle episodes (point-in-time, only meaningful for recent days)
+        cursor.execute("SELECT COUNT(*) FROM bundle_episodes WHERE status = 'active'")
+        active = cursor.fetchone()[0]
+        cutoff = date.today() - timedelta(days=1)
+        for day, snapshot in snapshots.items():
+            if day >= cutoff:
+                snapshot.bundle_episodes_active = active
+
+        # Bundle alerts created per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day, COUNT(*)
+            FROM bundle_alerts WHERE created_at >= ? AND created_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].bundle_alerts_created = row[1]
+
+        # Average adherence rate for episodes completed per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(completed_at, 1, 10) AS day, AVG(adherence_percentage)
+            FROM bundle_episodes
+            WHERE completed_at >= ? AND completed_at < ?
+            AND adherence_percentage IS NOT NULL
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].bundle_adherence_rate = round(row[1], 1) if row[1] else None
+
+    def _aggregate_indication_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
+        """Aggregate metrics from the indication monitoring module."""
+        # Reviews per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(reviewed_at, 1, 10) AS day, COUNT(*)
+            FROM indication_reviews WHERE reviewed_at >= ? AND reviewed_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].indication_reviews = row[1]
+
+        # Classification breakdown for orders per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day,
+                SUM(CASE WHEN final_classification IN ('A', 'S', 'P') THEN 1 ELSE 0 END),
+                SUM(CASE WHEN final_classification = 'N' THEN 1 ELSE 0 END)
+            FROM indication_candidates WHERE created_at >= ? AND created_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshot = snapshots[day]
+            snapshot.appropriate_count = row[1] or 0
+            snapshot.inappropriate_count = row[2] or 0
+
+            total = snapshot.appropriate_count + snapshot.inappropriate_count
+            if total > 0:
+                snapshot.inappropriate_rate = round(
+                    snapshot.inappropriate_count / total * 100, 1
                 )
-                row = cursor.fetchone()
-                snapshot.appropriate_count = row["appropriate"] or 0
-                snapshot.inappropriate_count = row["inappropriate"] or 0
-
-                total = snapshot.appropriate_count + snapshot.inappropriate_count
-                if total > 0:
-                    snapshot.inappropriate_rate = round(
-                        snapshot.inappropriate_count / total * 100, 1
-                    )
-
-        except Exception as e:
-            logger.error(f"Error aggregating indication metrics: {e}")
 
-    def _aggregate_drug_bug_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+    def _aggregate_drug_bug_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate drug-bug mismatch metrics from the alert store."""
-        alert_store = self._get_alert_store()
-        if not alert_store:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(alert_store.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Drug-bug alerts created on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE alert_type = 'drug_bug_mismatch' AND date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.drug_bug_alerts_created = cursor.fetchone()[0]
-
-                # Drug-bug alerts resolved on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM alerts WHERE alert_type = 'drug_bug_mismatch' AND date(resolved_at) = ?",
-                    (date_str,)
-                )
-                snapshot.drug_bug_alerts_resolved = cursor.fetchone()[0]
-
-                # Drug-bug alerts resolved with therapy_changed reason
-                cursor.execute(
-                    """SELECT COUNT(*) FROM alerts
-                    WHERE alert_type = 'drug_bug_mismatch'
-                    AND date(resolved_at) = ?
-                    AND resolution_reason IN ('therapy_changed', 'therapy_stopped')""",
-                    (date_str,)
-                )
-                snapshot.drug_bug_therapy_changed_count = cursor.fetchone()[0]
-        except Exception as e:
-            logger.error(f"Error aggregating drug-bug metrics: {e}")
-
-    def _aggregate_mdro_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+        # Drug-bug alerts created per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day, COUNT(*)
+            FROM alerts
+            WHERE created_at >= ? AND created_at < ?
+            AND alert_type = 'drug_bug_mismatch'
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].drug_bug_alerts_created = row[1]
+
+        # Drug-bug alerts resolved per day, and those resolved by changing therapy
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(resolved_at, 1, 10) AS day, COUNT(*),
+                SUM(CASE WHEN resolution_reason IN ('therapy_changed', 'therapy_stopped')
+                    THEN 1 ELSE 0 END)
+            FROM alerts
+            WHERE resolved_at >= ? AND resolved_at < ?
+            AND alert_type = 'drug_bug_mismatch'
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].drug_bug_alerts_resolved = row[1]
+            snapshots[day].drug_bug_therapy_changed_count = row[2] or 0
+
+    def _aggregate_mdro_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate MDRO surveillance metrics."""
-        mdro_db = self._get_mdro_db()
-        if not mdro_db:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(mdro_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # MDRO cases identified on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_cases WHERE date(identified_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_cases_identified = cursor.fetchone()[0]
-
-                # Cases reviewed on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_reviews WHERE date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_cases_reviewed = cursor.fetchone()[0]
-
-                # Confirmed cases
-                cursor.execute(
-                    "SELECT COUNT(*) FROM mdro_cases WHERE status = 'confirmed' AND date(identified_at) = ?",
-                    (date_str,)
-                )
-                snapshot.mdro_confirmed = cursor.fetchone()[0]
-        except Exception as e:
-            logger.error(f"Error aggregating MDRO metrics: {e}")
-
-    def _aggregate_outbreak_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+        # MDRO cases identified per day, and how many are confirmed
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(identified_at, 1, 10) AS day, COUNT(*),
+                SUM(CASE WHEN status = 'confirmed' THEN 1 ELSE 0 END)
+            FROM mdro_cases WHERE identified_at >= ? AND identified_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].mdro_cases_identified = row[1]
+            snapshots[day].mdro_confirmed = row[2] or 0
+
+        # Cases reviewed per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(reviewed_at, 1, 10) AS day, COUNT(*)
+            FROM mdro_reviews WHERE reviewed_at >= ? AND reviewed_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].mdro_cases_reviewed = row[1]
+
+    def _aggregate_outbreak_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate outbreak detection metrics."""
-        outbreak_db = self._get_outbreak_db()
-        if not outbreak_db:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(outbreak_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Active clusters as of this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM outbreak_clusters WHERE status IN ('active', 'investigating')"
-                )
-                snapshot.outbreak_clusters_active = cursor.fetchone()[0]
-
-                # Alerts triggered on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM outbreak_alerts WHERE date(created_at) = ?",
-                    (date_str,)
-                )
-                snapshot.outbreak_alerts_triggered = cursor.fetchone()[0]
-        except Exception as e:
-            logger.error(f"Error aggregating outbreak metrics: {e}")
-
-    def _aggregate_surgical_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+        # Active clusters (point-in-time, only meaningful for recent days)
+        cursor.execute(
+            "SELECT COUNT(*) FROM outbreak_clusters WHERE status IN ('active', 'investigating')"
+        )
+        active = cursor.fetchone()[0]
+        cutoff = date.today() - timedelta(days=1)
+        for day, snapshot in snapshots.items():
+            if day >= cutoff:
+                snapshot.outbreak_clusters_active = active
+
+        # Alerts triggered per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(created_at, 1, 10) AS day, COUNT(*)
+            FROM outbreak_alerts WHERE created_at >= ? AND created_at < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].outbreak_alerts_triggered = row[1]
+
+    def _aggregate_surgical_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate surgical prophylaxis metrics."""
-        surgical_db = self._get_surgical_db()
-        if not surgical_db:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(surgical_db.db_path) as conn:
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Cases evaluated on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM surgical_cases WHERE date(scheduled_or_time) = ?",
-                    (date_str,)
-                )
-                snapshot.surgical_prophylaxis_cases = cursor.fetchone()[0]
-
-                # Compliant cases
-                cursor.execute(
-                    """SELECT COUNT(*) FROM compliance_evaluations ce
-                    JOIN surgical_cases sc ON ce.case_id = sc.case_id
-                    WHERE ce.bundle_compliant = 1
-                    AND date(sc.scheduled_or_time) = ?""",
-                    (date_str,)
+        # Cases evaluated per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(scheduled_or_time, 1, 10) AS day, COUNT(*)
+            FROM surgical_cases WHERE scheduled_or_time >= ? AND scheduled_or_time < ?
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshots[day].surgical_prophylaxis_cases = row[1]
+
+        # Compliant cases per day
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(sc.scheduled_or_time, 1, 10) AS day, COUNT(*)
+            FROM compliance_evaluations ce
+            JOIN surgical_cases sc ON ce.case_id = sc.case_id
+            WHERE sc.scheduled_or_time >= ? AND sc.scheduled_or_time < ?
+            AND ce.bundle_compliant = 1
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshot = snapshots[day]
+            snapshot.surgical_prophylaxis_compliant = row[1]
+
+            # Calculate compliance rate
+            if snapshot.surgical_prophylaxis_cases > 0:
+                snapshot.surgical_prophylaxis_compliance_rate = round(
+                    snapshot.surgical_prophylaxis_compliant / snapshot.surgical_prophylaxis_cases * 100, 1
                 )
-                snapshot.surgical_prophylaxis_compliant = cursor.fetchone()[0]
 
-                # Calculate compliance rate
-                if snapshot.surgical_prophylaxis_cases > 0:
-                    snapshot.surgical_prophylaxis_compliance_rate = round(
-                        snapshot.surgical_prophylaxis_compliant / snapshot.surgical_prophylaxis_cases * 100, 1
-                    )
-        except Exception as e:
-            logger.error(f"Error aggregating surgical prophylaxis metrics: {e}")
-
-    def _aggregate_llm_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+    def _aggregate_llm_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate LLM extraction accuracy metrics."""
-        tracker = self._get_llm_tracker()
-        if not tracker:
-            return
-        try:
-            import sqlite3
-            with sqlite3.connect(tracker.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                date_str = snapshot_date.isoformat()
-
-                # Total reviewed extractions on this date
-                cursor.execute(
-                    "SELECT COUNT(*) FROM llm_decisions WHERE outcome != 'pending' AND date(reviewed_at) = ?",
-                    (date_str,)
-                )
-                snapshot.llm_extractions_total = cursor.fetchone()[0]
-
-                if snapshot.llm_extractions_total == 0:
-                    return
-
-                # Breakdown by outcome
-                cursor.execute(
-                    """SELECT
-                        SUM(CASE WHEN outcome = 'accepted' THEN 1 ELSE 0 END) as accepted,
-                        SUM(CASE WHEN outcome = 'modified' THEN 1 ELSE 0 END) as modified,
-                        SUM(CASE WHEN outcome = 'overridden' THEN 1 ELSE 0 END) as overridden,
-                        AVG(CASE WHEN llm_confidence IS NOT NULL THEN llm_confidence END) as avg_conf
-                    FROM llm_decisions
-                    WHERE outcome != 'pending' AND date(reviewed_at) = ?""",
-                    (date_str,)
-                )
-                row = cursor.fetchone()
-                snapshot.llm_accepted_count = row["accepted"] or 0
-                snapshot.llm_modified_count = row["modified"] or 0
-                snapshot.llm_overridden_count = row["overridden"] or 0
-
-                total = snapshot.llm_extractions_total
-                accepted = snapshot.llm_accepted_count + snapshot.llm_modified_count
-                snapshot.llm_acceptance_rate = round(accepted / total * 100, 1)
-                snapshot.llm_override_rate = round(snapshot.llm_overridden_count / total * 100, 1)
-                snapshot.llm_avg_confidence = round(row["avg_conf"], 3) if row["avg_conf"] else None
-        except Exception as e:
-            logger.error(f"Error aggregating LLM metrics: {e}")
-
-    def _aggregate_activity_metrics(self, snapshot: DailySnapshot, snapshot_date: date) -> None:
+        # Reviewed extractions per day, broken down by outcome
+        for day, row in _rows_by_day(cursor, """
+            SELECT substr(reviewed_at, 1, 10) AS day, COUNT(*),
+                SUM(CASE WHEN outcome = 'accepted' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN outcome = 'modified' THEN 1 ELSE 0 END),
+                SUM(CASE WHEN outcome = 'overridden' THEN 1 ELSE 0 END),
+                AVG(CASE WHEN llm_confidence IS NOT NULL THEN llm_confidence END)
+            FROM llm_decisions
+            WHERE reviewed_at >= ? AND reviewed_at < ?
+            AND outcome != 'pending'
+            GROUP BY day
+        """, lo, hi, snapshots):
+            snapshot = snapshots[day]
+            snapshot.llm_extractions_total = row[1]
+            snapshot.llm_accepted_count = row[2] or 0
+            snapshot.llm_modified_count = row[3] or 0
+            snapshot.llm_overridden_count = row[4] or 0
+
+            total = snapshot.llm_extractions_total
+            accepted = snapshot.llm_accepted_count + snapshot.llm_modified_count
+            snapshot.llm_acceptance_rate = round(accepted / total * 100, 1)
+            snapshot.llm_override_rate = round(snapshot.llm_overridden_count / total * 100, 1)
+            snapshot.llm_avg_confidence = round(row[5], 3) if row[5] else None
+
+    def _aggregate_activity_metrics(
+        self, cursor, snapshots: dict[date, DailySnapshot], lo: str, hi: str
+    ) -> None:
         """Aggregate human activity metrics from the unified metrics store."""
-        try:
-            activities = self.metrics_store.list_activities(
-                start_date=snapshot_date,
-                end_date=snapshot_date,
-                limit=10000,
-            )
-
-            snapshot.total_reviews = sum(
-                1 for a in activities if a.activity_type in ("review", "acknowledgment", "resolution")
-            )
-
-            provider_ids = set(a.provider_id for a in activities if a.provider_id)
-            snapshot.unique_reviewers = len(provider_ids)
-
-            snapshot.total_interventions = sum(
-                1 for a in activities if a.activity_type == "intervention"
-            )
-
-            # Build location breakdown
-            by_location: dict[str, dict] = {}
-            for a in activities:
-                if a.location_code:
-                    if a.location_code not in by_location:
-                        by_location[a.location_code] = {"activities": 0, "reviews": 0}
-                    by_location[a.location_code]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_location[a.location_code]["reviews"] += 1
-            snapshot.by_location = by_location
-
-            # Build service breakdown
-            by_service: dict[str, dict] = {}
-            for a in activities:
-                if a.service:
-                    if a.service not in by_service:
-                        by_service[a.service] = {"activities": 0, "reviews": 0}
-                    by_service[a.service]["activities"] += 1
-                    if a.activity_type in ("review", "acknowledgment", "resolution"):
-                        by_service[a.service]["reviews"] += 1
-            snapshot.by_service = by_service
+        self.metrics_store.flush_activities()
+        cursor.execute(
+            """
+            SELECT substr(performed_at, 1, 10) AS day,
+                activity_type, provider_id, location_code, service
+            FROM provider_activity
+            WHERE performed_at >= ? AND performed_at < ?
+            """,
+            (lo, hi)
+        )
 
-        except Exception as e:
-            logger.error(f"Error aggregating activity metrics: {e}")
+        reviewers: dict[date, set[str]] = {}
+        for row in cursor.fetchall():
+            day = _parse_day(row[0])
+            snapshot = snapshots.get(day)
+            if snapshot is None:
+                continue
+            activity_type, provider_id, location_code, service = row[1:]
+            is_review = activity_type in ("review", "acknowledgment", "resolution")
+
+            if is_review:
+                snapshot.total_reviews += 1
+            if activity_type == "intervention":
+                snapshot.total_interventions += 1
+            if provider_id:
+                reviewers.setdefault(day, set()).add(provider_id)
+
+            # Location and service breakdowns
+            for breakdown, key in ((snapshot.by_location, location_code), (snapshot.by_service, service)):
+                if key:
+                    counts = breakdown.setdefault(key, {"activities": 0, "reviews": 0})
+                    counts["activities"] += 1
+                    if is_review:
+                        counts["reviews"] += 1
+
+        for day, providers in reviewers.items():
+            snapshots[day].unique_reviewers = len(providers)
 
     def calculate_location_scores(self, days: int = 30) -> list[LocationScore]:
         """Calculate aggregate scores by hospital location.
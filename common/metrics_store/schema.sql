@@ -148,6 +148,14 @@ CREATE TABLE IF NOT EXISTS metrics_daily_snapshot (
 
 CREATE INDEX IF NOT EXISTS idx_snapshot_date ON metrics_daily_snapshot(snapshot_date);
 
+-- Snapshot high-water marks - latest source timestamp seen per module, so
+-- incremental refreshes only recompute days whose source rows changed
+CREATE TABLE IF NOT EXISTS snapshot_watermarks (
+    module TEXT PRIMARY KEY,
+    high_water TEXT NOT NULL,      -- Max change timestamp seen in the module's tables
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Intervention targets - identifies units/services needing attention
 CREATE TABLE IF NOT EXISTS intervention_targets (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
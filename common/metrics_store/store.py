@@ -4,10 +4,13 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from ..sqlite_pool import get_connection_manager
+from .activity_sink import ActivitySink
 from .models import (
     ActivityType,
     ModuleSource,
@@ -25,6 +28,34 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+ACTIVITY_INSERT_SQL = """
+    INSERT INTO provider_activity (
+        provider_id, provider_name, provider_role,
+        activity_type, module, entity_id, entity_type,
+        action_taken, outcome, patient_mrn, location_code,
+        service, duration_minutes, performed_at, details
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SNAPSHOT_UPSERT_SQL = """
+    INSERT OR REPLACE INTO metrics_daily_snapshot (
+        snapshot_date,
+        alerts_created, alerts_resolved, alerts_acknowledged,
+        avg_time_to_ack_minutes, avg_time_to_resolve_minutes,
+        hai_candidates_created, hai_candidates_reviewed, hai_confirmed, hai_override_count,
+        bundle_episodes_active, bundle_alerts_created, bundle_adherence_rate,
+        indication_reviews, appropriate_count, inappropriate_count, inappropriate_rate,
+        drug_bug_alerts_created, drug_bug_alerts_resolved, drug_bug_therapy_changed_count,
+        mdro_cases_identified, mdro_cases_reviewed, mdro_confirmed,
+        outbreak_clusters_active, outbreak_alerts_triggered,
+        surgical_prophylaxis_cases, surgical_prophylaxis_compliant, surgical_prophylaxis_compliance_rate,
+        llm_extractions_total, llm_accepted_count, llm_modified_count,
+        llm_overridden_count, llm_acceptance_rate, llm_override_rate, llm_avg_confidence,
+        total_reviews, unique_reviewers, total_interventions,
+        by_location, by_service, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class MetricsStore:
     """SQLite-backed storage for ASP/IP metrics and activity tracking."""
@@ -48,22 +79,21 @@ class MetricsStore:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
+        self._db = get_connection_manager(self.db_path)
+        self._activity_sink: ActivitySink | None = None
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize database schema."""
+        """Initialize database schema (once per process)."""
         schema_path = Path(__file__).parent / "schema.sql"
         with open(schema_path) as f:
             schema = f.read()
 
-        with self._connect() as conn:
-            conn.executescript(schema)
+        self._db.ensure_schema("metrics_store", schema)
 
     def _connect(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled connection with row factory."""
+        return self._db.connect()
 
     # =========================================================================
     # Provider Activity Operations
@@ -107,36 +137,114 @@ class MetricsStore:
         Returns:
             ID of the created activity record
         """
-        now = datetime.now()
-        activity_type_val = activity_type.value if isinstance(activity_type, ActivityType) else activity_type
-        module_val = module.value if isinstance(module, ModuleSource) else module
-        details_json = json.dumps(details) if details else None
+        row = self._activity_row(
+            activity_type, module, provider_id, provider_name, provider_role,
+            entity_id, entity_type, action_taken, outcome, patient_mrn,
+            location_code, service, duration_minutes, details,
+        )
 
         with self._connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT INTO provider_activity (
-                    provider_id, provider_name, provider_role,
-                    activity_type, module, entity_id, entity_type,
-                    action_taken, outcome, patient_mrn, location_code,
-                    service, duration_minutes, performed_at, details
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    provider_id, provider_name, provider_role,
-                    activity_type_val, module_val, entity_id, entity_type,
-                    action_taken, outcome, patient_mrn, location_code,
-                    service, duration_minutes, now.isoformat(), details_json
-                )
-            )
+            cursor = conn.execute(ACTIVITY_INSERT_SQL, row)
             conn.commit()
             activity_id = cursor.lastrowid
 
         logger.debug(
-            f"Logged activity: {activity_type_val} in {module_val} by {provider_name or provider_id}"
+            f"Logged activity: {row[3]} in {row[4]} by {provider_name or provider_id}"
         )
         return activity_id
 
+    def log_activity_async(
+        self,
+        activity_type: ActivityType | str,
+        module: ModuleSource | str,
+        provider_id: str | None = None,
+        provider_name: str | None = None,
+        provider_role: str | None = None,
+        entity_id: str | None = None,
+        entity_type: str | None = None,
+        action_taken: str | None = None,
+        outcome: str | None = None,
+        patient_mrn: str | None = None,
+        location_code: str | None = None,
+        service: str | None = None,
+        duration_minutes: int | None = None,
+        details: dict | None = None,
+    ) -> None:
+        """Queue a provider activity for a batched background write.
+
+        Same arguments as log_activity(). The activity's performed_at is
+        captured now; the row is written within METRICS_ACTIVITY_FLUSH_MS.
+        Use this from request handlers and alert lifecycle methods that
+        don't need the new row's ID.
+        """
+        row = self._activity_row(
+            activity_type, module, provider_id, provider_name, provider_role,
+            entity_id, entity_type, action_taken, outcome, patient_mrn,
+            location_code, service, duration_minutes, details,
+        )
+        self.activity_sink.submit(row)
+
+    def log_activities(self, rows: list[tuple]) -> int:
+        """Insert pre-built activity rows in one transaction.
+
+        Args:
+            rows: Tuples in ACTIVITY_INSERT_SQL column order, as built by
+                _activity_row().
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(ACTIVITY_INSERT_SQL, rows)
+            conn.commit()
+        logger.debug(f"Logged {len(rows)} activities")
+        return len(rows)
+
+    @property
+    def activity_sink(self) -> ActivitySink:
+        """Background writer used by log_activity_async() (created on first use)."""
+        if self._activity_sink is None:
+            with _shared_lock:
+                if self._activity_sink is None:
+                    self._activity_sink = ActivitySink(self.log_activities)
+        return self._activity_sink
+
+    def flush_activities(self, timeout: float | None = 5.0) -> bool:
+        """Wait for queued async activities to be written."""
+        if self._activity_sink is None:
+            return True
+        return self._activity_sink.flush(timeout)
+
+    @staticmethod
+    def _activity_row(
+        activity_type: ActivityType | str,
+        module: ModuleSource | str,
+        provider_id: str | None,
+        provider_name: str | None,
+        provider_role: str | None,
+        entity_id: str | None,
+        entity_type: str | None,
+        action_taken: str | None,
+        outcome: str | None,
+        patient_mrn: str | None,
+        location_code: str | None,
+        service: str | None,
+        duration_minutes: int | None,
+        details: dict | None,
+    ) -> tuple:
+        """Build a provider_activity row in ACTIVITY_INSERT_SQL order."""
+        activity_type_val = activity_type.value if isinstance(activity_type, ActivityType) else activity_type
+        module_val = module.value if isinstance(module, ModuleSource) else module
+        details_json = json.dumps(details) if details else None
+        return (
+            provider_id, provider_name, provider_role,
+            activity_type_val, module_val, entity_id, entity_type,
+            action_taken, outcome, patient_mrn, location_code,
+            service, duration_minutes, datetime.now().isoformat(), details_json,
+        )
+
     def get_activity(self, activity_id: int) -> ProviderActivity | None:
         """Get a single activity by ID."""
         with self._connect() as conn:
@@ -495,57 +603,55 @@ class MetricsStore:
         Returns:
             ID of the snapshot
         """
-        now = datetime.now()
-        by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
-        by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+        with self._connect() as conn:
+            cursor = conn.execute(SNAPSHOT_UPSERT_SQL, self._snapshot_row(snapshot))
+            conn.commit()
+            return cursor.lastrowid
+
+    def save_daily_snapshots(self, snapshots: list[DailySnapshot]) -> int:
+        """Save or update many daily snapshots in one transaction.
 
+        Returns:
+            Number of snapshots written
+        """
+        if not snapshots:
+            return 0
         with self._connect() as conn:
-            cursor = conn.execute(
-                """
-                INSERT OR REPLACE INTO metrics_daily_snapshot (
-                    snapshot_date,
-                    alerts_created, alerts_resolved, alerts_acknowledged,
-                    avg_time_to_ack_minutes, avg_time_to_resolve_minutes,
-                    hai_candidates_created, hai_candidates_reviewed, hai_confirmed, hai_override_count,
-                    bundle_episodes_active, bundle_alerts_created, bundle_adherence_rate,
-                    indication_reviews, appropriate_count, inappropriate_count, inappropriate_rate,
-                    drug_bug_alerts_created, drug_bug_alerts_resolved, drug_bug_therapy_changed_count,
-                    mdro_cases_identified, mdro_cases_reviewed, mdro_confirmed,
-                    outbreak_clusters_active, outbreak_alerts_triggered,
-                    surgical_prophylaxis_cases, surgical_prophylaxis_compliant, surgical_prophylaxis_compliance_rate,
-                    llm_extractions_total, llm_accepted_count, llm_modified_count,
-                    llm_overridden_count, llm_acceptance_rate, llm_override_rate, llm_avg_confidence,
-                    total_reviews, unique_reviewers, total_interventions,
-                    by_location, by_service, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.snapshot_date.isoformat(),
-                    snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
-                    snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
-                    snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
-                    snapshot.hai_confirmed, snapshot.hai_override_count,
-                    snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
-                    snapshot.bundle_adherence_rate,
-                    snapshot.indication_reviews, snapshot.appropriate_count,
-                    snapshot.inappropriate_count, snapshot.inappropriate_rate,
-                    snapshot.drug_bug_alerts_created, snapshot.drug_bug_alerts_resolved,
-                    snapshot.drug_bug_therapy_changed_count,
-                    snapshot.mdro_cases_identified, snapshot.mdro_cases_reviewed,
-                    snapshot.mdro_confirmed,
-                    snapshot.outbreak_clusters_active, snapshot.outbreak_alerts_triggered,
-                    snapshot.surgical_prophylaxis_cases, snapshot.surgical_prophylaxis_compliant,
-                    snapshot.surgical_prophylaxis_compliance_rate,
-                    snapshot.llm_extractions_total, snapshot.llm_accepted_count,
-                    snapshot.llm_modified_count, snapshot.llm_overridden_count,
-                    snapshot.llm_acceptance_rate, snapshot.llm_override_rate,
-                    snapshot.llm_avg_confidence,
-                    snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
-                    by_location_json, by_service_json, now.isoformat()
-                )
+            conn.executemany(
+                SNAPSHOT_UPSERT_SQL, [self._snapshot_row(s) for s in snapshots]
             )
             conn.commit()
-            return cursor.lastrowid
+        return len(snapshots)
+
+    @staticmethod
+    def _snapshot_row(snapshot: DailySnapshot) -> tuple:
+        """Build a metrics_daily_snapshot row in SNAPSHOT_UPSERT_SQL order."""
+        by_location_json = json.dumps(snapshot.by_location) if snapshot.by_location else None
+        by_service_json = json.dumps(snapshot.by_service) if snapshot.by_service else None
+        return (
+            snapshot.snapshot_date.isoformat(),
+            snapshot.alerts_created, snapshot.alerts_resolved, snapshot.alerts_acknowledged,
+            snapshot.avg_time_to_ack_minutes, snapshot.avg_time_to_resolve_minutes,
+            snapshot.hai_candidates_created, snapshot.hai_candidates_reviewed,
+            snapshot.hai_confirmed, snapshot.hai_override_count,
+            snapshot.bundle_episodes_active, snapshot.bundle_alerts_created,
+            snapshot.bundle_adherence_rate,
+            snapshot.indication_reviews, snapshot.appropriate_count,
+            snapshot.inappropriate_count, snapshot.inappropriate_rate,
+            snapshot.drug_bug_alerts_created, snapshot.drug_bug_alerts_resolved,
+            snapshot.drug_bug_therapy_changed_count,
+            snapshot.mdro_cases_identified, snapshot.mdro_cases_reviewed,
+            snapshot.mdro_confirmed,
+            snapshot.outbreak_clusters_active, snapshot.outbreak_alerts_triggered,
+            snapshot.surgical_prophylaxis_cases, snapshot.surgical_prophylaxis_compliant,
+            snapshot.surgical_prophylaxis_compliance_rate,
+            snapshot.llm_extractions_total, snapshot.llm_accepted_count,
+            snapshot.llm_modified_count, snapshot.llm_overridden_count,
+            snapshot.llm_acceptance_rate, snapshot.llm_override_rate,
+            snapshot.llm_avg_confidence,
+            snapshot.total_reviews, snapshot.unique_reviewers, snapshot.total_interventions,
+            by_location_json, by_service_json, datetime.now().isoformat(),
+        )
 
     def get_daily_snapshot(self, snapshot_date: date) -> DailySnapshot | None:
         """Get snapshot for a specific date."""
@@ -592,6 +698,27 @@ class MetricsStore:
             )
             return [DailySnapshot.from_row(row) for row in cursor.fetchall()]
 
+    def get_snapshot_watermarks(self) -> dict[str, str]:
+        """Get the snapshot high-water mark for each source module."""
+        with self._connect() as conn:
+            cursor = conn.execute("SELECT module, high_water FROM snapshot_watermarks")
+            return {row["module"]: row["high_water"] for row in cursor.fetchall()}
+
+    def set_snapshot_watermarks(self, watermarks: dict[str, str]) -> None:
+        """Record snapshot high-water marks by module."""
+        if not watermarks:
+            return
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO snapshot_watermarks (module, high_water, updated_at)
+                VALUES (?, ?, ?)
+                """,
+                [(module, mark, now) for module, mark in watermarks.items()]
+            )
+            conn.commit()
+
     # =========================================================================
     # Intervention Target Operations
     # =========================================================================
@@ -1280,3 +1407,24 @@ class MetricsStore:
             "locations_covered": json.loads(row["locations_covered"]) if row["locations_covered"] else [],
             "status": row["status"],
         }
+
+
+_shared_stores: dict[str, MetricsStore] = {}
+_shared_lock = threading.Lock()
+
+
+def get_metrics_store(db_path: str | None = None) -> MetricsStore:
+    """Get the process-wide MetricsStore for a database path.
+
+    Use this for fire-and-forget activity logging instead of constructing a
+    new MetricsStore per event.
+    """
+    path = os.path.expanduser(
+        db_path or os.environ.get("METRICS_DB_PATH", "~/.aegis/metrics.db")
+    )
+    with _shared_lock:
+        store = _shared_stores.get(path)
+        if store is None:
+            store = MetricsStore(path)
+            _shared_stores[path] = store
+        return store
@@ -0,0 +1,19 @@
+"""Shared SQLite connection management for AEGIS stores.
+
+Provides per-thread pooled connections with WAL and performance pragmas,
+and a schema_version table so each store's DDL runs once per process.
+"""
+
+from .manager import (
+    PooledConnection,
+    SQLiteConnectionManager,
+    close_all_connections,
+    get_connection_manager,
+)
+
+__all__ = [
+    "PooledConnection",
+    "SQLiteConnectionManager",
+    "close_all_connections",
+    "get_connection_manager",
+]
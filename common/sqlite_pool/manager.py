@@ -0,0 +1,248 @@
+"""Per-thread pooled SQLite connections with one-time schema setup.
+
+Stores used to call ``sqlite3.connect`` for every operation and re-run
+their full ``schema.sql`` on every construction. The manager here keeps one
+connection per (database file, thread), applies performance pragmas once
+when the connection is opened, and records applied schemas in a
+``schema_version`` table so DDL and migrations only run when the schema
+actually changes.
+
+Connections are handed out as ``PooledConnection`` objects, so existing
+code keeps working unchanged:
+
+    with manager.connect() as conn:   # commits or rolls back, stays open
+        conn.execute(...)
+
+    conn = manager.connect()
+    ...
+    conn.close()                      # rolls back open work, stays pooled
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DB = ":memory:"
+
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    component TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    applied_at TEXT NOT NULL
+)
+"""
+
+
+def _default_pragmas() -> dict[str, str | int]:
+    """Pragmas applied to every new connection."""
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.environ.get("AEGIS_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        # Negative cache_size is in KiB
+        "cache_size": -int(os.environ.get("AEGIS_SQLITE_CACHE_KB", "16384")),
+        "mmap_size": int(os.environ.get("AEGIS_SQLITE_MMAP_BYTES", str(128 * 1024 * 1024))),
+        "temp_store": "MEMORY",
+    }
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to the pool."""
+
+    def close(self) -> None:
+        """Discard uncommitted work but keep the connection open."""
+        if self.in_transaction:
+            self.rollback()
+
+    def force_close(self) -> None:
+        """Really close the underlying connection."""
+        super().close()
+
+
+class SQLiteConnectionManager:
+    """Connection pool and schema tracker for one SQLite database file."""
+
+    def __init__(self, db_path: str, pragmas: dict[str, str | int] | None = None):
+        """Initialize manager.
+
+        Args:
+            db_path: Path to the database file, or ":memory:".
+            pragmas: Pragmas for new connections. Defaults to WAL,
+                synchronous=NORMAL, mmap and cache-size settings.
+        """
+        self.db_path = db_path
+        self.pragmas = _default_pragmas() if pragmas is None else pragmas
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Weak so a connection is closed when its thread exits
+        self._connections: weakref.WeakSet[PooledConnection] = weakref.WeakSet()
+        self._applied: set[str] = set()
+
+    @property
+    def is_memory(self) -> bool:
+        return self.db_path == MEMORY_DB
+
+    def connect(self, row_factory=sqlite3.Row) -> PooledConnection:
+        """Get this thread's connection, opening it on first use."""
+        conn: PooledConnection | None = getattr(self._local, "conn", None)
+        if conn is not None and not self._file_replaced():
+            conn.row_factory = row_factory
+            return conn
+
+        if conn is not None:
+            # Database file was deleted or replaced underneath us
+            self._discard(conn)
+
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=PooledConnection,
+            check_same_thread=False,
+        )
+        for name, value in self.pragmas.items():
+            if self.is_memory and name in ("journal_mode", "mmap_size"):
+                continue
+            conn.execute(f"PRAGMA {name}={value}")
+        conn.row_factory = row_factory
+
+        with self._lock:
+            self._connections.add(conn)
+        self._local.conn = conn
+        self._local.file_id = None if self.is_memory else self._stat()
+        return conn
+
+    def ensure_schema(
+        self,
+        component: str,
+        schema: str,
+        migrate: Callable[[sqlite3.Connection], None] | None = None,
+        version: int | str = 1,
+    ) -> bool:
+        """Apply a component's DDL (and migrations) once.
+
+        The schema text and version are hashed and stored in the
+        schema_version table; DDL only runs when the hash changes, and at
+        most once per process per database file.
+
+        Args:
+            component: Name of the store owning the schema (e.g. "alert_store").
+            schema: DDL script (CREATE ... IF NOT EXISTS).
+            migrate: Optional callable run after the DDL, e.g. to ALTER
+                existing tables.
+            version: Bump to re-run migrate() when it changes without the
+                schema text changing.
+
+        Returns:
+            True if the DDL ran, False if it was already current.
+        """
+        conn = self.connect()
+        if self.is_memory:
+            # Every thread has its own in-memory database
+            applied = getattr(self._local, "applied", set())
+            if component in applied:
+                return False
+            conn.executescript(schema)
+            if migrate:
+                migrate(conn)
+            conn.commit()
+            applied.add(component)
+            self._local.applied = applied
+            return True
+
+        with self._lock:
+            if component in self._applied:
+                return False
+
+            checksum = hashlib.sha256(f"{version}\n{schema}".encode()).hexdigest()[:16]
+            conn.execute(SCHEMA_VERSION_DDL)
+            row = conn.execute(
+                "SELECT checksum FROM schema_version WHERE component = ?",
+                (component,),
+            ).fetchone()
+
+            ran = row is None or row[0] != checksum
+            if ran:
+                conn.executescript(schema)
+                if migrate:
+                    migrate(conn)
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO schema_version (component, checksum, applied_at)
+                    VALUES (?, ?, ?)
+                    """,
+                    (component, checksum, datetime.now().isoformat()),
+                )
+                logger.debug(f"Applied schema for {component} to {self.db_path}")
+            conn.commit()
+            self._applied.add(component)
+            return ran
+
+    def close_all(self) -> None:
+        """Close every pooled connection (all threads)."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+            self._applied.clear()
+        for conn in connections:
+            try:
+                conn.force_close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.db_path)
+            return (st.st_dev, st.st_ino)
+        except OSError:
+            return None
+
+    def _file_replaced(self) -> bool:
+        """Whether this thread's connection points at a deleted/replaced file."""
+        if self.is_memory:
+            return False
+        return self._stat() != getattr(self._local, "file_id", None)
+
+    def _discard(self, conn: PooledConnection) -> None:
+        with self._lock:
+            self._connections.discard(conn)
+            # A new file needs its schema applied again
+            self._applied.clear()
+        try:
+            conn.force_close()
+        except sqlite3.Error:
+            pass
+        self._local.conn = None
+
+
+_managers: dict[str, SQLiteConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_path: str | Path) -> SQLiteConnectionManager:
+    """Get the process-wide manager for a database file."""
+    path = str(db_path)
+    if path != MEMORY_DB:
+        path = os.path.abspath(os.path.expanduser(path))
+    with _managers_lock:
+        manager = _managers.get(path)
+        if manager is None:
+            manager = SQLiteConnectionManager(path)
+            _managers[path] = manager
+        return manager
+
+
+def close_all_connections() -> None:
+    """Close pooled connections for every database (e.g. at shutdown)."""
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close_all()
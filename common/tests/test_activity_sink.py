@@ -0,0 +1,71 @@
+"""Tests for the batched metrics activity sink."""
+
+import threading
+
+from common.metrics_store import ActivitySink, MetricsStore
+
+
+class TestActivitySink:
+    """Tests for batching, flushing and backpressure."""
+
+    def test_rows_written_in_batches(self):
+        batches = []
+        sink = ActivitySink(batches.append, flush_interval_ms=50, batch_size=3)
+
+        for i in range(7):
+            sink.submit((i,))
+        assert sink.flush()
+        sink.close()
+
+        assert [row for batch in batches for row in batch] == [(i,) for i in range(7)]
+        assert all(len(batch) <= 3 for batch in batches)
+        assert sink.stats()["written"] == 7
+
+    def test_full_queue_falls_back_to_sync_write(self):
+        release = threading.Event()
+        written = []
+
+        def slow_write(batch):
+            release.wait(2)
+            written.extend(batch)
+
+        sink = ActivitySink(
+            slow_write, flush_interval_ms=10, batch_size=1, max_queue=1, put_timeout=0.01
+        )
+        sink.submit((1,))  # taken by the writer, which then blocks
+        sink.submit((2,))  # fills the queue
+        threading.Timer(0.2, release.set).start()
+        sink.submit((3,))  # no room: written by the caller
+
+        sink.close()
+        assert sorted(written) == [(1,), (2,), (3,)]
+        assert sink.stats()["sync_writes"] >= 1
+
+    def test_close_writes_pending_rows(self):
+        batches = []
+        sink = ActivitySink(batches.append, flush_interval_ms=10_000, batch_size=100)
+
+        sink.submit(("a",))
+        sink.close()
+
+        assert batches == [[("a",)]]
+
+
+class TestLogActivityAsync:
+    """Tests for MetricsStore.log_activity_async()."""
+
+    def test_async_activity_persisted_after_flush(self, tmp_path):
+        store = MetricsStore(str(tmp_path / "metrics.db"))
+
+        store.log_activity_async(
+            activity_type="acknowledgment",
+            module="asp_alerts",
+            entity_id="alert-1",
+            details={"source": "test"},
+        )
+        assert store.flush_activities()
+
+        activities = store.list_activities(module="asp_alerts")
+        assert len(activities) == 1
+        assert activities[0].entity_id == "alert-1"
+        store.activity_sink.close()
@@ -0,0 +1,11 @@
+"""Tests for token budgets in the shared context packer."""
+
+from common.context_packer import context_token_budget, estimate_tokens
+
+
+def test_budget_derived_from_context_window_and_capped():
+    template = "x" * 4000
+
+    assert context_token_budget(8192, estimate_tokens(template), max_tokens=7500) == 8192 - 1000 - 1024
+    assert context_token_budget(32768, estimate_tokens(template), max_tokens=7500) == 7500
+    assert context_token_budget(None, max_tokens=2000) == 2000
@@ -0,0 +1,180 @@
+"""Tests for the shared pooled FHIR client."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from common.fhir_client import PooledFHIRClient, ResourceCache
+
+
+class StubFHIRServer:
+    """Local FHIR server serving fixed resources with ETags."""
+
+    def __init__(self, resources: dict[str, dict], delay: float = 0.0):
+        self.resources = resources
+        self.delay = delay
+        self.requests: list[tuple[str, str | None]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("/fhir/", 1)[1]
+                server.requests.append((path, self.headers.get("If-None-Match")))
+                time.sleep(server.delay)
+                resource = server.resources.get(path.split("?", 1)[0])
+                if resource is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                etag = f'W/"{resource.get("meta", {}).get("versionId", "1")}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = json.dumps(resource).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/fhir+json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/fhir"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = StubFHIRServer({
+        "Patient/p1": {"resourceType": "Patient", "id": "p1", "meta": {"versionId": "1"}},
+        "Observation": {"resourceType": "Bundle", "type": "searchset", "entry": []},
+    })
+    yield stub
+    stub.close()
+
+
+class TestPooledFHIRClient:
+    """Tests for caching, revalidation and coalescing."""
+
+    def test_read_cached_within_ttl(self, server):
+        client = PooledFHIRClient(server.base_url)
+
+        first = client.get("Patient/p1")
+        first["mutated"] = True
+        second = client.read("Patient", "p1")
+
+        assert second == {"resourceType": "Patient", "id": "p1", "meta": {"versionId": "1"}}
+        assert len(server.requests) == 1
+        stats = client.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["by_type"]["Patient"] == {"hits": 1, "misses": 1}
+
+    def test_expired_entry_revalidated_with_etag(self, server):
+        client = PooledFHIRClient(server.base_url, ttl_by_type={"Patient": 0})
+
+        client.read("Patient", "p1")
+        patient = client.read("Patient", "p1")
+
+        assert patient["id"] == "p1"
+        assert server.requests[1] == ("Patient/p1", 'W/"1"')
+        assert client.stats()["revalidated"] == 1
+
+    def test_changed_resource_refetched(self, server):
+        client = PooledFHIRClient(server.base_url, ttl_by_type={"Patient": 0})
+
+        client.read("Patient", "p1")
+        server.resources["Patient/p1"] = {
+            "resourceType": "Patient", "id": "p1", "meta": {"versionId": "2"},
+        }
+
+        assert client.read("Patient", "p1")["meta"]["versionId"] == "2"
+        assert client.stats()["misses"] == 2
+
+    def test_searches_not_cached(self, server):
+        client = PooledFHIRClient(server.base_url)
+
+        client.get("Observation", {"patient": "p1"})
+        client.get("Observation", {"patient": "p1"})
+
+        assert len(server.requests) == 2
+        assert client.stats()["hits"] == 0
+
+    def test_concurrent_identical_gets_coalesced(self, server):
+        server.delay = 0.2
+        client = PooledFHIRClient(server.base_url)
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(
+                lambda _: client.get("Observation", {"patient": "p1"}), range(5)
+            ))
+
+        assert all(r["resourceType"] == "Bundle" for r in results)
+        assert len(server.requests) == 1
+        assert client.stats()["coalesced"] == 4
+
+    def test_not_found_raises_http_error(self, server):
+        client = PooledFHIRClient(server.base_url)
+
+        with pytest.raises(requests.HTTPError) as exc:
+            client.read("Patient", "missing")
+        assert exc.value.response.status_code == 404
+        assert client.stats()["errors"] == 1
+
+    def test_end_cycle_reports_the_change_since_the_labels_last_cycle(self, server):
+        client = PooledFHIRClient(server.base_url)
+        client.read("Patient", "p1")
+        client.read("Patient", "p1")
+
+        cycle = client.end_cycle("test")
+
+        assert cycle["hit_rate"] == 0.5
+        assert client.end_cycle("test")["hits"] == 0
+        # Cached entries survive the cycle boundary
+        assert client.stats()["cached_resources"] == 1
+
+        # Another monitor's cycle still sees the reads, and totals are kept
+        client.read("Patient", "p1")
+        assert client.end_cycle("other")["hits"] == 2
+        assert client.end_cycle("test")["hits"] == 1
+        assert client.stats()["hits"] == 2
+
+
+class TestResourceCache:
+    """Tests for LRU eviction."""
+
+    def test_least_recently_used_evicted(self):
+        cache = ResourceCache(max_entries=2)
+        cache.put("Patient", "a", b"{}")
+        cache.put("Patient", "b", b"{}")
+        cache.get("Patient", "a")
+        cache.put("Patient", "c", b"{}")
+
+        assert cache.get("Patient", "b") is None
+        assert cache.get("Patient", "a") is not None
+        assert len(cache) == 2
+
+    def test_invalidate_type(self):
+        cache = ResourceCache()
+        cache.put("Patient", "a", b"{}")
+        cache.put("Encounter", "e", b"{}")
+
+        cache.invalidate("Patient")
+
+        assert cache.get("Patient", "a") is None
+        assert cache.get("Encounter", "e") is not None
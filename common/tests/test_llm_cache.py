@@ -0,0 +1,79 @@
+"""Tests for the content-addressed LLM response cache."""
+
+import sqlite3
+
+import pytest
+
+from common.llm_cache import LLMResponseCache, cached_call, make_cache_key
+from common.llm_cache import cache as llm_cache
+
+SCHEMA = {"type": "object", "properties": {"line_present": {"type": "boolean"}}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(tmp_path / "llm_cache.db")
+
+
+class TestLLMResponseCache:
+    """Tests for cache keys and eviction."""
+
+    def test_key_ignores_whitespace_but_not_content(self):
+        key = make_cache_key("m", "Note:\n  CVC  in place.\n\n\n", "v1", SCHEMA)
+
+        assert key == make_cache_key("m", "Note:\r\nCVC in place.", "v1", SCHEMA)
+        assert key != make_cache_key("m", "Note:\nCVC removed.", "v1", SCHEMA)
+        assert key != make_cache_key("m", "Note:\nCVC in place.", "v2", SCHEMA)
+        assert key != make_cache_key("other", "Note:\nCVC in place.", "v1", SCHEMA)
+
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        cache.max_bytes = 100
+        payload = {"text": "x" * 30}  # ~41 bytes serialized
+
+        cache.put("a", payload)
+        cache.put("b", payload)
+        assert cache.get("a") == payload  # a is now more recent than b
+        cache.put("c", payload)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == payload and cache.get("c") == payload
+        assert cache.stats()["evictions"] == 1
+
+    def test_broken_database_falls_back_to_one_llm_call(self, cache, monkeypatch):
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(cache, "get", locked)
+        monkeypatch.setattr(cache, "put", locked)
+        calls = []
+
+        response = cache.get_or_call(lambda: calls.append(1) or {"ok": True}, model="m", prompt="p")
+
+        assert response == {"ok": True}
+        assert calls == [1]
+
+    def test_cached_call_without_a_cache_calls_the_llm_once(self, monkeypatch):
+        def unavailable():
+            raise sqlite3.OperationalError("unable to open database file")
+
+        monkeypatch.setattr(llm_cache, "get_llm_cache", unavailable)
+        calls = []
+
+        response = cached_call(lambda: calls.append(1) or {"ok": True}, model="m", prompt="p")
+
+        assert response == {"ok": True}
+        assert calls == [1]
+
+    def test_cached_call_reuses_the_shared_cache(self, cache, monkeypatch):
+        monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+        calls = []
+
+        for _ in range(2):
+            response = cached_call(
+                lambda: calls.append(1) or {"ok": True}, model="m", prompt="p", options={"num_ctx": 4096},
+            )
+
+        assert response == {"ok": True}
+        assert calls == [1]
+        assert cached_call(lambda: calls.append(1) or {}, model="m", prompt="p", options={"num_ctx": 8192}) == {}
+        assert calls == [1, 1]
@@ -0,0 +1,70 @@
+"""Tests for grouped and incremental daily metrics snapshots."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from common.alert_store import AlertStore
+from common.metrics_store import MetricsAggregator, MetricsStore
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    metrics = MetricsStore(str(tmp_path / "metrics.db"))
+    alerts = AlertStore(str(tmp_path / "alerts.db"))
+    aggregator = MetricsAggregator(metrics_store=metrics)
+    aggregator._source_db_paths = lambda: {
+        "alerts": alerts.db_path,
+        "activity": metrics.db_path,
+    }
+    aggregator.alert_conn = alerts._connect()
+    return aggregator
+
+
+def _add_alert(conn, alert_id: str, created: datetime, acknowledged: datetime | None = None):
+    conn.execute(
+        """
+        INSERT INTO alerts (id, alert_type, source_id, severity, title, summary,
+                            created_at, acknowledged_at)
+        VALUES (?, 'bacteremia', ?, 'high', 't', 's', ?, ?)
+        """,
+        (alert_id, alert_id, created.isoformat(sep=" "),
+         acknowledged.isoformat() if acknowledged else None),
+    )
+    conn.commit()
+
+
+class TestSnapshotBackfill:
+    """Tests for backfill() and refresh_snapshots()."""
+
+    def test_backfill_counts_each_day(self, aggregator):
+        start = date.today() - timedelta(days=10)
+        day = datetime.combine(start, datetime.min.time())
+        _add_alert(aggregator.alert_conn, "a1", day + timedelta(hours=23, minutes=59))
+        _add_alert(aggregator.alert_conn, "a2", day + timedelta(days=1),
+                   acknowledged=day + timedelta(days=1, minutes=30))
+
+        snapshots = aggregator.backfill(start)
+
+        assert len(snapshots) == 10
+        assert snapshots[0].alerts_created == 1
+        assert snapshots[1].alerts_created == 1
+        assert snapshots[1].alerts_acknowledged == 1
+        assert snapshots[1].avg_time_to_ack_minutes == 30.0
+        assert aggregator.metrics_store.get_daily_snapshot(start).alerts_created == 1
+
+    def test_refresh_recomputes_only_changed_days(self, aggregator):
+        start = date.today() - timedelta(days=30)
+        aggregator.backfill(start)
+
+        old_day = date.today() - timedelta(days=5)
+        _add_alert(aggregator.alert_conn, "late",
+                   datetime.combine(old_day, datetime.min.time()) + timedelta(hours=8))
+
+        refreshed = aggregator.refresh_snapshots()
+
+        # The changed day plus yesterday, which is always refreshed
+        assert [s.snapshot_date for s in refreshed] == [
+            old_day, date.today() - timedelta(days=1)
+        ]
+        assert refreshed[0].alerts_created == 1
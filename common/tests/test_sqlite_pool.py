@@ -0,0 +1,154 @@
+"""Tests for the shared SQLite connection manager."""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from common.sqlite_pool import PooledConnection, SQLiteConnectionManager, get_connection_manager
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT);"
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SQLiteConnectionManager(str(tmp_path / "store.db"))
+    yield manager
+    manager.close_all()
+
+
+def _remove_db(path: str) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+class TestConnections:
+    """Tests for per-thread pooling and pragmas."""
+
+    def test_one_connection_per_thread(self, manager):
+        first = manager.connect()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(manager.connect()))
+        thread.start()
+        thread.join()
+
+        assert manager.connect() is first
+        assert isinstance(first, PooledConnection)
+        assert other[0] is not first
+
+    def test_pragmas_are_applied_to_new_connections(self, manager):
+        conn = manager.connect()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    def test_close_rolls_back_and_keeps_the_connection_usable(self, manager):
+        manager.ensure_schema("items", SCHEMA)
+        conn = manager.connect()
+        conn.execute("INSERT INTO items (name) VALUES ('committed')")
+        conn.commit()
+        conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+
+        conn.close()
+
+        assert not conn.in_transaction
+        assert manager.connect() is conn
+        assert [r["name"] for r in conn.execute("SELECT name FROM items")] == ["committed"]
+
+    def test_context_manager_commits_and_stays_open(self, manager):
+        manager.ensure_schema("items", SCHEMA)
+        with manager.connect() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+
+        other = sqlite3.connect(manager.db_path)
+        assert other.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+        other.close()
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+    def test_deleted_file_gets_a_new_connection_and_schema(self, manager):
+        assert manager.ensure_schema("items", SCHEMA)
+        old = manager.connect()
+
+        _remove_db(manager.db_path)
+        conn = manager.connect()
+
+        assert conn is not old
+        assert manager.ensure_schema("items", SCHEMA)
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_replaced_file_is_detected(self, manager, tmp_path):
+        manager.ensure_schema("items", SCHEMA)
+        old = manager.connect()
+        replacement = tmp_path / "replacement.db"
+        other = sqlite3.connect(replacement)
+        other.executescript(SCHEMA + "INSERT INTO items (name) VALUES ('restored');")
+        other.close()
+
+        # Restore the way a WAL database must be: without the old WAL files
+        _remove_db(manager.db_path)
+        os.replace(replacement, manager.db_path)
+        conn = manager.connect()
+
+        assert conn is not old
+        assert [r["name"] for r in conn.execute("SELECT name FROM items")] == ["restored"]
+
+    def test_managers_are_shared_per_file(self, tmp_path):
+        path = tmp_path / "shared.db"
+
+        manager = get_connection_manager(path)
+
+        assert get_connection_manager(str(path)) is manager
+        assert get_connection_manager(tmp_path / "other.db") is not manager
+        manager.close_all()
+
+
+class TestEnsureSchema:
+    """Tests for one-time DDL and migrations."""
+
+    def test_schema_runs_once_per_process_and_file(self, manager):
+        assert manager.ensure_schema("items", SCHEMA)
+        assert not manager.ensure_schema("items", SCHEMA)
+
+        # A new process finds the checksum already recorded
+        fresh = SQLiteConnectionManager(manager.db_path)
+        assert not fresh.ensure_schema("items", SCHEMA)
+        fresh.close_all()
+
+    def test_changed_schema_runs_again(self, manager):
+        manager.ensure_schema("items", SCHEMA)
+
+        fresh = SQLiteConnectionManager(manager.db_path)
+        changed = SCHEMA + "CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);"
+        assert fresh.ensure_schema("items", changed)
+        indexes = [r[1] for r in fresh.connect().execute("PRAGMA index_list(items)")]
+        fresh.close_all()
+
+        assert indexes == ["idx_items_name"]
+
+    def test_migration_reruns_when_the_version_changes(self, manager):
+        calls = []
+
+        def migrate(conn):
+            calls.append(1)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+            if "notes" not in columns:
+                conn.execute("ALTER TABLE items ADD COLUMN notes TEXT")
+
+        manager.ensure_schema("items", SCHEMA, migrate=migrate, version=1)
+        again = SQLiteConnectionManager(manager.db_path)
+        again.ensure_schema("items", SCHEMA, migrate=migrate, version=1)
+        bumped = SQLiteConnectionManager(manager.db_path)
+        bumped.ensure_schema("items", SCHEMA, migrate=migrate, version=2)
+        again.close_all()
+        bumped.close_all()
+
+        assert len(calls) == 2
+
+    def test_components_are_tracked_separately(self, manager):
+        assert manager.ensure_schema("items", SCHEMA)
+        assert manager.ensure_schema("tags", "CREATE TABLE IF NOT EXISTS tags (name TEXT);")
+
+        rows = manager.connect().execute("SELECT component FROM schema_version ORDER BY component")
+        assert [r["component"] for r in rows] == ["items", "tags"]
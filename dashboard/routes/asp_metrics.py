@@ -22,7 +22,7 @@ if str(_common_path.parent) not in sys.path:
     sys.path.insert(0, str(_common_path.parent))
 
 from common.metrics_store import (
-    MetricsStore,
+    get_metrics_store,
     MetricsAggregator,
     MetricsReporter,
     InterventionType,
@@ -32,8 +32,8 @@ from common.metrics_store import (
 
 
 def _get_metrics_store():
-    """Get MetricsStore instance."""
-    return MetricsStore()
+    """Get the shared MetricsStore instance."""
+    return get_metrics_store()
 
 
 def _get_aggregator():
@@ -652,6 +652,34 @@ def api_create_snapshot():
         return api_error(str(e), 500)
 
 
+@asp_metrics_bp.route("/api/backfill-snapshots", methods=["POST"])
+def api_backfill_snapshots():
+    """API endpoint to rebuild daily snapshots for a date range.
+
+    With no start date, only days whose source data changed since the last
+    run are recomputed.
+    """
+    try:
+        aggregator = _get_aggregator()
+        data = request.get_json() or {}
+
+        start_str = data.get("start")
+        end_str = data.get("end")
+        end = date.fromisoformat(end_str) if end_str else None
+
+        if start_str:
+            snapshots = aggregator.backfill(date.fromisoformat(start_str), end)
+        else:
+            snapshots = aggregator.refresh_snapshots(end)
+        return api_success(data={
+            "count": len(snapshots),
+            "dates": [s.snapshot_date.isoformat() for s in snapshots],
+        })
+    except Exception as e:
+        logger.error(f"Error backfilling snapshots: {e}")
+        return api_error(str(e), 500)
+
+
 # =============================================================================
 # Export and Report Endpoints
 # =============================================================================
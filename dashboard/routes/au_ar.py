@@ -498,6 +498,47 @@ def api_au_summary():
         return api_error(str(e), 500)
 
 
+@nhsn_reporting_bp.route("/api/au/drilldown")
+def api_au_drilldown():
+    """Get the patient-drug-days behind a location/month/drug DOT figure."""
+    try:
+        au_extractor = get_au_extractor()
+
+        from_date_str = request.args.get("from_date")
+        to_date_str = request.args.get("to_date")
+        location = request.args.get("location")
+        nhsn_code = request.args.get("nhsn_code")
+        route = request.args.get("route")
+
+        from_date = datetime.strptime(from_date_str, "%Y-%m-%d").date() if from_date_str else None
+        to_date = datetime.strptime(to_date_str, "%Y-%m-%d").date() if to_date_str else None
+        locations = [location] if location else None
+
+        df = au_extractor.get_patient_drug_days(locations, from_date, to_date, nhsn_code, route)
+        return api_success(data={"count": len(df), "patient_days": df.to_dict("records")})
+    except Exception as e:
+        return api_error(str(e), 500)
+
+
+@nhsn_reporting_bp.route("/api/au/refresh", methods=["POST"])
+def api_au_refresh():
+    """Refresh (or with rebuild=true, rebuild) the AU patient-drug-day facts."""
+    try:
+        au_extractor = get_au_extractor()
+        data = request.get_json(silent=True) or {}
+
+        if data.get("rebuild"):
+            written = au_extractor.rebuild_facts()
+        else:
+            written = au_extractor.refresh_facts()
+        return api_success(data={
+            "facts_written": written,
+            "last_mar_id": au_extractor.facts.get_watermark(au_extractor.fact_source),
+        })
+    except Exception as e:
+        return api_error(str(e), 500)
+
+
 @nhsn_reporting_bp.route("/api/ar/summary")
 def api_ar_summary():
     """Get AR summary as JSON."""
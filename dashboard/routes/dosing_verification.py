@@ -55,7 +55,7 @@ def _log_activity(activity_type, alert_id, action_taken, outcome=None, patient_m
     try:
         user = get_user_from_request(default="unknown")
         metrics = _get_metrics_store()
-        metrics.log_activity(
+        metrics.log_activity_async(
             provider_id=user,
             activity_type=activity_type,
             module=ModuleSource.DOSING_VERIFICATION,
@@ -24,10 +24,10 @@ def _log_drug_bug_activity(
 ) -> None:
     """Log activity to the unified metrics store. Fire-and-forget."""
     try:
-        from common.metrics_store import MetricsStore, ActivityType, ModuleSource
+        from common.metrics_store import get_metrics_store, ActivityType, ModuleSource
 
-        store = MetricsStore()
-        store.log_activity(
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.DRUG_BUG,
             provider_id=provider_id,
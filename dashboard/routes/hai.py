@@ -500,11 +500,7 @@ def _send_review_notification(candidate, decision, reviewer, notes):
         return  # Email not configured
 
     try:
-        common_path = Path(__file__).parent.parent.parent / "common"
-        if str(common_path) not in sys.path:
-            sys.path.insert(0, str(common_path))
-
-        from channels.email import EmailChannel, EmailMessage
+        from common.channels.email import EmailChannel, EmailMessage
 
         # Parse recipient list (can be comma-separated)
         recipients = [
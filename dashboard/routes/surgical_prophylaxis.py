@@ -49,9 +49,9 @@ def _log_surgical_activity(
 ) -> None:
     """Log activity to the unified metrics store. Fire-and-forget."""
     try:
-        from common.metrics_store import MetricsStore, ActivityType, ModuleSource
-        store = MetricsStore()
-        store.log_activity(
+        from common.metrics_store import get_metrics_store, ActivityType, ModuleSource
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.SURGICAL_PROPHYLAXIS,
             provider_id=provider_id,
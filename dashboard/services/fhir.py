@@ -6,6 +6,8 @@ from typing import Optional
 
 import requests
 
+from common.fhir_client import get_shared_fhir_client
+
 
 @dataclass
 class DrugAllergy:
@@ -148,22 +150,13 @@ class FHIRService:
 
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def _get(self, path: str, params: dict | None = None) -> dict | None:
         """Make a GET request to the FHIR server."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/{path}",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            return response.json()
+            return self.client.get(path, params, timeout=10)
         except requests.RequestException as e:
             print(f"FHIR request error: {e}")
             return None
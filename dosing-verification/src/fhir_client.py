@@ -16,6 +16,8 @@ from typing import Any
 
 import requests
 
+from common.fhir_client import get_shared_fhir_client
+
 from .models import PatientContext, MedicationOrder
 
 logger = logging.getLogger(__name__)
@@ -104,15 +106,13 @@ class DosingFHIRClient:
             fhir_url: Base URL for FHIR server. Defaults to FHIR_BASE_URL env var.
         """
         self.fhir_url = fhir_url or os.environ.get("FHIR_BASE_URL", "http://localhost:8081/fhir")
+        self.client = get_shared_fhir_client(self.fhir_url)
         logger.info(f"Initialized FHIR client: {self.fhir_url}")
 
     def _get(self, resource_type: str, params: dict | None = None) -> dict:
         """Execute FHIR GET request."""
-        url = f"{self.fhir_url}/{resource_type}"
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get(resource_type, params, timeout=30)
         except requests.RequestException as e:
             logger.error(f"FHIR request failed: {e}")
             raise
@@ -14,6 +14,7 @@ from common.dosing_verification import DoseAlertStore
 from common.dosing_verification.models import DoseAlertSeverity, DoseAlertStatus
 from common.alert_store import AlertStore, AlertType
 from common.channels import EmailChannel, TeamsWebhookChannel, TeamsMessage, EmailMessage
+from common.fhir_client import end_fhir_cycle
 
 from .models import PatientContext
 from .rules_engine import DosingRulesEngine
@@ -368,6 +369,7 @@ class DosingVerificationMonitor:
             "patients_checked": patients_checked,
             "alerts_created": alerts_created,
             "elapsed_seconds": round(elapsed, 2),
+            "fhir_cache": end_fhir_cycle("dosing-verification"),
         }
 
         logger.info(
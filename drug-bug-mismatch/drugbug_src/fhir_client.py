@@ -3,14 +3,24 @@
 Provides methods to query cultures with susceptibilities and current medications.
 """
 
+import sys
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 
 import requests
 
 from .config import config
+
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir_client import get_shared_fhir_client
+
 from .models import (
     Antibiotic,
     CultureWithSusceptibilities,
@@ -111,29 +121,16 @@ class HAPIFHIRClient(FHIRClient):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or config.FHIR_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request to FHIR server."""
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(resource_path, params)
 
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request to FHIR server."""
-        response = self.session.post(
-            f"{self.base_url}/{resource_path}",
-            json=resource,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.client.post(resource_path, resource)
 
 
 class EpicFHIRClient(FHIRClient):
@@ -152,11 +149,8 @@ class EpicFHIRClient(FHIRClient):
         self.access_token: str | None = None
         self.token_expires_at: datetime | None = None
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
         # Load private key
         self.private_key: str | None = None
@@ -217,25 +211,21 @@ class EpicFHIRClient(FHIRClient):
         """GET request with OAuth authentication."""
         token = self._get_access_token()
 
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
+        return self.client.get(
+            resource_path,
+            params,
             headers={"Authorization": f"Bearer {token}"},
         )
-        response.raise_for_status()
-        return response.json()
 
     def post(self, resource_path: str, resource: dict) -> dict:
         """POST request with OAuth authentication."""
         token = self._get_access_token()
 
-        response = self.session.post(
-            f"{self.base_url}/{resource_path}",
-            json=resource,
+        return self.client.post(
+            resource_path,
+            resource,
             headers={"Authorization": f"Bearer {token}"},
         )
-        response.raise_for_status()
-        return response.json()
 
 
 def get_fhir_client() -> FHIRClient:
@@ -13,6 +13,7 @@ from .matcher import assess_mismatch, should_alert
 from .models import AlertSeverity
 
 from common.alert_store import AlertStore, AlertType, AlertStatus
+from common.fhir_client import end_fhir_cycle
 
 
 class DrugBugMismatchMonitor:
@@ -198,6 +199,7 @@ class DrugBugMismatchMonitor:
         else:
             print("  No mismatches detected")
 
+        end_fhir_cycle("drug-bug")
         return cycle_alerts
 
     def run_continuous(self, interval_seconds: int | None = None):
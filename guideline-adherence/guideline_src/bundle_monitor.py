@@ -11,9 +11,9 @@ tracking element compliance.
 """
 
 import logging
-import re
 import time
-from datetime import datetime, timedelta
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 import sys
@@ -23,11 +23,17 @@ from pathlib import Path
 GUIDELINE_ADHERENCE_PATH = Path(__file__).parent.parent
 if str(GUIDELINE_ADHERENCE_PATH) not in sys.path:
     sys.path.insert(0, str(GUIDELINE_ADHERENCE_PATH))
+if str(GUIDELINE_ADHERENCE_PATH.parent) not in sys.path:
+    sys.path.insert(0, str(GUIDELINE_ADHERENCE_PATH.parent))
 
 from guideline_adherence import GUIDELINE_BUNDLES, GuidelineBundle, BundleElement
 
+from common.fhir_client import end_fhir_cycle
+
+from .checkers.snapshot import ClinicalSnapshot
 from .config import config
 from .episode_db import EpisodeDB, BundleEpisode, ElementResult, BundleAlert, BundleTrigger, EpisodeAssessment
+from .trigger_index import TriggerIndex
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +65,12 @@ class BundleTriggerMonitor:
         self.bundles = GUIDELINE_BUNDLES
         self._running = False
 
+        # Compiled trigger indexes by trigger type, rebuilt when triggers change
+        self._trigger_indexes: dict[str, tuple[tuple, TriggerIndex]] = {}
+        # Patients and ages in days (None if unknown), cleared each cycle
+        self._patients: dict[str, Optional[dict]] = {}
+        self._patient_ages: dict[str, Optional[int]] = {}
+
         # Load element checkers
         self._checkers = {}
         self._load_checkers()
@@ -102,6 +114,8 @@ class BundleTriggerMonitor:
         while self._running:
             try:
                 cycle_start = datetime.now()
+                self._patients.clear()
+                self._patient_ages.clear()
 
                 # Poll for new triggers
                 self._poll_diagnosis_triggers()
@@ -120,6 +134,8 @@ class BundleTriggerMonitor:
                     self._reassess_active_episodes()
                     reassessment_counter = 0
 
+                end_fhir_cycle("guideline-bundles")
+
                 if once:
                     break
 
@@ -140,6 +156,79 @@ class BundleTriggerMonitor:
 
         logger.info("Bundle Trigger Monitor stopped.")
 
+    def run_push(self, changes, reconcile_interval_seconds: Optional[int] = None):
+        """Run the monitoring loop driven by FHIR Subscription notifications.
+
+        Instead of polling every interval, waits for patients to be queued
+        by a SubscriptionReceiver. On a notification, the trigger polls run
+        and only the notified patients' active episodes are re-checked.
+        A full cycle (all polls, all episodes) still runs every
+        reconcile_interval_seconds, catching missed notifications.
+        Overdue-element alerts are raised every poll interval, since
+        deadlines pass without any FHIR change.
+
+        Args:
+            changes: PatientChangeQueue the receiver fills.
+            reconcile_interval_seconds: Seconds between full cycles.
+                Defaults to config.RECONCILE_INTERVAL_SECONDS.
+        """
+        reconcile_interval = reconcile_interval_seconds or config.RECONCILE_INTERVAL_SECONDS
+        self._running = True
+        logger.info(
+            f"Bundle Trigger Monitor starting in push mode "
+            f"(reconcile every {reconcile_interval}s)..."
+        )
+
+        self._assess_unprocessed_episodes()
+
+        last_reconcile = None
+        last_reassessment = time.monotonic()
+        REASSESSMENT_SECONDS = 12 * 60 * 60
+
+        while self._running:
+            try:
+                now = time.monotonic()
+                reconcile_due = (
+                    last_reconcile is None or now - last_reconcile >= reconcile_interval
+                )
+                if reconcile_due:
+                    patient_ids, resync = set(), True
+                else:
+                    timeout = min(self.poll_interval, last_reconcile + reconcile_interval - now)
+                    patient_ids, resync = changes.wait(timeout)
+
+                self._patients.clear()
+                self._patient_ages.clear()
+
+                if resync or patient_ids:
+                    self._poll_diagnosis_triggers()
+                    self._poll_order_triggers()
+                    self._poll_lab_triggers()
+
+                if resync:
+                    self._check_active_episodes()
+                    last_reconcile = time.monotonic()
+                elif patient_ids:
+                    logger.debug(f"Re-checking episodes for {len(patient_ids)} notified patients")
+                    self._check_active_episodes(patient_ids)
+
+                self._check_overdue_elements()
+
+                if time.monotonic() - last_reassessment >= REASSESSMENT_SECONDS:
+                    self._reassess_active_episodes()
+                    last_reassessment = time.monotonic()
+
+                end_fhir_cycle("guideline-bundles")
+
+            except KeyboardInterrupt:
+                logger.info("Received interrupt, stopping...")
+                self._running = False
+            except Exception as e:
+                logger.exception(f"Error in monitoring cycle: {e}")
+                time.sleep(self.poll_interval)
+
+        logger.info("Bundle Trigger Monitor stopped.")
+
     def stop(self):
         """Stop the monitoring loop."""
         self._running = False
@@ -164,6 +253,8 @@ class BundleTriggerMonitor:
             logger.debug("No diagnosis triggers configured")
             return
 
+        index = self._trigger_index("diagnosis", triggers)
+
         # Build list of ICD-10 patterns to search for
         icd10_patterns = [t.trigger_code for t in triggers if t.trigger_code]
 
@@ -185,7 +276,7 @@ class BundleTriggerMonitor:
 
             # Find matching triggers
             matching_bundles = self._match_triggers(
-                triggers, icd10_code, patient_id, encounter_id
+                index, icd10_code, patient_id, encounter_id
             )
 
             for bundle_id, trigger in matching_bundles:
@@ -236,6 +327,9 @@ class BundleTriggerMonitor:
             logger.debug("No order triggers configured")
             return
 
+        # Medication names are matched by substring, so lowercase codes once
+        trigger_names = [(t, t.trigger_code.lower()) for t in triggers if t.trigger_code]
+
         # Query FHIR for new medication orders
         orders = self.fhir_client.get_recent_medication_orders(since_time=last_poll)
 
@@ -250,8 +344,8 @@ class BundleTriggerMonitor:
                 continue
 
             # Find matching triggers
-            for trigger in triggers:
-                if trigger.trigger_code and trigger.trigger_code.lower() in medication_name:
+            for trigger, name in trigger_names:
+                if name in medication_name:
                     # Check age criteria
                     if not self._check_age_criteria(patient_id, trigger):
                         continue
@@ -297,6 +391,8 @@ class BundleTriggerMonitor:
             logger.debug("No lab triggers configured")
             return
 
+        index = self._trigger_index("lab", triggers)
+
         # Get LOINC codes from triggers
         loinc_codes = [t.trigger_code for t in triggers if t.trigger_code]
 
@@ -317,43 +413,51 @@ class BundleTriggerMonitor:
                 continue
 
             # Find matching trigger
-            for trigger in triggers:
-                if trigger.trigger_code == loinc_code:
-                    # Check age criteria
-                    if not self._check_age_criteria(patient_id, trigger):
-                        continue
+            for trigger in index.match_exact(loinc_code):
+                # Check age criteria
+                if not self._check_age_criteria(patient_id, trigger):
+                    continue
 
-                    # Check if episode already exists
-                    existing = self.db.get_active_episode(
-                        patient_id, encounter_id, trigger.bundle_id
-                    )
-                    if existing:
-                        continue
+                # Check if episode already exists
+                existing = self.db.get_active_episode(
+                    patient_id, encounter_id, trigger.bundle_id
+                )
+                if existing:
+                    continue
 
-                    # Create new episode
-                    episode = self._create_episode(
-                        patient_id=patient_id,
-                        encounter_id=encounter_id,
-                        bundle_id=trigger.bundle_id,
-                        trigger_type="lab",
-                        trigger_code=loinc_code,
-                        trigger_description=trigger.trigger_description,
-                        trigger_time=order_time or datetime.now(),
-                    )
+                # Create new episode
+                episode = self._create_episode(
+                    patient_id=patient_id,
+                    encounter_id=encounter_id,
+                    bundle_id=trigger.bundle_id,
+                    trigger_type="lab",
+                    trigger_code=loinc_code,
+                    trigger_description=trigger.trigger_description,
+                    trigger_time=order_time or datetime.now(),
+                )
 
-                    if episode:
-                        new_episodes += 1
-                        logger.info(
-                            f"Created episode for {patient_id}: {trigger.bundle_id} "
-                            f"(trigger: LOINC {loinc_code})"
-                        )
+                if episode:
+                    new_episodes += 1
+                    logger.info(
+                        f"Created episode for {patient_id}: {trigger.bundle_id} "
+                        f"(trigger: LOINC {loinc_code})"
+                    )
 
         self.db.update_poll_time("lab", datetime.now(), new_episodes)
         logger.debug(f"Lab poll complete: {new_episodes} new episodes")
 
+    def _trigger_index(self, trigger_type: str, triggers: list[BundleTrigger]) -> TriggerIndex:
+        """Compiled index for a trigger type, rebuilt only when triggers change."""
+        fingerprint = TriggerIndex.fingerprint(triggers)
+        cached = self._trigger_indexes.get(trigger_type)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, TriggerIndex(triggers))
+            self._trigger_indexes[trigger_type] = cached
+        return cached[1]
+
     def _match_triggers(
         self,
-        triggers: list[BundleTrigger],
+        index: TriggerIndex,
         code: str,
         patient_id: str,
         encounter_id: str,
@@ -361,7 +465,7 @@ class BundleTriggerMonitor:
         """Find triggers that match a given code.
 
         Args:
-            triggers: List of triggers to check.
+            index: Compiled triggers to check.
             code: Code to match (ICD-10, LOINC, etc.).
             patient_id: Patient ID for age checking.
             encounter_id: Encounter ID.
@@ -369,27 +473,39 @@ class BundleTriggerMonitor:
         Returns:
             List of (bundle_id, trigger) tuples for matches.
         """
-        matches = []
-
-        for trigger in triggers:
-            # Check code match
-            if trigger.trigger_code:
-                pattern = trigger.trigger_code.replace("%", ".*")
-                if not re.match(pattern, code, re.IGNORECASE):
-                    continue
-
-            # Check pattern match
-            if trigger.trigger_pattern:
-                if not re.match(trigger.trigger_pattern, code, re.IGNORECASE):
-                    continue
-
-            # Check age criteria
-            if not self._check_age_criteria(patient_id, trigger):
-                continue
-
-            matches.append((trigger.bundle_id, trigger))
-
-        return matches
+        return [
+            (trigger.bundle_id, trigger)
+            for trigger in index.match(code)
+            if self._check_age_criteria(patient_id, trigger)
+        ]
+
+    def _get_patient(self, patient_id: str) -> Optional[dict]:
+        """Patient resource, fetched once per cycle."""
+        if patient_id not in self._patients:
+            self._patients[patient_id] = self.fhir_client.get_patient(patient_id)
+        return self._patients[patient_id]
+
+    @staticmethod
+    def _birth_date(patient: Optional[dict]) -> Optional[date]:
+        """Birth date from a patient dict, which may hold a date or ISO string."""
+        birth_date = patient.get("birth_date") if patient else None
+        if isinstance(birth_date, str):
+            try:
+                return date.fromisoformat(birth_date[:10])
+            except ValueError:
+                return None
+        if isinstance(birth_date, datetime):
+            return birth_date.date()
+        return birth_date or None
+
+    def _patient_age_days(self, patient_id: str) -> Optional[int]:
+        """Patient age in days today, computed once per cycle. None if unknown."""
+        if patient_id not in self._patient_ages:
+            birth_date = self._birth_date(self._get_patient(patient_id))
+            self._patient_ages[patient_id] = (
+                (datetime.now().date() - birth_date).days if birth_date else None
+            )
+        return self._patient_ages[patient_id]
 
     def _check_age_criteria(self, patient_id: str, trigger: BundleTrigger) -> bool:
         """Check if patient meets age criteria for trigger.
@@ -404,14 +520,10 @@ class BundleTriggerMonitor:
         if trigger.age_min_days is None and trigger.age_max_days is None:
             return True
 
-        # Get patient age
-        patient = self.fhir_client.get_patient(patient_id)
-        if not patient or not patient.get("birth_date"):
+        age_days = self._patient_age_days(patient_id)
+        if age_days is None:
             return True  # Allow if can't determine age
 
-        birth_date = patient["birth_date"]
-        age_days = (datetime.now().date() - birth_date).days
-
         if trigger.age_min_days is not None and age_days < trigger.age_min_days:
             return False
 
@@ -454,13 +566,13 @@ class BundleTriggerMonitor:
             return None
 
         # Get patient info
-        patient = self.fhir_client.get_patient(patient_id)
+        patient = self._get_patient(patient_id)
         patient_mrn = patient.get("mrn") if patient else None
         patient_age_days = None
         patient_age_months = None
 
-        if patient and patient.get("birth_date"):
-            birth_date = patient["birth_date"]
+        birth_date = self._birth_date(patient)
+        if birth_date:
             patient_age_days = (trigger_time.date() - birth_date).days
             patient_age_months = patient_age_days / 30.44
 
@@ -521,19 +633,57 @@ class BundleTriggerMonitor:
     # ELEMENT CHECKING
     # =========================================================================
 
-    def _check_active_episodes(self):
-        """Check element status for all active episodes."""
+    def _check_active_episodes(self, patient_ids: Optional[set[str]] = None):
+        """Check element status for active episodes.
+
+        Episodes for the same patient share one ClinicalSnapshot per cycle,
+        so every element of every episode reads labs, medications and notes
+        from one FHIR search each.
+
+        Args:
+            patient_ids: Only check these patients' episodes. All if None.
+        """
         episodes = self.db.get_active_episodes()
+        if patient_ids is not None:
+            episodes = [e for e in episodes if e.patient_id in patient_ids]
         logger.debug(f"Checking {len(episodes)} active episodes...")
 
+        by_patient: dict[str, list[BundleEpisode]] = {}
         for episode in episodes:
-            self._check_episode_elements(episode)
+            by_patient.setdefault(episode.patient_id, []).append(episode)
+
+        fhir_calls = served = 0
+        for patient_id, patient_episodes in by_patient.items():
+            trigger_times = [e.trigger_time for e in patient_episodes if e.trigger_time]
+            window_start = (
+                min(trigger_times) - timedelta(hours=config.CLINICAL_SNAPSHOT_LOOKBACK_HOURS)
+                if trigger_times else None
+            )
+            snapshot = ClinicalSnapshot(self.fhir_client, patient_id, window_start=window_start)
+            for episode in patient_episodes:
+                self._check_episode_elements(episode, snapshot)
+
+            stats = snapshot.stats()
+            fhir_calls += stats["fhir_calls"]
+            served += stats["served_from_snapshot"]
+
+        if by_patient:
+            logger.debug(
+                f"Element checks for {len(by_patient)} patients: {fhir_calls} FHIR calls, "
+                f"{served} queries answered from snapshots"
+            )
 
-    def _check_episode_elements(self, episode: BundleEpisode):
+    def _check_episode_elements(
+        self,
+        episode: BundleEpisode,
+        snapshot: Optional[ClinicalSnapshot] = None,
+    ):
         """Check all elements for an episode.
 
         Args:
             episode: Episode to check.
+            snapshot: Patient's clinical snapshot for this cycle. Checkers
+                query FHIR directly if not given.
         """
         bundle = self.bundles.get(episode.bundle_id)
         if not bundle:
@@ -569,12 +719,13 @@ class BundleTriggerMonitor:
 
             # Check element status
             if checker:
-                check_result = checker.check(
-                    element=element,
-                    patient_id=episode.patient_id,
-                    trigger_time=episode.trigger_time,
-                    age_days=episode.patient_age_days,
-                )
+                with checker.use_snapshot(snapshot) if snapshot else nullcontext():
+                    check_result = checker.check(
+                        element=element,
+                        patient_id=episode.patient_id,
+                        trigger_time=episode.trigger_time,
+                        age_days=episode.patient_age_days,
+                    )
 
                 # Update result
                 result.status = check_result.status.value
@@ -918,6 +1069,8 @@ class BundleTriggerMonitor:
         Returns:
             Created episode or None.
         """
+        # May run outside a monitoring cycle; don't reuse a cycle's patient
+        self._patients.pop(patient_id, None)
         return self._create_episode(
             patient_id=patient_id,
             encounter_id=encounter_id,
@@ -5,6 +5,7 @@ from .lab_checker import LabChecker
 from .medication_checker import MedicationChecker
 from .note_checker import NoteChecker
 from .febrile_infant_checker import FebrileInfantChecker
+from .snapshot import ClinicalSnapshot
 
 __all__ = [
     "ElementChecker",
@@ -12,4 +13,5 @@ __all__ = [
     "MedicationChecker",
     "NoteChecker",
     "FebrileInfantChecker",
+    "ClinicalSnapshot",
 ]
@@ -1,6 +1,7 @@
 """Base class for guideline element checkers."""
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import logging
 import sys
@@ -18,6 +19,7 @@ from ..models import ElementCheckResult, ElementCheckStatus
 
 if TYPE_CHECKING:
     from ..fhir_client import GuidelineFHIRClient
+    from .snapshot import ClinicalSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,24 @@ class ElementChecker(ABC):
         """
         self.fhir_client = fhir_client
 
+    @contextmanager
+    def use_snapshot(self, snapshot: "ClinicalSnapshot"):
+        """Evaluate against a patient's clinical snapshot instead of live FHIR.
+
+        Within the block every self.fhir_client query is answered by the
+        snapshot, so repeated lab/medication/note lookups across elements
+        cost one FHIR search each.
+
+        Args:
+            snapshot: Snapshot for the patient being checked.
+        """
+        client = self.fhir_client
+        self.fhir_client = snapshot
+        try:
+            yield snapshot
+        finally:
+            self.fhir_client = client
+
     @abstractmethod
     def check(
         self,
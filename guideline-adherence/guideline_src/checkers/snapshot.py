@@ -0,0 +1,324 @@
+"""Per-patient clinical snapshot for element checkers.
+
+Checkers ask for labs, medication administrations and notes element by
+element, each with its own LOINC list and start time. Within one
+monitoring cycle those are all views of the same few FHIR searches, so a
+ClinicalSnapshot fetches each resource kind once per patient and answers
+the individual queries from memory:
+
+- Labs: one Observation search for every monitored LOINC code
+- Medication administrations: one search
+- Notes: one DocumentReference search (unfiltered by note type)
+
+It exposes the same query methods as GuidelineFHIRClient, so a checker
+evaluates against it unchanged (see ElementChecker.use_snapshot). A query
+that reaches earlier than what has been fetched widens the fetch once.
+Results come back as the live search would return them. When a fetch hit
+its result cap, older windows are queried directly rather than trusting a
+truncated list. Any other get_* call is passed through and memoized for
+the life of the snapshot.
+"""
+
+from datetime import datetime, timedelta
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+# Add parent paths for imports
+GUIDELINE_ADHERENCE_PATH = Path(__file__).parent.parent.parent
+if str(GUIDELINE_ADHERENCE_PATH) not in sys.path:
+    sys.path.insert(0, str(GUIDELINE_ADHERENCE_PATH))
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# Result caps for the snapshot searches. Labs cover every monitored code at
+# once, so they get more room than a single-code search.
+MAX_LAB_RESULTS = 500
+MAX_MEDICATION_RESULTS = 200
+MAX_NOTE_RESULTS = 50
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Aware datetimes to naive local time, for comparison with trigger times."""
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _lab_time(lab: dict) -> datetime | None:
+    return lab.get("effective_time")
+
+
+def _admin_time(admin: dict) -> datetime | None:
+    return admin.get("admin_time")
+
+
+def _note_day(note: dict) -> datetime | None:
+    """Start of the note's day; the note search compares dates, not times."""
+    value = note.get("date")
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    return datetime.combine(_local_naive(value).date(), datetime.min.time())
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a call argument, for memoizing pass-through calls."""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class _Prefetch:
+    """One resource kind's fetched results and the window they cover."""
+
+    __slots__ = ("since", "items", "complete_since")
+
+    def __init__(self, since: datetime, items: list[dict], complete_since: datetime):
+        self.since = since
+        self.items = items
+        # Earliest time from which the items are known to be complete; later
+        # than since when the search hit its result cap
+        self.complete_since = complete_since
+
+
+class ClinicalSnapshot:
+    """Labs, medications and notes for one patient, fetched once per cycle."""
+
+    def __init__(
+        self,
+        fhir_client,
+        patient_id: str,
+        window_start: datetime | None = None,
+        lab_loinc_codes: list[str] | None = None,
+    ):
+        """Initialize the snapshot. Nothing is fetched until first asked for.
+
+        Args:
+            fhir_client: Client the snapshot fetches from.
+            patient_id: FHIR patient ID the snapshot covers.
+            window_start: Earliest time to fetch from, typically the episode
+                trigger time less a lookback. Queries reaching earlier widen
+                the fetch.
+            lab_loinc_codes: Codes fetched together in the lab search.
+                Defaults to config.MONITORED_LAB_LOINCS.
+        """
+        self.fhir_client = fhir_client
+        self.patient_id = patient_id
+        self.window_start = window_start
+        self.lab_loinc_codes = list(lab_loinc_codes or config.MONITORED_LAB_LOINCS)
+        self._lab_codes = set(self.lab_loinc_codes)
+
+        self._labs: _Prefetch | None = None
+        self._meds: _Prefetch | None = None
+        self._notes: _Prefetch | None = None
+        self._memo: dict[tuple, Any] = {}
+
+        self.fetches = 0
+        self.served = 0
+
+    # -------------------------------------------------------------------------
+    # Snapshot queries (same signatures as GuidelineFHIRClient)
+    # -------------------------------------------------------------------------
+
+    def get_lab_results(
+        self,
+        patient_id: str,
+        loinc_codes: list[str],
+        since_time: datetime | None = None,
+        since_hours: int | None = None,
+        max_results: int = 100,
+    ) -> list[dict]:
+        """Lab results for LOINC codes since a time, from the snapshot."""
+        if since_hours and not since_time:
+            since_time = datetime.now() - timedelta(hours=since_hours)
+
+        codes = set(loinc_codes)
+        if patient_id != self.patient_id or since_time is None or not codes <= self._lab_codes:
+            return self._passthrough(
+                "get_lab_results", patient_id=patient_id, loinc_codes=loinc_codes,
+                since_time=since_time, max_results=max_results,
+            )
+
+        self._labs = self._ensure(
+            self._labs, since_time, self.window_start, MAX_LAB_RESULTS, self._fetch_labs, _lab_time,
+        )
+        if since_time < self._labs.complete_since:
+            return self._passthrough(
+                "get_lab_results", patient_id=patient_id, loinc_codes=loinc_codes,
+                since_time=since_time, max_results=max_results,
+            )
+
+        self.served += 1
+        results = [
+            lab for lab in self._labs.items
+            if lab.get("loinc_code") in codes
+            and lab.get("effective_time") is not None
+            and _local_naive(lab["effective_time"]) >= since_time
+        ]
+        return results[:max_results]
+
+    def get_medication_administrations(
+        self,
+        patient_id: str,
+        since_time: datetime | None = None,
+        since_hours: int = 24,
+        max_results: int = 200,
+    ) -> list[dict]:
+        """Medication administrations since a time, from the snapshot."""
+        if not since_time:
+            since_time = datetime.now() - timedelta(hours=since_hours)
+
+        if patient_id != self.patient_id:
+            return self._passthrough(
+                "get_medication_administrations", patient_id=patient_id,
+                since_time=since_time, max_results=max_results,
+            )
+
+        self._meds = self._ensure(
+            self._meds, since_time, self.window_start, MAX_MEDICATION_RESULTS, self._fetch_meds, _admin_time,
+        )
+        if since_time < self._meds.complete_since:
+            return self._passthrough(
+                "get_medication_administrations", patient_id=patient_id,
+                since_time=since_time, max_results=max_results,
+            )
+
+        self.served += 1
+        results = [
+            admin for admin in self._meds.items
+            if admin.get("admin_time") is not None
+            and _local_naive(admin["admin_time"]) >= since_time
+        ]
+        return results[:max_results]
+
+    def get_recent_notes(
+        self,
+        patient_id: str,
+        since_hours: int = 48,
+        note_types: list[str] | None = None,
+        since_time: datetime | None = None,
+        max_results: int = 50,
+    ) -> list[dict]:
+        """Clinical notes since a time, from the snapshot.
+
+        Like the DocumentReference search, the start is compared by date.
+        """
+        since_date = since_time or datetime.now() - timedelta(hours=since_hours)
+
+        if patient_id != self.patient_id or note_types:
+            return self._passthrough(
+                "get_recent_notes", patient_id=patient_id, note_types=note_types,
+                since_time=since_date, max_results=max_results,
+            )
+
+        # The search filters by day, so fetch from the start of the day
+        day_start = datetime.combine(since_date.date(), datetime.min.time())
+        window_day = (
+            datetime.combine(self.window_start.date(), datetime.min.time())
+            if self.window_start else None
+        )
+        self._notes = self._ensure(
+            self._notes, day_start, window_day, MAX_NOTE_RESULTS, self._fetch_notes, _note_day,
+        )
+        if day_start < self._notes.complete_since:
+            return self._passthrough(
+                "get_recent_notes", patient_id=patient_id, note_types=note_types,
+                since_time=since_date, max_results=max_results,
+            )
+
+        self.served += 1
+        results = [
+            note for note in self._notes.items
+            if (day := _note_day(note)) is not None and day >= day_start
+        ]
+        return results[:max_results]
+
+    def __getattr__(self, name: str):
+        """Pass other client methods through, memoizing get_* queries."""
+        attr = getattr(self.fhir_client, name)
+        if not name.startswith("get_") or not callable(attr):
+            return attr
+
+        def memoized(*args, **kwargs):
+            return self._passthrough(name, *args, **kwargs)
+
+        return memoized
+
+    def stats(self) -> dict:
+        """FHIR calls made vs queries answered from the snapshot."""
+        return {"fhir_calls": self.fetches, "served_from_snapshot": self.served}
+
+    # -------------------------------------------------------------------------
+    # Fetching
+    # -------------------------------------------------------------------------
+
+    def _ensure(
+        self,
+        prefetch: _Prefetch | None,
+        since_time: datetime,
+        window_start: datetime | None,
+        cap: int,
+        fetch: Callable[[datetime], list[dict]],
+        time_of: Callable[[dict], datetime | None],
+    ) -> _Prefetch:
+        """Return a prefetch covering since_time, fetching or widening once."""
+        if prefetch is not None and prefetch.since <= since_time:
+            return prefetch
+
+        since = since_time
+        if window_start is not None and window_start < since:
+            since = window_start
+        if prefetch is not None and prefetch.since < since:
+            since = prefetch.since
+
+        items = fetch(since)
+        self.fetches += 1
+
+        complete_since = since
+        if len(items) >= cap:
+            # Capped, newest first: only the span the items reach is complete
+            times = [_local_naive(t) for t in map(time_of, items) if t is not None]
+            complete_since = min(times) if times else datetime.max
+        return _Prefetch(since, items, complete_since)
+
+    def _fetch_labs(self, since: datetime) -> list[dict]:
+        return self.fhir_client.get_lab_results(
+            patient_id=self.patient_id,
+            loinc_codes=self.lab_loinc_codes,
+            since_time=since,
+            max_results=MAX_LAB_RESULTS,
+        )
+
+    def _fetch_meds(self, since: datetime) -> list[dict]:
+        return self.fhir_client.get_medication_administrations(
+            patient_id=self.patient_id,
+            since_time=since,
+            max_results=MAX_MEDICATION_RESULTS,
+        )
+
+    def _fetch_notes(self, since: datetime) -> list[dict]:
+        return self.fhir_client.get_recent_notes(
+            patient_id=self.patient_id,
+            since_time=since,
+            max_results=MAX_NOTE_RESULTS,
+        )
+
+    def _passthrough(self, name: str, *args, **kwargs) -> Any:
+        """Call the client directly, once per distinct arguments."""
+        key = (name, _freeze(args), _freeze(kwargs))
+        if key not in self._memo:
+            self._memo[key] = getattr(self.fhir_client, name)(*args, **kwargs)
+            self.fetches += 1
+        else:
+            self.served += 1
+        return self._memo[key]
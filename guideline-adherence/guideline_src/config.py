@@ -27,6 +27,18 @@ class Config:
     # Monitoring intervals (minutes)
     CHECK_INTERVAL_MINUTES = int(os.environ.get("CHECK_INTERVAL_MINUTES", "15"))
 
+    # Per-patient clinical snapshot: labs/meds/notes are fetched from this
+    # many hours before the earliest episode trigger, once per cycle
+    CLINICAL_SNAPSHOT_LOOKBACK_HOURS = int(os.environ.get("CLINICAL_SNAPSHOT_LOOKBACK_HOURS", "24"))
+
+    # Push mode: FHIR rest-hook Subscription receiver, with a full
+    # reconciliation poll every RECONCILE_INTERVAL_SECONDS as a safety net.
+    # Listening on anything but loopback requires a token.
+    SUBSCRIPTION_RECEIVER_HOST = os.environ.get("SUBSCRIPTION_RECEIVER_HOST", "127.0.0.1")
+    SUBSCRIPTION_RECEIVER_PORT = int(os.environ.get("SUBSCRIPTION_RECEIVER_PORT", "8095"))
+    SUBSCRIPTION_RECEIVER_TOKEN = os.environ.get("SUBSCRIPTION_RECEIVER_TOKEN", "")
+    RECONCILE_INTERVAL_SECONDS = int(os.environ.get("RECONCILE_INTERVAL_SECONDS", "900"))
+
     # Bundle configuration
     ENABLED_BUNDLES = os.environ.get(
         "ENABLED_BUNDLES",
@@ -71,6 +83,16 @@ class Config:
     LOINC_CDIFF_PCR = "54067-4"           # C. diff PCR/NAAT
     LOINC_CDIFF_GDH = "29484-9"           # C. diff GDH antigen
 
+    # Lab codes fetched together into each patient's clinical snapshot
+    MONITORED_LAB_LOINCS = [
+        LOINC_LACTATE, LOINC_BLOOD_CULTURE,
+        LOINC_PROCALCITONIN, LOINC_CRP, LOINC_ANC, LOINC_WBC,
+        LOINC_UA, LOINC_UA_WBC, LOINC_UA_LE, LOINC_URINE_CULTURE,
+        LOINC_CSF_WBC, LOINC_CSF_RBC,
+        LOINC_HSV_PCR_CSF, LOINC_HSV_PCR_BLOOD, LOINC_HSV_CULTURE, LOINC_ALT, LOINC_AST,
+        LOINC_CDIFF_TOXIN, LOINC_CDIFF_PCR, LOINC_CDIFF_GDH,
+    ]
+
     # Febrile infant inflammatory marker thresholds (AAP 2021)
     FI_PCT_ABNORMAL = 0.5                 # ng/mL
     FI_ANC_ABNORMAL = 4000                # cells/μL
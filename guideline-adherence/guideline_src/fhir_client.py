@@ -5,15 +5,24 @@ to the base FHIR client pattern.
 """
 
 import logging
+import sys
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
 import requests
 
 from .config import config
 
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir_client import get_shared_fhir_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -280,6 +289,7 @@ class GuidelineFHIRClient(ABC):
         loinc_codes: list[str],
         since_time: datetime | None = None,
         since_hours: int | None = None,
+        max_results: int = 100,
     ) -> list[dict]:
         """Get lab results for specific LOINC codes.
 
@@ -288,6 +298,7 @@ class GuidelineFHIRClient(ABC):
             loinc_codes: List of LOINC codes to search for.
             since_time: Optional start time for search.
             since_hours: Optional hours back to search (alternative to since_time).
+            max_results: Most recent results to return.
 
         Returns:
             List of dicts with loinc_code, value, unit, effective_time.
@@ -298,7 +309,7 @@ class GuidelineFHIRClient(ABC):
         params = {
             "patient": patient_id,
             "code": ",".join(f"http://loinc.org|{code}" for code in loinc_codes),
-            "_count": "100",
+            "_count": str(max_results),
             "_sort": "-date",
         }
 
@@ -421,6 +432,7 @@ class GuidelineFHIRClient(ABC):
         patient_id: str,
         since_time: datetime | None = None,
         since_hours: int = 24,
+        max_results: int = 200,
     ) -> list[dict]:
         """Get medication administrations (actual given times).
 
@@ -428,6 +440,7 @@ class GuidelineFHIRClient(ABC):
             patient_id: FHIR patient ID.
             since_time: Optional start time.
             since_hours: Hours back to search.
+            max_results: Most recent administrations to return.
 
         Returns:
             List of dicts with medication_name, dose, admin_time, status.
@@ -438,7 +451,7 @@ class GuidelineFHIRClient(ABC):
         params = {
             "patient": patient_id,
             "effective-time": f"ge{since_time.strftime('%Y-%m-%dT%H:%M:%S')}",
-            "_count": "200",
+            "_count": str(max_results),
             "_sort": "-effective-time",
         }
 
@@ -505,6 +518,7 @@ class GuidelineFHIRClient(ABC):
         since_hours: int = 48,
         note_types: list[str] | None = None,
         since_time: datetime | None = None,
+        max_results: int = 50,
     ) -> list[dict]:
         """Get recent clinical notes.
 
@@ -513,6 +527,7 @@ class GuidelineFHIRClient(ABC):
             since_hours: Hours back to search (if since_time not provided).
             note_types: Optional LOINC codes for note types.
             since_time: Optional specific start time.
+            max_results: Most recent notes to return.
 
         Returns:
             List of dicts with type, date, author, text.
@@ -525,7 +540,7 @@ class GuidelineFHIRClient(ABC):
         params = {
             "patient": patient_id,
             "date": f"ge{since_date.strftime('%Y-%m-%d')}",
-            "_count": "50",
+            "_count": str(max_results),
             "_sort": "-date",
         }
 
@@ -595,20 +610,12 @@ class HAPIGuidelineFHIRClient(GuidelineFHIRClient):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or config.FHIR_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request to FHIR server."""
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(resource_path, params)
 
     def post(self, resource_type: str, resource: dict) -> dict:
         """POST a new resource to FHIR server."""
@@ -626,14 +633,21 @@ class HAPIGuidelineFHIRClient(GuidelineFHIRClient):
             json=resource,
         )
         response.raise_for_status()
+        self._invalidate(resource_path)
         return response.json()
 
     def delete(self, resource_path: str) -> bool:
         """DELETE a resource from FHIR server."""
         response = self.session.delete(f"{self.base_url}/{resource_path}")
         response.raise_for_status()
+        self._invalidate(resource_path)
         return True
 
+    def _invalidate(self, resource_path: str) -> None:
+        """Drop a written resource from the shared read cache."""
+        resource_type, _, resource_id = resource_path.strip("/").partition("/")
+        self.client.invalidate(resource_type, resource_id or None)
+
     def create_patient(
         self,
         mrn: str,
@@ -859,11 +873,8 @@ class EpicGuidelineFHIRClient(GuidelineFHIRClient):
         self.access_token: str | None = None
         self.token_expires_at: datetime | None = None
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
         self.private_key: str | None = None
         if self.private_key_path:
@@ -920,13 +931,11 @@ class EpicGuidelineFHIRClient(GuidelineFHIRClient):
         """GET request with OAuth authentication."""
         token = self._get_access_token()
 
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
+        return self.client.get(
+            resource_path,
+            params,
             headers={"Authorization": f"Bearer {token}"},
         )
-        response.raise_for_status()
-        return response.json()
 
 
 class DemoGuidelineFHIRClient(GuidelineFHIRClient):
@@ -1071,6 +1080,7 @@ Clinical assessment pending.""",
         since_hours: int = 48,
         note_types: list[str] | None = None,
         since_time: datetime | None = None,
+        max_results: int = 50,
     ) -> list[dict]:
         """Return demo clinical notes based on patient scenario.
 
@@ -1088,9 +1098,9 @@ Clinical assessment pending.""",
 
         notes = self.DEMO_NOTES.get(scenario, self.DEMO_NOTES["default"])
 
-        # Set timestamps
+        # Set timestamps: recent notes, so they fall inside any search window
         from datetime import datetime, timedelta
-        base_time = since_time or datetime.now()
+        base_time = datetime.now()
         result = []
         for i, note in enumerate(notes):
             note_copy = note.copy()
@@ -1105,6 +1115,7 @@ Clinical assessment pending.""",
         loinc_codes: list[str],
         since_time: datetime | None = None,
         since_hours: int | None = None,
+        max_results: int = 100,
     ) -> list[dict]:
         """Return empty list - demo doesn't include lab data."""
         return []
@@ -1123,6 +1134,7 @@ Clinical assessment pending.""",
         patient_id: str,
         since_time: datetime | None = None,
         since_hours: int = 24,
+        max_results: int = 200,
     ) -> list[dict]:
         """Return empty list - demo doesn't include medications."""
         return []
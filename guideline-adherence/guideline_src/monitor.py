@@ -6,19 +6,20 @@ generates alerts when elements are not met within their time windows.
 
 import logging
 import sys
-from datetime import datetime
+from contextlib import ExitStack
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 # Add paths for imports
-COMMON_PATH = Path(__file__).parent.parent.parent / "common"
+PROJECT_ROOT = Path(__file__).parent.parent.parent
 GUIDELINE_PATH = Path(__file__).parent.parent
-if str(COMMON_PATH) not in sys.path:
-    sys.path.insert(0, str(COMMON_PATH))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 if str(GUIDELINE_PATH) not in sys.path:
     sys.path.insert(0, str(GUIDELINE_PATH))
 
-from alert_store import AlertStore, AlertType
+from common.alert_store import AlertStore, AlertType
 
 from guideline_adherence import (
     BundleElement,
@@ -37,7 +38,13 @@ from .models import (
 )
 from .fhir_client import GuidelineFHIRClient, get_fhir_client
 from .adherence_db import AdherenceDatabase
-from .checkers import LabChecker, MedicationChecker, NoteChecker, FebrileInfantChecker
+from .checkers import (
+    ClinicalSnapshot,
+    FebrileInfantChecker,
+    LabChecker,
+    MedicationChecker,
+    NoteChecker,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -280,31 +287,41 @@ class GuidelineAdherenceMonitor:
         # Use febrile infant checker for febrile infant bundles
         is_febrile_infant_bundle = bundle.bundle_id.startswith("febrile_infant")
 
-        for element in bundle.elements:
-            if is_febrile_infant_bundle:
-                # Use specialized febrile infant checker
-                result = self.febrile_infant_checker.check(
-                    element, patient_id, trigger_time, age_days=age_days
-                )
-            else:
-                result = self._check_element(element, patient_id, trigger_time)
-            element_results.append(result)
-
-            # Track initial lactate for repeat check
-            if element.element_id == "sepsis_lactate" and result.value:
-                try:
-                    initial_lactate = float(result.value)
-                except (ValueError, TypeError):
-                    pass
-
-        # Handle repeat lactate specially (sepsis bundle only)
-        if not is_febrile_infant_bundle:
-            for i, element in enumerate(bundle.elements):
-                if element.element_id == "sepsis_repeat_lactate":
-                    result = self.lab_checker.check_repeat_lactate(
-                        element, patient_id, trigger_time, initial_lactate
+        # All checkers read this patient's labs, meds and notes from one snapshot
+        snapshot = ClinicalSnapshot(
+            self.fhir_client,
+            patient_id,
+            window_start=trigger_time - timedelta(hours=config.CLINICAL_SNAPSHOT_LOOKBACK_HOURS),
+        )
+        with ExitStack() as stack:
+            for checker in (self.lab_checker, self.med_checker, self.note_checker, self.febrile_infant_checker):
+                stack.enter_context(checker.use_snapshot(snapshot))
+
+            for element in bundle.elements:
+                if is_febrile_infant_bundle:
+                    # Use specialized febrile infant checker
+                    result = self.febrile_infant_checker.check(
+                        element, patient_id, trigger_time, age_days=age_days
                     )
-                    element_results[i] = result
+                else:
+                    result = self._check_element(element, patient_id, trigger_time)
+                element_results.append(result)
+
+                # Track initial lactate for repeat check
+                if element.element_id == "sepsis_lactate" and result.value:
+                    try:
+                        initial_lactate = float(result.value)
+                    except (ValueError, TypeError):
+                        pass
+
+            # Handle repeat lactate specially (sepsis bundle only)
+            if not is_febrile_infant_bundle:
+                for i, element in enumerate(bundle.elements):
+                    if element.element_id == "sepsis_repeat_lactate":
+                        result = self.lab_checker.check_repeat_lactate(
+                            element, patient_id, trigger_time, initial_lactate
+                        )
+                        element_results[i] = result
 
         # Determine episode status
         has_pending = any(r.status == ElementCheckStatus.PENDING for r in element_results)
@@ -18,13 +18,22 @@ Tiered Extraction:
 
 import json
 import logging
+import sys
 import time
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 
 import requests
 
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.llm_cache import cached_call
+
 if TYPE_CHECKING:
     from .triage_extractor import ClinicalAppearanceTriageExtractor, AppearanceTriageResult
     from .training_collector import ClinicalAppearanceTrainingCollector
@@ -75,6 +84,7 @@ class ClinicalImpressionExtractor:
     """Extract clinical impression/appearance from clinical notes using LLM."""
 
     PROMPT_VERSION = "clinical_impression_v1"
+    LLM_OPTIONS = {"temperature": 0.0, "num_predict": 1024, "num_ctx": 8192}
 
     # Default prompt template
     DEFAULT_PROMPT = """You are a clinical decision support system analyzing pediatric clinical notes.
@@ -215,7 +225,7 @@ If the notes do not contain enough information about clinical appearance, return
         return combined
 
     def _call_llm(self, prompt: str) -> dict:
-        """Call the LLM API.
+        """Call the LLM API, reusing the cached response for an identical prompt.
 
         Args:
             prompt: The prompt to send.
@@ -226,6 +236,16 @@ If the notes do not contain enough information about clinical appearance, return
         Raises:
             Exception on API or parsing errors.
         """
+        return cached_call(
+            lambda: self._request_llm(prompt),
+            model=self.model,
+            prompt=prompt,
+            prompt_version=self.PROMPT_VERSION,
+            options=self.LLM_OPTIONS,
+        )
+
+    def _request_llm(self, prompt: str) -> dict:
+        """Send a prompt to the Ollama chat API and parse the JSON reply."""
         response = requests.post(
             f"{self.base_url}/api/chat",
             json={
@@ -235,11 +255,7 @@ If the notes do not contain enough information about clinical appearance, return
                 ],
                 "stream": False,
                 "format": "json",
-                "options": {
-                    "temperature": 0.0,
-                    "num_predict": 1024,
-                    "num_ctx": 8192,
-                },
+                "options": self.LLM_OPTIONS,
             },
             timeout=120,
         )
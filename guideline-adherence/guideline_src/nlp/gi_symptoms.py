@@ -13,13 +13,22 @@ Extracts:
 import json
 import logging
 import re
+import sys
 import time
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Optional
 
 import requests
 
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.llm_cache import cached_call
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +96,7 @@ class GISymptomExtractor:
     """Extract GI symptoms from clinical notes using LLM."""
 
     PROMPT_VERSION = "gi_symptoms_v1"
+    LLM_OPTIONS = {"temperature": 0.0, "num_predict": 1024, "num_ctx": 4096}
 
     DEFAULT_PROMPT = """You are a clinical decision support system analyzing clinical notes for GI symptoms.
 
@@ -206,7 +216,17 @@ Guidelines:
         return combined
 
     def _call_llm(self, prompt: str) -> dict:
-        """Call the LLM API."""
+        """Call the LLM API, reusing the cached response for an identical prompt."""
+        return cached_call(
+            lambda: self._request_llm(prompt),
+            model=self.model,
+            prompt=prompt,
+            prompt_version=self.PROMPT_VERSION,
+            options=self.LLM_OPTIONS,
+        )
+
+    def _request_llm(self, prompt: str) -> dict:
+        """Send a prompt to the Ollama chat API and parse the JSON reply."""
         response = requests.post(
             f"{self.base_url}/api/chat",
             json={
@@ -216,11 +236,7 @@ Guidelines:
                 ],
                 "stream": False,
                 "format": "json",
-                "options": {
-                    "temperature": 0.0,
-                    "num_predict": 1024,
-                    "num_ctx": 4096,
-                },
+                "options": self.LLM_OPTIONS,
             },
             timeout=60,
         )
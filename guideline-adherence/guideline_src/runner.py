@@ -17,6 +17,7 @@ Usage:
     python -m guideline_src.runner --trigger --once          # Poll once
     python -m guideline_src.runner --trigger --daemon        # Poll continuously
     python -m guideline_src.runner --trigger --status        # Show monitoring status
+    python -m guideline_src.runner --trigger --daemon --push # React to FHIR Subscription notifications
 
     # Episode checking (check episodes in database, create alerts)
     python -m guideline_src.runner --episodes --once         # Check episodes once
@@ -204,6 +205,7 @@ def run_trigger_monitor(
     interval_seconds: int = 60,
     bundles: list[str] | None = None,
     use_fhir: bool = False,
+    push: bool = False,
 ) -> int:
     """Run the bundle trigger monitor.
 
@@ -212,6 +214,8 @@ def run_trigger_monitor(
         interval_seconds: Polling interval.
         bundles: Optional list of bundle IDs to monitor.
         use_fhir: If True, use real FHIR client.
+        push: If True, start a FHIR Subscription receiver and re-check
+            only notified patients between reconciliation polls.
 
     Returns:
         0 on success, 1 on error.
@@ -256,11 +260,19 @@ def run_trigger_monitor(
     print(f"Database: {config.ADHERENCE_DB_PATH}")
     print(f"Poll interval: {interval_seconds} seconds")
     print(f"Bundles: {len(monitor.bundles)}")
-    print(f"Mode: {'Single run' if once else 'Continuous'}")
+    print(f"Mode: {'Single run' if once else 'Push' if push else 'Continuous'}")
     print("=" * 70 + "\n")
 
     try:
-        monitor.run(once=once)
+        if push and not once:
+            from guideline_src.subscription_receiver import SubscriptionReceiver
+
+            with SubscriptionReceiver() as receiver:
+                print(f"Receiving FHIR notifications at {receiver.url}")
+                print(f"Reconciliation poll every {config.RECONCILE_INTERVAL_SECONDS} seconds\n")
+                monitor.run_push(receiver.queue)
+        else:
+            monitor.run(once=once)
         return 0
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -381,16 +393,16 @@ def _create_mock_fhir_client():
         def get_recent_lab_orders(self, since_time, loinc_codes=None):
             return []
 
-        def get_lab_results(self, patient_id, loinc_codes, since_time):
+        def get_lab_results(self, patient_id, loinc_codes, since_time=None, since_hours=None, max_results=100):
             return []
 
-        def get_medication_administrations(self, patient_id, since_time):
+        def get_medication_administrations(self, patient_id, since_time=None, since_hours=24, max_results=200):
             return []
 
         def get_medication_orders(self, patient_id, since_time):
             return []
 
-        def get_recent_notes(self, patient_id, since_time):
+        def get_recent_notes(self, patient_id, since_hours=48, note_types=None, since_time=None, max_results=50):
             return []
 
         def get_orders(self, patient_id, order_type, since_time):
@@ -424,6 +436,7 @@ Examples:
   %(prog)s --trigger --once                  Poll once for new triggers
   %(prog)s --trigger --daemon                Poll continuously
   %(prog)s --trigger --status                Show monitoring status
+  %(prog)s --trigger --daemon --push         React to FHIR Subscription notifications
   %(prog)s --trigger --list-bundles          List available bundles
         """
     )
@@ -483,6 +496,11 @@ Examples:
         type=int,
         help="Check interval (minutes for adherence, seconds for trigger)",
     )
+    parser.add_argument(
+        "--push",
+        action="store_true",
+        help="With --trigger --daemon: receive FHIR Subscription notifications instead of polling",
+    )
     parser.add_argument(
         "--use-fhir",
         action="store_true",
@@ -519,6 +537,7 @@ Examples:
             interval_seconds=interval,
             bundles=args.bundle,
             use_fhir=args.use_fhir,
+            push=args.push,
         )
         sys.exit(result)
 
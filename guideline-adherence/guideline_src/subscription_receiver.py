@@ -0,0 +1,418 @@
+"""FHIR Subscription rest-hook receiver.
+
+In push mode the bundle monitor stops re-polling every 60 seconds. Instead
+the FHIR server notifies it through R4 rest-hook Subscriptions when a
+Condition, MedicationRequest, ServiceRequest or Observation changes. The
+receiver queues the affected patient IDs, and the monitor re-checks only
+those patients' episodes (see BundleTriggerMonitor.run_push).
+
+A notification may arrive in any of these forms:
+- A FHIR resource, with payload application/fhir+json: R4 servers PUT it
+  to {endpoint}/{type}/{id}.
+- A Bundle of resources, including the subscriptions backport
+  notification Bundle. Its handshake and heartbeat events are acknowledged
+  and ignored.
+- An empty body, for payload-less subscriptions. The changed patient is
+  unknown, so a full resync is requested.
+
+Usage:
+    # Stand-in notifier: post a Condition for a patient to a running receiver
+    python -m guideline_src.subscription_receiver --notify http://localhost:8095/fhir/notify --patient 12345
+
+    # Register rest-hook Subscriptions on the FHIR server
+    python -m guideline_src.subscription_receiver --register http://aegis-host:8095/fhir/notify
+"""
+
+import hmac
+import ipaddress
+import json
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add parent path for imports
+GUIDELINE_ADHERENCE_PATH = Path(__file__).parent.parent
+if str(GUIDELINE_ADHERENCE_PATH) not in sys.path:
+    sys.path.insert(0, str(GUIDELINE_ADHERENCE_PATH))
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# Searches the monitor reacts to: trigger sources plus element evidence
+SUBSCRIPTION_CRITERIA = [
+    "Condition?",
+    "MedicationRequest?",
+    "MedicationAdministration?",
+    "ServiceRequest?",
+    "Observation?category=laboratory",
+    "DocumentReference?",
+]
+
+_IGNORED_EVENTS = {"handshake", "heartbeat"}
+
+# Largest notification body accepted; bigger requests get 413 unread
+MAX_NOTIFICATION_BYTES = 10 * 1024 * 1024
+
+
+class PatientChangeQueue:
+    """Patients with pending changes, deduplicated, shared across threads."""
+
+    def __init__(self):
+        self._patients: set[str] = set()
+        self._resync = False
+        self._changed = threading.Condition()
+        self.notifications = 0
+
+    def add(self, patient_ids: set[str]) -> None:
+        """Queue patients whose data changed."""
+        with self._changed:
+            self._patients.update(patient_ids)
+            self.notifications += 1
+            self._changed.notify_all()
+
+    def request_resync(self) -> None:
+        """Queue a full re-check (the notification did not name a patient)."""
+        with self._changed:
+            self._resync = True
+            self.notifications += 1
+            self._changed.notify_all()
+
+    def wait(self, timeout: float) -> tuple[set[str], bool]:
+        """Wait for changes and take them.
+
+        Args:
+            timeout: Seconds to wait if nothing is queued.
+
+        Returns:
+            (patient IDs, whether a full resync was requested); empty and
+            False if the wait timed out.
+        """
+        with self._changed:
+            if not self._patients and not self._resync:
+                self._changed.wait(timeout)
+            patients, resync = self._patients, self._resync
+            self._patients, self._resync = set(), False
+            return patients, resync
+
+
+def _reference_id(reference: str | None, resource_type: str = "Patient") -> str | None:
+    """ID from a reference like 'Patient/123' or an absolute URL to one."""
+    if not reference:
+        return None
+    parts = reference.rstrip("/").split("/")
+    if len(parts) >= 2 and parts[-2] == resource_type:
+        return parts[-1]
+    return None
+
+
+def patient_ids_from_resource(resource: dict) -> tuple[set[str], bool]:
+    """Patients a notified resource concerns.
+
+    Returns:
+        (patient IDs, whether a resync is needed because the notification
+        referenced a change without saying whose)
+    """
+    resource_type = resource.get("resourceType")
+    if resource_type == "Bundle":
+        patients: set[str] = set()
+        resync = False
+        for entry in resource.get("entry", []):
+            entry_resource = entry.get("resource")
+            if entry_resource is None:
+                # id-only payload: the URL names the resource, not the patient
+                if entry.get("fullUrl") or entry.get("request"):
+                    resync = True
+                continue
+            if entry_resource.get("resourceType") in ("SubscriptionStatus", "Parameters"):
+                if _event_type(entry_resource) in _IGNORED_EVENTS:
+                    return set(), False
+                continue
+            entry_patients, entry_resync = patient_ids_from_resource(entry_resource)
+            patients |= entry_patients
+            resync = resync or entry_resync
+        return patients, resync
+
+    if resource_type == "Patient":
+        return ({resource["id"]} if resource.get("id") else set()), False
+
+    for field in ("subject", "patient"):
+        patient_id = _reference_id((resource.get(field) or {}).get("reference"))
+        if patient_id:
+            return {patient_id}, False
+    return set(), True
+
+
+def _event_type(status: dict) -> str | None:
+    """Notification type from a SubscriptionStatus (or backport Parameters)."""
+    if status.get("resourceType") == "SubscriptionStatus":
+        return status.get("type")
+    for parameter in status.get("parameter", []):
+        if parameter.get("name") == "type":
+            return parameter.get("valueCode")
+    return None
+
+
+class _NotificationHandler(BaseHTTPRequestHandler):
+    """Accepts rest-hook POST/PUT notifications under the receiver's path."""
+
+    server: "_ReceiverServer"
+
+    def do_POST(self):
+        self._receive()
+
+    def do_PUT(self):
+        self._receive()
+
+    def _receive(self):
+        receiver = self.server.receiver
+        if not self.path.split("?")[0].startswith(receiver.path):
+            self._respond(404)
+            return
+        if receiver.token and not hmac.compare_digest(
+            (self.headers.get("Authorization") or "").encode(),
+            f"Bearer {receiver.token}".encode(),
+        ):
+            self._respond(401)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._respond(400)
+            return
+        if length > MAX_NOTIFICATION_BYTES:
+            self._respond(413)
+            return
+        body = self.rfile.read(length) if length else b""
+        if not body.strip():
+            receiver.queue.request_resync()
+            self._respond(200)
+            return
+
+        try:
+            resource = json.loads(body)
+        except ValueError:
+            self._respond(400)
+            return
+
+        patients, resync = patient_ids_from_resource(resource)
+        if patients:
+            receiver.queue.add(patients)
+        if resync:
+            receiver.queue.request_resync()
+        self._respond(200)
+
+    def _respond(self, status: int):
+        self.send_response(status)
+        if status >= 400:
+            # The body may be unread; don't reuse the connection
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug("Subscription notification: " + format, *args)
+
+
+def _is_loopback(host: str) -> bool:
+    """Whether host only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _ReceiverServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, receiver: "SubscriptionReceiver"):
+        self.receiver = receiver
+        super().__init__(address, _NotificationHandler)
+
+
+class SubscriptionReceiver:
+    """HTTP endpoint for FHIR rest-hook notifications, run on a background thread."""
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        path: str = "/fhir/notify",
+        token: str | None = None,
+        queue: PatientChangeQueue | None = None,
+    ):
+        """Initialize the receiver.
+
+        Args:
+            host: Interface to listen on. Defaults to config.SUBSCRIPTION_RECEIVER_HOST
+                (127.0.0.1). Any other interface requires a token.
+            port: Port to listen on (0 picks a free port). Defaults to
+                config.SUBSCRIPTION_RECEIVER_PORT.
+            path: URL path notifications are accepted under.
+            token: Bearer token notifications must carry (the Subscription's
+                channel header). Defaults to config.SUBSCRIPTION_RECEIVER_TOKEN;
+                empty accepts any, which is only allowed on loopback.
+            queue: Queue patient changes are put on. Created if not given.
+        """
+        self.host = host if host is not None else config.SUBSCRIPTION_RECEIVER_HOST
+        self.port = port if port is not None else config.SUBSCRIPTION_RECEIVER_PORT
+        self.path = path
+        self.token = token if token is not None else config.SUBSCRIPTION_RECEIVER_TOKEN
+        self.queue = queue or PatientChangeQueue()
+        self._server: _ReceiverServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start listening.
+
+        Raises:
+            ValueError: If listening beyond loopback without a token.
+        """
+        if not self.token and not _is_loopback(self.host):
+            raise ValueError(
+                f"Refusing to listen on {self.host} without a token; "
+                "set SUBSCRIPTION_RECEIVER_TOKEN or listen on 127.0.0.1"
+            )
+        self._server = _ReceiverServer((self.host, self.port), self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fhir-subscription-receiver", daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"FHIR subscription receiver listening on {self.url}")
+
+    def stop(self) -> None:
+        """Stop listening."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def bound_port(self) -> int:
+        """Port actually listened on (useful with port 0)."""
+        return self._server.server_address[1] if self._server else self.port
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.bound_port}{self.path}"
+
+    def __enter__(self) -> "SubscriptionReceiver":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def notify(url: str, resource: dict | None, token: str | None = None, timeout: float = 10.0) -> int:
+    """Send a rest-hook notification, as the FHIR server would.
+
+    Stand-in notifier for testing a receiver without a Subscription-capable
+    server.
+
+    Args:
+        url: Receiver endpoint.
+        resource: Resource or Bundle payload; None for an empty notification.
+        token: Bearer token to send.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        HTTP status code.
+    """
+    headers = {"Content-Type": "application/fhir+json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    body = json.dumps(resource) if resource is not None else ""
+    response = requests.post(url, data=body, headers=headers, timeout=timeout)
+    return response.status_code
+
+
+def register_subscriptions(
+    fhir_client,
+    endpoint: str,
+    token: str | None = None,
+    criteria: list[str] | None = None,
+) -> list[str]:
+    """Create rest-hook Subscriptions on the FHIR server for the monitor.
+
+    Args:
+        fhir_client: Client with a post() method (e.g. HAPIGuidelineFHIRClient).
+        endpoint: Receiver URL as the FHIR server reaches it.
+        token: Bearer token for the channel header.
+        criteria: Search criteria to subscribe to. Defaults to SUBSCRIPTION_CRITERIA.
+
+    Returns:
+        IDs of the created Subscriptions.
+    """
+    created = []
+    for criterion in criteria or SUBSCRIPTION_CRITERIA:
+        channel = {
+            "type": "rest-hook",
+            "endpoint": endpoint,
+            "payload": "application/fhir+json",
+        }
+        if token:
+            channel["header"] = [f"Authorization: Bearer {token}"]
+        result = fhir_client.post("Subscription", {
+            "resourceType": "Subscription",
+            "status": "requested",
+            "reason": "AEGIS guideline bundle monitoring",
+            "criteria": criterion,
+            "channel": channel,
+        })
+        created.append(result.get("id"))
+        logger.info(f"Registered subscription {result.get('id')}: {criterion}")
+    return created
+
+
+def main():
+    """Stand-in notifier and subscription registration."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FHIR Subscription rest-hook tools")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--notify", metavar="URL", help="Send a test notification to a receiver")
+    action.add_argument("--register", metavar="ENDPOINT", help="Register Subscriptions pointing at ENDPOINT")
+    parser.add_argument("--patient", action="append", default=[], help="Patient ID to notify for (can repeat)")
+    parser.add_argument("--count", type=int, default=1, help="Notifications to send with --notify")
+    parser.add_argument("--token", default=config.SUBSCRIPTION_RECEIVER_TOKEN, help="Bearer token")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.register:
+        from .fhir_client import HAPIGuidelineFHIRClient
+        register_subscriptions(HAPIGuidelineFHIRClient(), args.register, args.token or None)
+        return 0
+
+    start = time.perf_counter()
+    for i in range(args.count):
+        resource = None
+        if args.patient:
+            patient_id = args.patient[i % len(args.patient)]
+            resource = {
+                "resourceType": "Condition",
+                "id": f"test-{i}",
+                "subject": {"reference": f"Patient/{patient_id}"},
+            }
+        status = notify(args.notify, resource, args.token or None)
+        if status != 200:
+            print(f"Notification {i} rejected: HTTP {status}")
+            return 1
+    print(f"Sent {args.count} notification(s) in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""Compiled matcher for bundle triggers.
+
+Trigger codes are ICD-10/LOINC prefixes written SQL-style ('A41%',
+'R65.2%', 'P81.9'). They go into a character trie, so one walk down a code
+finds every trigger whose prefix it starts with. Codes with a wildcard
+elsewhere and the optional trigger_pattern regexes are folded into one
+combined regex. Each one is an optional lookahead with its own named
+group, so a single match() reports all of them.
+
+Every regex is compiled on its own first. One that does not compile is
+logged and its trigger never matches. One that cannot be combined safely
+(its own groups, back-references or inline global flags) is matched on
+its own instead.
+
+Matching one code costs O(len(code)) plus one regex match, plus one match
+per pattern that could not be combined.
+"""
+
+import logging
+import re
+from typing import Iterable
+
+from .episode_db import BundleTrigger
+
+logger = logging.getLogger(__name__)
+
+# Regex metacharacters that make a trigger code a pattern rather than a
+# literal prefix. '.' is absent on purpose: it appears in nearly every
+# ICD-10 code, so the trie handles it, matching any character as re did.
+_PATTERN_CHARS = set("%*+?[](){}|^$\\")
+
+_END = ""  # Trie key holding the triggers whose prefix ends at a node
+_ANY = "."  # Trie key matching any one character
+
+
+class TriggerIndex:
+    """Triggers compiled for fast code matching, in configured order."""
+
+    def __init__(self, triggers: Iterable[BundleTrigger]):
+        """Compile triggers.
+
+        Args:
+            triggers: Triggers to index (typically one trigger type).
+        """
+        self.triggers = list(triggers)
+        self._trie: dict = {}
+        self._exact: dict[str, list[int]] = {}
+        self._unconditional: list[int] = []  # No code: every code is a candidate
+        self._code_groups: dict[str, int] = {}
+        self._pattern_groups: dict[int, str] = {}
+        self._separate_codes: list[tuple[int, re.Pattern]] = []
+        self._separate_patterns: dict[int, re.Pattern] = {}
+
+        lookaheads: list[str] = []
+        for i, trigger in enumerate(self.triggers):
+            code = trigger.trigger_code
+            if code:
+                self._exact.setdefault(code, []).append(i)
+
+            code_regex = None
+            if code and _PATTERN_CHARS.intersection(code.rstrip("%")):
+                code_regex = self._compile(trigger, code.replace("%", ".*"))
+                if code_regex is None:
+                    continue
+            pattern_regex = None
+            if trigger.trigger_pattern:
+                pattern_regex = self._compile(trigger, trigger.trigger_pattern)
+                if pattern_regex is None:
+                    continue
+
+            if not code:
+                self._unconditional.append(i)
+            elif code_regex is None:
+                node = self._trie
+                for char in code.rstrip("%").upper():
+                    node = node.setdefault(char, {})
+                node.setdefault(_END, []).append(i)
+            elif self._combinable(code_regex):
+                group = f"c{i}"
+                self._code_groups[group] = i
+                lookaheads.append(f"(?:(?=(?P<{group}>{code_regex.pattern})))?")
+            else:
+                self._separate_codes.append((i, code_regex))
+
+            if pattern_regex is not None:
+                if self._combinable(pattern_regex):
+                    group = f"p{i}"
+                    self._pattern_groups[i] = group
+                    lookaheads.append(f"(?:(?=(?P<{group}>{pattern_regex.pattern})))?")
+                else:
+                    self._separate_patterns[i] = pattern_regex
+
+        self._regex = re.compile("".join(lookaheads), re.IGNORECASE) if lookaheads else None
+
+    @staticmethod
+    def _compile(trigger: BundleTrigger, pattern: str) -> re.Pattern | None:
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error as e:
+            logger.warning(
+                f"Skipping trigger {trigger.id} for bundle {trigger.bundle_id}: "
+                f"invalid pattern {pattern!r}: {e}"
+            )
+            return None
+
+    @staticmethod
+    def _combinable(regex: re.Pattern) -> bool:
+        """Whether a pattern keeps its meaning inside the combined regex.
+
+        Its own groups would renumber back-references and could clash with
+        the index's group names; inline global flags are only allowed at
+        the start of an expression.
+        """
+        if regex.groups:
+            return False
+        try:
+            re.compile(f"x(?:{regex.pattern})", re.IGNORECASE)
+        except re.error:
+            return False
+        return True
+
+    def match(self, code: str) -> list[BundleTrigger]:
+        """Triggers whose code prefix/pattern and trigger_pattern match a code.
+
+        Args:
+            code: Code to match (ICD-10, LOINC, etc.).
+
+        Returns:
+            Matching triggers in configured order.
+        """
+        candidates = list(self._unconditional)
+
+        candidates.extend(self._trie.get(_END, ()))
+        nodes = [self._trie]
+        for char in code.upper():
+            keys = (char, _ANY) if char != _ANY else (_ANY,)
+            nodes = [child for node in nodes for key in keys if (child := node.get(key)) is not None]
+            if not nodes:
+                break
+            for node in nodes:
+                candidates.extend(node.get(_END, ()))
+
+        groups = self._regex.match(code).groupdict() if self._regex else {}
+        candidates.extend(
+            i for group, i in self._code_groups.items() if groups[group] is not None
+        )
+        candidates.extend(i for i, regex in self._separate_codes if regex.match(code))
+
+        return [
+            self.triggers[i]
+            for i in sorted(set(candidates))
+            if self._pattern_matches(i, code, groups)
+        ]
+
+    def _pattern_matches(self, i: int, code: str, groups: dict) -> bool:
+        """Whether trigger i's trigger_pattern (if any) matches the code."""
+        group = self._pattern_groups.get(i)
+        if group is not None:
+            return groups[group] is not None
+        regex = self._separate_patterns.get(i)
+        return regex is None or regex.match(code) is not None
+
+    def match_exact(self, code: str) -> list[BundleTrigger]:
+        """Triggers whose code equals a code exactly (e.g. LOINC lab triggers)."""
+        return [self.triggers[i] for i in self._exact.get(code, ())]
+
+    @staticmethod
+    def fingerprint(triggers: Iterable[BundleTrigger]) -> tuple:
+        """Identity of a trigger list, to tell when an index must be rebuilt."""
+        return tuple(
+            (t.id, t.bundle_id, t.trigger_code, t.trigger_pattern, t.age_min_days, t.age_max_days)
+            for t in triggers
+        )
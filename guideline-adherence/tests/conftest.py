@@ -0,0 +1,9 @@
+"""Make the guideline_src and shared common packages importable for tests."""
+
+import sys
+from pathlib import Path
+
+_module_root = Path(__file__).parent.parent
+for _path in (_module_root, _module_root.parent):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
@@ -0,0 +1,38 @@
+"""Tests for the clinical impression extractor's LLM call path."""
+
+import sqlite3
+from unittest.mock import Mock
+
+from common.llm_cache import cache as llm_cache
+from guideline_src.nlp import clinical_impression
+from guideline_src.nlp.clinical_impression import ClinicalImpressionExtractor
+
+
+def _ollama_reply(content: str) -> Mock:
+    return Mock(status_code=200, json=Mock(return_value={"message": {"content": content}}))
+
+
+def test_unavailable_cache_falls_back_to_the_llm(monkeypatch):
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    post = Mock(return_value=_ollama_reply('{"appearance": "well"}'))
+    monkeypatch.setattr(llm_cache, "get_llm_cache", locked)
+    monkeypatch.setattr(clinical_impression.requests, "post", post)
+
+    result = ClinicalImpressionExtractor()._call_llm("prompt")
+
+    assert result == {"appearance": "well"}
+    post.assert_called_once()
+
+
+def test_cache_key_uses_the_options_sent_to_the_llm(monkeypatch):
+    cache = Mock()
+    cache.get_or_call.side_effect = lambda call, **kwargs: call()
+    post = Mock(return_value=_ollama_reply("{}"))
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(clinical_impression.requests, "post", post)
+
+    ClinicalImpressionExtractor()._call_llm("prompt")
+
+    assert cache.get_or_call.call_args.kwargs["options"] == post.call_args.kwargs["json"]["options"]
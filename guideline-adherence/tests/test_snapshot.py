@@ -0,0 +1,127 @@
+"""Tests for the per-patient clinical snapshot used by element checkers."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from guideline_src.checkers import snapshot as snapshot_module
+from guideline_src.checkers.snapshot import ClinicalSnapshot
+
+NOW = datetime(2024, 3, 10, 12, 0)
+PCT, CRP, UA = "33959-8", "1988-5", "5799-2"
+
+
+class FakeFHIR:
+    """Answers the three searches like the FHIR server, newest first, counting calls."""
+
+    def __init__(self, labs, admins=(), notes=()):
+        self.labs = sorted(labs, key=lambda lab: lab["effective_time"], reverse=True)
+        self.admins = sorted(admins, key=lambda a: a["admin_time"], reverse=True)
+        self.notes = sorted(notes, key=lambda n: n["date"], reverse=True)
+        self.calls = []
+
+    def get_lab_results(self, patient_id, loinc_codes, since_time=None, since_hours=None, max_results=100):
+        self.calls.append(("labs", tuple(loinc_codes), since_time))
+        return [
+            lab for lab in self.labs
+            if lab["loinc_code"] in loinc_codes and lab["effective_time"] >= since_time
+        ][:max_results]
+
+    def get_medication_administrations(self, patient_id, since_time=None, since_hours=24, max_results=200):
+        self.calls.append(("meds", since_time))
+        return [a for a in self.admins if a["admin_time"] >= since_time][:max_results]
+
+    def get_recent_notes(self, patient_id, since_hours=48, note_types=None, since_time=None, max_results=50):
+        self.calls.append(("notes", since_time))
+        return [n for n in self.notes if n["date"].date() >= since_time.date()][:max_results]
+
+    def get_patient(self, patient_id):
+        self.calls.append(("patient", patient_id))
+        return {"id": patient_id}
+
+
+def _lab(code, hours_ago):
+    return {"loinc_code": code, "effective_time": NOW - timedelta(hours=hours_ago), "value": hours_ago}
+
+
+@pytest.fixture
+def fhir():
+    return FakeFHIR(
+        labs=[_lab(PCT, 2), _lab(CRP, 5), _lab(UA, 30), _lab(PCT, 80)],
+        admins=[{"admin_time": NOW - timedelta(hours=h), "medication_name": "ampicillin"} for h in (1, 20)],
+        notes=[{"date": NOW - timedelta(hours=h), "type": "progress"} for h in (3, 40, 100)],
+    )
+
+
+def _snapshot(fhir):
+    return ClinicalSnapshot(
+        fhir, "p1", window_start=NOW - timedelta(hours=48), lab_loinc_codes=[PCT, CRP, UA],
+    )
+
+
+class TestClinicalSnapshot:
+    """Snapshot queries return what the live searches would, with fewer calls."""
+
+    def test_element_queries_share_one_search_per_kind(self, fhir):
+        snap = _snapshot(fhir)
+        queries = [
+            ([PCT, CRP], NOW - timedelta(hours=24)),
+            ([UA], NOW - timedelta(hours=48)),
+            ([PCT], NOW - timedelta(hours=3)),
+        ]
+
+        results = [snap.get_lab_results("p1", codes, since_time=since) for codes, since in queries]
+        meds = snap.get_medication_administrations("p1", since_time=NOW - timedelta(hours=6))
+        meds_day = snap.get_medication_administrations("p1", since_time=NOW - timedelta(hours=24))
+        notes = snap.get_recent_notes("p1", since_time=NOW - timedelta(hours=30))
+        calls = len(fhir.calls)
+
+        live = FakeFHIR(fhir.labs, fhir.admins, fhir.notes)
+        assert results == [live.get_lab_results("p1", codes, since_time=since) for codes, since in queries]
+        assert meds == live.get_medication_administrations("p1", since_time=NOW - timedelta(hours=6))
+        assert meds_day == live.get_medication_administrations("p1", since_time=NOW - timedelta(hours=24))
+        assert notes == live.get_recent_notes("p1", since_time=NOW - timedelta(hours=30))
+        assert calls == 3
+        assert snap.stats() == {"fhir_calls": 3, "served_from_snapshot": 6}
+
+    def test_query_before_the_window_widens_the_fetch_once(self, fhir):
+        snap = _snapshot(fhir)
+
+        snap.get_lab_results("p1", [PCT], since_time=NOW - timedelta(hours=24))
+        older = snap.get_lab_results("p1", [PCT], since_time=NOW - timedelta(hours=96))
+        snap.get_lab_results("p1", [PCT], since_time=NOW - timedelta(hours=90))
+
+        assert [lab["value"] for lab in older] == [2, 80]
+        assert [call[2] for call in fhir.calls] == [NOW - timedelta(hours=48), NOW - timedelta(hours=96)]
+
+    def test_capped_fetch_sends_older_queries_to_fhir(self, fhir, monkeypatch):
+        monkeypatch.setattr(snapshot_module, "MAX_LAB_RESULTS", 2)
+        snap = _snapshot(fhir)
+
+        recent = snap.get_lab_results("p1", [PCT, CRP], since_time=NOW - timedelta(hours=6))
+        older = snap.get_lab_results("p1", [UA], since_time=NOW - timedelta(hours=40))
+
+        assert [lab["value"] for lab in recent] == [2, 5]
+        # The capped search stopped at 5 hours ago, so this one goes live
+        assert [lab["value"] for lab in older] == [30]
+        assert fhir.calls[-1] == ("labs", (UA,), NOW - timedelta(hours=40))
+
+    def test_uncovered_queries_pass_through_and_are_memoized(self, fhir):
+        snap = _snapshot(fhir)
+
+        other_code = snap.get_lab_results("p1", ["2160-0"], since_time=NOW - timedelta(hours=24))
+        typed = snap.get_recent_notes("p1", note_types=["H&P"], since_time=NOW - timedelta(hours=24))
+        patient = snap.get_patient("p1")
+        assert snap.get_patient("p1") is patient
+
+        assert other_code == []
+        assert typed == FakeFHIR([], notes=fhir.notes).get_recent_notes("p1", since_time=NOW - timedelta(hours=24))
+        assert [call[0] for call in fhir.calls] == ["labs", "notes", "patient"]
+
+    def test_notes_are_compared_by_day_like_the_search(self, fhir):
+        snap = _snapshot(fhir)
+
+        # The 40-hours-ago note is before 38 hours ago but on the same day
+        notes = snap.get_recent_notes("p1", since_time=NOW - timedelta(hours=38))
+
+        assert [n["date"] for n in notes] == [NOW - timedelta(hours=3), NOW - timedelta(hours=40)]
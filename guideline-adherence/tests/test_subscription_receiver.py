@@ -0,0 +1,144 @@
+"""Tests for the FHIR Subscription rest-hook receiver."""
+
+import http.client
+import threading
+from urllib.parse import urlparse
+
+import pytest
+
+from guideline_src import subscription_receiver
+from guideline_src.subscription_receiver import (
+    PatientChangeQueue,
+    SubscriptionReceiver,
+    notify,
+    patient_ids_from_resource,
+)
+
+
+def _condition(patient_id: str) -> dict:
+    return {"resourceType": "Condition", "id": "c1", "subject": {"reference": f"Patient/{patient_id}"}}
+
+
+class TestPatientIdsFromResource:
+    """Tests for finding the patients a notification concerns."""
+
+    def test_subject_and_patient_references(self):
+        assert patient_ids_from_resource(_condition("p1")) == ({"p1"}, False)
+        assert patient_ids_from_resource({
+            "resourceType": "MedicationAdministration",
+            "subject": {"reference": "https://fhir.example.org/R4/Patient/p2/"},
+        }) == ({"p2"}, False)
+        assert patient_ids_from_resource({
+            "resourceType": "Observation", "patient": {"reference": "Patient/p3"},
+        }) == ({"p3"}, False)
+        assert patient_ids_from_resource({"resourceType": "Patient", "id": "p4"}) == ({"p4"}, False)
+
+    def test_resource_without_a_patient_requests_resync(self):
+        assert patient_ids_from_resource({
+            "resourceType": "Observation", "subject": {"reference": "Group/g1"},
+        }) == (set(), True)
+
+    def test_bundle_collects_every_entry(self):
+        bundle = {
+            "resourceType": "Bundle",
+            "entry": [
+                {"resource": {"resourceType": "SubscriptionStatus", "type": "event-notification"}},
+                {"resource": _condition("p1")},
+                {"resource": _condition("p2")},
+                {"fullUrl": "https://fhir.example.org/R4/Condition/c9"},
+            ],
+        }
+
+        assert patient_ids_from_resource(bundle) == ({"p1", "p2"}, True)
+
+    @pytest.mark.parametrize("status", [
+        {"resourceType": "SubscriptionStatus", "type": "heartbeat"},
+        {"resourceType": "Parameters", "parameter": [{"name": "type", "valueCode": "handshake"}]},
+    ])
+    def test_handshake_and_heartbeat_bundles_are_ignored(self, status):
+        bundle = {"resourceType": "Bundle", "entry": [{"resource": status}]}
+
+        assert patient_ids_from_resource(bundle) == (set(), False)
+
+
+class TestPatientChangeQueue:
+    """Tests for the queue between the receiver and the monitor."""
+
+    def test_patients_are_deduplicated_and_taken_once(self):
+        queue = PatientChangeQueue()
+        queue.add({"p1", "p2"})
+        queue.add({"p2"})
+
+        assert queue.wait(timeout=0) == ({"p1", "p2"}, False)
+        assert queue.wait(timeout=0) == (set(), False)
+        assert queue.notifications == 2
+
+    def test_wait_wakes_when_a_change_arrives(self):
+        queue = PatientChangeQueue()
+        threading.Timer(0.05, queue.request_resync).start()
+
+        assert queue.wait(timeout=5) == (set(), True)
+
+
+class TestSubscriptionReceiver:
+    """End-to-end notifications through the notify() stand-in."""
+
+    @pytest.fixture
+    def receiver(self):
+        with SubscriptionReceiver(host="127.0.0.1", port=0, token="secret") as receiver:
+            yield receiver
+
+    def test_notifications_queue_patients_and_resyncs(self, receiver):
+        assert notify(receiver.url, _condition("p1"), token="secret") == 200
+        assert notify(f"{receiver.url}/Condition/c2", _condition("p2"), token="secret") == 200
+
+        assert receiver.queue.wait(timeout=0) == ({"p1", "p2"}, False)
+
+        # Payload-less subscriptions don't say whose data changed
+        assert notify(receiver.url, None, token="secret") == 200
+        assert receiver.queue.wait(timeout=0) == (set(), True)
+
+    def test_rejected_notifications_queue_nothing(self, receiver):
+        assert notify(receiver.url, _condition("p1")) == 401
+        assert notify(receiver.url, _condition("p1"), token="wrong") == 401
+        assert notify(receiver.url.replace("/fhir/notify", "/other"), _condition("p1"), token="secret") == 404
+
+        assert receiver.queue.wait(timeout=0) == (set(), False)
+        assert receiver.queue.notifications == 0
+
+    def _post(self, receiver, body: bytes, content_length: str) -> int:
+        url = urlparse(receiver.url)
+        conn = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+        conn.putrequest("POST", url.path)
+        conn.putheader("Authorization", "Bearer secret")
+        conn.putheader("Content-Length", content_length)
+        conn.endheaders(body)
+        status = conn.getresponse().status
+        conn.close()
+        return status
+
+    def test_malformed_content_length_is_rejected(self, receiver):
+        assert self._post(receiver, b"{}", "two") == 400
+        assert self._post(receiver, b"{}", "-5") == 400
+        assert receiver.queue.notifications == 0
+
+    def test_oversized_body_is_rejected_unread(self, receiver, monkeypatch):
+        monkeypatch.setattr(subscription_receiver, "MAX_NOTIFICATION_BYTES", 16)
+
+        assert self._post(receiver, b"", "17") == 413
+        assert notify(receiver.url, _condition("p1"), token="secret") == 413
+        assert receiver.queue.wait(timeout=0) == (set(), False)
+
+    def test_defaults_to_loopback(self):
+        assert SubscriptionReceiver(token="").host == "127.0.0.1"
+
+    def test_refuses_public_interface_without_token(self):
+        receiver = SubscriptionReceiver(host="0.0.0.0", port=0, token="")
+        with pytest.raises(ValueError, match="without a token"):
+            receiver.start()
+        assert receiver._server is None
+
+    def test_loopback_without_token_accepts_any(self):
+        with SubscriptionReceiver(host="127.0.0.1", port=0, token="") as receiver:
+            assert notify(receiver.url, _condition("p1")) == 200
+            assert receiver.queue.wait(timeout=0) == ({"p1"}, False)
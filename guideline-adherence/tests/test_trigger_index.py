@@ -0,0 +1,92 @@
+"""Tests for the compiled bundle trigger index."""
+
+import random
+import re
+
+from guideline_src.episode_db import BundleTrigger
+from guideline_src.trigger_index import TriggerIndex
+
+
+def _old_match(triggers, code):
+    """BundleTriggerMonitor._match_triggers before the index, without age checks."""
+    matches = []
+    for trigger in triggers:
+        if trigger.trigger_code:
+            if not re.match(trigger.trigger_code.replace("%", ".*"), code, re.IGNORECASE):
+                continue
+        if trigger.trigger_pattern:
+            if not re.match(trigger.trigger_pattern, code, re.IGNORECASE):
+                continue
+        matches.append(trigger)
+    return matches
+
+
+def _trigger(i, code=None, pattern=None):
+    return BundleTrigger(
+        bundle_id=f"bundle{i}", trigger_type="diagnosis",
+        trigger_code=code, trigger_pattern=pattern, id=i,
+    )
+
+
+CODES = [
+    None, "A41%", "A41.9", "a40%", "R65.2%", "R65.21", "P81.9", "P81%", "%",
+    "A4%9", "R6[0-9]%", "T8[0-9].4%", "J1(2|8)%", "A41", "Z%", "P8", "G0.",
+]
+PATTERNS = [
+    None, None, None, "A4.*", r"R65\.2[01]", "P8", "(?i)a41", "(?P<sepsis>A4[01])",
+    r"(R)\1?65", "(A|R)", "^A", r"P81\.9$", "[AP]",
+]
+
+
+class TestTriggerIndex:
+    """TriggerIndex.match agrees with the per-trigger regex loop it replaced."""
+
+    def test_matches_old_regex_loop_on_random_triggers(self):
+        rng = random.Random(7)
+        codes = [
+            "A41.9", "A41.51", "A40.0", "a41.9", "R65.20", "R65.21", "R652", "P81.9",
+            "P81.8", "P8119", "T81.4XXA", "J12.89", "J18.9", "G00.1", "Z99", "", "A", "RR65",
+        ]
+        for _ in range(200):
+            triggers = [
+                _trigger(i, rng.choice(CODES), rng.choice(PATTERNS))
+                for i in range(rng.randint(1, 12))
+            ]
+            index = TriggerIndex(triggers)
+            for code in codes:
+                assert index.match(code) == _old_match(triggers, code), (code, triggers)
+
+    def test_dot_in_a_code_prefix_matches_any_character_like_re(self):
+        index = TriggerIndex([_trigger(0, "P81.9")])
+
+        assert [t.id for t in index.match("P81.9")] == [0]
+        assert [t.id for t in index.match("P8119")] == [0]
+        assert index.match("P81") == []
+
+    def test_uncombinable_patterns_are_matched_on_their_own(self):
+        triggers = [
+            _trigger(0, "A41%", "(?i)a41"),
+            _trigger(1, "A41%", "(?P<p0>A41)"),
+            _trigger(2, "(A)%", r"(A)\1?4"),
+            _trigger(3, "A41%", "A4"),
+        ]
+        index = TriggerIndex(triggers)
+
+        assert index._separate_patterns.keys() == {0, 1, 2}
+        assert [code for code, _ in index._separate_codes] == [2]
+        assert [t.id for t in index.match("A41.9")] == [0, 1, 2, 3]
+        assert [t.id for t in index.match("B41")] == []
+
+    def test_invalid_pattern_skips_only_its_trigger(self, caplog):
+        triggers = [_trigger(0, "A41%", "A4["), _trigger(1, "A4(%"), _trigger(2, "A41%")]
+
+        index = TriggerIndex(triggers)
+
+        assert [t.id for t in index.match("A41.9")] == [2]
+        assert "invalid pattern" in caplog.text
+
+    def test_match_exact(self):
+        index = TriggerIndex([_trigger(0, "2093-3"), _trigger(1, "2093%"), _trigger(2, "2093-3")])
+
+        assert [t.id for t in index.match_exact("2093-3")] == [0, 2]
+        assert index.match_exact("2093") == []
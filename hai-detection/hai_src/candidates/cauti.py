@@ -89,7 +89,7 @@ class CAUTICandidateDetector(BaseCandidateDetector):
 
         Process:
         1. Get all positive urine cultures meeting CFU threshold
-        2. For each culture, find associated urinary catheter
+        2. Resolve urinary catheters at every culture date in bulk
         3. Calculate catheter days at culture date
         4. Create candidate if catheter >2 days and culture meets criteria
         5. Exclude Candida-only cultures and mixed flora
@@ -114,24 +114,54 @@ class CAUTICandidateDetector(BaseCandidateDetector):
 
         logger.info(f"Found {len(positive_cultures)} positive urine cultures >= {self.min_cfu_ml} CFU/mL")
 
-        for patient, culture in positive_cultures:
-            candidate = self._evaluate_for_cauti(patient, culture)
+        catheters = self._resolve_catheters(positive_cultures)
+
+        for i, (patient, culture) in enumerate(positive_cultures):
+            candidate = self._evaluate_for_cauti(
+                patient,
+                culture,
+                catheters[i] if catheters is not None else None,
+            )
             if candidate:
                 candidates.append(candidate)
 
         logger.info(f"Identified {len(candidates)} CAUTI candidates")
         return candidates
 
+    def _resolve_catheters(
+        self,
+        positive_cultures: list[tuple[Patient, CultureResult]],
+    ) -> list[list[DeviceInfo] | None] | None:
+        """Urinary catheters at each culture's collection date, fetched in bulk.
+
+        Returns None when the catheter source has no bulk lookup, in which
+        case catheters are fetched per culture. Cultures whose patient the
+        bulk lookup could not resolve are None and fetched on their own.
+        """
+        if not positive_cultures or not isinstance(self.catheter_source, FHIRUrinaryCatheterSource):
+            return None
+        try:
+            return self.catheter_source.get_urinary_catheters_bulk([
+                (patient.fhir_id, culture.collection_date)
+                for patient, culture in positive_cultures
+            ])
+        except Exception as e:
+            logger.warning(f"Bulk urinary catheter lookup failed, querying per culture: {e}")
+            return None
+
     def _evaluate_for_cauti(
         self,
         patient: Patient,
         culture: CultureResult,
+        catheters: list[DeviceInfo] | None = None,
     ) -> HAICandidate | None:
         """Evaluate a urine culture for CAUTI criteria.
 
         Args:
             patient: Patient information
             culture: Urine culture result
+            catheters: Urinary catheters at the culture date, if already
+                resolved. Queried from the catheter source if None.
 
         Returns:
             HAICandidate if initial CAUTI criteria met, None otherwise
@@ -157,10 +187,11 @@ class CAUTICandidateDetector(BaseCandidateDetector):
             return None
 
         # Find urinary catheters present at culture date
-        catheters = self.catheter_source.get_urinary_catheters(
-            patient.fhir_id,
-            culture.collection_date,
-        )
+        if catheters is None:
+            catheters = self.catheter_source.get_urinary_catheters(
+                patient.fhir_id,
+                culture.collection_date,
+            )
 
         if not catheters:
             logger.debug(
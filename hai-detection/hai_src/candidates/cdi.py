@@ -25,6 +25,7 @@ Reference: 2024 NHSN Patient Safety Component Manual, Chapter 12
 
 import logging
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from .base import BaseCandidateDetector
@@ -53,13 +54,29 @@ from ..data.fhir_source import FHIRCDITestSource
 
 logger = logging.getLogger(__name__)
 
+# Look-back for prior positive tests (get_patient_cdi_history default)
+CDI_HISTORY_LOOKBACK_DAYS = 90
+
+# Encounter search floor when resolving admissions in bulk
+ADMISSION_LOOKBACK_DAYS = 365
+
+
+@dataclass
+class CDIDetectionContext:
+    """Prior tests and encounters for every patient in one detection run."""
+
+    history: dict[str, list[CDITestResult]]
+    encounters: dict[str, list[dict]]
+    inpatient_encounters: dict[str, list[dict]]
+
 
 class CDICandidateDetector(BaseCandidateDetector):
     """Detect CDI candidates from positive C. difficile tests.
 
     This detector:
     1. Queries FHIR for positive C. diff toxin/PCR tests
-    2. Gets patient admission date for each positive test
+    2. Resolves prior tests and encounters for all tested patients in bulk,
+       then gets the admission date for each positive test
     3. Calculates specimen day (days since admission)
     4. Checks for prior CDI episodes (recurrence detection)
     5. Skips duplicates (≤14 days since last event)
@@ -114,9 +131,11 @@ class CDICandidateDetector(BaseCandidateDetector):
             logger.error(f"Failed to query CDI tests: {e}")
             return []
 
+        context = self._resolve_context(positive_tests)
+
         for patient, cdi_test in positive_tests:
             try:
-                candidate = self._evaluate_for_cdi(patient, cdi_test)
+                candidate = self._evaluate_for_cdi(patient, cdi_test, context)
                 if candidate:
                     candidates.append(candidate)
             except Exception as e:
@@ -128,16 +147,76 @@ class CDICandidateDetector(BaseCandidateDetector):
         logger.info(f"Created {len(candidates)} CDI candidates")
         return candidates
 
+    def _resolve_context(
+        self,
+        positive_tests: list[tuple[Patient, CDITestResult]],
+    ) -> CDIDetectionContext | None:
+        """Fetch prior tests and encounters for all tested patients at once.
+
+        Three batched searches replace the per-test history, admission and
+        prior discharge lookups. Returns None when the source has no bulk
+        lookups or they fail, in which case lookups are made per test.
+        Patients a bulk search could not resolve are missing from the
+        context and looked up per test as well.
+        """
+        if not positive_tests or not isinstance(self.cdi_source, FHIRCDITestSource):
+            return None
+
+        patient_ids = [patient.fhir_id for patient, _ in positive_tests]
+        earliest = min(cdi_test.test_date for _, cdi_test in positive_tests)
+        latest = max(cdi_test.test_date for _, cdi_test in positive_tests)
+
+        try:
+            history = self.cdi_source.get_cdi_history_for_patients(
+                patient_ids,
+                earliest - timedelta(days=CDI_HISTORY_LOOKBACK_DAYS),
+                latest,
+            )
+            encounters = self.cdi_source.get_encounters_for_patients(
+                patient_ids,
+                earliest - timedelta(days=ADMISSION_LOOKBACK_DAYS),
+                latest,
+            )
+
+            # Prior discharges are searched back from each admission date
+            admission_days = [
+                (
+                    FHIRCDITestSource.admission_date_from_encounters(
+                        encounters.get(patient.fhir_id, []), cdi_test.test_date
+                    ) or cdi_test.test_date
+                ).date()
+                for patient, cdi_test in positive_tests
+            ]
+            inpatient_encounters = self.cdi_source.get_encounters_for_patients(
+                patient_ids,
+                min(admission_days) - timedelta(days=CDI_CO_HCFA_DISCHARGE_WINDOW_DAYS),
+                max(admission_days),
+                status="finished",
+                encounter_class="IMP,ACUTE,NONAC",  # Inpatient classes
+            )
+        except Exception as e:
+            logger.warning(f"Bulk CDI context lookup failed, querying per test: {e}")
+            return None
+
+        return CDIDetectionContext(
+            history=history,
+            encounters=encounters,
+            inpatient_encounters=inpatient_encounters,
+        )
+
     def _evaluate_for_cdi(
         self,
         patient: Patient,
         cdi_test: CDITestResult,
+        context: CDIDetectionContext | None = None,
     ) -> HAICandidate | None:
         """Evaluate a positive CDI test for candidacy.
 
         Args:
             patient: Patient with positive test
             cdi_test: The positive CDI test result
+            context: Prior tests and encounters resolved for the run. Queried
+                per test if None or the patient is missing from it.
 
         Returns:
             HAICandidate if criteria met, None otherwise
@@ -157,9 +236,14 @@ class CDICandidateDetector(BaseCandidateDetector):
             return None
 
         # Step 3: Get admission date
-        admission_date = self.cdi_source.get_patient_admission_date(
-            patient.fhir_id, cdi_test.test_date
-        )
+        if context is not None and patient.fhir_id in context.encounters:
+            admission_date = FHIRCDITestSource.admission_date_from_encounters(
+                context.encounters[patient.fhir_id], cdi_test.test_date
+            )
+        else:
+            admission_date = self.cdi_source.get_patient_admission_date(
+                patient.fhir_id, cdi_test.test_date
+            )
 
         if admission_date is None:
             logger.warning(
@@ -180,7 +264,9 @@ class CDICandidateDetector(BaseCandidateDetector):
 
         # Step 6: Check for prior CDI episodes (recurrence)
         prior_episodes = self._get_prior_cdi_episodes(
-            patient.fhir_id, cdi_test.test_date
+            patient.fhir_id,
+            cdi_test.test_date,
+            context.history.get(patient.fhir_id) if context is not None else None,
         )
         days_since_last_cdi = None
         is_duplicate = False
@@ -212,9 +298,21 @@ class CDICandidateDetector(BaseCandidateDetector):
         days_since_discharge = None
 
         if onset_type == "co":
-            discharge_date, facility = self.cdi_source.get_patient_prior_discharge(
-                patient.fhir_id, admission_date
-            )
+            # The inpatient search window starts from the prefetched admissions
+            if (
+                context is not None
+                and patient.fhir_id in context.encounters
+                and patient.fhir_id in context.inpatient_encounters
+            ):
+                discharge_date, facility = FHIRCDITestSource.prior_discharge_from_encounters(
+                    context.inpatient_encounters[patient.fhir_id],
+                    admission_date,
+                    CDI_CO_HCFA_DISCHARGE_WINDOW_DAYS,
+                )
+            else:
+                discharge_date, facility = self.cdi_source.get_patient_prior_discharge(
+                    patient.fhir_id, admission_date
+                )
             if discharge_date:
                 days_since_discharge = (admission_date.date() - discharge_date.date()).days
                 if days_since_discharge <= CDI_CO_HCFA_DISCHARGE_WINDOW_DAYS:
@@ -293,6 +391,7 @@ class CDICandidateDetector(BaseCandidateDetector):
         self,
         patient_id: str,
         before_date: datetime,
+        history: list[CDITestResult] | None = None,
     ) -> list[CDIEpisode]:
         """Get prior CDI episodes for recurrence detection.
 
@@ -301,6 +400,8 @@ class CDICandidateDetector(BaseCandidateDetector):
         Args:
             patient_id: FHIR patient ID
             before_date: Current test date
+            history: The patient's positive tests prefetched for the run.
+                Queried from FHIR if None.
 
         Returns:
             List of prior CDI episodes, sorted by date descending
@@ -329,9 +430,16 @@ class CDICandidateDetector(BaseCandidateDetector):
 
         # Also check FHIR for prior positive tests
         try:
-            fhir_history = self.cdi_source.get_patient_cdi_history(
-                patient_id, before_date
-            )
+            if history is not None:
+                window_start = (before_date - timedelta(days=CDI_HISTORY_LOOKBACK_DAYS)).date()
+                fhir_history = [
+                    test for test in history
+                    if window_start <= test.test_date.date() < before_date.date()
+                ]
+            else:
+                fhir_history = self.cdi_source.get_patient_cdi_history(
+                    patient_id, before_date
+                )
             for test in fhir_history:
                 # Don't duplicate entries already found in DB
                 if not any(e.test_date == test.test_date for e in episodes):
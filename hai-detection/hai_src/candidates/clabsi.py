@@ -49,6 +49,14 @@ COMMON_CONTAMINANTS = {
 }
 
 
+def _is_contaminant(organism: str | None) -> bool:
+    """Whether an organism is a common commensal needing a second culture."""
+    if not organism:
+        return False
+    organism_lower = organism.lower()
+    return any(contam in organism_lower for contam in COMMON_CONTAMINANTS)
+
+
 class CLABSICandidateDetector(BaseCandidateDetector):
     """Detector for CLABSI candidates based on NHSN criteria."""
 
@@ -81,9 +89,11 @@ class CLABSICandidateDetector(BaseCandidateDetector):
 
         Process:
         1. Get all positive blood cultures in date range
-        2. For each culture, check for central line presence
-        3. Validate against NHSN criteria
-        4. Create candidate if criteria met
+        2. Resolve central lines (and, for contaminants, the patients'
+           other cultures) for all of them in bulk
+        3. For each culture, check for central line presence
+        4. Validate against NHSN criteria
+        5. Create candidate if criteria met
 
         Args:
             start_date: Start of date range
@@ -105,33 +115,100 @@ class CLABSICandidateDetector(BaseCandidateDetector):
 
         logger.info(f"Found {len(cultures_with_patients)} positive blood cultures")
 
-        for patient, culture in cultures_with_patients:
-            candidate = self._evaluate_for_clabsi(patient, culture)
+        central_lines = self._resolve_central_lines(cultures_with_patients)
+        other_cultures = self._resolve_confirmatory_cultures(cultures_with_patients)
+
+        for i, (patient, culture) in enumerate(cultures_with_patients):
+            candidate = self._evaluate_for_clabsi(
+                patient,
+                culture,
+                central_lines[i] if central_lines is not None else None,
+                other_cultures.get(patient.fhir_id) if other_cultures is not None else None,
+            )
             if candidate:
                 candidates.append(candidate)
 
         logger.info(f"Identified {len(candidates)} CLABSI candidates")
         return candidates
 
+    def _resolve_central_lines(
+        self,
+        cultures_with_patients: list[tuple[Patient, CultureResult]],
+    ) -> list[list[DeviceInfo] | None] | None:
+        """Central lines at each culture's collection date, fetched in bulk.
+
+        Returns None when the device source has no bulk lookup, in which
+        case lines are fetched per culture. Cultures whose patient the bulk
+        lookup could not resolve are None and fetched on their own.
+        """
+        if not cultures_with_patients or not isinstance(self.device_source, BaseDeviceSource):
+            return None
+        try:
+            return self.device_source.get_central_lines_bulk([
+                (patient.fhir_id, culture.collection_date)
+                for patient, culture in cultures_with_patients
+            ])
+        except Exception as e:
+            logger.warning(f"Bulk central line lookup failed, querying per culture: {e}")
+            return None
+
+    def _resolve_confirmatory_cultures(
+        self,
+        cultures_with_patients: list[tuple[Patient, CultureResult]],
+    ) -> dict[str, list[CultureResult]] | None:
+        """Other cultures of patients with contaminant organisms, fetched in bulk.
+
+        Covers every contaminant culture's confirmatory window. Returns None
+        when the culture source has no bulk lookup; patients missing from
+        the result are queried per culture.
+        """
+        if not isinstance(self.culture_source, BaseCultureSource):
+            return None
+
+        contaminants = [
+            (patient, culture) for patient, culture in cultures_with_patients
+            if _is_contaminant(culture.organism)
+        ]
+        if not contaminants:
+            return {}
+
+        collection_dates = [culture.collection_date for _, culture in contaminants]
+        try:
+            return self.culture_source.get_cultures_for_patients(
+                [patient.fhir_id for patient, _ in contaminants],
+                min(collection_dates) - timedelta(days=2),
+                max(collection_dates) + timedelta(days=2),
+            )
+        except Exception as e:
+            logger.warning(f"Bulk culture lookup failed, querying per culture: {e}")
+            return None
+
     def _evaluate_for_clabsi(
         self,
         patient: Patient,
         culture: CultureResult,
+        central_lines: list[DeviceInfo] | None = None,
+        other_cultures: list[CultureResult] | None = None,
     ) -> HAICandidate | None:
         """Evaluate a positive blood culture for CLABSI criteria.
 
         Args:
             patient: Patient information
             culture: Positive blood culture result
+            central_lines: Central lines at the culture date, if already
+                resolved. Queried from the device source if None.
+            other_cultures: The patient's cultures around the collection
+                date, if already resolved. Passed on to validate_candidate.
 
         Returns:
             HAICandidate if criteria met, None otherwise
         """
         # Check for central line presence at time of culture
-        central_lines = self.device_source.get_central_lines(
-            patient.fhir_id,
-            culture.collection_date,
-        )
+        if central_lines is None:
+            central_lines = self.device_source.get_central_lines(
+                patient.fhir_id,
+                culture.collection_date,
+            )
 
         if not central_lines:
             logger.debug(
@@ -167,7 +244,7 @@ class CLABSICandidateDetector(BaseCandidateDetector):
         )
 
         # Validate against NHSN criteria
-        is_valid, exclusion_reason = self.validate_candidate(candidate)
+        is_valid, exclusion_reason = self.validate_candidate(candidate, other_cultures)
 
         if not is_valid:
             candidate.meets_initial_criteria = False
@@ -182,7 +259,9 @@ class CLABSICandidateDetector(BaseCandidateDetector):
         return candidate
 
     def validate_candidate(
-        self, candidate: HAICandidate
+        self,
+        candidate: HAICandidate,
+        other_cultures: list[CultureResult] | None = None,
     ) -> tuple[bool, str | None]:
         """Validate candidate against NHSN CLABSI criteria.
 
@@ -193,6 +272,9 @@ class CLABSICandidateDetector(BaseCandidateDetector):
 
         Args:
             candidate: The candidate to validate
+            other_cultures: The patient's cultures around the collection
+                date, if already resolved. Queried from the culture source
+                if None and the organism is a common contaminant.
 
         Returns:
             Tuple of (is_valid, exclusion_reason)
@@ -205,36 +287,41 @@ class CLABSICandidateDetector(BaseCandidateDetector):
             return False, f"Device days ({candidate.device_days_at_culture}) < minimum ({self.min_device_days})"
 
         # Criterion 2: Check for common contaminants
-        if candidate.culture.organism:
-            organism_lower = candidate.culture.organism.lower()
-            is_contaminant = any(
-                contam in organism_lower for contam in COMMON_CONTAMINANTS
-            )
-
-            if is_contaminant:
-                # For contaminants, need to check for 2 positive cultures
-                # within 2 days (simplified check - could be enhanced)
-                if not self._has_confirmatory_culture(candidate):
-                    return False, f"Single positive for contaminant organism ({candidate.culture.organism})"
+        if _is_contaminant(candidate.culture.organism):
+            # For contaminants, need to check for 2 positive cultures
+            # within 2 days (simplified check - could be enhanced)
+            if not self._has_confirmatory_culture(candidate, other_cultures):
+                return False, f"Single positive for contaminant organism ({candidate.culture.organism})"
 
         return True, None
 
-    def _has_confirmatory_culture(self, candidate: HAICandidate) -> bool:
+    def _has_confirmatory_culture(
+        self,
+        candidate: HAICandidate,
+        prefetched: list[CultureResult] | None = None,
+    ) -> bool:
         """Check if there's a second positive culture for contaminant organisms.
 
         NHSN requires 2 positive blood cultures drawn on separate occasions
-        within 2 days for common contaminants.
+        within 2 days for common contaminants. Uses the patient's prefetched
+        cultures when given, otherwise queries the culture source.
         """
         culture_date = candidate.culture.collection_date
         window_start = culture_date - timedelta(days=2)
         window_end = culture_date + timedelta(days=2)
 
         try:
-            other_cultures = self.culture_source.get_cultures_for_patient(
-                candidate.patient.fhir_id,
-                window_start,
-                window_end,
-            )
+            if prefetched is not None:
+                other_cultures = [
+                    other for other in prefetched
+                    if window_start.date() <= other.collection_date.date() <= window_end.date()
+                ]
+            else:
+                other_cultures = self.culture_source.get_cultures_for_patient(
+                    candidate.patient.fhir_id,
+                    window_start,
+                    window_end,
+                )
 
             # Look for another positive culture with same organism
             for other in other_cultures:
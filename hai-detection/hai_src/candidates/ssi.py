@@ -28,15 +28,23 @@ from ..models import (
 from ..data.factory import get_procedure_source, get_culture_source, get_note_source
 from ..data.procedure_source import BaseProcedureSource
 from ..data.base import BaseCultureSource, BaseNoteSource
+from ..data.note_store import LocalNoteStore
 from ..rules.nhsn_criteria import (
     is_nhsn_operative_procedure,
     get_surveillance_window,
     SSI_DETECTION_KEYWORDS,
 )
+from ..notes.keywords import KeywordAutomaton, keyword_snippets
 from .base import BaseCandidateDetector
 
 logger = logging.getLogger(__name__)
 
+# Built once; scanning a 90-day surveillance window is one pass per note
+SSI_KEYWORD_AUTOMATON = KeywordAutomaton(SSI_DETECTION_KEYWORDS)
+
+# Evidence snippets kept per candidate
+MAX_KEYWORD_SNIPPETS = 10
+
 
 class SSICandidateDetector(BaseCandidateDetector):
     """Detector for SSI candidates based on NHSN criteria.
@@ -160,14 +168,14 @@ class SSICandidateDetector(BaseCandidateDetector):
             )
 
         # Signal 2: Scan notes for SSI keywords
-        ssi_keywords_found = self._scan_notes_for_ssi_keywords(
+        ssi_keywords_found, keyword_evidence = self._scan_notes_for_ssi_keywords(
             patient.fhir_id, procedure.procedure_date, end_date
         )
         if ssi_keywords_found:
             infection_signals.append(("keywords", ssi_keywords_found))
             logger.debug(
                 f"Found SSI keywords in notes for patient {patient.mrn}: "
-                f"{ssi_keywords_found[:3]}..."
+                f"{ssi_keywords_found[:3]}... e.g. {keyword_evidence[0]!r}"
             )
 
         # If no infection signals, no candidate
@@ -199,6 +207,7 @@ class SSICandidateDetector(BaseCandidateDetector):
             days_post_op=days_post_op,
             wound_culture_organism=wound_culture.organism if wound_culture else None,
             wound_culture_date=wound_culture.collection_date if wound_culture else None,
+            keyword_snippets=keyword_evidence,
         )
 
         # Attach SSI data to candidate for later use
@@ -279,7 +288,7 @@ class SSICandidateDetector(BaseCandidateDetector):
         patient_id: str,
         procedure_date: datetime,
         end_date: datetime,
-    ) -> list[str]:
+    ) -> tuple[list[str], list[str]]:
         """Scan clinical notes for SSI-related keywords.
 
         Args:
@@ -288,29 +297,52 @@ class SSICandidateDetector(BaseCandidateDetector):
             end_date: End of search window
 
         Returns:
-            List of SSI keywords found in notes
+            Tuple of (SSI keywords found in notes, text snippets around
+            the matches labelled with note type and date)
         """
         try:
-            notes = self.note_source.get_notes_for_patient(
-                patient_id,
-                procedure_date,
-                end_date,
-                note_types=None,  # All note types
-            )
+            if isinstance(self.note_source, LocalNoteStore):
+                # Only the notes containing a keyword, from the full-text index
+                notes = self.note_source.search_notes(
+                    patient_id,
+                    SSI_KEYWORD_AUTOMATON.keywords,
+                    procedure_date,
+                    end_date,
+                )
+            else:
+                notes = self.note_source.get_notes_for_patient(
+                    patient_id,
+                    procedure_date,
+                    end_date,
+                    note_types=None,  # All note types
+                )
 
             keywords_found = set()
+            snippets = []
 
             for note in notes:
-                content_lower = note.content.lower()
-                for keyword in SSI_DETECTION_KEYWORDS:
-                    if keyword in content_lower:
-                        keywords_found.add(keyword)
+                if len(snippets) >= MAX_KEYWORD_SNIPPETS:
+                    # Snippet quota full; only the keyword set is still needed
+                    keywords_found.update(SSI_KEYWORD_AUTOMATON.keywords_in(note.content))
+                    continue
+                matches = SSI_KEYWORD_AUTOMATON.scan(note.content)
+                if not matches:
+                    continue
+                keywords_found.update(match.keyword for match in matches)
+                label = f"[{note.note_type} {note.date.strftime('%Y-%m-%d')}]"
+                snippets.extend(
+                    f"{label} {snippet}"
+                    for snippet in keyword_snippets(
+                        note.content, matches,
+                        max_snippets=MAX_KEYWORD_SNIPPETS - len(snippets),
+                    )
+                )
 
-            return list(keywords_found)
+            return sorted(keywords_found), snippets
 
         except Exception as e:
             logger.warning(f"Error scanning notes for SSI keywords: {e}")
-            return []
+            return [], []
 
     def _create_culture_for_candidate(
         self,
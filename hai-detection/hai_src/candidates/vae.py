@@ -15,6 +15,9 @@ import logging
 import uuid
 from datetime import datetime, timedelta, date
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from ..config import Config
 from ..models import (
     HAICandidate,
@@ -40,6 +43,27 @@ from .base import BaseCandidateDetector
 logger = logging.getLogger(__name__)
 
 
+def _nan_if_none(value: float | None) -> float:
+    return np.nan if value is None else value
+
+
+def _none_if_nan(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def _first_recorded(values: np.ndarray, width: int) -> np.ndarray:
+    """First non-NaN value in each rolling window (NaN if the window has none)."""
+    windows = sliding_window_view(values, width)
+    first = (~np.isnan(windows)).argmax(axis=1)
+    return windows[np.arange(len(windows)), first]
+
+
+def _max_rise(rises: np.ndarray, threshold: float) -> float | None:
+    """Largest increase in a worsening window that meets the threshold."""
+    met = rises >= threshold
+    return float(rises[met].max()) if met.any() else None
+
+
 class VAECandidateDetector(BaseCandidateDetector):
     """Detector for VAE (specifically VAC) candidates based on NHSN criteria.
 
@@ -227,6 +251,10 @@ class VAECandidateDetector(BaseCandidateDetector):
         2. Baseline = ≥2 days of stable or decreasing FiO2/PEEP
         3. Worsening = ≥2 days of sustained increase from baseline
 
+        Daily minimums are held as arrays (NaN for a missing value), and every
+        onset day is evaluated at once over rolling baseline and worsening
+        windows; the earliest onset meeting the criteria is returned.
+
         Args:
             daily_params: List of daily ventilator parameters, sorted by date
 
@@ -235,192 +263,56 @@ class VAECandidateDetector(BaseCandidateDetector):
                      baseline_fio2, baseline_peep, fio2_increase, peep_increase)
             or None if no VAC detected
         """
-        if len(daily_params) < self.baseline_period_days + self.worsening_period_days:
+        baseline_days = self.baseline_period_days
+        worsening_days = self.worsening_period_days
+        if len(daily_params) < baseline_days + worsening_days:
             return None
 
-        # Build lookup by date
+        # One row per calendar day (a later entry for the same date wins)
         params_by_date = {p.date: p for p in daily_params}
         sorted_dates = sorted(params_by_date.keys())
-
-        # Need at least baseline_days + worsening_days to detect VAC
-        min_days_needed = self.baseline_period_days + self.worsening_period_days
-
-        # Try to detect VAC starting from day 3 onwards
-        for i in range(min_days_needed - 1, len(sorted_dates)):
-            potential_onset = sorted_dates[i - self.worsening_period_days + 1]
-
-            # Check for valid baseline period before onset
-            baseline_result = self._check_baseline(
-                sorted_dates, params_by_date, potential_onset
-            )
-
-            if baseline_result is None:
-                continue
-
-            baseline_start, baseline_end, baseline_fio2, baseline_peep = baseline_result
-
-            # Check for sustained worsening after baseline
-            worsening_result = self._check_worsening(
-                sorted_dates, params_by_date, potential_onset,
-                baseline_fio2, baseline_peep
-            )
-
-            if worsening_result is not None:
-                fio2_increase, peep_increase = worsening_result
-                return (
-                    potential_onset, baseline_start, baseline_end,
-                    baseline_fio2, baseline_peep, fio2_increase, peep_increase
-                )
-
-        return None
-
-    def _check_baseline(
-        self,
-        sorted_dates: list[date],
-        params_by_date: dict[date, DailyVentParameters],
-        potential_onset: date,
-    ) -> tuple[date, date, float, float] | None:
-        """Check for valid baseline period before potential VAC onset.
-
-        Baseline = ≥2 calendar days of stable or decreasing FiO2/PEEP.
-
-        Args:
-            sorted_dates: Sorted list of dates with data
-            params_by_date: Lookup of parameters by date
-            potential_onset: Potential VAC onset date
-
-        Returns:
-            Tuple of (baseline_start, baseline_end, baseline_fio2, baseline_peep)
-            or None if no valid baseline
-        """
-        onset_idx = sorted_dates.index(potential_onset)
-
-        if onset_idx < self.baseline_period_days:
-            return None
-
-        # Look for baseline ending just before onset
-        baseline_end_idx = onset_idx - 1
-        baseline_start_idx = baseline_end_idx - self.baseline_period_days + 1
-
-        if baseline_start_idx < 0:
+        n_days = len(sorted_dates)
+        if n_days < baseline_days + worsening_days:
             return None
 
-        baseline_dates = sorted_dates[baseline_start_idx:baseline_end_idx + 1]
-
-        # Collect values for baseline period
-        fio2_values = []
-        peep_values = []
-
-        for d in baseline_dates:
-            params = params_by_date.get(d)
-            if params:
-                if params.min_fio2 is not None:
-                    fio2_values.append(params.min_fio2)
-                if params.min_peep is not None:
-                    peep_values.append(params.min_peep)
-
-        if not fio2_values and not peep_values:
-            return None
+        fio2 = np.array(
+            [_nan_if_none(params_by_date[d].min_fio2) for d in sorted_dates], dtype=float
+        )
+        peep = np.array(
+            [_nan_if_none(params_by_date[d].min_peep) for d in sorted_dates], dtype=float
+        )
 
-        # Check for stable or decreasing trend (no significant increase)
-        # For simplicity, check that last value is not significantly higher than first
-        if len(fio2_values) >= 2:
-            if fio2_values[-1] > fio2_values[0] + 10:  # 10% threshold for baseline instability
-                pass  # Still allow, we're looking for stable-ish baseline
+        # Candidate onsets are indices baseline_days .. n_days - worsening_days.
+        # Row k of each window array belongs to onset baseline_days + k.
+        n_onsets = n_days - baseline_days - worsening_days + 1
+        baseline_fio2 = _first_recorded(fio2, baseline_days)[:n_onsets]
+        baseline_peep = _first_recorded(peep, baseline_days)[:n_onsets]
+        has_baseline = ~(np.isnan(baseline_fio2) & np.isnan(baseline_peep))
 
-        if len(peep_values) >= 2:
-            if peep_values[-1] > peep_values[0] + 2:  # 2 cmH2O threshold
-                pass  # Still allow
+        fio2_rise = sliding_window_view(fio2[baseline_days:], worsening_days) - baseline_fio2[:, None]
+        peep_rise = sliding_window_view(peep[baseline_days:], worsening_days) - baseline_peep[:, None]
 
-        # Use the minimum values from the first day of baseline as reference
-        baseline_fio2 = fio2_values[0] if fio2_values else None
-        baseline_peep = peep_values[0] if peep_values else None
+        # Sustained worsening: every day in the window meets a threshold
+        # (NaN compares False, so a missing day or baseline never qualifies)
+        fio2_met = (fio2_rise >= self.fio2_increase_threshold).all(axis=1)
+        peep_met = (peep_rise >= self.peep_increase_threshold).all(axis=1)
 
-        if baseline_fio2 is None and baseline_peep is None:
+        hits = np.flatnonzero(has_baseline & (fio2_met | peep_met))
+        if hits.size == 0:
             return None
 
+        k = int(hits[0])
+        onset_idx = baseline_days + k
         return (
-            baseline_dates[0],
-            baseline_dates[-1],
-            baseline_fio2,
-            baseline_peep,
+            sorted_dates[onset_idx],
+            sorted_dates[k],
+            sorted_dates[onset_idx - 1],
+            _none_if_nan(baseline_fio2[k]),
+            _none_if_nan(baseline_peep[k]),
+            _max_rise(fio2_rise[k], self.fio2_increase_threshold),
+            _max_rise(peep_rise[k], self.peep_increase_threshold),
         )
 
-    def _check_worsening(
-        self,
-        sorted_dates: list[date],
-        params_by_date: dict[date, DailyVentParameters],
-        onset_date: date,
-        baseline_fio2: float | None,
-        baseline_peep: float | None,
-    ) -> tuple[float | None, float | None] | None:
-        """Check for sustained worsening starting at onset date.
-
-        Worsening = ≥2 calendar days where daily minimum FiO2 increases ≥20%
-        OR daily minimum PEEP increases ≥3 cmH2O from baseline.
-
-        Args:
-            sorted_dates: Sorted list of dates with data
-            params_by_date: Lookup of parameters by date
-            onset_date: Potential VAC onset date
-            baseline_fio2: Baseline FiO2 value
-            baseline_peep: Baseline PEEP value
-
-        Returns:
-            Tuple of (fio2_increase, peep_increase) or None if no sustained worsening
-        """
-        try:
-            onset_idx = sorted_dates.index(onset_date)
-        except ValueError:
-            return None
-
-        # Need at least worsening_period_days starting from onset
-        if onset_idx + self.worsening_period_days > len(sorted_dates):
-            return None
-
-        worsening_dates = sorted_dates[onset_idx:onset_idx + self.worsening_period_days]
-
-        # Check each day in worsening period meets threshold
-        fio2_met_all = True
-        peep_met_all = True
-        max_fio2_increase = None
-        max_peep_increase = None
-
-        for d in worsening_dates:
-            params = params_by_date.get(d)
-            if params is None:
-                fio2_met_all = False
-                peep_met_all = False
-                continue
-
-            # Check FiO2 increase
-            if baseline_fio2 is not None and params.min_fio2 is not None:
-                fio2_increase = params.min_fio2 - baseline_fio2
-                if fio2_increase >= self.fio2_increase_threshold:
-                    if max_fio2_increase is None or fio2_increase > max_fio2_increase:
-                        max_fio2_increase = fio2_increase
-                else:
-                    fio2_met_all = False
-            else:
-                fio2_met_all = False
-
-            # Check PEEP increase
-            if baseline_peep is not None and params.min_peep is not None:
-                peep_increase = params.min_peep - baseline_peep
-                if peep_increase >= self.peep_increase_threshold:
-                    if max_peep_increase is None or peep_increase > max_peep_increase:
-                        max_peep_increase = peep_increase
-                else:
-                    peep_met_all = False
-            else:
-                peep_met_all = False
-
-        # VAC requires sustained worsening in either FiO2 OR PEEP
-        if fio2_met_all or peep_met_all:
-            return (max_fio2_increase, max_peep_increase)
-
-        return None
-
     def validate_candidate(self, candidate: HAICandidate) -> tuple[bool, str | None]:
         """Validate candidate against NHSN VAC criteria.
 
@@ -18,6 +18,7 @@ from ..models import (
 )
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker
 from ..db import HAIDatabase
 from ..data.fhir_source import FHIRCultureSource
 from .base import BaseHAIClassifier
@@ -46,6 +47,7 @@ class CLABSIClassifier(BaseHAIClassifier):
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(HAIType.CLABSI, self.chunker)
         self._culture_source = culture_source
         self._prompt_template = self._load_prompt_template()
 
@@ -190,8 +192,10 @@ Respond with JSON: {{"decision": "hai_confirmed"|"not_hai"|"pending_review", "co
         notes: list[ClinicalNote],
     ) -> str:
         """Build the classification prompt."""
-        # Extract relevant sections from notes
-        notes_context = self.chunker.extract_relevant_context(notes)
+        # Pack the most relevant note chunks into the token budget
+        notes_context = self.packer.pack_for_prompt(
+            notes, self._prompt_template, self.llm_client, candidate_id=candidate.id,
+        )
 
         # Check for matching organisms at other sites
         other_cultures_context = self._get_other_cultures_context(candidate)
@@ -129,10 +129,6 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         if collect_training_data:
             self._training_collector = get_collector()
 
-        # Track metrics for analysis
-        self._last_metrics: ClassificationMetrics | None = None
-        self._last_triage_result: TriageExtraction | None = None
-
     @property
     def llm_client(self):
         """Get LLM client (from extractor)."""
@@ -166,6 +162,28 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         Returns:
             Classification with decision, confidence, and reasoning
         """
+        classification, _ = self.classify_with_metrics(candidate, notes, structured_data)
+        return classification
+
+    def classify_with_metrics(
+        self,
+        candidate: HAICandidate,
+        notes: list[ClinicalNote],
+        structured_data: StructuredCaseData | None = None,
+    ) -> tuple[Classification, ClassificationMetrics]:
+        """Classify a CLABSI candidate and return the run's path and timings.
+
+        Metrics are returned rather than kept on the classifier, so one
+        instance can classify candidates concurrently.
+
+        Args:
+            candidate: The CLABSI candidate
+            notes: Clinical notes for context
+            structured_data: Optional pre-built structured data
+
+        Returns:
+            Tuple of (Classification, ClassificationMetrics)
+        """
         start_time = time.time()
 
         # Step 1: Build structured data from candidate if not provided
@@ -174,15 +192,12 @@ class CLABSIClassifierV2(BaseHAIClassifier):
 
         # Step 2: Triage or full extraction
         if self.use_triage and self._triage_extractor:
-            classification = self._classify_with_triage(
+            return self._classify_with_triage(
                 candidate, notes, structured_data, start_time
             )
-        else:
-            classification = self._classify_full(
-                candidate, notes, structured_data, start_time
-            )
-
-        return classification
+        return self._classify_full(
+            candidate, notes, structured_data, start_time
+        )
 
     def _classify_full(
         self,
@@ -190,7 +205,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         notes: list[ClinicalNote],
         structured_data: StructuredCaseData,
         start_time: float,
-    ) -> Classification:
+    ) -> tuple[Classification, ClassificationMetrics]:
         """Full classification without triage."""
         # Extract clinical information using LLM
         extraction = self.extractor.extract(candidate, notes)
@@ -205,12 +220,11 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         )
 
         # Track metrics
-        self._last_metrics = ClassificationMetrics(
+        metrics = ClassificationMetrics(
             path=ClassificationPath.FULL_ONLY,
             extraction_ms=elapsed_ms,
             total_ms=elapsed_ms,
         )
-        self._last_triage_result = None
 
         # Log training data
         self._log_training_data(
@@ -219,9 +233,10 @@ class CLABSIClassifierV2(BaseHAIClassifier):
             extraction=extraction,
             classification=classification,
             triage_result=None,
+            metrics=metrics,
         )
 
-        return classification
+        return classification, metrics
 
     def _classify_with_triage(
         self,
@@ -229,7 +244,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         notes: list[ClinicalNote],
         structured_data: StructuredCaseData,
         start_time: float,
-    ) -> Classification:
+    ) -> tuple[Classification, ClassificationMetrics]:
         """Classification with two-stage triage pipeline."""
         # Stage 1: Fast triage
         triage_start = time.time()
@@ -260,14 +275,13 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 + classification.reasoning
             )
 
-            self._last_metrics = ClassificationMetrics(
+            metrics = ClassificationMetrics(
                 path=ClassificationPath.TRIAGE_ESCALATED,
                 triage_ms=triage_ms,
                 extraction_ms=elapsed_ms - triage_ms,
                 total_ms=elapsed_ms,
                 triage_decision=triage_result.decision,
             )
-            self._last_triage_result = triage_result
 
             # Log training data (full extraction after triage)
             self._log_training_data(
@@ -276,6 +290,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 extraction=extraction,
                 classification=classification,
                 triage_result=triage_result,
+                metrics=metrics,
             )
         else:
             # Use triage results directly
@@ -293,13 +308,12 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 + classification.reasoning
             )
 
-            self._last_metrics = ClassificationMetrics(
+            metrics = ClassificationMetrics(
                 path=ClassificationPath.TRIAGE_ONLY,
                 triage_ms=triage_ms,
                 total_ms=elapsed_ms,
                 triage_decision=triage_result.decision,
             )
-            self._last_triage_result = triage_result
 
             # Log training data (triage only, no full extraction)
             self._log_training_data(
@@ -308,6 +322,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 extraction=extraction,
                 classification=classification,
                 triage_result=triage_result,
+                metrics=metrics,
             )
 
             logger.info(
@@ -315,7 +330,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 f"(saved ~{60000 - elapsed_ms}ms)"
             )
 
-        return classification
+        return classification, metrics
 
     def _triage_to_extraction(self, triage: TriageExtraction) -> ClinicalExtraction:
         """Convert triage results to ClinicalExtraction for rules engine.
@@ -369,6 +384,7 @@ class CLABSIClassifierV2(BaseHAIClassifier):
         extraction: ClinicalExtraction,
         classification: Classification,
         triage_result: TriageExtraction | None,
+        metrics: ClassificationMetrics,
     ) -> None:
         """Log extraction for training data collection."""
         if not self.collect_training_data or not self._training_collector:
@@ -405,20 +421,15 @@ class CLABSIClassifierV2(BaseHAIClassifier):
                 input_context=input_context,
                 extraction=extraction_dict,
                 model=self.llm_client.model_name,
-                latency_ms=self._last_metrics.total_ms if self._last_metrics else 0,
+                latency_ms=metrics.total_ms,
                 triage_result=triage_result,
                 classification_decision=classification.decision.value,
                 classification_confidence=classification.confidence,
-                classification_path=self._last_metrics.path.value if self._last_metrics else None,
+                classification_path=metrics.path.value,
             )
         except Exception as e:
             logger.warning(f"Failed to log training data: {e}")
 
-    @property
-    def last_metrics(self) -> ClassificationMetrics | None:
-        """Get metrics from the last classification run."""
-        return self._last_metrics
-
     def _build_structured_data(self, candidate: HAICandidate) -> StructuredCaseData:
         """Build StructuredCaseData from HAICandidate.
 
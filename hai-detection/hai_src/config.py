@@ -19,8 +19,15 @@ for env_path in _env_candidates:
 
 # Add common module to path
 _project_root = Path(__file__).parent.parent.parent
-if str(_project_root) not in sys.path:
-    sys.path.insert(0, str(_project_root))
+
+
+def add_common_to_path() -> None:
+    """Make the repo-level common/ package importable."""
+    if str(_project_root) not in sys.path:
+        sys.path.insert(0, str(_project_root))
+
+
+add_common_to_path()
 
 
 class Config:
@@ -36,16 +43,61 @@ class Config:
     VENTILATOR_SOURCE: str = os.getenv("VENTILATOR_SOURCE", "fhir")  # fhir only
     FHIR_BASE_URL: str = os.getenv("FHIR_BASE_URL", "http://localhost:8081/fhir")
     CLARITY_CONNECTION_STRING: str | None = os.getenv("CLARITY_CONNECTION_STRING")
+    # Safety cap on Bundle pages followed per FHIR search (via link[relation=next])
+    FHIR_MAX_PAGES: int = int(os.getenv("FHIR_MAX_PAGES", "200"))
+    # Patients per multi-patient FHIR search (patient=a,b,c) or Clarity IN
+    # list when candidate detectors resolve devices, cultures and encounters
+    # in bulk
+    FHIR_PATIENT_BATCH_SIZE: int = int(os.getenv("FHIR_PATIENT_BATCH_SIZE", "50"))
 
     # --- LLM Backend ---
-    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "ollama")  # ollama, vllm, or claude
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "ollama")  # ollama, vllm, claude, or replay
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.3:70b")
     VLLM_BASE_URL: str = os.getenv("VLLM_BASE_URL", "http://localhost:8000")
     VLLM_MODEL: str = os.getenv("VLLM_MODEL", "Qwen/Qwen2.5-72B-Instruct")
+    # How long Ollama keeps a model in VRAM after a request (e.g. "30m",
+    # "24h"; -1 pins it until the server restarts)
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # Route models to dedicated Ollama endpoints, e.g.
+    # "llama3.3:70b=http://gpu1:11434,http://gpu2:11434;qwen2.5:7b=http://gpu3:11434".
+    # Models not listed (or all, if empty) go to OLLAMA_BASE_URL.
+    LLM_ENDPOINTS: str = os.getenv("LLM_ENDPOINTS", "")
+    # Requests one endpoint serves at once (its OLLAMA_NUM_PARALLEL) before
+    # the router would rather queue elsewhere
+    LLM_ENDPOINT_SLOTS: int = int(os.getenv("LLM_ENDPOINT_SLOTS", "2"))
+    # Stream triage responses and stop generating once the escalation
+    # decision is settled
+    LLM_STREAM_TRIAGE: bool = os.getenv("LLM_STREAM_TRIAGE", "true").lower() == "true"
     CLAUDE_API_KEY: str | None = os.getenv("CLAUDE_API_KEY")
     CLAUDE_MODEL: str = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-20250514")
 
+    # --- LLM Record/Replay (offline benchmarking) ---
+    # LLM_RECORD=true appends live responses and profiles to the cassette;
+    # LLM_BACKEND=replay answers from it with simulated latency.
+    LLM_CASSETTE_PATH: str = os.getenv("LLM_CASSETTE_PATH", "~/.aegis/llm_cassette.jsonl")
+    LLM_RECORD: bool = os.getenv("LLM_RECORD", "false").lower() == "true"
+    LLM_RECORD_MODE: str = os.getenv("LLM_RECORD_MODE", "auto")  # auto (new calls only) or record
+    LLM_REPLAY_LATENCY: str = os.getenv("LLM_REPLAY_LATENCY", "recorded")  # recorded, rates, or none
+    LLM_REPLAY_SPEED: float = float(os.getenv("LLM_REPLAY_SPEED", "1.0"))
+    # Token rates for "rates" latency; default to the recorded medians
+    LLM_REPLAY_PREFILL_TPS: float | None = float(os.getenv("LLM_REPLAY_PREFILL_TPS", "0")) or None
+    LLM_REPLAY_DECODE_TPS: float | None = float(os.getenv("LLM_REPLAY_DECODE_TPS", "0")) or None
+    LLM_REPLAY_JITTER: float = float(os.getenv("LLM_REPLAY_JITTER", "0.1"))
+    # Simulated server slots (0 = unlimited)
+    LLM_REPLAY_MAX_CONCURRENT: int = int(os.getenv("LLM_REPLAY_MAX_CONCURRENT", "0"))
+    # false: unrecorded prompts reuse the latest response for the same schema
+    LLM_REPLAY_STRICT: bool = os.getenv("LLM_REPLAY_STRICT", "true").lower() == "true"
+
+    # --- Classification Concurrency ---
+    # Concurrent LLM requests per backend during classify_pending. Ollama
+    # serves OLLAMA_NUM_PARALLEL requests per loaded model; vLLM batches
+    # continuously and benefits from more in-flight requests.
+    OLLAMA_MAX_CONCURRENT: int = int(os.getenv("OLLAMA_MAX_CONCURRENT", "2"))
+    VLLM_MAX_CONCURRENT: int = int(os.getenv("VLLM_MAX_CONCURRENT", "8"))
+    # Concurrent note retrievals feeding the LLM stage
+    NOTE_FETCH_WORKERS: int = int(os.getenv("NOTE_FETCH_WORKERS", "4"))
+
     # --- Classification Thresholds ---
     # Above this confidence: auto-classify as HAI (no review needed)
     AUTO_CLASSIFY_THRESHOLD: float = float(
@@ -58,6 +110,9 @@ class Config:
     # --- CLABSI Criteria ---
     # Minimum device days before culture for CLABSI eligibility
     MIN_DEVICE_DAYS: int = int(os.getenv("MIN_DEVICE_DAYS", "2"))
+    # Days of Clarity line flowsheet rows read before a culture; older
+    # insertions are reported as the first row in this window
+    CENTRAL_LINE_LOOKBACK_DAYS: int = int(os.getenv("CENTRAL_LINE_LOOKBACK_DAYS", "90"))
     # Days after line removal that BSI can still be attributed
     POST_REMOVAL_WINDOW_DAYS: int = int(os.getenv("POST_REMOVAL_WINDOW_DAYS", "1"))
 
@@ -121,6 +176,30 @@ class Config:
     MAX_NOTE_LENGTH: int = int(os.getenv("MAX_NOTE_LENGTH", "50000"))
     # Maximum notes to retrieve per patient
     MAX_NOTES_PER_PATIENT: int = int(os.getenv("MAX_NOTES_PER_PATIENT", "20"))
+    # Replace copy-forwarded (exact and near-duplicate) paragraphs before LLM.
+    # Off until the near-duplicate rewrite is checked against labelled cases.
+    NOTE_DEDUP_ENABLED: bool = os.getenv("NOTE_DEDUP_ENABLED", "false").lower() == "true"
+    # Hard cap on note-context tokens per prompt (also bounded by num_ctx)
+    NOTE_CONTEXT_MAX_TOKENS: int = int(os.getenv("NOTE_CONTEXT_MAX_TOKENS", "7500"))
+    # Local note store: serve repeat note requests from SQLite, sync new notes incrementally
+    NOTE_STORE_ENABLED: bool = os.getenv("NOTE_STORE_ENABLED", "true").lower() == "true"
+    NOTE_STORE_DB_PATH: str = os.getenv(
+        "NOTE_STORE_DB_PATH",
+        str(Path.home() / ".aegis" / "note_store.db"),
+    )
+    # Most notes one store sync fetches for a window; a window that reaches it
+    # may be truncated and is fetched again. Reads are still capped at
+    # MAX_NOTES_PER_PATIENT.
+    NOTE_STORE_SYNC_MAX_NOTES: int = int(os.getenv("NOTE_STORE_SYNC_MAX_NOTES", "1000"))
+    # Seconds a synced window is served before checking the EHR for new notes
+    NOTE_STORE_REFRESH_SECONDS: int = int(os.getenv("NOTE_STORE_REFRESH_SECONDS", "900"))
+    # Hours before the latest stored note that a refresh re-fetches (late signatures, addenda)
+    NOTE_STORE_OVERLAP_HOURS: int = int(os.getenv("NOTE_STORE_OVERLAP_HOURS", "48"))
+    # Seconds an empty EHR reply (days before a patient's first note) is trusted
+    NOTE_STORE_EMPTY_TTL_SECONDS: int = int(os.getenv("NOTE_STORE_EMPTY_TTL_SECONDS", "3600"))
+    # Days stored notes (PHI) are kept; purged each monitor cycle. Covers the
+    # 90-day implant SSI window. 0 keeps notes indefinitely.
+    NOTE_STORE_RETENTION_DAYS: int = int(os.getenv("NOTE_STORE_RETENTION_DAYS", "120"))
 
     # --- Epic FHIR (if using Epic) ---
     EPIC_CLIENT_ID: str | None = os.getenv("EPIC_CLIENT_ID")
@@ -149,6 +228,18 @@ class Config:
         """Check if Claude API is configured."""
         return cls.LLM_BACKEND == "claude" and bool(cls.CLAUDE_API_KEY)
 
+    @classmethod
+    def get_llm_concurrency(cls, backend: str | None = None) -> int:
+        """Get the number of concurrent LLM requests for a backend."""
+        backend = backend or cls.LLM_BACKEND
+        if backend == "vllm":
+            return cls.VLLM_MAX_CONCURRENT
+        if backend == "ollama":
+            return cls.OLLAMA_MAX_CONCURRENT
+        if backend == "replay":
+            return cls.LLM_REPLAY_MAX_CONCURRENT or cls.OLLAMA_MAX_CONCURRENT
+        return 1
+
     @classmethod
     def is_clarity_configured(cls) -> bool:
         """Check if Clarity database is configured (real or mock)."""
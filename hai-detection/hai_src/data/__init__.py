@@ -13,6 +13,9 @@ Factory functions:
     get_urinary_catheter_source: Urinary catheters for CAUTI (FHIR only)
     get_urine_culture_source: Urine cultures for CAUTI (FHIR only)
     get_cdi_test_source: C. difficile tests for CDI (FHIR only)
+
+LocalNoteStore keeps synced notes in SQLite (FTS5) in front of the
+note source; get_note_source() adds it when NOTE_STORE_ENABLED.
 """
 
 from .factory import (
@@ -26,6 +29,8 @@ from .factory import (
     get_cdi_test_source,
 )
 
+from .note_store import LocalNoteStore
+
 from .base import (
     BaseNoteSource,
     BaseDeviceSource,
@@ -48,4 +53,6 @@ __all__ = [
     "BaseDeviceSource",
     "BaseCultureSource",
     "BaseVentilatorSource",
+    # Local note store
+    "LocalNoteStore",
 ]
@@ -3,9 +3,33 @@
 from abc import ABC, abstractmethod
 from datetime import datetime, date
 
+from ..config import Config
 from ..models import ClinicalNote, DeviceInfo, CultureResult, Patient, VentilationEpisode, DailyVentParameters
 
 
+def patient_batches(patient_ids: list[str]) -> list[list[str]]:
+    """Unique patient IDs in batches of Config.FHIR_PATIENT_BATCH_SIZE.
+
+    Used for multi-patient FHIR searches (patient=a,b,c) and Clarity IN
+    lists, which SQL Server caps at 2,100 parameters.
+    """
+    unique = list(dict.fromkeys(patient_ids))
+    size = max(1, Config.FHIR_PATIENT_BATCH_SIZE)
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+class NoteFetchError(Exception):
+    """An EHR note query failed part way.
+
+    Attributes:
+        notes: Notes fetched before the failure.
+    """
+
+    def __init__(self, message: str, notes: list[ClinicalNote] | None = None):
+        super().__init__(message)
+        self.notes = notes or []
+
+
 class BaseNoteSource(ABC):
     """Abstract base class for clinical note retrieval."""
 
@@ -30,6 +54,30 @@ class BaseNoteSource(ABC):
         """
         pass
 
+    def fetch_notes_for_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+        max_notes: int | None = None,
+    ) -> list[ClinicalNote]:
+        """Like get_notes_for_patient, but raises when the query fails.
+
+        get_notes_for_patient logs failures and returns what it has, which
+        callers that cache the result cannot tell from "no notes". Sources
+        override this; the default assumes get_notes_for_patient raises,
+        and ignores max_notes.
+
+        Args:
+            max_notes: Most notes to return, newest first. Defaults to
+                Config.MAX_NOTES_PER_PATIENT.
+
+        Raises:
+            NoteFetchError: The query failed; carries the notes fetched so far.
+        """
+        return self.get_notes_for_patient(patient_id, start_date, end_date, note_types)
+
     @abstractmethod
     def get_note_by_id(self, note_id: str) -> ClinicalNote | None:
         """Retrieve a specific note by ID."""
@@ -56,6 +104,25 @@ class BaseDeviceSource(ABC):
         """
         pass
 
+    def get_central_lines_bulk(
+        self,
+        queries: list[tuple[str, datetime]],
+    ) -> list[list[DeviceInfo] | None]:
+        """Get central lines for several (patient_id, as_of_date) pairs at once.
+
+        Sources that can search many patients in one request override this;
+        the default makes one get_central_lines call per query.
+
+        Args:
+            queries: (patient ID, date to check for line presence) pairs
+
+        Returns:
+            Lists of central lines present, in query order. None where the
+            query's patient could not be looked up, so callers can fall
+            back to get_central_lines for it.
+        """
+        return [self.get_central_lines(patient_id, as_of) for patient_id, as_of in queries]
+
     @abstractmethod
     def get_active_devices(
         self,
@@ -104,6 +171,27 @@ class BaseCultureSource(ABC):
         """Get cultures for a specific patient."""
         pass
 
+    def get_cultures_for_patients(
+        self,
+        patient_ids: list[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, list[CultureResult]]:
+        """Get cultures for several patients at once.
+
+        Sources that can search many patients in one request override this;
+        the default makes one get_cultures_for_patient call per patient.
+
+        Returns:
+            Dict mapping patient ID to that patient's cultures. Patients
+            that could not be looked up are left out, so callers can fall
+            back to get_cultures_for_patient for them.
+        """
+        return {
+            patient_id: self.get_cultures_for_patient(patient_id, start_date, end_date)
+            for patient_id in patient_ids
+        }
+
 
 class BaseVentilatorSource(ABC):
     """Abstract base class for mechanical ventilation data retrieval.
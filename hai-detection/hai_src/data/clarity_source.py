@@ -5,11 +5,22 @@ and device information. Requires CLARITY_CONNECTION_STRING to be configured.
 """
 
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from ..config import Config
 from ..models import ClinicalNote, DeviceInfo, CultureResult, Patient
-from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource
+from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, NoteFetchError, patient_batches
+
+
+def _clarity_datetime(value) -> datetime | None:
+    """DATETIME column value as a datetime.
+
+    SQL Server drivers return datetimes; SQLite (the mock Clarity DB)
+    returns the stored ISO string.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +60,24 @@ class ClarityNoteSource(BaseNoteSource):
         Note: This is a template implementation. The exact SQL will depend
         on your institution's Clarity configuration.
         """
+        try:
+            return self.fetch_notes_for_patient(patient_id, start_date, end_date, note_types)
+        except NoteFetchError as e:
+            logger.error(f"Clarity note query failed: {e}")
+            return []
+
+    def fetch_notes_for_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+        max_notes: int | None = None,
+    ) -> list[ClinicalNote]:
+        """Retrieve clinical notes, raising NoteFetchError if the query fails."""
         notes = []
+        if max_notes is None:
+            max_notes = Config.MAX_NOTES_PER_PATIENT
 
         # Map note types to Clarity note type IDs
         # These IDs are institution-specific
@@ -91,7 +119,7 @@ class ClarityNoteSource(BaseNoteSource):
                         "patient_id": patient_id,
                         "start_date": start_date,
                         "end_date": end_date,
-                        "limit": Config.MAX_NOTES_PER_PATIENT,
+                        "limit": max_notes,
                     },
                 )
 
@@ -108,7 +136,7 @@ class ClarityNoteSource(BaseNoteSource):
                     notes.append(note)
 
         except Exception as e:
-            logger.error(f"Clarity note query failed: {e}")
+            raise NoteFetchError(str(e)) from e
 
         return notes
 
@@ -240,6 +268,7 @@ class ClarityDeviceSource(BaseDeviceSource):
         JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
         WHERE pat.PAT_MRN_ID = :patient_id
           AND fd.DISP_NAME LIKE '%central%line%'
+          AND fm.RECORDED_TIME >= :since
           AND fm.RECORDED_TIME <= :as_of_date
         GROUP BY fm.FLO_MEAS_ID, fd.DISP_NAME
         HAVING MIN(fm.RECORDED_TIME) <= :as_of_date
@@ -253,14 +282,18 @@ class ClarityDeviceSource(BaseDeviceSource):
             with engine.connect() as conn:
                 result = conn.execute(
                     text(query),
-                    {"patient_id": patient_id, "as_of_date": as_of_date},
+                    {
+                        "patient_id": patient_id,
+                        "as_of_date": as_of_date,
+                        "since": as_of_date - timedelta(days=Config.CENTRAL_LINE_LOOKBACK_DAYS),
+                    },
                 )
 
                 for row in result:
                     device = DeviceInfo(
                         device_type=self._normalize_line_type(row.LINE_TYPE),
-                        insertion_date=row.INSERTION_DATE,
-                        removal_date=row.REMOVAL_DATE,
+                        insertion_date=_clarity_datetime(row.INSERTION_DATE),
+                        removal_date=_clarity_datetime(row.REMOVAL_DATE),
                         site=row.SITE,
                         fhir_id=None,  # Not applicable for Clarity
                     )
@@ -271,6 +304,102 @@ class ClarityDeviceSource(BaseDeviceSource):
 
         return devices
 
+    def get_central_lines_bulk(
+        self,
+        queries: list[tuple[str, datetime]],
+    ) -> list[list[DeviceInfo] | None]:
+        """Get central lines for several (patient_id, as_of_date) pairs.
+
+        Fetches the central line flowsheet rows of every patient in batched
+        IN queries, then aggregates them per query the way get_central_lines
+        does. A query is None where its patient's batch failed.
+
+        Like get_central_lines, only rows from CENTRAL_LINE_LOOKBACK_DAYS
+        before each date count.
+        """
+        if not queries:
+            return []
+
+        query = """
+        SELECT
+            pat.PAT_MRN_ID,
+            fm.FLO_MEAS_ID,
+            fd.DISP_NAME as LINE_TYPE,
+            fm.RECORDED_TIME,
+            fm.MEAS_VALUE
+        FROM IP_FLWSHT_MEAS fm
+        JOIN IP_FLWSHT_REC fr ON fm.FSD_ID = fr.FSD_ID
+        JOIN IP_FLO_GP_DATA fd ON fm.FLO_MEAS_ID = fd.FLO_MEAS_ID
+        JOIN PAT_ENC pe ON fr.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
+        JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+        WHERE pat.PAT_MRN_ID IN :patient_ids
+          AND fd.DISP_NAME LIKE '%central%line%'
+          AND fm.RECORDED_TIME >= :since
+          AND fm.RECORDED_TIME <= :as_of_date
+        """
+
+        # patient -> (FLO_MEAS_ID, LINE_TYPE) -> [(RECORDED_TIME, MEAS_VALUE)]
+        measurements: dict[str, dict[tuple, list[tuple]]] = {}
+        lookback = timedelta(days=Config.CENTRAL_LINE_LOOKBACK_DAYS)
+        as_of_date = max(as_of for _, as_of in queries)
+        since = min(as_of for _, as_of in queries) - lookback
+        failed: set[str] = set()
+        try:
+            from sqlalchemy import bindparam, text
+            engine = self._get_engine()
+        except Exception as e:
+            logger.error(f"Clarity device bulk query failed: {e}")
+            return [None] * len(queries)
+
+        for batch in patient_batches([patient_id for patient_id, _ in queries]):
+            try:
+                with engine.connect() as conn:
+                    result = conn.execute(
+                        text(query).bindparams(bindparam("patient_ids", expanding=True)),
+                        {"patient_ids": batch, "as_of_date": as_of_date, "since": since},
+                    )
+                    for row in result:
+                        lines = measurements.setdefault(row.PAT_MRN_ID, {})
+                        lines.setdefault((row.FLO_MEAS_ID, row.LINE_TYPE), []).append(
+                            (_clarity_datetime(row.RECORDED_TIME), row.MEAS_VALUE)
+                        )
+
+            except Exception as e:
+                logger.error(f"Clarity device bulk query failed for {len(batch)} patients: {e}")
+                failed.update(batch)
+
+        results = []
+        for patient_id, as_of_date in queries:
+            if patient_id in failed:
+                results.append(None)
+                continue
+            devices = []
+            for (_, line_type), rows in measurements.get(patient_id, {}).items():
+                recorded = [
+                    (time, value) for time, value in rows
+                    if as_of_date - lookback <= time <= as_of_date
+                ]
+                if not recorded:
+                    continue
+                removals = [time for time, value in recorded if "removed" in (value or "").lower()]
+                removal_date = max(removals) if removals else None
+                if removal_date is not None and removal_date < as_of_date:
+                    continue
+                sites = [
+                    value for _, value in recorded
+                    if value is not None and "site" in (line_type or "").lower()
+                ]
+                devices.append(DeviceInfo(
+                    device_type=self._normalize_line_type(line_type),
+                    insertion_date=min(time for time, _ in recorded),
+                    removal_date=removal_date,
+                    site=max(sites) if sites else None,
+                    fhir_id=None,  # Not applicable for Clarity
+                ))
+            results.append(devices)
+
+        return results
+
     def get_active_devices(
         self,
         patient_id: str,
@@ -444,3 +573,80 @@ class ClarityCultureSource(BaseCultureSource):
             logger.error(f"Clarity culture query failed: {e}")
 
         return cultures
+
+    def get_cultures_for_patients(
+        self,
+        patient_ids: list[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, list[CultureResult]]:
+        """Get cultures for several patients from Clarity in batched IN queries.
+
+        Patients whose batch failed are left out of the result.
+        """
+        cultures = {patient_id: [] for patient_id in patient_ids}
+        if not cultures:
+            return cultures
+
+        query = """
+        SELECT
+            pat.PAT_MRN_ID,
+            ores.ORDER_ID,
+            ores.SPECIMN_TAKEN_TIME as COLLECTION_DATE,
+            ores.RESULT_TIME,
+            orc.NAME as ORGANISM,
+            ores.ORD_VALUE
+        FROM ORDER_RESULTS ores
+        JOIN ORDER_PROC op ON ores.ORDER_PROC_ID = op.ORDER_PROC_ID
+        JOIN PATIENT pat ON op.PAT_ID = pat.PAT_ID
+        LEFT JOIN CLARITY_COMPONENT orc ON ores.COMPONENT_ID = orc.COMPONENT_ID
+        WHERE pat.PAT_MRN_ID IN :patient_ids
+          AND op.PROC_NAME LIKE '%blood culture%'
+          AND ores.SPECIMN_TAKEN_TIME BETWEEN :start_date AND :end_date
+        ORDER BY ores.SPECIMN_TAKEN_TIME DESC
+        """
+
+        try:
+            from sqlalchemy import bindparam, text
+            engine = self._get_engine()
+        except Exception as e:
+            logger.error(f"Clarity culture bulk query failed: {e}")
+            return {}
+
+        for batch in patient_batches(patient_ids):
+            try:
+                with engine.connect() as conn:
+                    result = conn.execute(
+                        text(query).bindparams(bindparam("patient_ids", expanding=True)),
+                        {
+                            "patient_ids": batch,
+                            "start_date": start_date,
+                            "end_date": end_date,
+                        },
+                    )
+
+                    for row in result:
+                        if row.PAT_MRN_ID not in cultures:
+                            continue
+                        is_positive = (
+                            "positive" in (row.ORD_VALUE or "").lower()
+                            or "growth" in (row.ORD_VALUE or "").lower()
+                            or row.ORGANISM is not None
+                        )
+
+                        culture = CultureResult(
+                            fhir_id=str(row.ORDER_ID),
+                            collection_date=row.COLLECTION_DATE,
+                            organism=row.ORGANISM,
+                            result_date=row.RESULT_TIME,
+                            specimen_source="blood",
+                            is_positive=is_positive,
+                        )
+                        cultures[row.PAT_MRN_ID].append(culture)
+
+            except Exception as e:
+                logger.error(f"Clarity culture bulk query failed for {len(batch)} patients: {e}")
+                for patient_id in batch:
+                    cultures.pop(patient_id, None)
+
+        return cultures
@@ -3,7 +3,7 @@
 import logging
 
 from ..config import Config
-from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, BaseVentilatorSource
+from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, BaseVentilatorSource, NoteFetchError
 from .fhir_source import (
     FHIRNoteSource,
     FHIRDeviceSource,
@@ -14,6 +14,7 @@ from .fhir_source import (
     FHIRCDITestSource,
 )
 from .clarity_source import ClarityNoteSource, ClarityDeviceSource, ClarityCultureSource
+from .note_store import LocalNoteStore
 from .procedure_source import (
     BaseProcedureSource,
     MockProcedureSource,
@@ -31,6 +32,9 @@ def get_note_source(source_type: str | None = None) -> BaseNoteSource:
     immediate access to clinical notes. Clarity should only be used for bulk
     historical extraction where FHIR pagination would be impractical.
 
+    With NOTE_STORE_ENABLED, the source is wrapped in a LocalNoteStore so
+    repeat requests for a patient's notes are served from SQLite.
+
     Args:
         source_type: Override source type (fhir, clarity, both). Uses config if not specified.
 
@@ -42,16 +46,20 @@ def get_note_source(source_type: str | None = None) -> BaseNoteSource:
     if source == "clarity":
         if not Config.is_clarity_configured():
             logger.warning("Clarity not configured, falling back to FHIR")
-            return FHIRNoteSource()
-        logger.info("Using Clarity for note source (consider FHIR for real-time)")
-        return ClarityNoteSource()
-
-    if source == "both":
+            note_source = FHIRNoteSource()
+        else:
+            logger.info("Using Clarity for note source (consider FHIR for real-time)")
+            note_source = ClarityNoteSource()
+    elif source == "both":
         # Return a composite source that tries both (deduplicates results)
-        return CompositeNoteSource()
+        note_source = CompositeNoteSource()
+    else:
+        # Default to FHIR (preferred for real-time surveillance)
+        note_source = FHIRNoteSource()
 
-    # Default to FHIR (preferred for real-time surveillance)
-    return FHIRNoteSource()
+    if Config.NOTE_STORE_ENABLED:
+        return LocalNoteStore(note_source)
+    return note_source
 
 
 def get_device_source(source_type: str | None = None) -> BaseDeviceSource:
@@ -121,41 +129,73 @@ class CompositeNoteSource(BaseNoteSource):
         end_date,
         note_types=None,
     ):
-        """Get notes from both sources and deduplicate."""
+        """Get notes from both sources and deduplicate.
+
+        Notes are deduplicated by id. A Clarity note is also skipped when a
+        FHIR note has the same date and type, since the two systems use
+        different ids for the same document.
+        """
+        try:
+            return self.fetch_notes_for_patient(patient_id, start_date, end_date, note_types)
+        except NoteFetchError as e:
+            return e.notes
+
+    def fetch_notes_for_patient(
+        self,
+        patient_id: str,
+        start_date,
+        end_date,
+        note_types=None,
+        max_notes=None,
+    ):
+        """Get notes from both sources, raising NoteFetchError if either failed.
+
+        The error carries the notes the other source returned.
+        """
         from datetime import datetime
 
         notes = []
-        seen_dates = set()
+        seen_ids = set()
+        fhir_dates = set()
+        failures = []
+
+        def date_key(note):
+            return (note.date.isoformat() if isinstance(note.date, datetime) else note.date, note.note_type)
 
         # Try FHIR first
         try:
-            fhir_notes = self.fhir_source.get_notes_for_patient(
-                patient_id, start_date, end_date, note_types
+            fhir_notes = self.fhir_source.fetch_notes_for_patient(
+                patient_id, start_date, end_date, note_types, max_notes=max_notes
             )
-            for note in fhir_notes:
-                key = (note.date.isoformat() if isinstance(note.date, datetime) else note.date, note.note_type)
-                if key not in seen_dates:
-                    notes.append(note)
-                    seen_dates.add(key)
         except Exception as e:
             logger.warning(f"FHIR note retrieval failed: {e}")
+            fhir_notes = getattr(e, "notes", [])
+            failures.append(f"FHIR: {e}")
+        for note in fhir_notes:
+            if note.id not in seen_ids:
+                notes.append(note)
+                seen_ids.add(note.id)
+                fhir_dates.add(date_key(note))
 
         # Try Clarity if configured
         if self.clarity_source:
             try:
-                clarity_notes = self.clarity_source.get_notes_for_patient(
-                    patient_id, start_date, end_date, note_types
+                clarity_notes = self.clarity_source.fetch_notes_for_patient(
+                    patient_id, start_date, end_date, note_types, max_notes=max_notes
                 )
-                for note in clarity_notes:
-                    key = (note.date.isoformat() if isinstance(note.date, datetime) else note.date, note.note_type)
-                    if key not in seen_dates:
-                        notes.append(note)
-                        seen_dates.add(key)
             except Exception as e:
                 logger.warning(f"Clarity note retrieval failed: {e}")
+                clarity_notes = getattr(e, "notes", [])
+                failures.append(f"Clarity: {e}")
+            for note in clarity_notes:
+                if note.id not in seen_ids and date_key(note) not in fhir_dates:
+                    notes.append(note)
+                    seen_ids.add(note.id)
 
         # Sort by date descending
         notes.sort(key=lambda n: n.date, reverse=True)
+        if failures:
+            raise NoteFetchError("; ".join(failures), notes)
         return notes
 
     def get_note_by_id(self, note_id: str):
@@ -0,0 +1,159 @@
+"""Paginated FHIR Bundle iteration.
+
+FHIR search results are returned as Bundles holding at most ``_count``
+entries; the remainder is advertised through ``link[relation=next]``.
+Reading only the first Bundle silently drops results on busy days, so all
+FHIR sources should walk searches through the helpers in this module.
+
+Pages are fetched lazily and the next page is requested in the background
+while the caller parses the current one. At most two pages are held in
+memory at any time regardless of the size of the result set.
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator
+from urllib.parse import urljoin
+
+import requests
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def get_next_link(bundle: dict) -> str | None:
+    """Return the URL of the next page of a search Bundle, if any.
+
+    Accepts both the R4 ``relation`` key and the older ``rel`` spelling
+    emitted by some servers.
+    """
+    for link in bundle.get("link", []) or []:
+        relation = link.get("relation") or link.get("rel")
+        if relation == "next" and link.get("url"):
+            return link["url"]
+    return None
+
+
+def _fetch_page(
+    session: requests.Session,
+    url: str,
+    params: dict | list | None,
+    timeout: float,
+) -> dict:
+    """Fetch a single Bundle page and return the decoded JSON."""
+    response = session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def iter_bundle_pages(
+    session: requests.Session,
+    url: str,
+    params: dict | list | None = None,
+    timeout: float = 30,
+    max_pages: int | None = None,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """Iterate over the pages of a FHIR search, following ``next`` links.
+
+    The first request is sent with ``params``; subsequent requests use the
+    server-provided ``next`` URL verbatim, since it already encodes the
+    search and the paging cursor.
+
+    Args:
+        session: HTTP session used for all page requests
+        url: Search URL (e.g. ``{base_url}/DiagnosticReport``)
+        params: Query parameters for the first page
+        timeout: Per-request timeout in seconds
+        max_pages: Safety cap on pages fetched (defaults to Config.FHIR_MAX_PAGES)
+        prefetch: Request the next page while the current one is consumed
+
+    Yields:
+        Bundle dicts, one per page.
+
+    Raises:
+        requests.RequestException: If any page request fails. Pages already
+            yielded remain valid, so callers keep partial results.
+    """
+    if max_pages is None:
+        max_pages = Config.FHIR_MAX_PAGES
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending: Future | None = None
+    seen_urls: set[str] = set()
+
+    try:
+        page = _fetch_page(session, url, params, timeout)
+        pages_fetched = 1
+
+        while True:
+            next_url = get_next_link(page)
+            if next_url:
+                next_url = urljoin(url, next_url)
+                if next_url in seen_urls:
+                    logger.warning(f"FHIR paging loop detected at {next_url}, stopping")
+                    next_url = None
+                elif pages_fetched >= max_pages:
+                    logger.warning(
+                        f"FHIR search {url} exceeded {max_pages} pages, "
+                        f"remaining results were not retrieved"
+                    )
+                    next_url = None
+                else:
+                    seen_urls.add(next_url)
+
+            if next_url and executor:
+                pending = executor.submit(_fetch_page, session, next_url, None, timeout)
+
+            yield page
+
+            if not next_url:
+                return
+
+            if pending is not None:
+                page = pending.result()
+                pending = None
+            else:
+                page = _fetch_page(session, next_url, None, timeout)
+            pages_fetched += 1
+
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor:
+            executor.shutdown(wait=False)
+
+
+def iter_bundle_resources(
+    session: requests.Session,
+    url: str,
+    params: dict | list | None = None,
+    timeout: float = 30,
+    resource_type: str | None = None,
+    max_pages: int | None = None,
+    prefetch: bool = True,
+) -> Iterator[dict]:
+    """Iterate over resources in a paginated FHIR search.
+
+    Args:
+        session: HTTP session used for all page requests
+        url: Search URL
+        params: Query parameters for the first page
+        timeout: Per-request timeout in seconds
+        resource_type: Only yield resources of this type (skips _include
+            and OperationOutcome entries)
+        max_pages: Safety cap on pages fetched
+        prefetch: Request the next page while the current one is consumed
+
+    Yields:
+        Resource dicts in server order.
+    """
+    for page in iter_bundle_pages(
+        session, url, params, timeout=timeout, max_pages=max_pages, prefetch=prefetch
+    ):
+        for entry in page.get("entry", []) or []:
+            resource = entry.get("resource", {})
+            if resource_type and resource.get("resourceType") != resource_type:
+                continue
+            yield resource
@@ -6,21 +6,38 @@ from datetime import datetime, timedelta, date
 import requests
 
 from ..config import Config
+
+from common.fhir_client import get_shared_fhir_client
 from ..models import (
     ClinicalNote, DeviceInfo, CultureResult, Patient,
     VentilationEpisode, DailyVentParameters,
 )
-from .base import BaseNoteSource, BaseDeviceSource, BaseCultureSource, BaseVentilatorSource
+from .base import (
+    BaseNoteSource,
+    BaseDeviceSource,
+    BaseCultureSource,
+    BaseVentilatorSource,
+    NoteFetchError,
+    patient_batches,
+)
+from .fhir_paging import iter_bundle_pages, iter_bundle_resources
 
 logger = logging.getLogger(__name__)
 
 
+def _subject_id(resource: dict) -> str:
+    """Patient ID from a resource's subject (or patient) reference."""
+    reference = (resource.get("subject") or resource.get("patient") or {}).get("reference", "")
+    return reference.split("/")[-1]
+
+
 class FHIRNoteSource(BaseNoteSource):
     """FHIR DocumentReference-based note retrieval."""
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or Config.get_fhir_base_url()
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_notes_for_patient(
         self,
@@ -30,7 +47,24 @@ class FHIRNoteSource(BaseNoteSource):
         note_types: list[str] | None = None,
     ) -> list[ClinicalNote]:
         """Retrieve clinical notes from FHIR DocumentReference."""
+        try:
+            return self.fetch_notes_for_patient(patient_id, start_date, end_date, note_types)
+        except NoteFetchError as e:
+            logger.error(f"FHIR request failed: {e}")
+            return e.notes
+
+    def fetch_notes_for_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+        max_notes: int | None = None,
+    ) -> list[ClinicalNote]:
+        """Retrieve clinical notes, raising NoteFetchError if the search fails."""
         notes = []
+        if max_notes is None:
+            max_notes = Config.MAX_NOTES_PER_PATIENT
 
         params = {
             "patient": patient_id,
@@ -39,7 +73,8 @@ class FHIRNoteSource(BaseNoteSource):
                 f"le{end_date.strftime('%Y-%m-%d')}",
             ],
             "status": "current",
-            "_count": Config.MAX_NOTES_PER_PATIENT,
+            "_sort": "-date",
+            "_count": min(max_notes, 100),
         }
 
         # Add type filter if specified
@@ -50,21 +85,20 @@ class FHIRNoteSource(BaseNoteSource):
                 params["type"] = ",".join(type_codes)
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DocumentReference",
                 params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
+                resource_type="DocumentReference",
+            ):
                 note = self._parse_document_reference(resource)
                 if note:
                     notes.append(note)
+                    if len(notes) >= max_notes:
+                        break
 
         except requests.RequestException as e:
-            logger.error(f"FHIR request failed: {e}")
+            raise NoteFetchError(str(e), notes) from e
 
         return notes
 
@@ -191,7 +225,8 @@ class FHIRDeviceSource(BaseDeviceSource):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or Config.get_fhir_base_url()
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_central_lines(
         self,
@@ -208,16 +243,13 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
                 params=params,
                 timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
+                resource_type="DeviceUseStatement",
+            ):
                 # Skip entered-in-error status
                 if resource.get("status") == "entered-in-error":
                     continue
@@ -234,6 +266,66 @@ class FHIRDeviceSource(BaseDeviceSource):
 
         return devices
 
+    def get_central_lines_bulk(
+        self,
+        queries: list[tuple[str, datetime]],
+    ) -> list[list[DeviceInfo] | None]:
+        """Get central lines for several (patient_id, as_of_date) pairs.
+
+        Every patient's DeviceUseStatements are fetched in batched
+        multi-patient searches; line presence is then checked per query.
+        A query is None where its patient's search failed.
+        """
+        statements = self._device_use_statements_by_patient(
+            [patient_id for patient_id, _ in queries]
+        )
+        lines_by_patient = {
+            patient_id: [
+                device for device in map(self._parse_device_use_statement, resources)
+                if device and self._is_central_line(device)
+            ]
+            for patient_id, resources in statements.items()
+        }
+        return [
+            [line for line in lines_by_patient[patient_id] if self._was_present_at_date(line, as_of)]
+            if patient_id in lines_by_patient else None
+            for patient_id, as_of in queries
+        ]
+
+    def _device_use_statements_by_patient(self, patient_ids: list[str]) -> dict[str, list[dict]]:
+        """DeviceUseStatements for several patients, in batched searches.
+
+        Patients whose batch failed are left out of the result.
+        """
+        statements = {patient_id: [] for patient_id in patient_ids}
+
+        for batch in patient_batches(patient_ids):
+            params = {
+                "patient": ",".join(batch),
+                "_count": "200",
+            }
+            try:
+                for resource in iter_bundle_resources(
+                    self.session,
+                    f"{self.base_url}/DeviceUseStatement",
+                    params=params,
+                    timeout=30,
+                    resource_type="DeviceUseStatement",
+                ):
+                    # Skip entered-in-error status
+                    if resource.get("status") == "entered-in-error":
+                        continue
+                    patient_id = _subject_id(resource)
+                    if patient_id in statements:
+                        statements[patient_id].append(resource)
+
+            except requests.RequestException as e:
+                logger.error(f"FHIR device bulk query failed for {len(batch)} patients: {e}")
+                for patient_id in batch:
+                    statements.pop(patient_id, None)
+
+        return statements
+
     def get_active_devices(
         self,
         patient_id: str,
@@ -248,15 +340,12 @@ class FHIRDeviceSource(BaseDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
                 params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
+                resource_type="DeviceUseStatement",
+            ):
                 device = self._parse_device_use_statement(resource)
                 if device:
                     if device_types is None or device.device_type in device_types:
@@ -414,7 +503,8 @@ class FHIRCultureSource(BaseCultureSource):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or Config.get_fhir_base_url()
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_positive_blood_cultures(
         self,
@@ -436,43 +526,48 @@ class FHIRCultureSource(BaseCultureSource):
             "_count": "100",
         }
 
+        total_reports = 0
         try:
-            response = self.session.get(
+            # Patient lookup accumulates across pages; _include only carries
+            # each patient on the page of its first referencing report
+            patients = {}
+            for bundle in iter_bundle_pages(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
-
-            # Parse DiagnosticReports and filter for positive results
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_diagnostic_report(resource)
-                    if culture and culture.is_positive:
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-                        patient = patients.get(patient_id)
-
+            ):
+                entries = bundle.get("entry", [])
+
+                # Build patient lookup from included resources
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Patient":
+                        patient = self._parse_patient(resource)
                         if patient:
-                            results.append((patient, culture))
-                        else:
-                            # Fetch patient if not included
-                            patient = self._fetch_patient(patient_id)
+                            patients[patient.fhir_id] = patient
+
+                # Parse DiagnosticReports and filter for positive results
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "DiagnosticReport":
+                        total_reports += 1
+                        culture = self._parse_diagnostic_report(resource)
+                        if culture and culture.is_positive:
+                            patient_ref = resource.get("subject", {}).get("reference", "")
+                            patient_id = patient_ref.split("/")[-1]
+                            patient = patients.get(patient_id)
+
                             if patient:
                                 results.append((patient, culture))
+                            else:
+                                # Fetch patient if not included
+                                patient = self._fetch_patient(patient_id)
+                                if patient:
+                                    patients[patient_id] = patient
+                                    results.append((patient, culture))
 
-            logger.info(f"Found {len(results)} positive blood cultures from {len(bundle.get('entry', []))} total reports")
+            logger.info(f"Found {len(results)} positive blood cultures from {total_reports} total reports")
 
         except requests.RequestException as e:
             logger.error(f"FHIR culture query failed: {e}")
@@ -501,22 +596,65 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
                 params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+                resource_type="DiagnosticReport",
+            ):
+                culture = self._parse_diagnostic_report(resource)
+                if culture:
+                    results.append(culture)
 
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
+        except requests.RequestException as e:
+            logger.error(f"FHIR culture query failed: {e}")
+
+        return results
+
+    def get_cultures_for_patients(
+        self,
+        patient_ids: list[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, list[CultureResult]]:
+        """Get all cultures for several patients in batched searches.
+
+        Patients whose batch failed are left out of the result.
+        """
+        results = {patient_id: [] for patient_id in patient_ids}
+
+        all_culture_codes = set(self.BLOOD_CULTURE_CODES) | set(self.OTHER_CULTURE_CODES.keys())
+
+        for batch in patient_batches(patient_ids):
+            params = {
+                "patient": ",".join(batch),
+                "code": ",".join(all_culture_codes),
+                "date": [
+                    f"ge{start_date.strftime('%Y-%m-%d')}",
+                    f"le{end_date.strftime('%Y-%m-%d')}",
+                ],
+                "_count": "200",
+            }
+
+            try:
+                for resource in iter_bundle_resources(
+                    self.session,
+                    f"{self.base_url}/DiagnosticReport",
+                    params=params,
+                    timeout=30,
+                    resource_type="DiagnosticReport",
+                ):
+                    patient_id = _subject_id(resource)
+                    if patient_id not in results:
+                        continue
                     culture = self._parse_diagnostic_report(resource)
                     if culture:
-                        results.append(culture)
+                        results[patient_id].append(culture)
 
-        except requests.RequestException as e:
-            logger.error(f"FHIR culture query failed: {e}")
+            except requests.RequestException as e:
+                logger.error(f"FHIR culture bulk query failed for {len(batch)} patients: {e}")
+                for patient_id in batch:
+                    results.pop(patient_id, None)
 
         return results
 
@@ -630,9 +768,8 @@ class FHIRCultureSource(BaseCultureSource):
     def _fetch_patient(self, patient_id: str) -> Patient | None:
         """Fetch a patient by ID."""
         try:
-            response = self.session.get(f"{self.base_url}/Patient/{patient_id}")
-            response.raise_for_status()
-            return self._parse_patient(response.json())
+            resource = self.client.read("Patient", patient_id)
+            return self._parse_patient(resource)
         except requests.RequestException as e:
             logger.error(f"Failed to fetch patient {patient_id}: {e}")
             return None
@@ -661,20 +798,16 @@ class FHIRCultureSource(BaseCultureSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_other_culture(resource)
-                    if culture and culture.is_positive:
-                        results.append(culture)
+                resource_type="DiagnosticReport",
+            ):
+                culture = self._parse_other_culture(resource)
+                if culture and culture.is_positive:
+                    results.append(culture)
 
         except requests.RequestException as e:
             logger.error(f"FHIR other culture query failed: {e}")
@@ -820,7 +953,8 @@ class FHIRVentilatorSource(BaseVentilatorSource):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or Config.get_fhir_base_url()
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_ventilated_patients(
         self,
@@ -847,28 +981,26 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
+            # Episodes for one patient may span pages, so group across the
+            # whole search before filtering
+            patients = {}
+            episodes_by_patient = {}
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Procedure",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            ):
+                resource_type = resource.get("resourceType")
 
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
+                # Build patient lookup from included resources
+                if resource_type == "Patient":
                     patient = self._parse_patient(resource)
                     if patient:
                         patients[patient.fhir_id] = patient
 
-            # Parse Procedure resources to find ventilation episodes
-            episodes_by_patient = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
+                # Parse Procedure resources to find ventilation episodes
+                elif resource_type == "Procedure":
                     episode = self._parse_ventilation_procedure(resource)
                     if episode:
                         patient_id = episode.patient_id
@@ -903,8 +1035,8 @@ class FHIRVentilatorSource(BaseVentilatorSource):
     ) -> list[DailyVentParameters]:
         """Get daily ventilator parameters for a ventilation episode.
 
-        Queries FHIR Observation resources for FiO2 and PEEP values,
-        calculates the minimum for each calendar day.
+        Queries FHIR Observation resources for FiO2 and PEEP values in one
+        search, calculates the minimum for each calendar day.
         """
         results = []
 
@@ -916,31 +1048,25 @@ class FHIRVentilatorSource(BaseVentilatorSource):
 
         patient_id = parts[0]
 
-        # Query FiO2 observations
-        fio2_by_date = self._get_daily_min_observations(
+        # Query FiO2 and PEEP observations together
+        daily_mins = self._get_daily_min_observations(
             patient_id,
-            self.FIO2_LOINC_CODES,
-            start_date,
-            end_date,
-        )
-
-        # Query PEEP observations
-        peep_by_date = self._get_daily_min_observations(
-            patient_id,
-            self.PEEP_LOINC_CODES,
+            {"fio2": self.FIO2_LOINC_CODES, "peep": self.PEEP_LOINC_CODES},
             start_date,
             end_date,
         )
+        fio2_by_date = daily_mins["fio2"]
+        peep_by_date = daily_mins["peep"]
 
         # Merge FiO2 and PEEP data by date
         all_dates = set(fio2_by_date.keys()) | set(peep_by_date.keys())
+        intubation_date = datetime.fromisoformat(parts[1]).date() if len(parts) > 1 else start_date
 
         for day_date in sorted(all_dates):
             fio2_data = fio2_by_date.get(day_date, {})
             peep_data = peep_by_date.get(day_date, {})
 
             # Calculate ventilator day (1-based from start of episode)
-            intubation_date = datetime.fromisoformat(parts[1]).date() if len(parts) > 1 else start_date
             vent_day = (day_date - intubation_date).days + 1
 
             param = DailyVentParameters(
@@ -975,20 +1101,16 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Procedure",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    episode = self._parse_ventilation_procedure(resource)
-                    if episode:
-                        results.append(episode)
+                resource_type="Procedure",
+            ):
+                episode = self._parse_ventilation_procedure(resource)
+                if episode:
+                    results.append(episode)
 
         except requests.RequestException as e:
             logger.error(f"FHIR ventilation episodes query failed: {e}")
@@ -1058,19 +1180,26 @@ class FHIRVentilatorSource(BaseVentilatorSource):
     def _get_daily_min_observations(
         self,
         patient_id: str,
-        loinc_codes: list[str],
+        loinc_groups: dict[str, list[str]],
         start_date: date,
         end_date: date,
-    ) -> dict[date, dict]:
-        """Get minimum observation values for each day.
+    ) -> dict[str, dict[date, dict]]:
+        """Get minimum observation values for each day, per group of codes.
+
+        All groups are fetched in one Observation search, and each result is
+        assigned to the group its LOINC code belongs to.
 
-        Returns dict mapping date to {"value": float, "id": str}
+        Returns dict mapping group name to a dict mapping date to
+        {"value": float, "id": str}
         """
-        daily_mins = {}
+        group_by_code = {
+            code: group for group, codes in loinc_groups.items() for code in codes
+        }
+        daily_mins = {group: {} for group in loinc_groups}
 
         params = {
             "patient": patient_id,
-            "code": ",".join(loinc_codes),
+            "code": ",".join(group_by_code),
             "date": [
                 f"ge{start_date.isoformat()}",
                 f"le{end_date.isoformat()}",
@@ -1080,17 +1209,22 @@ class FHIRVentilatorSource(BaseVentilatorSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Observation",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") != "Observation":
+                resource_type="Observation",
+            ):
+                group = next(
+                    (
+                        group_by_code[coding.get("code")]
+                        for coding in resource.get("code", {}).get("coding", [])
+                        if coding.get("code") in group_by_code
+                    ),
+                    None,
+                )
+                if group is None:
                     continue
 
                 # Get date
@@ -1108,8 +1242,9 @@ class FHIRVentilatorSource(BaseVentilatorSource):
 
                 # Track minimum for each day
                 obs_id = resource.get("id")
-                if obs_date not in daily_mins or value < daily_mins[obs_date]["value"]:
-                    daily_mins[obs_date] = {"value": value, "id": obs_id}
+                group_mins = daily_mins[group]
+                if obs_date not in group_mins or value < group_mins[obs_date]["value"]:
+                    group_mins[obs_date] = {"value": value, "id": obs_id}
 
         except requests.RequestException as e:
             logger.error(f"FHIR observation query failed: {e}")
@@ -1119,12 +1254,7 @@ class FHIRVentilatorSource(BaseVentilatorSource):
     def _get_encounter_location(self, encounter_id: str) -> str | None:
         """Get location code from an encounter."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/Encounter/{encounter_id}",
-                timeout=10,
-            )
-            response.raise_for_status()
-            encounter = response.json()
+            encounter = self.client.read("Encounter", encounter_id, timeout=10)
 
             # Get location from encounter.location[]
             for loc in encounter.get("location", []):
@@ -1179,12 +1309,8 @@ class FHIRVentilatorSource(BaseVentilatorSource):
     def _fetch_patient(self, patient_id: str) -> Patient | None:
         """Fetch a patient by ID."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/Patient/{patient_id}",
-                timeout=10,
-            )
-            response.raise_for_status()
-            return self._parse_patient(response.json())
+            resource = self.client.read("Patient", patient_id, timeout=10)
+            return self._parse_patient(resource)
         except requests.RequestException as e:
             logger.error(f"Failed to fetch patient {patient_id}: {e}")
             return None
@@ -1239,17 +1365,13 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
                 params=params,
                 timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-
+                resource_type="DeviceUseStatement",
+            ):
                 # Skip entered-in-error status
                 if resource.get("status") == "entered-in-error":
                     continue
@@ -1266,6 +1388,37 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
 
         return devices
 
+    def get_urinary_catheters_bulk(
+        self,
+        queries: list[tuple[str, datetime]],
+    ) -> list[list[DeviceInfo] | None]:
+        """Get urinary catheters for several (patient_id, as_of_date) pairs.
+
+        Every patient's DeviceUseStatements are fetched in batched
+        multi-patient searches; catheter presence is then checked per query.
+
+        Returns:
+            Lists of urinary catheters present, in query order; None where
+            the query's patient's search failed
+        """
+        statements = self._device_use_statements_by_patient(
+            [patient_id for patient_id, _ in queries]
+        )
+        catheters_by_patient = {}
+        for patient_id, resources in statements.items():
+            catheters = []
+            for resource in resources:
+                device = self._parse_urinary_catheter(resource)
+                if device and self._is_urinary_catheter(device, resource):
+                    catheters.append(device)
+            catheters_by_patient[patient_id] = catheters
+
+        return [
+            [c for c in catheters_by_patient[patient_id] if self._was_present_at_date(c, as_of)]
+            if patient_id in catheters_by_patient else None
+            for patient_id, as_of in queries
+        ]
+
     def get_all_urinary_catheter_episodes(
         self,
         patient_id: str,
@@ -1289,17 +1442,13 @@ class FHIRUrinaryCatheterSource(FHIRDeviceSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DeviceUseStatement",
                 params=params,
                 timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-
+                resource_type="DeviceUseStatement",
+            ):
                 if resource.get("status") == "entered-in-error":
                     continue
 
@@ -1470,46 +1619,47 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
+            patients = {}
+            for bundle in iter_bundle_pages(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
-
-            # Parse urine culture DiagnosticReports
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_urine_culture(resource)
-
-                    if culture and culture.is_positive:
-                        # Check CFU threshold if available
-                        cfu_ml = self._extract_cfu_ml(resource)
-                        if cfu_ml is None or cfu_ml >= min_cfu_ml:
-                            patient_ref = resource.get("subject", {}).get("reference", "")
-                            patient_id = patient_ref.split("/")[-1]
-                            patient = patients.get(patient_id)
+            ):
+                entries = bundle.get("entry", [])
+
+                # Build patient lookup from included resources
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Patient":
+                        patient = self._parse_patient(resource)
+                        if patient:
+                            patients[patient.fhir_id] = patient
+
+                # Parse urine culture DiagnosticReports
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "DiagnosticReport":
+                        culture = self._parse_urine_culture(resource)
+
+                        if culture and culture.is_positive:
+                            # Check CFU threshold if available
+                            cfu_ml = self._extract_cfu_ml(resource)
+                            if cfu_ml is None or cfu_ml >= min_cfu_ml:
+                                patient_ref = resource.get("subject", {}).get("reference", "")
+                                patient_id = patient_ref.split("/")[-1]
+                                patient = patients.get(patient_id)
 
-                            if patient:
-                                # Store CFU in culture result for later use
-                                culture._cfu_ml = cfu_ml
-                                results.append((patient, culture))
-                            else:
-                                patient = self._fetch_patient(patient_id)
                                 if patient:
+                                    # Store CFU in culture result for later use
                                     culture._cfu_ml = cfu_ml
                                     results.append((patient, culture))
+                                else:
+                                    patient = self._fetch_patient(patient_id)
+                                    if patient:
+                                        patients[patient_id] = patient
+                                        culture._cfu_ml = cfu_ml
+                                        results.append((patient, culture))
 
             logger.info(f"Found {len(results)} positive urine cultures meeting CAUTI criteria")
 
@@ -1537,21 +1687,17 @@ class FHIRUrineCultureSource(FHIRCultureSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/DiagnosticReport",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "DiagnosticReport":
-                    culture = self._parse_urine_culture(resource)
-                    if culture:
-                        culture._cfu_ml = self._extract_cfu_ml(resource)
-                        results.append(culture)
+                resource_type="DiagnosticReport",
+            ):
+                culture = self._parse_urine_culture(resource)
+                if culture:
+                    culture._cfu_ml = self._extract_cfu_ml(resource)
+                    results.append(culture)
 
         except requests.RequestException as e:
             logger.error(f"FHIR urine culture patient query failed: {e}")
@@ -1727,7 +1873,8 @@ class FHIRCDITestSource:
     def __init__(self, base_url: str | None = None):
         from ..config import Config
         self.base_url = base_url or Config.get_fhir_base_url()
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_positive_cdi_tests(
         self,
@@ -1764,40 +1911,41 @@ class FHIRCDITestSource:
         }
 
         try:
-            response = self.session.get(
+            patients = {}
+            for bundle in iter_bundle_pages(
+                self.session,
                 f"{self.base_url}/Observation",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # Build patient lookup from included resources
-            patients = {}
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients[patient.fhir_id] = patient
+            ):
+                entries = bundle.get("entry", [])
+
+                # Build patient lookup from included resources
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Patient":
+                        patient = self._parse_patient(resource)
+                        if patient:
+                            patients[patient.fhir_id] = patient
 
-            # Parse Observation resources for positive CDI tests
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Observation":
-                    cdi_test = self._parse_cdi_observation(resource)
+                # Parse Observation resources for positive CDI tests
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Observation":
+                        cdi_test = self._parse_cdi_observation(resource)
 
-                    if cdi_test and cdi_test.result == "positive":
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-                        patient = patients.get(patient_id)
+                        if cdi_test and cdi_test.result == "positive":
+                            patient_ref = resource.get("subject", {}).get("reference", "")
+                            patient_id = patient_ref.split("/")[-1]
+                            patient = patients.get(patient_id)
 
-                        if patient:
-                            results.append((patient, cdi_test))
-                        else:
-                            patient = self._fetch_patient(patient_id)
                             if patient:
                                 results.append((patient, cdi_test))
+                            else:
+                                patient = self._fetch_patient(patient_id)
+                                if patient:
+                                    patients[patient_id] = patient
+                                    results.append((patient, cdi_test))
 
             logger.info(f"Found {len(results)} positive CDI tests from FHIR")
 
@@ -1846,20 +1994,16 @@ class FHIRCDITestSource:
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Observation",
                 params=params,
                 timeout=30,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Observation":
-                    cdi_test = self._parse_cdi_observation(resource)
-                    if cdi_test and cdi_test.result == "positive":
-                        results.append(cdi_test)
+                resource_type="Observation",
+            ):
+                cdi_test = self._parse_cdi_observation(resource)
+                if cdi_test and cdi_test.result == "positive":
+                    results.append(cdi_test)
 
         except requests.RequestException as e:
             logger.error(f"FHIR CDI history query failed: {e}")
@@ -1892,13 +2036,7 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
-                f"{self.base_url}/Encounter",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            bundle = self.client.get("Encounter", params, timeout=10)
 
             for entry in bundle.get("entry", []):
                 resource = entry.get("resource", {})
@@ -1946,13 +2084,7 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
-                f"{self.base_url}/Encounter",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            bundle = self.client.get("Encounter", params, timeout=10)
 
             for entry in bundle.get("entry", []):
                 resource = entry.get("resource", {})
@@ -2003,13 +2135,7 @@ class FHIRCDITestSource:
                 "_count": "1",
             }
 
-            response = self.session.get(
-                f"{self.base_url}/Encounter",
-                params=params,
-                timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
+            bundle = self.client.get("Encounter", params, timeout=10)
 
             for entry in bundle.get("entry", []):
                 resource = entry.get("resource", {})
@@ -2044,6 +2170,174 @@ class FHIRCDITestSource:
 
         return info
 
+    def get_cdi_history_for_patients(
+        self,
+        patient_ids: list[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> dict[str, list["CDITestResult"]]:
+        """Get positive qualifying CDI tests for several patients.
+
+        Batched counterpart of get_patient_cdi_history for a whole detection
+        run: covers start_date (inclusive) to end_date (exclusive), by day.
+
+        Returns:
+            Dict of patient ID to positive CDI tests ordered by date
+            descending. Patients whose batch failed are left out.
+        """
+        results = {patient_id: [] for patient_id in patient_ids}
+
+        all_codes = set(self.CDI_TOXIN_LOINC_CODES.keys()) | set(self.CDI_MOLECULAR_LOINC_CODES.keys())
+
+        for batch in patient_batches(patient_ids):
+            params = {
+                "patient": ",".join(batch),
+                "code": ",".join(all_codes),
+                "date": [
+                    f"ge{start_date.strftime('%Y-%m-%d')}",
+                    f"lt{end_date.strftime('%Y-%m-%d')}",
+                ],
+                "_count": "200",
+            }
+
+            try:
+                for resource in iter_bundle_resources(
+                    self.session,
+                    f"{self.base_url}/Observation",
+                    params=params,
+                    timeout=30,
+                    resource_type="Observation",
+                ):
+                    patient_id = _subject_id(resource)
+                    if patient_id not in results:
+                        continue
+                    cdi_test = self._parse_cdi_observation(resource)
+                    if cdi_test and cdi_test.result == "positive":
+                        results[patient_id].append(cdi_test)
+
+            except requests.RequestException as e:
+                logger.error(f"FHIR CDI history bulk query failed for {len(batch)} patients: {e}")
+                for patient_id in batch:
+                    results.pop(patient_id, None)
+
+        for tests in results.values():
+            tests.sort(key=lambda t: t.test_date, reverse=True)
+
+        return results
+
+    def get_encounters_for_patients(
+        self,
+        patient_ids: list[str],
+        start_date: datetime,
+        end_date: datetime,
+        status: str = "in-progress,finished",
+        encounter_class: str | None = None,
+    ) -> dict[str, list[dict]]:
+        """Get encounters overlapping a date range for several patients.
+
+        Feeds admission_date_from_encounters and
+        prior_discharge_from_encounters, which answer the per-test questions
+        of get_patient_admission_date and get_patient_prior_discharge in
+        memory.
+
+        Returns:
+            Dict of patient ID to encounter dicts (id, status, class, start,
+            end, facility). Patients whose batch failed are left out.
+        """
+        results = {patient_id: [] for patient_id in patient_ids}
+
+        for batch in patient_batches(patient_ids):
+            params = {
+                "patient": ",".join(batch),
+                "status": status,
+                "date": [
+                    f"ge{start_date.strftime('%Y-%m-%d')}",
+                    f"le{end_date.strftime('%Y-%m-%d')}",
+                ],
+                "_count": "200",
+            }
+            if encounter_class:
+                params["class"] = encounter_class
+
+            try:
+                for resource in iter_bundle_resources(
+                    self.session,
+                    f"{self.base_url}/Encounter",
+                    params=params,
+                    timeout=30,
+                    resource_type="Encounter",
+                ):
+                    patient_id = _subject_id(resource)
+                    if patient_id in results:
+                        results[patient_id].append(self._parse_encounter(resource))
+
+            except requests.RequestException as e:
+                logger.error(f"FHIR encounter bulk query failed for {len(batch)} patients: {e}")
+                for patient_id in batch:
+                    results.pop(patient_id, None)
+
+        return results
+
+    @staticmethod
+    def admission_date_from_encounters(
+        encounters: list[dict],
+        as_of_date: datetime,
+    ) -> datetime | None:
+        """Admission date of the latest encounter started by as_of_date."""
+        started = [
+            e for e in encounters
+            if e["start"] and e["start"].date() <= as_of_date.date()
+        ]
+        if not started:
+            return None
+        return max(started, key=lambda e: e["start"])["start"]
+
+    @staticmethod
+    def prior_discharge_from_encounters(
+        encounters: list[dict],
+        before_date: datetime,
+        lookback_days: int = 28,
+    ) -> tuple[datetime | None, str | None]:
+        """Most recent prior discharge among inpatient encounters.
+
+        Encounters must come from a finished, inpatient-class search.
+
+        Returns:
+            Tuple of (discharge_date, facility_name) or (None, None)
+        """
+        window_start = (before_date - timedelta(days=lookback_days)).date()
+        overlapping = [
+            e for e in encounters
+            if e["start"] and e["start"].date() < before_date.date()
+            and (e["end"] is None or e["end"].date() >= window_start)
+        ]
+        if not overlapping:
+            return (None, None)
+
+        latest = max(overlapping, key=lambda e: e["start"])
+        if latest["end"] is None:
+            return (None, None)
+        return (latest["end"], latest["facility"])
+
+    def _parse_encounter(self, resource: dict) -> dict:
+        """Parse a FHIR Encounter into the fields CDI classification needs."""
+        period = resource.get("period", {})
+        enc_class = resource.get("class", {})
+        return {
+            "id": resource.get("id"),
+            "status": resource.get("status"),
+            "class": enc_class.get("code") if isinstance(enc_class, dict) else None,
+            "start": (
+                datetime.fromisoformat(period["start"].replace("Z", "+00:00"))
+                if period.get("start") else None
+            ),
+            "end": (
+                datetime.fromisoformat(period["end"].replace("Z", "+00:00"))
+                if period.get("end") else None
+            ),
+            "facility": resource.get("serviceProvider", {}).get("display"),
+        }
+
     def _parse_cdi_observation(self, resource: dict) -> "CDITestResult | None":
         """Parse a FHIR Observation resource to CDITestResult."""
         from ..models import CDITestResult
@@ -2227,12 +2521,8 @@ class FHIRCDITestSource:
     def _fetch_patient(self, patient_id: str) -> "Patient | None":
         """Fetch a patient by ID."""
         try:
-            response = self.session.get(
-                f"{self.base_url}/Patient/{patient_id}",
-                timeout=10,
-            )
-            response.raise_for_status()
-            return self._parse_patient(response.json())
+            resource = self.client.read("Patient", patient_id, timeout=10)
+            return self._parse_patient(resource)
         except requests.RequestException as e:
             logger.error(f"Failed to fetch patient {patient_id}: {e}")
             return None
@@ -2280,19 +2570,13 @@ class FHIRCDITestSource:
                 ("_sort", "-date"),
             ]
 
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Observation",
                 params=params,
                 timeout=10,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") != "Observation":
-                    continue
-
+                resource_type="Observation",
+            ):
                 observation = self._parse_stool_observation(resource)
                 if observation:
                     results.append(observation)
@@ -0,0 +1,526 @@
+"""Local incremental clinical-note store with a full-text index.
+
+Candidate detection, triage, full extraction and the IP review UI each
+fetch the same patient's notes from FHIR or Clarity. LocalNoteStore sits
+in front of the EHR note source and keeps the notes in SQLite:
+- Per patient (and note-type filter) it records the date range already
+  fetched and a watermark, the date of the latest note seen
+- Requests inside that range are answered locally; only the part before
+  the range, and the recent tail from the watermark minus an overlap
+  (late-signed notes and addenda), go back to the EHR, and the tail at
+  most once per NOTE_STORE_REFRESH_SECONDS
+- Days before the patient's earliest note came back empty; that answer is
+  re-checked after NOTE_STORE_EMPTY_TTL_SECONDS
+- Syncs fetch up to NOTE_STORE_SYNC_MAX_NOTES notes per window; reads
+  return at most MAX_NOTES_PER_PATIENT, newest first, like the EHR sources
+- A fetch that fails, or returns NOTE_STORE_SYNC_MAX_NOTES notes and so may
+  be truncated, stores its notes but does not extend the synced range
+- Notes are deduplicated by note id; edited notes replace the stored copy
+- A window fetched completely replaces the stored notes in it: notes the
+  EHR no longer returns (entered-in-error, superseded) are deleted
+- search_notes() answers keyword searches from an FTS5 trigram index, which
+  matches case-insensitive substrings like the in-memory keyword scans
+- purge_expired() deletes notes older than NOTE_STORE_RETENTION_DAYS; the
+  HAI monitor calls it every cycle
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from common.sqlite_pool import get_connection_manager
+
+from ..config import Config
+from ..models import ClinicalNote
+from .base import BaseNoteSource, NoteFetchError
+
+logger = logging.getLogger(__name__)
+
+# FTS5 trigram tokens: shorter keywords cannot use the index
+MIN_FTS_KEYWORD_LENGTH = 3
+
+
+def _date_key(value: datetime) -> str:
+    """Sortable naive-UTC ISO string for a naive or aware datetime."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="seconds")
+
+
+def _day_start(value: datetime) -> str:
+    return _date_key(value)[:10]
+
+
+def _day_after(value: datetime) -> str:
+    return (datetime.fromisoformat(_date_key(value)[:10]) + timedelta(days=1)).date().isoformat()
+
+
+def _types_key(note_types: list[str] | None) -> str:
+    return ",".join(sorted(set(note_types))) if note_types else "*"
+
+
+class LocalNoteStore(BaseNoteSource):
+    """SQLite-backed note source that syncs incrementally from an EHR source.
+
+    Date windows follow the FHIR source: whole days, start and end day
+    included. Thread-safe; concurrent requests for one patient share a
+    single upstream fetch.
+    """
+
+    def __init__(
+        self,
+        upstream: BaseNoteSource,
+        db_path: str | None = None,
+        refresh_seconds: int | None = None,
+        overlap_hours: int | None = None,
+        retention_days: int | None = None,
+        empty_ttl_seconds: int | None = None,
+    ):
+        """Initialize store.
+
+        Args:
+            upstream: EHR note source to sync from (FHIR, Clarity, composite).
+            db_path: SQLite file. Defaults to Config.NOTE_STORE_DB_PATH.
+            refresh_seconds: How long a synced range is served without
+                asking the EHR for new notes. Config.NOTE_STORE_REFRESH_SECONDS
+                if None.
+            overlap_hours: How far behind the watermark a refresh starts.
+                Config.NOTE_STORE_OVERLAP_HOURS if None.
+            retention_days: Age after which purge_expired() deletes notes;
+                0 keeps them. Config.NOTE_STORE_RETENTION_DAYS if None.
+            empty_ttl_seconds: How long days that returned no notes are
+                served before asking the EHR again.
+                Config.NOTE_STORE_EMPTY_TTL_SECONDS if None.
+        """
+        self.upstream = upstream
+        self.db_path = str(db_path or Config.NOTE_STORE_DB_PATH)
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else Config.NOTE_STORE_REFRESH_SECONDS
+        )
+        self.overlap = timedelta(
+            hours=overlap_hours if overlap_hours is not None else Config.NOTE_STORE_OVERLAP_HOURS
+        )
+        self.retention_days = (
+            retention_days if retention_days is not None else Config.NOTE_STORE_RETENTION_DAYS
+        )
+        self.empty_ttl_seconds = (
+            empty_ttl_seconds if empty_ttl_seconds is not None
+            else Config.NOTE_STORE_EMPTY_TTL_SECONDS
+        )
+
+        self._lock = threading.Lock()
+        self._patient_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._counts: dict[str, int] = defaultdict(int)
+        self._ensure_db()
+
+    def _ensure_db(self):
+        """Create database and tables if they don't exist (once per process)."""
+        if os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        schema_path = Path(__file__).parent / "note_store.sql"
+        self._db = get_connection_manager(self.db_path)
+        with open(schema_path) as f:
+            self._db.ensure_schema("note_store", f.read(), migrate=self._run_migrations, version=2)
+
+    @staticmethod
+    def _run_migrations(conn) -> None:
+        """Add new columns to existing databases."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(note_sync_state)")}
+        # v2: empty replies expire
+        if "earliest" not in columns:
+            conn.execute("ALTER TABLE note_sync_state ADD COLUMN earliest TEXT")
+        if "empty_synced_at" not in columns:
+            conn.execute("ALTER TABLE note_sync_state ADD COLUMN empty_synced_at REAL")
+
+    def _connect(self):
+        """Get this thread's pooled database connection."""
+        return self._db.connect()
+
+    # --- BaseNoteSource ---
+
+    def get_notes_for_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+    ) -> list[ClinicalNote]:
+        """Sync the window if needed, then return the newest stored notes.
+
+        At most Config.MAX_NOTES_PER_PATIENT notes, newest first.
+        """
+        self.sync_patient(patient_id, start_date, end_date, note_types)
+        return self._query(
+            patient_id, _day_start(start_date), _day_after(end_date), note_types,
+            limit=Config.MAX_NOTES_PER_PATIENT,
+        )
+
+    def get_note_by_id(self, note_id: str) -> ClinicalNote | None:
+        """Return the stored note, fetching (and storing) it on a miss."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM clinical_notes WHERE note_id = ?", (note_id,)
+            ).fetchone()
+        if row is not None:
+            self._count("local_hits")
+            return self._row_to_note(row)
+
+        note = self.upstream.get_note_by_id(note_id)
+        self._count("upstream_fetches")
+        if note is not None:
+            self.store_notes([note])
+        return note
+
+    # --- Sync ---
+
+    def sync_patient(
+        self,
+        patient_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+    ) -> int:
+        """Fetch whatever part of the window is not yet stored or may have changed.
+
+        Returns:
+            Number of notes inserted or updated.
+        """
+        types_key = _types_key(note_types)
+        start_key, end_key = _day_start(start_date), _day_after(end_date)
+
+        with self._lock:
+            patient_lock = self._patient_locks[patient_id]
+        with patient_lock:
+            with self._connect() as conn:
+                state = conn.execute(
+                    "SELECT * FROM note_sync_state WHERE patient_id = ? AND note_types = ?",
+                    (patient_id, types_key),
+                ).fetchone()
+
+            windows, refresh, rechecked_empty = self._windows_to_fetch(state, start_key, end_key)
+            if not windows:
+                self._count("local_hits")
+                return 0
+
+            changed = 0
+            fetched: list[ClinicalNote] = []
+            for window_start, window_end in windows:
+                try:
+                    notes = self.upstream.fetch_notes_for_patient(
+                        patient_id,
+                        datetime.fromisoformat(window_start),
+                        datetime.fromisoformat(window_end) - timedelta(days=1),
+                        note_types,
+                        max_notes=Config.NOTE_STORE_SYNC_MAX_NOTES,
+                    )
+                except Exception as e:
+                    logger.warning(f"Note sync failed for {patient_id}, serving stored notes: {e}")
+                    if isinstance(e, NoteFetchError):
+                        changed += self.store_notes(e.notes)
+                    return changed
+                self._count("upstream_fetches")
+                fetched += notes
+                changed += self.store_notes(notes)
+                if len(notes) >= Config.NOTE_STORE_SYNC_MAX_NOTES:
+                    # The EHR may have cut the window short; ask again next time
+                    logger.debug(f"Note sync for {patient_id} hit the note limit, range left open")
+                    return changed
+                changed += self._delete_missing(patient_id, window_start, window_end, note_types, notes)
+
+            self._update_state(
+                patient_id, types_key, state, start_key, end_key, fetched, refresh, rechecked_empty,
+            )
+            return changed
+
+    def _windows_to_fetch(
+        self,
+        state,
+        start_key: str,
+        end_key: str,
+    ) -> tuple[list[tuple[str, str]], bool, bool]:
+        """Day ranges [start, end) to fetch.
+
+        Returns:
+            The windows, whether the recent tail is among them, and whether
+            they re-read every day before the earliest stored note.
+        """
+        if (
+            state is None
+            or end_key < state["covered_start"]
+            or start_key > state["covered_end"]
+        ):
+            # Nothing stored for this range (or it doesn't touch what is)
+            return [(start_key, end_key)], True, True
+
+        # Days before the earliest note came back empty; trusted for a while
+        empty_end = state["covered_end"]
+        if state["earliest"]:
+            empty_end = max(state["covered_start"], min(empty_end, state["earliest"][:10]))
+        head_end = state["covered_start"]
+        empty_stale = time.time() - (state["empty_synced_at"] or 0) >= self.empty_ttl_seconds
+        if empty_stale and start_key < empty_end:
+            head_end = max(head_end, min(empty_end, end_key))
+
+        windows = []
+        if start_key < head_end:
+            windows.append((start_key, head_end))
+
+        # Notes dated after this may still be signed or amended
+        settled = state["covered_start"]
+        if state["watermark"]:
+            settled = max(settled, (
+                datetime.fromisoformat(state["watermark"]) - self.overlap
+            ).date().isoformat())
+        settled = min(settled, state["covered_end"])
+
+        stale = time.time() - state["synced_at"] >= self.refresh_seconds
+        refresh = end_key > state["covered_end"] or (stale and end_key > settled)
+        if refresh:
+            tail_start = max(start_key, settled)
+            if windows and tail_start <= windows[-1][1]:
+                windows[-1] = (windows[-1][0], end_key)
+            else:
+                windows.append((tail_start, end_key))
+
+        rechecked_empty = bool(windows) and (
+            windows[0][0] <= state["covered_start"] and windows[0][1] >= empty_end
+        )
+        return windows, refresh, rechecked_empty
+
+    def _update_state(
+        self,
+        patient_id: str,
+        types_key: str,
+        state,
+        start_key: str,
+        end_key: str,
+        fetched: list[ClinicalNote],
+        refresh: bool,
+        rechecked_empty: bool,
+    ) -> None:
+        keys = [_date_key(note.date) for note in fetched]
+        watermark, earliest = max(keys, default=None), min(keys, default=None)
+        covered_start, covered_end = start_key, end_key
+        synced_at = empty_synced_at = time.time()
+        if state is not None and not (
+            end_key < state["covered_start"] or start_key > state["covered_end"]
+        ):
+            covered_start = min(start_key, state["covered_start"])
+            covered_end = max(end_key, state["covered_end"])
+            watermark = max(watermark or "", state["watermark"] or "") or None
+            earliest = min(filter(None, (earliest, state["earliest"])), default=None)
+            if not refresh:
+                synced_at = state["synced_at"]
+            if not rechecked_empty:
+                # Newly fetched empty days expire with the ones already stored
+                empty_synced_at = state["empty_synced_at"] or 0
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO note_sync_state
+                (patient_id, note_types, covered_start, covered_end, watermark, synced_at,
+                 earliest, empty_synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    patient_id, types_key, covered_start, covered_end, watermark, synced_at,
+                    earliest, empty_synced_at,
+                ),
+            )
+
+    def store_notes(self, notes: list[ClinicalNote]) -> int:
+        """Insert new notes and replace changed ones, keyed by note id.
+
+        Returns:
+            Number of notes inserted or updated.
+        """
+        if not notes:
+            return 0
+        now = time.time()
+        rows = [
+            (
+                note.id, note.patient_id, note.note_type, note.date.isoformat(),
+                _date_key(note.date), note.author, note.source, note.content,
+                hashlib.sha256(note.content.encode()).hexdigest(), now,
+            )
+            for note in notes
+        ]
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """INSERT INTO clinical_notes
+                (note_id, patient_id, note_type, note_date, date_key, author,
+                 source, content, content_hash, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(note_id) DO UPDATE SET
+                    note_type = excluded.note_type,
+                    note_date = excluded.note_date,
+                    date_key = excluded.date_key,
+                    author = excluded.author,
+                    content = excluded.content,
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at
+                WHERE clinical_notes.content_hash != excluded.content_hash
+                   OR clinical_notes.date_key != excluded.date_key
+                   OR clinical_notes.note_type != excluded.note_type""",
+                rows,
+            )
+            changed = conn.total_changes - before
+        self._count("notes_stored", changed)
+        return changed
+
+    def _delete_missing(
+        self,
+        patient_id: str,
+        start_key: str,
+        end_key: str,
+        note_types: list[str] | None,
+        notes: list[ClinicalNote],
+    ) -> int:
+        """Delete stored notes in a completely fetched window the EHR didn't return.
+
+        Returns:
+            Number of notes deleted.
+        """
+        sql = (
+            "DELETE FROM clinical_notes"
+            " WHERE patient_id = ? AND date_key >= ? AND date_key < ?"
+        )
+        params: list = [patient_id, start_key, end_key]
+        if note_types:
+            sql += f" AND note_type IN ({','.join('?' * len(note_types))})"
+            params += list(note_types)
+        returned = [note.id for note in notes]
+        if returned:
+            sql += f" AND note_id NOT IN ({','.join('?' * len(returned))})"
+            params += returned
+        with self._connect() as conn:
+            deleted = conn.execute(sql, params).rowcount
+        if deleted:
+            logger.info(f"Removed {deleted} stored notes for {patient_id} no longer in the EHR")
+            self._count("notes_removed", deleted)
+        return deleted
+
+    # --- Queries ---
+
+    def search_notes(
+        self,
+        patient_id: str,
+        keywords: list[str],
+        start_date: datetime,
+        end_date: datetime,
+        note_types: list[str] | None = None,
+    ) -> list[ClinicalNote]:
+        """Notes in the window containing any keyword (case-insensitive substring).
+
+        Syncs the window first, then answers from the full-text index.
+        Returns the same notes as scanning every stored note in the window
+        for the keywords, newest first; not capped at MAX_NOTES_PER_PATIENT.
+        """
+        self.sync_patient(patient_id, start_date, end_date, note_types)
+        keywords = [kw for kw in keywords if kw]
+        if not keywords:
+            return []
+        start_key, end_key = _day_start(start_date), _day_after(end_date)
+
+        if any(len(kw) < MIN_FTS_KEYWORD_LENGTH for kw in keywords):
+            # Too short for trigrams: filter the window in Python
+            lowered = [kw.lower() for kw in keywords]
+            return [
+                note for note in self._query(patient_id, start_key, end_key, note_types)
+                if any(kw in note.content.lower() for kw in lowered)
+            ]
+
+        match = " OR ".join('"' + kw.replace('"', '""') + '"' for kw in keywords)
+        return self._query(patient_id, start_key, end_key, note_types, match=match)
+
+    def _query(
+        self,
+        patient_id: str,
+        start_key: str,
+        end_key: str,
+        note_types: list[str] | None = None,
+        match: str | None = None,
+        limit: int | None = None,
+    ) -> list[ClinicalNote]:
+        sql = "SELECT n.* FROM clinical_notes n"
+        params: list = []
+        if match:
+            sql += " JOIN clinical_notes_fts f ON f.rowid = n.rowid AND clinical_notes_fts MATCH ?"
+            params.append(match)
+        sql += " WHERE n.patient_id = ? AND n.date_key >= ? AND n.date_key < ?"
+        params += [patient_id, start_key, end_key]
+        if note_types:
+            sql += f" AND n.note_type IN ({','.join('?' * len(note_types))})"
+            params += list(note_types)
+        sql += " ORDER BY n.date_key DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_note(row) for row in rows]
+
+    @staticmethod
+    def _row_to_note(row) -> ClinicalNote:
+        return ClinicalNote(
+            id=row["note_id"],
+            patient_id=row["patient_id"],
+            note_type=row["note_type"],
+            date=datetime.fromisoformat(row["note_date"]),
+            content=row["content"],
+            source=row["source"],
+            author=row["author"],
+        )
+
+    # --- Maintenance ---
+
+    def purge(self, before: datetime) -> int:
+        """Delete notes dated before a cutoff and the sync ranges that covered them.
+
+        Returns:
+            Number of notes deleted.
+        """
+        cutoff = _date_key(before)
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM clinical_notes WHERE date_key < ?", (cutoff,)
+            ).rowcount
+            conn.execute("DELETE FROM note_sync_state WHERE covered_start < ?", (cutoff,))
+        logger.info(f"Purged {deleted} stored notes dated before {cutoff}")
+        return deleted
+
+    def purge_expired(self) -> int:
+        """Delete notes older than the retention period.
+
+        Returns:
+            Number of notes deleted.
+        """
+        if self.retention_days <= 0:
+            return 0
+        return self.purge(datetime.now(timezone.utc) - timedelta(days=self.retention_days))
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += n
+
+    def get_stats(self) -> dict:
+        """Per-process request counters and stored note/patient counts."""
+        with self._connect() as conn:
+            notes, patients = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT patient_id) FROM clinical_notes"
+            ).fetchone()
+        with self._lock:
+            counts = dict(self._counts)
+        return {
+            "local_hits": counts.get("local_hits", 0),
+            "upstream_fetches": counts.get("upstream_fetches", 0),
+            "notes_stored": counts.get("notes_stored", 0),
+            "stored_notes": notes,
+            "stored_patients": patients,
+        }
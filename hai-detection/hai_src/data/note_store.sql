@@ -0,0 +1,51 @@
+-- Local clinical-note store
+-- Notes synced from FHIR/Clarity, one row per note id, with a trigram
+-- full-text index so keyword searches match substrings like the in-memory scans
+
+CREATE TABLE IF NOT EXISTS clinical_notes (
+    note_id TEXT PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    note_type TEXT NOT NULL,
+    note_date TEXT NOT NULL,           -- ISO datetime as returned by the source
+    date_key TEXT NOT NULL,            -- Naive UTC ISO datetime, for range queries
+    author TEXT,
+    source TEXT NOT NULL,              -- fhir or clarity
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,        -- Detects addenda/edits on re-sync
+    fetched_at REAL NOT NULL           -- Unix time of the last change
+);
+
+CREATE INDEX IF NOT EXISTS idx_clinical_notes_patient_date ON clinical_notes(patient_id, date_key);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS clinical_notes_fts USING fts5(
+    content,
+    content='clinical_notes',
+    content_rowid='rowid',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS clinical_notes_ai AFTER INSERT ON clinical_notes BEGIN
+    INSERT INTO clinical_notes_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS clinical_notes_ad AFTER DELETE ON clinical_notes BEGIN
+    INSERT INTO clinical_notes_fts(clinical_notes_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS clinical_notes_au AFTER UPDATE OF content ON clinical_notes BEGIN
+    INSERT INTO clinical_notes_fts(clinical_notes_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+    INSERT INTO clinical_notes_fts(rowid, content) VALUES (new.rowid, new.content);
+END;
+
+-- What has been fetched from the EHR, per patient and note-type filter
+CREATE TABLE IF NOT EXISTS note_sync_state (
+    patient_id TEXT NOT NULL,
+    note_types TEXT NOT NULL,          -- Sorted comma-joined filter, '*' for all types
+    covered_start TEXT NOT NULL,       -- date_key range fetched so far
+    covered_end TEXT NOT NULL,
+    watermark TEXT,                    -- date_key of the latest note seen
+    synced_at REAL NOT NULL,           -- Unix time of the last upstream fetch
+    earliest TEXT,                     -- date_key of the earliest note seen
+    empty_synced_at REAL,              -- Unix time the days before earliest were last fetched
+    PRIMARY KEY (patient_id, note_types)
+);
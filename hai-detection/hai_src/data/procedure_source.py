@@ -10,6 +10,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 
 from ..models import Patient, SurgicalProcedure
+from .fhir_paging import iter_bundle_pages, iter_bundle_resources
 from ..rules.nhsn_criteria import (
     NHSN_OPERATIVE_CATEGORIES,
     is_nhsn_operative_procedure,
@@ -333,10 +334,12 @@ class FHIRProcedureSource(BaseProcedureSource):
         Args:
             base_url: FHIR server base URL. Uses config default if None.
         """
-        import requests
         from ..config import Config
+        from common.fhir_client import get_shared_fhir_client
+
         self.base_url = base_url or Config.FHIR_BASE_URL
-        self.session = requests.Session()
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get_nhsn_procedures(
         self,
@@ -364,38 +367,40 @@ class FHIRProcedureSource(BaseProcedureSource):
         }
 
         try:
-            response = self.session.get(
+            for bundle in iter_bundle_pages(
+                self.session,
                 f"{self.base_url}/Procedure",
                 params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            # First pass: cache all patients from _include
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Patient":
-                    patient = self._parse_patient(resource)
-                    if patient:
-                        patients_cache[patient.fhir_id] = patient
-
-            # Second pass: parse procedures
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    procedure = self._parse_procedure(resource)
-                    if procedure and procedure.nhsn_category:
-                        # Get patient
-                        patient_ref = resource.get("subject", {}).get("reference", "")
-                        patient_id = patient_ref.split("/")[-1]
-
-                        patient = patients_cache.get(patient_id)
-                        if not patient:
-                            # Fetch patient if not in bundle
-                            patient = self._fetch_patient(patient_id)
-
+            ):
+                entries = bundle.get("entry", [])
+
+                # First pass: cache all patients from _include
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Patient":
+                        patient = self._parse_patient(resource)
                         if patient:
-                            results.append((patient, procedure))
+                            patients_cache[patient.fhir_id] = patient
+
+                # Second pass: parse procedures
+                for entry in entries:
+                    resource = entry.get("resource", {})
+                    if resource.get("resourceType") == "Procedure":
+                        procedure = self._parse_procedure(resource)
+                        if procedure and procedure.nhsn_category:
+                            # Get patient
+                            patient_ref = resource.get("subject", {}).get("reference", "")
+                            patient_id = patient_ref.split("/")[-1]
+
+                            patient = patients_cache.get(patient_id)
+                            if not patient:
+                                # Fetch patient if not in bundle
+                                patient = self._fetch_patient(patient_id)
+                                if patient:
+                                    patients_cache[patient_id] = patient
+
+                            if patient:
+                                results.append((patient, procedure))
 
             logger.debug(f"FHIRProcedureSource: Found {len(results)} NHSN procedures")
 
@@ -423,19 +428,15 @@ class FHIRProcedureSource(BaseProcedureSource):
         }
 
         try:
-            response = self.session.get(
+            for resource in iter_bundle_resources(
+                self.session,
                 f"{self.base_url}/Procedure",
                 params=params,
-            )
-            response.raise_for_status()
-            bundle = response.json()
-
-            for entry in bundle.get("entry", []):
-                resource = entry.get("resource", {})
-                if resource.get("resourceType") == "Procedure":
-                    procedure = self._parse_procedure(resource)
-                    if procedure:
-                        results.append(procedure)
+                resource_type="Procedure",
+            ):
+                procedure = self._parse_procedure(resource)
+                if procedure:
+                    results.append(procedure)
 
         except requests.RequestException as e:
             logger.error(f"FHIR procedure query failed: {e}")
@@ -576,9 +577,8 @@ class FHIRProcedureSource(BaseProcedureSource):
         import requests
 
         try:
-            response = self.session.get(f"{self.base_url}/Patient/{patient_id}")
-            response.raise_for_status()
-            return self._parse_patient(response.json())
+            resource = self.client.read("Patient", patient_id)
+            return self._parse_patient(resource)
         except requests.RequestException as e:
             logger.error(f"Failed to fetch patient {patient_id}: {e}")
             return None
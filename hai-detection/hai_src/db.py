@@ -7,6 +7,8 @@ from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Any
 
+from common.sqlite_pool import get_connection_manager
+
 from .models import (
     HAICandidate,
     HAIType,
@@ -48,10 +50,10 @@ def _log_hai_activity(
     interrupt the main operation.
     """
     try:
-        from common.metrics_store import MetricsStore, ModuleSource
+        from common.metrics_store import get_metrics_store, ModuleSource
 
-        store = MetricsStore()
-        store.log_activity(
+        store = get_metrics_store()
+        store.log_activity_async(
             activity_type=activity_type,
             module=ModuleSource.HAI,
             provider_id=provider_id,
@@ -71,25 +73,55 @@ def _log_hai_activity(
 class HAIDatabase:
     """SQLite database for HAI candidate and classification storage."""
 
+    SCHEMA_VERSION = 2
+
     def __init__(self, db_path: str | Path):
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = get_connection_manager(self.db_path)
         self._init_db()
 
     def _init_db(self) -> None:
-        """Initialize the database schema."""
+        """Initialize the database schema (once per process)."""
         schema_path = Path(__file__).parent.parent / "schema.sql"
         with open(schema_path) as f:
             schema = f.read()
 
-        with self._get_connection() as conn:
-            conn.executescript(schema)
+        # Migrations for existing databases run with the DDL, once per
+        # schema/migration version
+        self._db.ensure_schema(
+            "hai_detection",
+            schema,
+            migrate=self._run_migrations,
+            version=self.SCHEMA_VERSION,
+        )
+
+    def _run_migrations(self, conn: sqlite3.Connection) -> None:
+        """Add new columns to existing databases."""
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(hai_candidates)")
+        candidates_cols = {row[1] for row in cursor.fetchall()}
+
+        # v2: change stamp, so metrics snapshots see status changes
+        # (e.g. confirmation) on the day the candidate was created
+        if "updated_at" not in candidates_cols:
+            cursor.execute("ALTER TABLE hai_candidates ADD COLUMN updated_at TIMESTAMP")
+            cursor.execute("UPDATE hai_candidates SET updated_at = created_at")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hai_candidates_updated ON hai_candidates(updated_at)"
+        )
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS hai_candidates_touch AFTER UPDATE ON hai_candidates
+            WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE hai_candidates SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+            END
+        """)
 
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled connection with row factory."""
+        return self._db.connect()
 
     # --- Candidate Operations ---
 
@@ -16,7 +16,8 @@ import logging
 from pathlib import Path
 
 from ..config import Config
-from ..models import HAICandidate, ClinicalNote
+from ..models import HAICandidate, ClinicalNote, HAIType
+from ..notes.packer import ContextPacker
 from ..rules.cauti_schemas import (
     CAUTIExtraction,
     UrinarySymptomExtraction,
@@ -50,6 +51,7 @@ class CAUTIExtractor:
         self.llm_client = llm_client
         self.prompt_version = prompt_version
         self.prompt_template = self._load_prompt_template()
+        self.packer = ContextPacker(HAIType.CAUTI)
 
     def _load_prompt_template(self) -> str:
         """Load the extraction prompt template."""
@@ -145,7 +147,7 @@ Extract only what is documented. Do not infer or assume.
         }
 
         # Combine relevant notes
-        notes_text = self._prepare_notes(notes)
+        notes_text = self._prepare_notes(notes, candidate.id)
         context["notes"] = notes_text
 
         # Build prompt
@@ -175,22 +177,20 @@ Extract only what is documented. Do not infer or assume.
 
         return "; ".join(parts) if parts else "Positive urine culture"
 
-    def _prepare_notes(self, notes: list[ClinicalNote]) -> str:
+    def _prepare_notes(self, notes: list[ClinicalNote], candidate_id: str | None = None) -> str:
         """Prepare notes for LLM input.
 
-        Sorts by date and formats with metadata.
+        Sorts by date and packs the most relevant chunks into the token budget.
         """
         # Sort by date, most recent first
         sorted_notes = sorted(notes, key=lambda n: n.date, reverse=True)
 
-        formatted = []
-        for note in sorted_notes[:Config.MAX_NOTES_PER_PATIENT]:
-            header = f"--- {note.note_type.upper()} ({note.date.date()}) ---"
-            # Truncate very long notes
-            content = note.content[:8000] if len(note.content) > 8000 else note.content
-            formatted.append(f"{header}\n{content}")
-
-        return "\n\n".join(formatted)
+        return self.packer.pack_for_prompt(
+            sorted_notes[:Config.MAX_NOTES_PER_PATIENT],
+            self.prompt_template,
+            self.llm_client,
+            candidate_id=candidate_id,
+        )
 
     def _call_llm(self, prompt: str) -> str:
         """Call LLM for extraction.
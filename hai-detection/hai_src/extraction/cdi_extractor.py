@@ -20,8 +20,9 @@ import json
 import logging
 from pathlib import Path
 
-from ..models import HAICandidate, ClinicalNote
+from ..models import HAICandidate, ClinicalNote, HAIType
 from ..llm.factory import get_llm_client
+from ..notes.packer import ContextPacker
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.cdi_schemas import (
     CDIExtraction,
@@ -113,6 +114,7 @@ class CDIExtractor:
         self._llm_client = llm_client
         self.prompt_version = prompt_version
         self.prompt_template = self._load_prompt_template()
+        self.packer = ContextPacker(HAIType.CDI)
 
     @property
     def llm_client(self):
@@ -144,7 +146,7 @@ class CDIExtractor:
             )
 
         # Format notes for prompt
-        notes_text = self._format_notes(notes)
+        notes_text = self._format_notes(notes, candidate.id)
 
         # Get CDI-specific context from candidate
         cdi_data = getattr(candidate, "_cdi_data", None)
@@ -188,23 +190,11 @@ class CDIExtractor:
         extraction.notes_reviewed_count = len(notes)
         return extraction
 
-    def _format_notes(self, notes: list[ClinicalNote]) -> str:
-        """Format clinical notes for the prompt."""
-        formatted = []
-
-        for note in notes:
-            header = f"=== {note.note_type.upper()} ({note.date.strftime('%Y-%m-%d')}) ==="
-            if note.author:
-                header += f" by {note.author}"
-
-            # Truncate very long notes
-            content = note.content
-            if len(content) > 4000:
-                content = content[:4000] + "\n... [truncated]"
-
-            formatted.append(f"{header}\n{content}")
-
-        return "\n\n".join(formatted)
+    def _format_notes(self, notes: list[ClinicalNote], candidate_id: str | None = None) -> str:
+        """Pack the most relevant note chunks for the prompt's token budget."""
+        return self.packer.pack_for_prompt(
+            notes, self.prompt_template, self.llm_client, candidate_id=candidate_id,
+        )
 
     def _parse_response(self, data: dict) -> CDIExtraction:
         """Parse LLM structured response into CDIExtraction.
@@ -13,9 +13,10 @@ from pathlib import Path
 from datetime import datetime
 
 from ..config import Config
-from ..models import HAICandidate, ClinicalNote, LLMAuditEntry
+from ..models import HAICandidate, ClinicalNote, HAIType, LLMAuditEntry
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker
 from ..db import HAIDatabase
 from ..rules.schemas import (
     ClinicalExtraction,
@@ -187,6 +188,7 @@ class CLABSIExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(HAIType.CLABSI, self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -279,8 +281,10 @@ Respond with JSON matching the ClinicalExtraction schema."""
         notes: list[ClinicalNote],
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
-        notes_context = self.chunker.extract_relevant_context(notes)
+        # Pack the most relevant note chunks into the token budget
+        notes_context = self.packer.pack_for_prompt(
+            notes, self._prompt_template, self.llm_client, candidate_id=candidate.id,
+        )
 
         # Format prompt
         return self._prompt_template.format(
@@ -14,9 +14,10 @@ from pathlib import Path
 from datetime import datetime
 
 from ..config import Config
-from ..models import HAICandidate, ClinicalNote, LLMAuditEntry, SurgicalProcedure
+from ..models import HAICandidate, ClinicalNote, HAIType, LLMAuditEntry, SurgicalProcedure
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker
 from ..db import HAIDatabase
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.ssi_schemas import (
@@ -192,6 +193,8 @@ class SSIExtractor:
     """
 
     PROMPT_VERSION = "ssi_extraction_v1"
+    # Note-context cap in tokens (~4K chars) for the limited SSI context window
+    MAX_NOTE_TOKENS = 1000
 
     def __init__(
         self,
@@ -207,6 +210,7 @@ class SSIExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(HAIType.SSI, self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -320,10 +324,12 @@ Respond with JSON matching the SSIExtraction schema."""
         procedure: SurgicalProcedure,
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
+        # Pack the most relevant note chunks into the token budget
         # With 70B Q4 model on limited VRAM, context is limited to ~4K tokens
-        # Keep notes to ~4K chars to fit within context window
-        notes_context = self.chunker.extract_relevant_context(notes, max_length=4000)
+        notes_context = self.packer.pack_for_prompt(
+            notes, self._prompt_template, self.llm_client,
+            max_tokens=self.MAX_NOTE_TOKENS, candidate_id=candidate.id,
+        )
 
         # Calculate days post-op
         now = datetime.now()
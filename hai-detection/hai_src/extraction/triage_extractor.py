@@ -28,11 +28,15 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+from common.context_packer import estimate_tokens
+
 from ..config import Config
 from ..models import HAICandidate, ClinicalNote, HAIType
 from ..llm.ollama import OllamaClient
-from ..llm.base import LLMProfile
+from ..llm.base import BaseLLMClient, LLMProfile
+from ..llm.factory import get_ollama_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker
 
 logger = logging.getLogger(__name__)
 
@@ -154,6 +158,15 @@ TRIAGE_OUTPUT_SCHEMA = {
 }
 
 
+# Fields that force escalation as soon as any is true (see _make_decision)
+ESCALATION_FIELDS = (
+    "alternate_source_mentioned",
+    "contamination_mentioned",
+    "mbi_factors_present",
+    "multiple_organisms",
+    "clinical_impression_ambiguous",
+)
+
 # Triage prompt templates by HAI type
 TRIAGE_PROMPTS = {
     HAIType.CLABSI: """You are performing a QUICK TRIAGE of a potential Central Line-Associated Bloodstream Infection (CLABSI).
@@ -268,23 +281,31 @@ class TriageExtractor:
             max_context_chars: Maximum chars of notes to include.
         """
         self.model = model or self.DEFAULT_TRIAGE_MODEL
+        self._explicit_base_url = base_url is not None
         self.base_url = base_url or Config.OLLAMA_BASE_URL
         self.max_context_chars = max_context_chars
         self.chunker = NoteChunker()
 
         # Lazy-load client
-        self._client: OllamaClient | None = None
+        self._client: BaseLLMClient | None = None
 
     @property
-    def client(self) -> OllamaClient:
-        """Get or create Ollama client."""
+    def client(self) -> BaseLLMClient:
+        """Get or create Ollama client.
+
+        Uses the endpoint router when the triage model has dedicated
+        endpoints (LLM_ENDPOINTS), unless a base_url was given.
+        """
         if self._client is None:
-            self._client = OllamaClient(
-                base_url=self.base_url,
-                model=self.model,
-                timeout=60,  # Shorter timeout for fast model
-                num_ctx=4096,  # Smaller context window
-            )
+            if self._explicit_base_url:
+                self._client = OllamaClient(
+                    base_url=self.base_url,
+                    model=self.model,
+                    timeout=60,  # Shorter timeout for fast model
+                    num_ctx=4096,  # Smaller context window
+                )
+            else:
+                self._client = get_ollama_client(self.model, timeout=60, num_ctx=4096)
         return self._client
 
     def extract(
@@ -308,23 +329,39 @@ class TriageExtractor:
             hai_type = self._infer_hai_type(candidate)
 
         # Build abbreviated notes context
-        notes_context = self._build_notes_context(notes)
+        notes_context = self._build_notes_context(notes, hai_type, candidate.id)
 
         # Build prompt
         prompt = self._build_prompt(candidate, notes_context, hai_type)
 
         try:
-            # Call LLM with structured output
-            result = self.client.generate_structured_with_profile(
-                prompt=prompt,
-                output_schema=TRIAGE_OUTPUT_SCHEMA,
-                temperature=0.0,
-                profile_context=f"triage_{hai_type.value}",
-            )
+            # Call LLM with structured output. Streaming stops generating as
+            # soon as a field forces escalation; the full model redoes the
+            # extraction anyway.
+            if Config.LLM_STREAM_TRIAGE and hasattr(self.client, "generate_structured_stream"):
+                result = self.client.generate_structured_stream(
+                    prompt=prompt,
+                    output_schema=TRIAGE_OUTPUT_SCHEMA,
+                    temperature=0.0,
+                    profile_context=f"triage_{hai_type.value}",
+                    stop_when=self._escalation_settled,
+                )
+            else:
+                result = self.client.generate_structured_with_profile(
+                    prompt=prompt,
+                    output_schema=TRIAGE_OUTPUT_SCHEMA,
+                    temperature=0.0,
+                    profile_context=f"triage_{hai_type.value}",
+                )
 
             # Parse response
             extraction = self._parse_response(result.data)
             extraction.profile = result.profile
+            if not extraction.quick_reasoning and self._escalation_settled(result.data):
+                triggers = [name for name in ESCALATION_FIELDS if result.data.get(name) is True]
+                extraction.quick_reasoning = (
+                    f"Stopped at escalation trigger: {', '.join(triggers) or 'documentation quality'}"
+                )
 
             # Make escalation decision
             extraction.decision = self._make_decision(extraction)
@@ -349,6 +386,13 @@ class TriageExtractor:
                 quick_reasoning=f"Triage failed: {e}",
             )
 
+    @staticmethod
+    def _escalation_settled(fields: dict[str, Any]) -> bool:
+        """Whether the fields parsed so far already force escalation."""
+        return fields.get("documentation_quality") in ("poor", "limited") or any(
+            fields.get(name) is True for name in ESCALATION_FIELDS
+        )
+
     def _infer_hai_type(self, candidate: HAICandidate) -> HAIType:
         """Infer HAI type from candidate."""
         # Check for explicit type
@@ -368,17 +412,25 @@ class TriageExtractor:
         # Default to CLABSI for blood cultures
         return HAIType.CLABSI
 
-    def _build_notes_context(self, notes: list[ClinicalNote]) -> str:
+    def _build_notes_context(
+        self,
+        notes: list[ClinicalNote],
+        hai_type: HAIType,
+        candidate_id: str | None = None,
+    ) -> str:
         """Build abbreviated notes context for triage.
 
-        Prioritizes Assessment/Plan sections and recent notes.
+        Packs the highest-scoring chunks for the HAI type (Assessment/Plan
+        sections first) into max_context_chars worth of tokens.
         """
-        # Use chunker but with tighter limits
-        context = self.chunker.extract_relevant_context(
+        packer = ContextPacker(hai_type, self.chunker)
+        return packer.pack_for_prompt(
             notes,
-            max_length=self.max_context_chars,
+            TRIAGE_PROMPTS.get(hai_type, TRIAGE_PROMPTS[HAIType.CLABSI]),
+            self.client,
+            max_tokens=estimate_tokens(self.max_context_chars),
+            candidate_id=candidate_id,
         )
-        return context
 
     def _build_prompt(
         self,
@@ -20,9 +20,10 @@ from pathlib import Path
 from datetime import datetime
 
 from ..config import Config
-from ..models import HAICandidate, ClinicalNote, LLMAuditEntry, VAECandidate
+from ..models import HAICandidate, ClinicalNote, HAIType, LLMAuditEntry, VAECandidate
 from ..llm.factory import get_llm_client
 from ..notes.chunker import NoteChunker
+from ..notes.packer import ContextPacker
 from ..db import HAIDatabase
 from ..rules.schemas import ConfidenceLevel, EvidenceSource
 from ..rules.vae_schemas import (
@@ -188,6 +189,7 @@ class VAEExtractor:
         self._llm_client = llm_client
         self.db = db
         self.chunker = NoteChunker()
+        self.packer = ContextPacker(HAIType.VAE, self.chunker)
         self._prompt_template = self._load_prompt_template()
 
     @property
@@ -299,8 +301,10 @@ Respond with JSON matching the VAEExtraction schema."""
         vae_data: VAECandidate,
     ) -> str:
         """Build the extraction prompt."""
-        # Extract relevant context from notes
-        notes_context = self.chunker.extract_relevant_context(notes)
+        # Pack the most relevant note chunks into the token budget
+        notes_context = self.packer.pack_for_prompt(
+            notes, self._prompt_template, self.llm_client, candidate_id=candidate.id,
+        )
 
         # Get VAE-specific context
         vac_onset_date = vae_data.vac_onset_date.strftime("%Y-%m-%d") if vae_data.vac_onset_date else "Unknown"
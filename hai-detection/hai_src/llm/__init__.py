@@ -1,8 +1,20 @@
 """LLM backend abstraction layer."""
 
-from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse
+from .base import (
+    BaseLLMClient,
+    LLMResponse,
+    LLMProfile,
+    StructuredBatchResponse,
+    StructuredLLMResponse,
+    ThroughputMeter,
+    submit_in_context,
+    track_throughput,
+)
 from .ollama import OllamaClient
-from .factory import get_llm_client
+from .streaming import IncrementalJSONParser
+from .replay import CassetteMissError, ReplayLLMClient
+from .router import LLMRouter, RoutedOllamaClient
+from .factory import get_llm_client, get_llm_router, get_ollama_client
 
 # Profiling utilities
 from .ollama import (
@@ -17,9 +29,20 @@ __all__ = [
     "LLMResponse",
     "LLMProfile",
     "StructuredLLMResponse",
+    "StructuredBatchResponse",
     "OllamaClient",
+    "IncrementalJSONParser",
+    "ReplayLLMClient",
+    "CassetteMissError",
+    "LLMRouter",
+    "RoutedOllamaClient",
     "get_llm_client",
+    "get_llm_router",
+    "get_ollama_client",
     # Profiling
+    "ThroughputMeter",
+    "track_throughput",
+    "submit_in_context",
     "get_profile_history",
     "get_profile_summary",
     "clear_profile_history",
@@ -1,10 +1,26 @@
 """Abstract base class for LLM clients."""
 
+import logging
+import sqlite3
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+from ..config import add_common_to_path
+
+add_common_to_path()
+
+from common.llm_cache import LLMResponseCache, get_llm_cache, make_cache_key  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class LLMProfile:
@@ -23,6 +39,10 @@ class LLMProfile:
     prefill_ms: float = 0.0  # Time to process input (prompt_eval)
     generation_ms: float = 0.0  # Time to generate output (eval)
 
+    # Streaming (generate_structured_stream)
+    time_to_first_field_ms: float = 0.0  # Request start to first complete field
+    tokens_saved: int = 0  # Typical output tokens not generated after stopping early
+
     # Derived metrics
     @property
     def tokens_per_second(self) -> float:
@@ -55,6 +75,8 @@ class LLMProfile:
             "tokens_per_second": round(self.tokens_per_second, 1),
             "prefill_tokens_per_second": round(self.prefill_tokens_per_second, 1),
             "model_was_cold": self.model_was_cold,
+            "time_to_first_field_ms": round(self.time_to_first_field_ms, 1),
+            "tokens_saved": self.tokens_saved,
         }
 
     def summary(self) -> str:
@@ -71,6 +93,10 @@ class LLMProfile:
             f"gen={self.generation_ms:.0f}ms",
             f"({self.tokens_per_second:.1f}tok/s)",
         ])
+        if self.time_to_first_field_ms:
+            parts.append(f"first_field={self.time_to_first_field_ms:.0f}ms")
+        if self.tokens_saved:
+            parts.append(f"saved~{self.tokens_saved}tok")
         return " | ".join(parts)
 
 
@@ -92,10 +118,146 @@ class StructuredLLMResponse:
     data: dict[str, Any]  # Parsed JSON response
     profile: LLMProfile
     raw_response: dict[str, Any] | None = None
+    cached: bool = False  # Served from the response cache, no LLM call made
+
+
+class ThroughputMeter:
+    """Aggregate token throughput of a group of LLM calls.
+
+    Per-call tokens/sec understates what a concurrent workload achieves;
+    this divides the tokens of all calls by the wall time they spanned.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.cached_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.model_ms = 0.0  # Sum of per-call model time
+        self._started = time.perf_counter()
+        self._stopped: float | None = None
+        self._lock = threading.Lock()
+
+    def record(self, profile: LLMProfile | None, cached: bool = False) -> None:
+        """Count one call."""
+        with self._lock:
+            self.calls += 1
+            if cached:
+                self.cached_calls += 1
+            if profile is not None:
+                self.input_tokens += profile.input_tokens
+                self.output_tokens += profile.output_tokens
+                self.model_ms += profile.total_ms
+
+    def stop(self) -> None:
+        if self._stopped is None:
+            self._stopped = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        end = self._stopped if self._stopped is not None else time.perf_counter()
+        return (end - self._started) * 1000
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Output tokens per second of wall time."""
+        elapsed = self.elapsed_ms
+        return self.output_tokens / (elapsed / 1000) if elapsed > 0 else 0.0
+
+    @property
+    def prefill_tokens_per_second(self) -> float:
+        """Input tokens per second of wall time."""
+        elapsed = self.elapsed_ms
+        return self.input_tokens / (elapsed / 1000) if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "cached_calls": self.cached_calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "model_ms": round(self.model_ms, 1),
+            "tokens_per_second": round(self.tokens_per_second, 1),
+            "prefill_tokens_per_second": round(self.prefill_tokens_per_second, 1),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} calls ({self.cached_calls} cached) | "
+            f"in={self.input_tokens}tok out={self.output_tokens}tok | "
+            f"wall={self.elapsed_ms:.0f}ms | {self.tokens_per_second:.1f}tok/s aggregate"
+        )
+
+
+# Meters of the enclosing track_throughput blocks. A context variable keeps
+# concurrent blocks (monitor runs, validation, API requests) from counting
+# each other's calls; worker threads join a block through submit_in_context.
+_active_meters: ContextVar[tuple[ThroughputMeter, ...]] = ContextVar("llm_meters", default=())
+
+
+@contextmanager
+def track_throughput() -> Iterator[ThroughputMeter]:
+    """Meter every LLM call made in this context while the block runs."""
+    meter = ThroughputMeter()
+    token = _active_meters.set(_active_meters.get() + (meter,))
+    try:
+        yield meter
+    finally:
+        meter.stop()
+        _active_meters.reset(token)
+
+
+def record_llm_call(profile: LLMProfile | None, cached: bool = False) -> None:
+    """Report a finished call to the throughput meters of the current context."""
+    for meter in _active_meters.get():
+        meter.record(profile, cached)
+
+
+def submit_in_context(executor: Executor, fn: Callable[..., Any], *args: Any) -> Future:
+    """Submit fn so its LLM calls count toward the caller's throughput meters."""
+    return executor.submit(copy_context().run, fn, *args)
+
+
+@dataclass
+class StructuredBatchResponse:
+    """Results of generate_structured_batch, in prompt order.
+
+    A failed prompt has None in responses and its exception in errors;
+    the other prompts are unaffected.
+    """
+    responses: list[StructuredLLMResponse | None]
+    errors: list[Exception | None]
+    throughput: ThroughputMeter
+
+    @property
+    def data(self) -> list[dict[str, Any] | None]:
+        return [r.data if r is not None else None for r in self.responses]
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for e in self.errors if e is not None)
+
+    def __len__(self) -> int:
+        return len(self.responses)
 
 
 class BaseLLMClient(ABC):
-    """Abstract base class for LLM API clients."""
+    """Abstract base class for LLM API clients.
+
+    Deterministic (temperature 0) generate_structured calls are served from
+    a content-addressed response cache when the same model, schema and
+    normalized prompt were seen before.
+    """
+
+    # Set False to always call the model; set response_cache to use a
+    # specific cache instead of the process-wide one.
+    use_response_cache: bool = True
+    response_cache: LLMResponseCache | None = None
+
+    # Requests generate_structured_batch keeps in flight; backends that
+    # serve requests concurrently raise this.
+    batch_concurrency: int = 1
 
     @abstractmethod
     def generate(
@@ -149,3 +311,133 @@ class BaseLLMClient(ABC):
     def model_name(self) -> str:
         """Get the model name being used."""
         pass
+
+    def generate_structured_batch(
+        self,
+        prompts: list[str],
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_concurrent: int | None = None,
+        profile_context: str = "",
+    ) -> StructuredBatchResponse:
+        """Generate structured responses for many prompts at once.
+
+        Up to max_concurrent requests are in flight together so the server
+        can batch them; results come back in prompt order.
+
+        Args:
+            prompts: User prompts, all answered with the same schema
+            output_schema: JSON schema for the expected output
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_concurrent: Requests in flight; defaults to batch_concurrency
+            profile_context: Context label for profiling
+
+        Returns:
+            StructuredBatchResponse with per-prompt responses and errors
+        """
+        responses: list[StructuredLLMResponse | None] = [None] * len(prompts)
+        errors: list[Exception | None] = [None] * len(prompts)
+        meter = ThroughputMeter()
+
+        def run(index: int) -> None:
+            try:
+                result = self._generate_structured_profiled(
+                    prompts[index], output_schema, system_prompt, temperature, profile_context,
+                )
+            except Exception as e:
+                logger.warning(f"Batch item {index} failed: {e}")
+                errors[index] = e
+                return
+            responses[index] = result
+            meter.record(result.profile, result.cached)
+
+        workers = max(1, min(max_concurrent or self.batch_concurrency, len(prompts)))
+        if workers == 1:
+            for index in range(len(prompts)):
+                run(index)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as pool:
+                for future in [submit_in_context(pool, run, i) for i in range(len(prompts))]:
+                    future.result()
+        meter.stop()
+
+        if prompts:
+            logger.info(f"LLM batch of {len(prompts)} ({workers} concurrent): {meter.summary()}")
+        return StructuredBatchResponse(responses=responses, errors=errors, throughput=meter)
+
+    def _generate_structured_profiled(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None,
+        temperature: float,
+        profile_context: str,
+    ) -> StructuredLLMResponse:
+        """One structured call, with a profile even if the backend has none."""
+        with_profile = getattr(self, "generate_structured_with_profile", None)
+        if with_profile is not None:
+            return with_profile(
+                prompt=prompt,
+                output_schema=output_schema,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                profile_context=profile_context,
+            )
+        start = time.perf_counter()
+        data = self.generate_structured(prompt, output_schema, system_prompt, temperature)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return StructuredLLMResponse(data=data, profile=LLMProfile(total_ms=elapsed_ms))
+
+    def _get_response_cache(self) -> LLMResponseCache | None:
+        """The cache for structured calls, or None if caching is off."""
+        if not self.use_response_cache:
+            return None
+        return self.response_cache or get_llm_cache()
+
+    def _structured_cache_key(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        options: dict[str, Any] | None = None,
+    ) -> str | None:
+        """Cache key for a structured call, or None if it must not be cached.
+
+        Args:
+            options: Backend settings that change the output (e.g. num_ctx,
+                which truncates long note context).
+        """
+        if temperature > 0 or self._get_response_cache() is None:
+            return None
+        return make_cache_key(
+            self.model_name,
+            prompt,
+            prompt_version="generate_structured",
+            schema=output_schema,
+            system_prompt=system_prompt,
+            options=options,
+        )
+
+    def _cache_lookup(self, key: str | None) -> dict[str, Any] | None:
+        """Cached structured response for a key, if any."""
+        cache = self._get_response_cache() if key else None
+        if cache is None:
+            return None
+        try:
+            return cache.get(key)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            return None
+
+    def _cache_store(self, key: str | None, data: dict[str, Any], elapsed_seconds: float = 0.0) -> None:
+        """Store a structured response under a key from _structured_cache_key()."""
+        cache = self._get_response_cache() if key else None
+        if cache is None or not data:
+            return
+        try:
+            cache.put(key, data, self.model_name, "generate_structured", elapsed_seconds)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM response cache store failed: {e}")
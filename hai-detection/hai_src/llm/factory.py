@@ -1,18 +1,57 @@
 """Factory for LLM client creation."""
 
 import logging
+import threading
 
 from ..config import Config
 from .base import BaseLLMClient
 from .ollama import OllamaClient
+from .replay import get_replay_client
+from .router import LLMRouter, RoutedOllamaClient
 from .vllm import VLLMClient
 
 logger = logging.getLogger(__name__)
 
 
+_router: LLMRouter | None = None
+_router_lock = threading.Lock()
+
+
+def get_llm_router() -> LLMRouter | None:
+    """Get the process-wide endpoint router, or None if LLM_ENDPOINTS is unset."""
+    global _router
+    if not Config.LLM_ENDPOINTS:
+        return None
+    with _router_lock:
+        if _router is None:
+            _router = LLMRouter.from_config()
+        return _router
+
+
+def get_ollama_client(
+    model: str | None = None,
+    timeout: int = 300,
+    num_ctx: int = 8192,
+) -> BaseLLMClient:
+    """Get an Ollama client for a model, routed if the model has endpoints.
+
+    Models listed in LLM_ENDPOINTS are spread over their own servers;
+    others go to OLLAMA_BASE_URL.
+    """
+    model = model or Config.OLLAMA_MODEL
+    router = get_llm_router()
+    if router is not None and router.serves(model):
+        return RoutedOllamaClient(router, model, timeout=timeout, num_ctx=num_ctx)
+    return OllamaClient(model=model, timeout=timeout, num_ctx=num_ctx)
+
+
 def get_llm_client(backend: str | None = None) -> BaseLLMClient:
     """Get the configured LLM client.
 
+    LLM_BACKEND=replay answers from the recorded cassette (no server needed);
+    LLM_RECORD=true wraps the live client so its calls are recorded. With
+    LLM_ENDPOINTS set, Ollama requests are routed across endpoints.
+
     Args:
         backend: Override backend selection. Uses config if None.
 
@@ -24,11 +63,23 @@ def get_llm_client(backend: str | None = None) -> BaseLLMClient:
     """
     backend = backend or Config.LLM_BACKEND
 
+    if backend == "replay":
+        return get_replay_client()
+
+    client = _get_live_client(backend)
+    if Config.LLM_RECORD:
+        logger.info(f"Recording LLM calls to {Config.LLM_CASSETTE_PATH}")
+        return get_replay_client(inner=client)
+    return client
+
+
+def _get_live_client(backend: str) -> BaseLLMClient:
+    """Create the client for a live LLM server."""
     if backend == "ollama":
         if not Config.is_ollama_configured():
             raise ValueError("Ollama is not configured")
 
-        client = OllamaClient()
+        client = get_ollama_client()
 
         if not client.is_available():
             logger.warning(
@@ -6,13 +6,16 @@ requiring a BAA.
 
 import json
 import logging
+import threading
 import time
+from collections.abc import Callable, Iterable
 from typing import Any
 
 import requests
 
 from ..config import Config
-from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse
+from .base import BaseLLMClient, LLMResponse, LLMProfile, StructuredLLMResponse, record_llm_call
+from .streaming import IncrementalJSONParser
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +93,7 @@ def get_profile_summary() -> dict[str, Any]:
         "p95_total_ms": round(percentile("total_ms", 0.95), 1),
         "p50_generation_ms": round(percentile("generation_ms", 0.5), 1),
         "p95_generation_ms": round(percentile("generation_ms", 0.95), 1),
+        "total_tokens_saved": sum(p.get("tokens_saved", 0) for p in profiles),
     }
 
 
@@ -99,6 +103,13 @@ def clear_profile_history() -> None:
     _profile_history = []
 
 
+def _parse_keep_alive(value: str | int) -> str | int:
+    """Ollama takes a duration string ("30m") or a number of seconds (-1 = forever)."""
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return value
+
+
 class OllamaClient(BaseLLMClient):
     """Ollama API client for local LLM inference."""
 
@@ -109,6 +120,7 @@ class OllamaClient(BaseLLMClient):
         timeout: int = 300,  # Increased for large models like 70b
         num_ctx: int = 8192,  # Context window size
         enable_profiling: bool = True,  # Store profiles for analysis
+        keep_alive: str | int | None = None,
     ):
         """Initialize Ollama client.
 
@@ -118,13 +130,25 @@ class OllamaClient(BaseLLMClient):
             timeout: Request timeout in seconds.
             num_ctx: Context window size in tokens.
             enable_profiling: Whether to store profiles in history.
+            keep_alive: How long the server keeps the model loaded after a
+                request. Uses OLLAMA_KEEP_ALIVE if None.
         """
         self.base_url = (base_url or Config.OLLAMA_BASE_URL).rstrip("/")
         self.model = model or Config.OLLAMA_MODEL
         self.timeout = timeout
         self.num_ctx = num_ctx
         self.enable_profiling = enable_profiling
+        self.keep_alive = _parse_keep_alive(Config.OLLAMA_KEEP_ALIVE if keep_alive is None else keep_alive)
         self.session = requests.Session()
+        # Output tokens of complete streamed responses, per schema, for
+        # estimating what stopping early saves
+        self._stream_lengths: dict[str, float] = {}
+        self._stream_lock = threading.Lock()
+
+    @property
+    def batch_concurrency(self) -> int:
+        """Requests in flight per batch, matched to OLLAMA_NUM_PARALLEL."""
+        return Config.OLLAMA_MAX_CONCURRENT
 
     def generate(
         self,
@@ -157,6 +181,7 @@ class OllamaClient(BaseLLMClient):
             "model": self.model,
             "messages": messages,
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
@@ -183,6 +208,7 @@ class OllamaClient(BaseLLMClient):
             # Store for analysis
             if self.enable_profiling:
                 _store_profile(profile, profile_context)
+            record_llm_call(profile)
 
             return LLMResponse(
                 content=data.get("message", {}).get("content", ""),
@@ -239,8 +265,18 @@ class OllamaClient(BaseLLMClient):
             profile_context: Optional context string for profiling.
 
         Returns:
-            StructuredLLMResponse with parsed data and profiling.
+            StructuredLLMResponse with parsed data and profiling. Responses
+            served from the cache have cached=True and an empty profile.
         """
+        cache_key = self._structured_cache_key(
+            prompt, output_schema, system_prompt, temperature, {"num_ctx": self.num_ctx},
+        )
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"LLM structured [{profile_context or 'unnamed'}]: cache hit")
+            record_llm_call(None, cached=True)
+            return StructuredLLMResponse(data=cached, profile=LLMProfile(), cached=True)
+
         # Build system prompt with JSON schema
         schema_prompt = f"""You must respond with valid JSON matching this schema:
 {json.dumps(output_schema, indent=2)}
@@ -257,6 +293,7 @@ class OllamaClient(BaseLLMClient):
             "messages": messages,
             "stream": False,
             "format": "json",
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": temperature,
                 "num_ctx": self.num_ctx,
@@ -283,9 +320,11 @@ class OllamaClient(BaseLLMClient):
             # Store for analysis
             if self.enable_profiling:
                 _store_profile(profile, profile_context)
+            record_llm_call(profile)
 
             # Parse JSON response
             parsed = json.loads(content)
+            self._cache_store(cache_key, parsed, profile.total_ms / 1000)
 
             return StructuredLLMResponse(
                 data=parsed,
@@ -300,6 +339,167 @@ class OllamaClient(BaseLLMClient):
             logger.error(f"Ollama request failed: {e}")
             raise
 
+    def generate_structured_stream(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+        required_fields: Iterable[str] | None = None,
+        stop_when: Callable[[dict[str, Any]], bool] | None = None,
+        on_field: Callable[[str, Any], None] | None = None,
+    ) -> StructuredLLMResponse:
+        """Stream a structured JSON response, stopping once it has what's needed.
+
+        Top-level fields are parsed as they complete. Generation is
+        cancelled (the connection closed, which aborts it in Ollama) as
+        soon as all required_fields are present, stop_when returns True,
+        or the JSON object closes.
+
+        Args:
+            prompt: The user prompt.
+            output_schema: JSON schema for the expected output.
+            system_prompt: Optional system prompt.
+            temperature: Sampling temperature (0.0 = deterministic).
+            profile_context: Optional context string for profiling.
+            required_fields: Stop once these fields are parsed.
+            stop_when: Called with the fields parsed so far after each
+                completed field; stop when it returns True.
+            on_field: Called with (field, value) as each field completes.
+
+        Returns:
+            StructuredLLMResponse with the parsed fields. The profile's
+            time_to_first_field_ms and tokens_saved report the streaming
+            gain; token counts of a cancelled request are estimates.
+
+        Raises:
+            ValueError: If the stream ends without a usable JSON object, or
+                before the object closes without having stopped early
+                (e.g. at num_ctx); the partial fields are not returned.
+        """
+        required = list(required_fields or [])
+        cache_key = self._structured_cache_key(
+            prompt, output_schema, system_prompt, temperature, {"num_ctx": self.num_ctx},
+        )
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"LLM stream [{profile_context or 'unnamed'}]: cache hit")
+            record_llm_call(None, cached=True)
+            for name, value in cached.items():
+                if on_field:
+                    on_field(name, value)
+            return StructuredLLMResponse(data=cached, profile=LLMProfile(), cached=True)
+
+        schema_prompt = f"""You must respond with valid JSON matching this schema:
+{json.dumps(output_schema, indent=2)}
+
+{system_prompt or ''}"""
+
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": schema_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            "stream": True,
+            "format": "json",
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": temperature,
+                "num_ctx": self.num_ctx,
+            },
+        }
+
+        parser = IncrementalJSONParser()
+        start = time.perf_counter()
+        first_chunk_ms = first_field_ms = 0.0
+        chunks = 0
+        final: dict[str, Any] | None = None
+        stopped_early = False
+
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/chat",
+                json=payload,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("done"):
+                        final = data
+                        break
+                    content = data.get("message", {}).get("content", "")
+                    if not content:
+                        continue
+                    chunks += 1
+                    if chunks == 1:
+                        first_chunk_ms = (time.perf_counter() - start) * 1000
+
+                    for name, value in parser.feed(content):
+                        if not first_field_ms:
+                            first_field_ms = (time.perf_counter() - start) * 1000
+                        if on_field:
+                            on_field(name, value)
+
+                    if parser.closed:
+                        break
+                    if (required and parser.has_fields(required)) or (
+                        stop_when and parser.fields and stop_when(parser.fields)
+                    ):
+                        stopped_early = True
+                        break
+        except requests.RequestException as e:
+            logger.error(f"Ollama stream failed: {e}")
+            raise
+
+        total_ms = (time.perf_counter() - start) * 1000
+        if final is not None:
+            profile = _extract_profile(final)
+        else:
+            # Cancelled before Ollama's final stats; each chunk is one token
+            profile = LLMProfile(
+                input_tokens=-(-(len(schema_prompt) + len(prompt)) // 4),
+                output_tokens=chunks,
+                total_ms=total_ms,
+                prefill_ms=first_chunk_ms,
+                generation_ms=total_ms - first_chunk_ms,
+            )
+        profile.time_to_first_field_ms = first_field_ms
+
+        schema_key = json.dumps(output_schema, sort_keys=True)
+        with self._stream_lock:
+            if stopped_early:
+                typical = self._stream_lengths.get(schema_key)
+                if typical:
+                    profile.tokens_saved = max(0, round(typical) - profile.output_tokens)
+            elif parser.closed:
+                previous = self._stream_lengths.get(schema_key)
+                self._stream_lengths[schema_key] = (
+                    profile.output_tokens if previous is None
+                    else previous + 0.2 * (profile.output_tokens - previous)
+                )
+
+        logger.info(f"LLM stream [{profile_context or 'unnamed'}]: {profile.summary()}")
+        if self.enable_profiling:
+            _store_profile(profile, profile_context)
+        record_llm_call(profile)
+
+        if not parser.fields and not parser.closed:
+            raise ValueError(f"Invalid JSON response: {parser.text[:200]!r}")
+        if not parser.closed and not stopped_early:
+            # Hit num_ctx/num_predict or the connection dropped mid-object
+            raise ValueError(f"Truncated JSON response: {parser.text[-200:]!r}")
+        parsed = parser.result()
+        if parser.closed:
+            # Only complete objects are safe to serve to non-streaming callers
+            self._cache_store(cache_key, parsed, profile.total_ms / 1000)
+        return StructuredLLMResponse(data=parsed, profile=profile)
+
     def is_available(self) -> bool:
         """Check if Ollama is running and the model is available."""
         try:
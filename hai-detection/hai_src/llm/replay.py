@@ -0,0 +1,456 @@
+"""Record/replay LLM client for offline benchmarking.
+
+In record mode every call is passed to a live client (Ollama or vLLM) and
+the response and its LLMProfile are appended to a JSON Lines cassette. In
+replay mode the cassette answers instead and the client sleeps for a
+realistic time, so the pipeline can be benchmarked and load-tested on a
+CPU-only machine and pipeline regressions separated from model speed.
+
+Replay latency:
+- "recorded": the recorded total duration of each call
+- "rates": input tokens / prefill rate + output tokens / decode rate, with
+  rates taken from the median of the recorded profiles (or overridden)
+  and lognormal jitter per call
+- "none": return immediately
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..config import Config
+from .base import (
+    BaseLLMClient,
+    LLMProfile,
+    LLMResponse,
+    StructuredLLMResponse,
+    record_llm_call,
+)
+from .ollama import _store_profile
+from common.llm_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+LATENCY_MODES = ("recorded", "rates", "none")
+
+# Used when the cassette has no usable profiles (70B model on one GPU)
+DEFAULT_PREFILL_TPS = 800.0
+DEFAULT_DECODE_TPS = 18.0
+
+# Rough characters-per-token for estimating tokens of unrecorded prompts
+CHARS_PER_TOKEN = 4
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response in the cassette."""
+
+
+class ReplayLLMClient(BaseLLMClient):
+    """LLM client that records live responses to a cassette and replays them."""
+
+    # Benchmarks should measure the (simulated) model, not the response cache
+    use_response_cache = False
+
+    def __init__(
+        self,
+        cassette_path: str | Path,
+        mode: str = "replay",
+        inner: BaseLLMClient | None = None,
+        latency: str = "recorded",
+        speed: float = 1.0,
+        prefill_tps: float | None = None,
+        decode_tps: float | None = None,
+        jitter: float = 0.1,
+        max_concurrent: int | None = None,
+        strict: bool = True,
+        seed: int | None = None,
+        enable_profiling: bool = True,
+    ):
+        """Initialize replay client.
+
+        Args:
+            cassette_path: JSON Lines cassette to read and/or append to.
+            mode: "replay" (cassette only), "record" (always call inner and
+                record) or "auto" (replay if recorded, otherwise record).
+            inner: Live client for record/auto mode.
+            latency: "recorded", "rates" or "none".
+            speed: Divides every simulated duration (2.0 = twice as fast).
+            prefill_tps: Input tokens/second for "rates" latency. Defaults
+                to the median recorded prefill rate.
+            decode_tps: Output tokens/second for "rates" latency. Defaults
+                to the median recorded generation rate.
+            jitter: Sigma of the lognormal multiplier on "rates" durations.
+            max_concurrent: Simulated server slots (like OLLAMA_NUM_PARALLEL);
+                extra requests queue. None for unlimited.
+            strict: If False, a replay miss falls back to the latest
+                response recorded for the same output schema, with latency
+                estimated from the prompt length. Use this when prompts have
+                changed since recording.
+            seed: Seed for latency jitter.
+            enable_profiling: Whether to store simulated profiles in the
+                shared profile history.
+        """
+        if mode not in ("replay", "record", "auto"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency: {latency}")
+        if mode != "replay" and inner is None:
+            raise ValueError(f"{mode} mode needs a live client to record from")
+
+        self.cassette_path = Path(cassette_path)
+        self.mode = mode
+        self.inner = inner
+        self.latency = latency
+        self.speed = speed
+        self.jitter = jitter
+        self.strict = strict
+        self.enable_profiling = enable_profiling
+        self.num_ctx = getattr(inner, "num_ctx", 8192)
+
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._latest_by_shape: dict[tuple[str, str], dict[str, Any]] = {}
+        self._recorded_model: str | None = None
+        self._load()
+
+        recorded_prefill, recorded_decode = self._recorded_rates()
+        self.prefill_tps = prefill_tps or recorded_prefill
+        self.decode_tps = decode_tps or recorded_decode
+
+        if inner is not None:
+            # Record real model timings, not response-cache hits
+            inner.use_response_cache = False
+
+        self.stats = {"replayed": 0, "recorded": 0, "fallbacks": 0, "simulated_ms": 0.0}
+        # Batches fill the simulated slots, or match the live backend
+        self.batch_concurrency = max_concurrent or (
+            inner.batch_concurrency if inner is not None else Config.get_llm_concurrency("replay")
+        )
+
+    # --- Cassette ---
+
+    def _load(self) -> None:
+        """Read recorded interactions; later lines win on duplicate keys."""
+        if not self.cassette_path.exists():
+            if self.mode == "replay":
+                raise FileNotFoundError(f"Cassette not found: {self.cassette_path}")
+            return
+
+        with open(self.cassette_path) as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping bad cassette line {line_no} in {self.cassette_path}")
+                    continue
+                self._add(entry)
+
+        logger.info(f"Loaded {len(self._entries)} recorded LLM calls from {self.cassette_path}")
+
+    def _add(self, entry: dict[str, Any]) -> None:
+        self._entries[entry["key"]] = entry
+        self._latest_by_shape[(entry["kind"], entry.get("schema_key", ""))] = entry
+        self._recorded_model = entry.get("model") or self._recorded_model
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        """Add an interaction and persist it to the cassette."""
+        with self._lock:
+            self._add(entry)
+            self.cassette_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self.stats["recorded"] += 1
+
+    @property
+    def recorded_calls(self) -> int:
+        """Number of distinct requests in the cassette."""
+        return len(self._entries)
+
+    @staticmethod
+    def _schema_key(output_schema: dict[str, Any] | None) -> str:
+        if output_schema is None:
+            return ""
+        canonical = json.dumps(output_schema, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _key(
+        kind: str,
+        prompt: str,
+        output_schema: dict[str, Any] | None,
+        system_prompt: str | None,
+        temperature: float,
+    ) -> str:
+        # Model is left out so one cassette replays under any client name
+        return make_cache_key(
+            "", prompt, kind, output_schema, system_prompt, {"temperature": temperature},
+        )
+
+    # --- Latency ---
+
+    def _recorded_rates(self) -> tuple[float, float]:
+        """Median prefill and decode tokens/second over recorded profiles."""
+        profiles = [LLMProfile(**e["profile"]) for e in self._entries.values() if e.get("profile")]
+        prefill = [p.prefill_tokens_per_second for p in profiles if p.prefill_tokens_per_second > 0]
+        decode = [p.tokens_per_second for p in profiles if p.tokens_per_second > 0]
+        return (
+            statistics.median(prefill) if prefill else DEFAULT_PREFILL_TPS,
+            statistics.median(decode) if decode else DEFAULT_DECODE_TPS,
+        )
+
+    def _simulate_profile(self, recorded: LLMProfile, input_tokens: int | None = None) -> LLMProfile:
+        """Timings for one replayed call under the configured latency model."""
+        input_tokens = recorded.input_tokens if input_tokens is None else input_tokens
+        if self.latency == "none":
+            return LLMProfile(input_tokens=input_tokens, output_tokens=recorded.output_tokens)
+
+        if self.latency == "recorded" and input_tokens == recorded.input_tokens:
+            profile = dataclasses.replace(recorded)
+        else:
+            with self._lock:
+                prefill_jitter = math.exp(self._rng.gauss(0, self.jitter))
+                decode_jitter = math.exp(self._rng.gauss(0, self.jitter))
+            profile = LLMProfile(
+                input_tokens=input_tokens,
+                output_tokens=recorded.output_tokens,
+                prefill_ms=input_tokens / self.prefill_tps * 1000 * prefill_jitter,
+                generation_ms=recorded.output_tokens / self.decode_tps * 1000 * decode_jitter,
+            )
+            profile.total_ms = profile.prefill_ms + profile.generation_ms
+
+        for name in ("total_ms", "load_ms", "prefill_ms", "generation_ms"):
+            setattr(profile, name, getattr(profile, name) / self.speed)
+        return profile
+
+    def _wait(self, profile: LLMProfile) -> None:
+        """Sleep for the simulated duration, holding a server slot."""
+        if profile.total_ms <= 0:
+            return
+        if self._slots is None:
+            time.sleep(profile.total_ms / 1000)
+        else:
+            with self._slots:
+                time.sleep(profile.total_ms / 1000)
+        with self._lock:
+            self.stats["simulated_ms"] += profile.total_ms
+
+    # --- Replay / record ---
+
+    def _replay(
+        self,
+        key: str,
+        kind: str,
+        prompt: str,
+        output_schema: dict[str, Any] | None,
+        profile_context: str,
+    ) -> tuple[dict[str, Any], LLMProfile] | None:
+        """Recorded entry and simulated profile for a request, or None to record."""
+        if self.mode == "record":
+            return None
+
+        entry = self._entries.get(key)
+        input_tokens = None
+
+        if entry is None:
+            if self.mode == "auto":
+                return None
+            if self.strict:
+                raise CassetteMissError(
+                    f"No recorded {kind} response for this request in {self.cassette_path}"
+                )
+            entry = self._latest_by_shape.get((kind, self._schema_key(output_schema)))
+            if entry is None:
+                raise CassetteMissError(f"No recorded {kind} responses to fall back on")
+            input_tokens = -(-len(prompt) // CHARS_PER_TOKEN)
+            with self._lock:
+                self.stats["fallbacks"] += 1
+
+        profile = self._simulate_profile(LLMProfile(**entry["profile"]), input_tokens)
+        self._wait(profile)
+        with self._lock:
+            self.stats["replayed"] += 1
+
+        logger.debug(f"LLM replay [{profile_context or 'unnamed'}]: {profile.summary()}")
+        if self.enable_profiling:
+            _store_profile(profile, profile_context)
+        record_llm_call(profile)
+        return entry, profile
+
+    def _entry(
+        self,
+        key: str,
+        kind: str,
+        prompt: str,
+        output_schema: dict[str, Any] | None,
+        profile: LLMProfile,
+        **response: Any,
+    ) -> dict[str, Any]:
+        return {
+            "key": key,
+            "kind": kind,
+            "model": self.inner.model_name,
+            "schema_key": self._schema_key(output_schema),
+            "prompt_chars": len(prompt),
+            "profile": dataclasses.asdict(profile),
+            "recorded_at": datetime.now().isoformat(),
+            **response,
+        }
+
+    @staticmethod
+    def _measured_profile(prompt: str, output: str, started: float) -> LLMProfile:
+        """Profile for backends that return no timings (e.g. vLLM)."""
+        total_ms = (time.perf_counter() - started) * 1000
+        return LLMProfile(
+            input_tokens=-(-len(prompt) // CHARS_PER_TOKEN),
+            output_tokens=-(-len(output) // CHARS_PER_TOKEN),
+            total_ms=total_ms,
+            generation_ms=total_ms,
+        )
+
+    # --- BaseLLMClient ---
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 4096,
+        profile_context: str = "",
+    ) -> LLMResponse:
+        """Replay (or record) a free-text generation."""
+        key = self._key("generate", prompt, None, system_prompt, temperature)
+        replayed = self._replay(key, "generate", prompt, None, profile_context)
+        if replayed is not None:
+            entry, profile = replayed
+            return LLMResponse(
+                content=entry["content"],
+                input_tokens=profile.input_tokens,
+                output_tokens=profile.output_tokens,
+                model=self.model_name,
+                finish_reason=entry.get("finish_reason"),
+                profile=profile,
+            )
+
+        started = time.perf_counter()
+        response = self.inner.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            profile_context=profile_context,
+        )
+        profile = response.profile or self._measured_profile(prompt, response.content, started)
+        if response.profile is None and response.output_tokens:
+            profile.input_tokens = response.input_tokens
+            profile.output_tokens = response.output_tokens
+        self._append(self._entry(
+            key, "generate", prompt, None, profile,
+            content=response.content, finish_reason=response.finish_reason,
+        ))
+        response.profile = profile
+        return response
+
+    def generate_structured(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+    ) -> dict[str, Any]:
+        """Replay (or record) a structured JSON generation."""
+        return self.generate_structured_with_profile(
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+        ).data
+
+    def generate_structured_with_profile(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+    ) -> StructuredLLMResponse:
+        """Replay (or record) a structured generation with its profile."""
+        key = self._key("structured", prompt, output_schema, system_prompt, temperature)
+        replayed = self._replay(key, "structured", prompt, output_schema, profile_context)
+        if replayed is not None:
+            entry, profile = replayed
+            return StructuredLLMResponse(data=entry["response"], profile=profile)
+
+        started = time.perf_counter()
+        if hasattr(self.inner, "generate_structured_with_profile"):
+            result = self.inner.generate_structured_with_profile(
+                prompt=prompt,
+                output_schema=output_schema,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                profile_context=profile_context,
+            )
+        else:
+            data = self.inner.generate_structured(
+                prompt=prompt,
+                output_schema=output_schema,
+                system_prompt=system_prompt,
+                temperature=temperature,
+            )
+            result = StructuredLLMResponse(
+                data=data,
+                profile=self._measured_profile(prompt, json.dumps(data), started),
+            )
+
+        self._append(self._entry(
+            key, "structured", prompt, output_schema, result.profile, response=result.data,
+        ))
+        return result
+
+    def is_available(self) -> bool:
+        """Replay is available once anything is recorded; recording needs the live client."""
+        if self.mode == "replay":
+            return bool(self._entries)
+        return self.inner.is_available()
+
+    @property
+    def model_name(self) -> str:
+        if self.inner is not None:
+            return self.inner.model_name
+        return self._recorded_model or "replay"
+
+
+def get_replay_client(inner: BaseLLMClient | None = None) -> ReplayLLMClient:
+    """Replay client configured from LLM_CASSETTE_PATH and LLM_REPLAY_* settings.
+
+    Args:
+        inner: Live client to record from. If given, the client runs in
+            LLM_RECORD_MODE ("auto" or "record"); otherwise it only replays.
+    """
+    return ReplayLLMClient(
+        os.path.expanduser(Config.LLM_CASSETTE_PATH),
+        mode=Config.LLM_RECORD_MODE if inner is not None else "replay",
+        inner=inner,
+        latency=Config.LLM_REPLAY_LATENCY,
+        speed=Config.LLM_REPLAY_SPEED,
+        prefill_tps=Config.LLM_REPLAY_PREFILL_TPS,
+        decode_tps=Config.LLM_REPLAY_DECODE_TPS,
+        jitter=Config.LLM_REPLAY_JITTER,
+        max_concurrent=Config.LLM_REPLAY_MAX_CONCURRENT or None,
+        strict=Config.LLM_REPLAY_STRICT,
+    )
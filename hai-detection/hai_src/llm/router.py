@@ -0,0 +1,399 @@
+"""Queue-aware routing of LLM requests across Ollama endpoints.
+
+The triage (7B) and full extraction (70B) models evict each other when
+they share one Ollama server, so every escalation pays a cold load. The
+router maps each model to the endpoints that should serve it and, per
+endpoint, tracks requests in flight, a moving average of latency, which
+models are loaded (via /api/ps) and recent connection failures. Each
+request goes to the least-loaded endpoint that already has the model in
+VRAM; models stay pinned there through Ollama's keep_alive.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import requests
+
+from ..config import Config
+from .base import BaseLLMClient, LLMResponse, StructuredLLMResponse
+from .ollama import OllamaClient, _parse_keep_alive
+
+logger = logging.getLogger(__name__)
+
+
+def parse_endpoints(spec: str) -> dict[str, list[str]]:
+    """Parse "model=url,url;model=url" into a model -> endpoint URLs map."""
+    routes: dict[str, list[str]] = {}
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        model, _, urls = part.partition("=")
+        if not urls:
+            raise ValueError(f"Bad LLM_ENDPOINTS entry (expected model=url,...): {part!r}")
+        routes[model.strip()] = [u.strip().rstrip("/") for u in urls.split(",") if u.strip()]
+    return routes
+
+
+@dataclass
+class EndpointState:
+    """Load and health of one Ollama server."""
+
+    url: str
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    latency_ms: float | None = None  # Moving average of successful calls
+    loaded_models: set[str] = field(default_factory=set)
+    loaded_checked_at: float | None = None
+    down_until: float = 0.0
+
+    def is_warm(self, model: str) -> bool:
+        return model in self.loaded_models
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.url,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "loaded_models": sorted(self.loaded_models),
+            "down": self.down_until > time.monotonic(),
+        }
+
+
+class LLMRouter:
+    """Chooses an endpoint for each request by warmth, queue depth and latency."""
+
+    def __init__(
+        self,
+        routes: dict[str, list[str]],
+        slots: int = 2,
+        keep_alive: str | int = "30m",
+        loaded_ttl: float = 30.0,
+        cooldown: float = 30.0,
+        latency_alpha: float = 0.3,
+    ):
+        """Initialize router.
+
+        Args:
+            routes: Model name -> endpoint base URLs that may serve it.
+            slots: Requests an endpoint runs at once (OLLAMA_NUM_PARALLEL).
+                A warm endpoint with all slots busy loses its preference.
+            keep_alive: keep_alive sent with warm-up requests.
+            loaded_ttl: Seconds between /api/ps checks of loaded models.
+            cooldown: Seconds an endpoint is skipped after a connection error.
+            latency_alpha: Weight of the newest call in the latency average.
+        """
+        self.routes = {model: list(urls) for model, urls in routes.items()}
+        self.slots = slots
+        self.keep_alive = _parse_keep_alive(keep_alive)
+        self.loaded_ttl = loaded_ttl
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, EndpointState] = {
+            url: EndpointState(url) for urls in self.routes.values() for url in urls
+        }
+        self._session = requests.Session()
+
+    @classmethod
+    def from_config(cls) -> "LLMRouter":
+        """Router for LLM_ENDPOINTS, LLM_ENDPOINT_SLOTS and OLLAMA_KEEP_ALIVE."""
+        return cls(
+            parse_endpoints(Config.LLM_ENDPOINTS),
+            slots=Config.LLM_ENDPOINT_SLOTS,
+            keep_alive=Config.OLLAMA_KEEP_ALIVE,
+        )
+
+    def serves(self, model: str) -> bool:
+        return bool(self.routes.get(model))
+
+    # --- Endpoint selection ---
+
+    def acquire(self, model: str, exclude: set[str] | None = None) -> EndpointState:
+        """Pick an endpoint for a request and count it as in flight.
+
+        Preference: reachable, then warm with a free slot, then fewest
+        in flight, then lowest recent latency. Callers must release().
+
+        Raises:
+            ValueError: If no endpoint is configured for the model.
+        """
+        urls = [u for u in self.routes.get(model, []) if u not in (exclude or ())]
+        if not urls:
+            raise ValueError(f"No LLM endpoint configured for model {model}")
+        self._refresh_loaded(urls)
+
+        now = time.monotonic()
+        with self._lock:
+            endpoint = min(
+                (self._endpoints[u] for u in urls),
+                key=lambda e: (
+                    e.down_until > now,
+                    not e.is_warm(model) or e.in_flight >= self.slots,
+                    e.in_flight,
+                    e.latency_ms or 0.0,
+                ),
+            )
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(
+        self,
+        endpoint: EndpointState,
+        model: str,
+        elapsed_ms: float | None = None,
+        failed: bool = False,
+    ) -> None:
+        """Record the outcome of a request started with acquire().
+
+        Args:
+            elapsed_ms: Model time of a successful call; None to leave the
+                latency average alone (e.g. a response cache hit).
+            failed: The endpoint could not be reached; skip it for a while.
+        """
+        with self._lock:
+            endpoint.in_flight -= 1
+            if failed:
+                endpoint.errors += 1
+                endpoint.down_until = time.monotonic() + self.cooldown
+                endpoint.loaded_models.discard(model)
+                return
+            endpoint.down_until = 0.0
+            endpoint.loaded_models.add(model)
+            if elapsed_ms is not None:
+                if endpoint.latency_ms is None:
+                    endpoint.latency_ms = elapsed_ms
+                else:
+                    endpoint.latency_ms += self.latency_alpha * (elapsed_ms - endpoint.latency_ms)
+
+    def _refresh_loaded(self, urls: list[str]) -> None:
+        """Update which models each endpoint has in memory (GET /api/ps)."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                u for u in urls
+                if self._endpoints[u].loaded_checked_at is None
+                or now - self._endpoints[u].loaded_checked_at >= self.loaded_ttl
+            ]
+            for url in stale:
+                # Claim the check so concurrent requests don't repeat it
+                self._endpoints[url].loaded_checked_at = now
+
+        for url in stale:
+            try:
+                response = self._session.get(f"{url}/api/ps", timeout=2)
+                response.raise_for_status()
+                loaded = {m.get("name") for m in response.json().get("models", [])}
+            except (requests.RequestException, ValueError) as e:
+                logger.debug(f"Could not list loaded models on {url}: {e}")
+                continue
+            with self._lock:
+                self._endpoints[url].loaded_models = loaded
+
+    # --- Warm-up and stats ---
+
+    def warm_up(self, model: str | None = None) -> dict[str, bool]:
+        """Load models on their endpoints and pin them with keep_alive.
+
+        Args:
+            model: Only this model. Defaults to every routed model.
+
+        Returns:
+            "model@url" -> whether the load succeeded.
+        """
+        results = {}
+        models = [model] if model else list(self.routes)
+        for name in models:
+            for url in self.routes.get(name, []):
+                try:
+                    # An empty generate request just loads the model
+                    response = self._session.post(
+                        f"{url}/api/generate",
+                        json={"model": name, "keep_alive": self.keep_alive},
+                        timeout=600,
+                    )
+                    response.raise_for_status()
+                    ok = True
+                except requests.RequestException as e:
+                    logger.warning(f"Failed to load {name} on {url}: {e}")
+                    ok = False
+                with self._lock:
+                    if ok:
+                        self._endpoints[url].loaded_models.add(name)
+                results[f"{name}@{url}"] = ok
+        return results
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Current per-endpoint load, latency and loaded models."""
+        with self._lock:
+            return [e.to_dict() for e in self._endpoints.values()]
+
+
+class RoutedOllamaClient(BaseLLMClient):
+    """Ollama client for one model that spreads requests across its endpoints."""
+
+    def __init__(
+        self,
+        router: LLMRouter,
+        model: str,
+        timeout: int = 300,
+        num_ctx: int = 8192,
+        enable_profiling: bool = True,
+    ):
+        """Initialize routed client.
+
+        Args:
+            router: Router holding the model's endpoints.
+            model: Model to use; must be routed.
+            timeout: Request timeout in seconds.
+            num_ctx: Context window size in tokens.
+            enable_profiling: Whether to store profiles in history.
+        """
+        if not router.serves(model):
+            raise ValueError(f"No LLM endpoint configured for model {model}")
+        self.router = router
+        self.model = model
+        self.timeout = timeout
+        self.num_ctx = num_ctx
+        self.enable_profiling = enable_profiling
+        self._clients: dict[str, OllamaClient] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def batch_concurrency(self) -> int:
+        """Every slot on every endpoint serving the model."""
+        return self.router.slots * len(self.router.routes[self.model])
+
+    def _client_for(self, url: str) -> OllamaClient:
+        with self._lock:
+            client = self._clients.get(url)
+            if client is None:
+                client = OllamaClient(
+                    base_url=url,
+                    model=self.model,
+                    timeout=self.timeout,
+                    num_ctx=self.num_ctx,
+                    enable_profiling=self.enable_profiling,
+                    keep_alive=self.router.keep_alive,
+                )
+                client.use_response_cache = self.use_response_cache
+                client.response_cache = self.response_cache
+                self._clients[url] = client
+            return client
+
+    def _call(self, method: str, **kwargs):
+        """Run a client call on the chosen endpoint, failing over once on connection errors."""
+        tried: set[str] = set()
+        while True:
+            endpoint = self.router.acquire(self.model, exclude=tried)
+            try:
+                result = getattr(self._client_for(endpoint.url), method)(**kwargs)
+            except requests.ConnectionError:
+                self.router.release(endpoint, self.model, failed=True)
+                tried.add(endpoint.url)
+                if len(tried) >= len(self.router.routes[self.model]):
+                    raise
+                logger.warning(f"LLM endpoint {endpoint.url} unreachable, trying another")
+                continue
+            except Exception:
+                self.router.release(endpoint, self.model)
+                raise
+
+            cached = getattr(result, "cached", False)
+            self.router.release(
+                endpoint, self.model, None if cached else result.profile.total_ms,
+            )
+            return result
+
+    def generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 4096,
+        profile_context: str = "",
+    ) -> LLMResponse:
+        """Generate a response on the least-loaded warm endpoint."""
+        return self._call(
+            "generate",
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            profile_context=profile_context,
+        )
+
+    def generate_structured(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+    ) -> dict[str, Any]:
+        """Generate a structured JSON response on the least-loaded warm endpoint."""
+        return self.generate_structured_with_profile(
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+        ).data
+
+    def generate_structured_with_profile(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+    ) -> StructuredLLMResponse:
+        """Generate a structured JSON response with profiling data."""
+        return self._call(
+            "generate_structured_with_profile",
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+        )
+
+    def generate_structured_stream(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+        required_fields: Iterable[str] | None = None,
+        stop_when: Callable[[dict[str, Any]], bool] | None = None,
+        on_field: Callable[[str, Any], None] | None = None,
+    ) -> StructuredLLMResponse:
+        """Stream a structured JSON response from the least-loaded warm endpoint."""
+        return self._call(
+            "generate_structured_stream",
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+            required_fields=required_fields,
+            stop_when=stop_when,
+            on_field=on_field,
+        )
+
+    def is_available(self) -> bool:
+        """Check if any endpoint has the model."""
+        return any(self._client_for(url).is_available() for url in self.router.routes[self.model])
+
+    @property
+    def model_name(self) -> str:
+        return self.model
@@ -0,0 +1,163 @@
+"""Incremental parsing of streamed JSON objects.
+
+Structured calls ask the model for one JSON object. Streaming it token by
+token lets callers act on each top-level field as soon as its value is
+complete, and stop generation once they have what they need instead of
+waiting for the whole completion.
+"""
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONParser:
+    """Parses a JSON object fed in arbitrary chunks.
+
+    Text before the opening brace is skipped. Each top-level field is
+    reported once, when its value is complete: at the closing quote,
+    bracket or brace, or for numbers/booleans/null at the next comma or
+    the closing brace of the object.
+    """
+
+    def __init__(self):
+        self.fields: dict[str, Any] = {}
+        self.closed = False  # Top-level object finished
+        self._text: list[str] = []
+        self._pos = 0  # Absolute position scanned up to
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "key"  # key, key_str, colon, value, value_str, value_nested, value_scalar, comma
+        self._key: str | None = None
+        self._start = 0  # Absolute position where the open key or value began
+        self._partial: list[str] = []  # Earlier chunks' text of the open key or value
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._text)
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Add streamed text.
+
+        Only the new chunk is scanned; the text of a key or value that spans
+        chunks is kept until it completes, so feeding is linear in the
+        length of the stream.
+
+        Returns:
+            (field, value) for each top-level field completed by this chunk.
+        """
+        self._text.append(chunk)
+        if self.closed:
+            return []
+        base = self._pos
+        completed: list[tuple[str, Any]] = []
+
+        for offset, c in enumerate(chunk):
+            i = base + offset
+
+            if not self._started:
+                if c == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key_str":
+                        self._key = self._load(self._take(chunk, base, i + 1))
+                        self._state = "colon"
+                    elif self._depth == 1 and self._state == "value_str":
+                        self._complete(self._take(chunk, base, i + 1), completed)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._begin(i, "key_str")
+                elif self._depth == 1 and self._state == "value":
+                    self._begin(i, "value_str")
+            elif c in "{[":
+                if self._depth == 1 and self._state == "value":
+                    self._begin(i, "value_nested")
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value_nested":
+                    self._complete(self._take(chunk, base, i + 1), completed)
+                elif self._depth == 0:
+                    if self._state == "value_scalar":
+                        self._complete(self._take(chunk, base, i), completed)
+                    self.closed = True
+                    self._pos = i + 1
+                    return completed
+            elif self._depth == 1:
+                if c == ":" and self._state == "colon":
+                    self._state = "value"
+                elif c == ",":
+                    if self._state == "value_scalar":
+                        self._complete(self._take(chunk, base, i), completed)
+                    self._state = "key"
+                elif self._state == "value" and not c.isspace():
+                    self._begin(i, "value_scalar")
+
+        if self._state in _OPEN_STATES:
+            self._partial.append(chunk[max(self._start - base, 0):])
+        self._pos = base + len(chunk)
+        return completed
+
+    def has_fields(self, names) -> bool:
+        """Whether every named field has been parsed."""
+        return all(name in self.fields for name in names)
+
+    def result(self) -> dict[str, Any]:
+        """The whole object if it parses, otherwise the fields completed so far."""
+        if self.closed:
+            text = self.text
+            start = text.find("{")
+            try:
+                return json.loads(text[start:self._pos])
+            except json.JSONDecodeError:
+                pass
+        return dict(self.fields)
+
+    def _begin(self, i: int, state: str) -> None:
+        self._start, self._state = i, state
+        self._partial = []
+
+    def _take(self, chunk: str, base: int, end: int) -> str:
+        """Text of the open key or value up to absolute position end."""
+        raw = "".join(self._partial) + chunk[max(self._start - base, 0):end - base]
+        self._partial = []
+        return raw
+
+    def _complete(self, raw: str, completed: list[tuple[str, Any]]) -> None:
+        value = self._load(raw.strip())
+        if self._key is not None and value is not _INVALID:
+            self.fields[self._key] = value
+            completed.append((self._key, value))
+        self._key = None
+        self._state = "comma"
+
+    @staticmethod
+    def _load(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping unparseable streamed JSON value: {raw[:80]!r}")
+            return _INVALID
+
+
+_INVALID = object()
+
+# States in which a key or value has begun but not yet completed
+_OPEN_STATES = ("key_str", "value_str", "value_nested", "value_scalar")
@@ -12,13 +12,31 @@ import time
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..config import Config
-from .base import BaseLLMClient, LLMResponse
+from .base import (
+    BaseLLMClient,
+    LLMProfile,
+    LLMResponse,
+    StructuredLLMResponse,
+    record_llm_call,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _usage_profile(usage: dict[str, Any], elapsed_seconds: float) -> LLMProfile:
+    """Profile from an OpenAI-style usage block and the request's wall time."""
+    elapsed_ms = elapsed_seconds * 1000
+    return LLMProfile(
+        input_tokens=usage.get("prompt_tokens", 0),
+        output_tokens=usage.get("completion_tokens", 0),
+        total_ms=elapsed_ms,
+        generation_ms=elapsed_ms,
+    )
+
+
 class VLLMClient(BaseLLMClient):
     """vLLM API client using OpenAI-compatible endpoint.
 
@@ -44,6 +62,15 @@ class VLLMClient(BaseLLMClient):
         self.model = model or getattr(Config, 'VLLM_MODEL', 'Qwen/Qwen2.5-72B-Instruct')
         self.timeout = timeout
         self.session = requests.Session()
+        # One pooled connection per concurrent batch request
+        adapter = HTTPAdapter(pool_maxsize=max(10, self.batch_concurrency))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def batch_concurrency(self) -> int:
+        """Requests in flight per batch; vLLM batches them continuously."""
+        return Config.VLLM_MAX_CONCURRENT
 
     def generate(
         self,
@@ -51,6 +78,7 @@ class VLLMClient(BaseLLMClient):
         system_prompt: str | None = None,
         temperature: float = 0.0,
         max_tokens: int = 4096,
+        profile_context: str = "",
     ) -> LLMResponse:
         """Generate a response using vLLM's OpenAI-compatible API."""
         messages = []
@@ -82,10 +110,11 @@ class VLLMClient(BaseLLMClient):
             usage = data.get("usage", {})
 
             logger.debug(
-                f"vLLM response in {elapsed:.1f}s: "
+                f"vLLM response [{profile_context or 'unnamed'}] in {elapsed:.1f}s: "
                 f"{usage.get('prompt_tokens', 0)} in, "
                 f"{usage.get('completion_tokens', 0)} out"
             )
+            record_llm_call(_usage_profile(usage, elapsed))
 
             return LLMResponse(
                 content=choice.get("message", {}).get("content", ""),
@@ -106,11 +135,43 @@ class VLLMClient(BaseLLMClient):
         output_schema: dict[str, Any],
         system_prompt: str | None = None,
         temperature: float = 0.0,
+        profile_context: str = "",
     ) -> dict[str, Any]:
         """Generate a structured JSON response.
 
         Uses guided generation if available, otherwise prompts for JSON.
+        Deterministic calls are served from the response cache when possible.
         """
+        return self.generate_structured_with_profile(
+            prompt=prompt,
+            output_schema=output_schema,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            profile_context=profile_context,
+        ).data
+
+    def generate_structured_with_profile(
+        self,
+        prompt: str,
+        output_schema: dict[str, Any],
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        profile_context: str = "",
+    ) -> StructuredLLMResponse:
+        """Generate a structured JSON response with profiling data.
+
+        vLLM reports token usage but no timing breakdown, so the profile's
+        durations are wall time of the request.
+        """
+        cache_key = self._structured_cache_key(
+            prompt, output_schema, system_prompt, temperature, {"max_tokens": 4096},
+        )
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            logger.info(f"vLLM structured [{profile_context or 'unnamed'}]: cache hit")
+            record_llm_call(None, cached=True)
+            return StructuredLLMResponse(data=cached, profile=LLMProfile(), cached=True)
+
         # Build system prompt with JSON schema instruction
         schema_prompt = f"""You must respond with valid JSON matching this schema:
 {json.dumps(output_schema, indent=2)}
@@ -143,6 +204,7 @@ Respond ONLY with the JSON object, no other text.
             pass
 
         try:
+            start_time = time.time()
             response = self.session.post(
                 f"{self.base_url}/v1/chat/completions",
                 json=payload,
@@ -152,6 +214,9 @@ Respond ONLY with the JSON object, no other text.
 
             data = response.json()
             content = data.get("choices", [{}])[0].get("message", {}).get("content", "{}")
+            profile = _usage_profile(data.get("usage", {}), time.time() - start_time)
+            logger.info(f"vLLM structured [{profile_context or 'unnamed'}]: {profile.summary()}")
+            record_llm_call(profile)
 
             # Clean up response (remove markdown code blocks if present)
             content = content.strip()
@@ -163,7 +228,9 @@ Respond ONLY with the JSON object, no other text.
                 content = content[:-3]
             content = content.strip()
 
-            return json.loads(content)
+            parsed = json.loads(content)
+            self._cache_store(cache_key, parsed, profile.total_ms / 1000)
+            return StructuredLLMResponse(data=parsed, profile=profile, raw_response=data)
 
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse vLLM JSON response: {e}")
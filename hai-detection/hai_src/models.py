@@ -386,6 +386,8 @@ class SSICandidate:
     wound_culture_date: datetime | None = None
     readmission_for_ssi: bool = False
     reoperation_for_ssi: bool = False
+    # Note text around SSI keyword matches (detection evidence, not persisted)
+    keyword_snippets: list[str] = field(default_factory=list)
 
     def to_db_row(self) -> dict:
         """Convert to database row format."""
@@ -12,9 +12,13 @@ import time
 from datetime import datetime, timedelta
 
 from common.alert_store import AlertStore, AlertType
+from common.fhir_client import end_fhir_cycle
+from common.llm_cache import get_llm_cache
 
 from .config import Config
+from .data.note_store import LocalNoteStore
 from .db import HAIDatabase
+from .llm.base import track_throughput
 from .models import (
     HAICandidate,
     HAIType,
@@ -24,6 +28,7 @@ from .models import (
 from .candidates import CLABSICandidateDetector, SSICandidateDetector, VAECandidateDetector, CAUTICandidateDetector, CDICandidateDetector
 from .classifiers import CLABSIClassifierV2, SSIClassifierV2, VAEClassifier, CAUTIClassifier, CDIClassifier
 from .notes.retriever import NoteRetriever
+from .worker_pool import ClassificationWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -139,8 +144,20 @@ class HAIMonitor:
                 logger.error(f"Error in {hai_type.value} detection: {e}", exc_info=True)
 
         logger.info(f"Detection cycle complete: {total_candidates} new candidates")
+        end_fhir_cycle("hai-detection")
+        self._purge_note_store()
         return total_candidates
 
+    def _purge_note_store(self) -> None:
+        """Drop stored notes past NOTE_STORE_RETENTION_DAYS."""
+        note_source = self.note_retriever.note_source
+        if not isinstance(note_source, LocalNoteStore):
+            return
+        try:
+            note_source.purge_expired()
+        except Exception as e:
+            logger.warning(f"Note store purge failed: {e}")
+
     def _process_candidates(
         self,
         candidates: list[HAICandidate],
@@ -712,12 +729,19 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
         self,
         limit: int | None = None,
         dry_run: bool = False,
+        max_concurrent: int | None = None,
     ) -> dict:
         """Classify pending candidates using LLM extraction + rules engine.
 
+        Note retrieval and LLM classification run on a bounded worker pool
+        so notes for upcoming candidates are fetched while earlier ones are
+        with the LLM. Results are committed in candidate order.
+
         Args:
             limit: Maximum number of candidates to classify. None for all.
             dry_run: If True, don't save classifications.
+            max_concurrent: Concurrent LLM requests. Uses the per-backend
+                config (OLLAMA_MAX_CONCURRENT / VLLM_MAX_CONCURRENT) if None.
 
         Returns:
             Dict with classification summary.
@@ -745,81 +769,111 @@ Review in Dashboard: {Config.DASHBOARD_BASE_URL}/hai-detection/candidates/{candi
             "details": [],
         }
 
-        for candidate in candidates:
-            try:
-                # Retrieve clinical notes for this patient
-                notes = self.note_retriever.get_notes_for_candidate(candidate)
-
-                if not notes:
-                    logger.warning(
-                        f"No notes found for candidate {candidate.id} "
-                        f"(patient {candidate.patient.mrn})"
-                    )
-                    # Still run classification - will get low confidence
-                    notes = []
-
-                logger.info(
-                    f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
-                    f"patient={candidate.patient.mrn}, "
-                    f"organism={candidate.culture.organism}, "
-                    f"notes={len(notes)}"
+        # Resolve lazy-loaded components up front so worker threads only
+        # read them
+        note_retriever = self.note_retriever
+        for hai_type in {c.hai_type for c in candidates}:
+            self.get_classifier(hai_type)
+
+        def classify(candidate: HAICandidate, notes: list) -> object:
+            if not notes:
+                logger.warning(
+                    f"No notes found for candidate {candidate.id} "
+                    f"(patient {candidate.patient.mrn})"
                 )
+                # Still run classification - will get low confidence
+
+            logger.info(
+                f"Classifying {candidate.hai_type.value} candidate {candidate.id}: "
+                f"patient={candidate.patient.mrn}, "
+                f"organism={candidate.culture.organism}, "
+                f"notes={len(notes)}"
+            )
+
+            # Get the appropriate classifier for this HAI type
+            return self.get_classifier(candidate.hai_type).classify(candidate, notes)
+
+        pool = ClassificationWorkerPool(
+            fetch_notes=note_retriever.get_notes_for_candidate,
+            classify=classify,
+            note_workers=Config.NOTE_FETCH_WORKERS,
+            llm_workers=max_concurrent or Config.get_llm_concurrency(),
+        )
 
-                # Get the appropriate classifier for this HAI type
-                classifier = self.get_classifier(candidate.hai_type)
-
-                # Run classification
-                classification = classifier.classify(candidate, notes)
-
-                if dry_run:
-                    logger.info(
-                        f"[DRY RUN] Would classify {candidate.id} as "
-                        f"{classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f})"
-                    )
-                else:
-                    # Save classification
-                    self.db.save_classification(classification)
-
-                    # Update candidate status based on decision
-                    new_status = self._determine_status(classification)
-                    self.db.update_candidate_status(candidate.id, new_status)
-
-                    # Create review entry so it appears in pending reviews queue
-                    self._create_review_entry(candidate, classification)
-
-                    logger.info(
-                        f"Classified {candidate.id} as {classification.decision.value} "
-                        f"(confidence={classification.confidence:.2f}, status={new_status.value})"
+        # Meter the LLM calls of every classifier stage across the run
+        with track_throughput() as llm_meter:
+            for outcome in pool.run(candidates):
+                candidate = outcome.candidate
+                try:
+                    if outcome.error is not None:
+                        raise outcome.error
+
+                    classification = outcome.classification
+
+                    if dry_run:
+                        logger.info(
+                            f"[DRY RUN] Would classify {candidate.id} as "
+                            f"{classification.decision.value} "
+                            f"(confidence={classification.confidence:.2f})"
+                        )
+                    else:
+                        # Save classification
+                        self.db.save_classification(classification)
+
+                        # Update candidate status based on decision
+                        new_status = self._determine_status(classification)
+                        self.db.update_candidate_status(candidate.id, new_status)
+
+                        # Create review entry so it appears in pending reviews queue
+                        self._create_review_entry(candidate, classification)
+
+                        logger.info(
+                            f"Classified {candidate.id} as {classification.decision.value} "
+                            f"(confidence={classification.confidence:.2f}, status={new_status.value})"
+                        )
+
+                    # Track results
+                    decision = classification.decision.value
+                    results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
+                    results["details"].append({
+                        "candidate_id": candidate.id,
+                        "patient_mrn": candidate.patient.mrn,
+                        "organism": candidate.culture.organism,
+                        "decision": decision,
+                        "confidence": classification.confidence,
+                    })
+
+                    classified_count += 1
+
+                except Exception as e:
+                    logger.error(
+                        f"Error classifying candidate {candidate.id}: {e}",
+                        exc_info=e,
                     )
-
-                # Track results
-                decision = classification.decision.value
-                results["by_decision"][decision] = results["by_decision"].get(decision, 0) + 1
-                results["details"].append({
-                    "candidate_id": candidate.id,
-                    "patient_mrn": candidate.patient.mrn,
-                    "organism": candidate.culture.organism,
-                    "decision": decision,
-                    "confidence": classification.confidence,
-                })
-
-                classified_count += 1
-
-            except Exception as e:
-                logger.error(
-                    f"Error classifying candidate {candidate.id}: {e}",
-                    exc_info=True
-                )
-                error_count += 1
+                    error_count += 1
 
         results["classified"] = classified_count
         results["errors"] = error_count
+        results["pipeline"] = pool.stats()
+        results["llm_throughput"] = llm_meter.to_dict()
+        llm_cache = get_llm_cache()
+        if llm_cache is not None:
+            results["llm_cache"] = llm_cache.stats()
 
         logger.info(
             f"Classification complete: {classified_count} classified, "
             f"{error_count} errors"
         )
+        logger.info(
+            f"Pipeline stages: {pool.note_stats.summary()}; {pool.llm_stats.summary()}"
+        )
+        logger.info(f"LLM throughput: {llm_meter.summary()}")
+        if "llm_cache" in results:
+            cache_stats = results["llm_cache"]
+            logger.info(
+                f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%}), ~{cache_stats['seconds_saved']:.0f}s saved"
+            )
 
         return results
 
@@ -2,5 +2,16 @@
 
 from .retriever import NoteRetriever
 from .chunker import NoteChunker
+from .deduplicator import NoteDeduplicator
+from .keywords import KeywordAutomaton, KeywordMatch, keyword_snippets
+from .packer import ContextPacker
 
-__all__ = ["NoteRetriever", "NoteChunker"]
+__all__ = [
+    "NoteRetriever",
+    "NoteChunker",
+    "NoteDeduplicator",
+    "KeywordAutomaton",
+    "KeywordMatch",
+    "keyword_snippets",
+    "ContextPacker",
+]
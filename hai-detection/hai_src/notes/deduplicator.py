@@ -3,17 +3,43 @@
 Clinical notes often contain copy-forwarded content from previous notes,
 which can introduce noise and redundancy for LLM analysis. This module
 helps identify and reduce such duplication.
+
+Byte-identical paragraphs are caught with a content hash. Copy-forwarded
+paragraphs that were lightly edited (a new vital sign, an updated line
+day) are caught with MinHash signatures over character shingles, indexed
+with locality-sensitive hashing (LSH) so each paragraph is only compared
+against the few earlier paragraphs that share a band of its signature.
+A near-duplicate keeps its lines and sentences that are not, word for
+word, in the earlier paragraph, so an edited finding ("No signs of
+infection" -> "Signs of infection") is never dropped.
 """
 
+import difflib
 import hashlib
 import logging
+import random
 import re
+import time
 from collections import defaultdict
+from dataclasses import dataclass
 
 from ..models import ClinicalNote
 
 logger = logging.getLogger(__name__)
 
+COPIED_MARKER = "[Content copied from previous note]"
+CHANGED_MARKER = "[Content copied from previous note, changed lines follow]"
+
+
+@dataclass
+class _IndexedParagraph:
+    """A paragraph already seen in an earlier note."""
+
+    note_id: str
+    normalized: str
+    signature: tuple[int, ...]
+    pieces: tuple[str, ...]  # Normalized lines/sentences, for changed-line diffs
+
 
 class NoteDeduplicator:
     """Identifies and filters duplicated content in clinical notes."""
@@ -24,8 +50,44 @@ class NoteDeduplicator:
     # Similarity threshold for considering paragraphs as duplicates
     SIMILARITY_THRESHOLD = 0.9
 
-    def __init__(self):
+    # Character shingle size for MinHash
+    SHINGLE_SIZE = 5
+
+    # MinHash signature length and LSH banding (NUM_PERM = BANDS * rows).
+    # 16 bands of 4 rows find pairs at 0.9 similarity with >99.9% probability.
+    NUM_PERM = 64
+    LSH_BANDS = 16
+
+    # Rough characters-per-token for clinical English, for token reports
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, similarity_threshold: float | None = None):
+        """Initialize deduplicator.
+
+        Args:
+            similarity_threshold: Estimated Jaccard similarity at or above
+                which two paragraphs are near-duplicates. Defaults to
+                SIMILARITY_THRESHOLD.
+        """
+        self.similarity_threshold = (
+            self.SIMILARITY_THRESHOLD if similarity_threshold is None else similarity_threshold
+        )
+        self._rows = self.NUM_PERM // self.LSH_BANDS
+
+        # Fixed seed so signatures are comparable across runs
+        rng = random.Random(0x5EED)
+        self._masks = [rng.getrandbits(64) for _ in range(self.NUM_PERM)]
+
         self._seen_hashes: dict[str, str] = {}  # hash -> first occurrence note_id
+        self._paragraphs: list[_IndexedParagraph] = []
+        self._buckets: dict[tuple, list[int]] = defaultdict(list)
+        self.last_report: dict | None = None
+
+    def reset(self) -> None:
+        """Forget all paragraphs seen so far."""
+        self._seen_hashes.clear()
+        self._paragraphs.clear()
+        self._buckets.clear()
 
     def deduplicate_notes(
         self,
@@ -34,6 +96,11 @@ class NoteDeduplicator:
     ) -> list[ClinicalNote]:
         """Process notes to identify and optionally remove duplicates.
 
+        When removing, exact copies are replaced by a marker and
+        near-duplicates by a marker followed by only the lines that differ
+        from the earlier paragraph. A token-reduction report for the call
+        is left in ``last_report``.
+
         Args:
             notes: Notes to process (should be sorted by date)
             remove_duplicates: If True, remove duplicate paragraphs
@@ -41,7 +108,9 @@ class NoteDeduplicator:
         Returns:
             Processed notes with duplicates marked/removed
         """
-        self._seen_hashes.clear()
+        self.reset()
+        started = time.perf_counter()
+        counts = {"paragraphs": 0, "exact_duplicates": 0, "near_duplicates": 0}
         processed = []
 
         # Sort by date (oldest first) to identify original vs copied
@@ -49,7 +118,7 @@ class NoteDeduplicator:
 
         for note in sorted_notes:
             if remove_duplicates:
-                deduped_content = self._remove_duplicate_paragraphs(note)
+                deduped_content = self._remove_duplicate_paragraphs(note, counts)
                 processed_note = ClinicalNote(
                     id=note.id,
                     patient_id=note.patient_id,
@@ -65,10 +134,41 @@ class NoteDeduplicator:
                 self._track_paragraphs(note)
                 processed.append(note)
 
+        chars_before = sum(len(n.content) for n in notes)
+        chars_after = sum(len(n.content) for n in processed)
+        tokens_before = self.estimate_tokens(chars_before)
+        tokens_after = self.estimate_tokens(chars_after)
+        self.last_report = {
+            "notes": len(notes),
+            **counts,
+            "chars_before": chars_before,
+            "chars_after": chars_after,
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": tokens_before - tokens_after,
+            "token_reduction_rate": (tokens_before - tokens_after) / max(tokens_before, 1),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
         # Restore original order (most recent first typically)
         processed.sort(key=lambda n: n.date, reverse=True)
         return processed
 
+    def get_token_report(self, notes: list[ClinicalNote]) -> dict:
+        """Measure how many prompt tokens deduplication saves for these notes.
+
+        Returns:
+            Dict with paragraph counts, characters and estimated tokens
+            before/after removal, and the time taken.
+        """
+        self.deduplicate_notes(notes, remove_duplicates=True)
+        return self.last_report
+
+    @classmethod
+    def estimate_tokens(cls, chars: int) -> int:
+        """Estimate LLM tokens for a character count."""
+        return -(-chars // cls.CHARS_PER_TOKEN)
+
     def _track_paragraphs(self, note: ClinicalNote) -> None:
         """Track paragraph hashes to identify duplicates."""
         paragraphs = self._split_into_paragraphs(note.content)
@@ -80,9 +180,15 @@ class NoteDeduplicator:
             para_hash = self._hash_paragraph(para)
             if para_hash not in self._seen_hashes:
                 self._seen_hashes[para_hash] = note.id
+                self._index(note.id, para)
 
-    def _remove_duplicate_paragraphs(self, note: ClinicalNote) -> str:
-        """Remove paragraphs that were seen in earlier notes."""
+    def _remove_duplicate_paragraphs(
+        self,
+        note: ClinicalNote,
+        counts: dict[str, int] | None = None,
+    ) -> str:
+        """Remove paragraphs that were seen (or nearly seen) in earlier notes."""
+        counts = counts if counts is not None else defaultdict(int)
         paragraphs = self._split_into_paragraphs(note.content)
         kept_paragraphs = []
 
@@ -91,6 +197,7 @@ class NoteDeduplicator:
                 kept_paragraphs.append(para)
                 continue
 
+            counts["paragraphs"] += 1
             para_hash = self._hash_paragraph(para)
 
             if para_hash in self._seen_hashes:
@@ -98,11 +205,23 @@ class NoteDeduplicator:
                 original_note = self._seen_hashes[para_hash]
                 if original_note != note.id:
                     # Skip duplicate, add marker
-                    kept_paragraphs.append("[Content copied from previous note]")
+                    counts["exact_duplicates"] += 1
+                    kept_paragraphs.append(COPIED_MARKER)
                     continue
 
-            # Track and keep this paragraph
-            self._seen_hashes[para_hash] = note.id
+            self._seen_hashes.setdefault(para_hash, note.id)
+            signature = self._index(note.id, para)
+            original = self._find_near_duplicate(signature, note.id)
+
+            if original is not None:
+                counts["near_duplicates"] += 1
+                changed = self._changed_lines(para, original.pieces)
+                kept_paragraphs.append(
+                    "\n".join([CHANGED_MARKER, *changed]) if changed else COPIED_MARKER
+                )
+                continue
+
+            # Keep this paragraph
             kept_paragraphs.append(para)
 
         return "\n\n".join(kept_paragraphs)
@@ -113,14 +232,93 @@ class NoteDeduplicator:
         paragraphs = re.split(r'\n\s*\n|\n(?=[A-Z][A-Z\s]+:)', content)
         return [p.strip() for p in paragraphs if p.strip()]
 
+    def _normalize(self, paragraph: str) -> str:
+        """Lowercase and collapse whitespace."""
+        return re.sub(r'\s+', ' ', paragraph.lower().strip())
+
     def _hash_paragraph(self, paragraph: str) -> str:
         """Create a hash for paragraph comparison.
 
         Normalizes whitespace and case for comparison.
         """
-        # Normalize: lowercase, collapse whitespace
-        normalized = re.sub(r'\s+', ' ', paragraph.lower().strip())
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return hashlib.md5(self._normalize(paragraph).encode()).hexdigest()
+
+    # --- MinHash / LSH ---
+
+    def _signature(self, normalized: str) -> tuple[int, ...]:
+        """MinHash signature over character shingles.
+
+        Each shingle is hashed once; the permutations are XOR masks over
+        that 64-bit hash, which keeps the inner loop in C.
+        """
+        k = self.SHINGLE_SIZE
+        shingles = {normalized[i:i + k] for i in range(max(len(normalized) - k + 1, 1))}
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+            for s in shingles
+        ]
+        return tuple(min(map(mask.__xor__, hashes)) for mask in self._masks)
+
+    def _index(self, note_id: str, paragraph: str) -> tuple[int, ...]:
+        """Add a paragraph to the LSH index and return its signature."""
+        normalized = self._normalize(paragraph)
+        signature = self._signature(normalized)
+        position = len(self._paragraphs)
+        pieces = tuple(self._normalize(piece) for piece in self._split_pieces(paragraph))
+        self._paragraphs.append(_IndexedParagraph(note_id, normalized, signature, pieces))
+        for band in range(self.LSH_BANDS):
+            key = (band, signature[band * self._rows:(band + 1) * self._rows])
+            self._buckets[key].append(position)
+        return signature
+
+    def _find_near_duplicate(
+        self,
+        signature: tuple[int, ...],
+        note_id: str,
+    ) -> _IndexedParagraph | None:
+        """Most similar paragraph from another note at or above the threshold."""
+        candidates: set[int] = set()
+        for band in range(self.LSH_BANDS):
+            key = (band, signature[band * self._rows:(band + 1) * self._rows])
+            candidates.update(self._buckets.get(key, ()))
+
+        best, best_similarity = None, self.similarity_threshold
+        for position in candidates:
+            other = self._paragraphs[position]
+            if other.note_id == note_id:
+                continue
+            similarity = sum(a == b for a, b in zip(signature, other.signature)) / self.NUM_PERM
+            if similarity >= best_similarity:
+                best, best_similarity = other, similarity
+        return best
+
+    @staticmethod
+    def _split_pieces(paragraph: str) -> list[str]:
+        """Lines and sentences of a paragraph."""
+        return [
+            piece.strip()
+            for piece in re.split(r'\n|(?<=[.;!?])\s+', paragraph)
+            if piece.strip()
+        ]
+
+    def _changed_lines(self, paragraph: str, original_pieces: tuple[str, ...]) -> list[str]:
+        """Lines or sentences of ``paragraph`` that differ from the original's.
+
+        Pieces are compared whole (after normalizing case and whitespace),
+        never as substrings, so a removed negation counts as a change.
+        """
+        pieces = self._split_pieces(paragraph)
+        matcher = difflib.SequenceMatcher(
+            a=list(original_pieces),
+            b=[self._normalize(piece) for piece in pieces],
+            autojunk=False,
+        )
+        return [
+            piece
+            for tag, _, _, j1, j2 in matcher.get_opcodes()
+            if tag in ("replace", "insert")
+            for piece in pieces[j1:j2]
+        ]
 
     def get_duplication_stats(self, notes: list[ClinicalNote]) -> dict:
         """Calculate duplication statistics for a set of notes.
@@ -128,9 +326,10 @@ class NoteDeduplicator:
         Returns:
             Dict with duplication metrics
         """
-        self._seen_hashes.clear()
+        self.reset()
         total_paragraphs = 0
         duplicate_paragraphs = 0
+        near_duplicate_paragraphs = 0
         total_chars = 0
         duplicate_chars = 0
 
@@ -152,12 +351,19 @@ class NoteDeduplicator:
                     if original_note != note.id:
                         duplicate_paragraphs += 1
                         duplicate_chars += len(para)
-                else:
-                    self._seen_hashes[para_hash] = note.id
+                    continue
+
+                self._seen_hashes[para_hash] = note.id
+                signature = self._index(note.id, para)
+                if self._find_near_duplicate(signature, note.id) is not None:
+                    duplicate_paragraphs += 1
+                    near_duplicate_paragraphs += 1
+                    duplicate_chars += len(para)
 
         return {
             "total_paragraphs": total_paragraphs,
             "duplicate_paragraphs": duplicate_paragraphs,
+            "near_duplicate_paragraphs": near_duplicate_paragraphs,
             "duplication_rate": duplicate_paragraphs / max(total_paragraphs, 1),
             "total_chars": total_chars,
             "duplicate_chars": duplicate_chars,
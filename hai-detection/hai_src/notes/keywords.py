@@ -0,0 +1,142 @@
+"""Multi-keyword matching over clinical notes.
+
+A KeywordAutomaton finds every occurrence of every keyword, with offsets,
+in one pass over a note, instead of a case-insensitive regex alternation
+(which re-tries each alternative at every position) or one finditer per
+keyword. Matching is case-insensitive and, like the substring checks it
+replaces, not limited to word boundaries.
+"""
+
+import logging
+import re
+from typing import Iterable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+_END = ""  # Trie key marking the end of a keyword
+
+
+class KeywordMatch(NamedTuple):
+    """One keyword occurrence; start/end index the original text."""
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordAutomaton:
+    """Precompiled matcher for a fixed keyword set.
+
+    The keywords form a trie that is compiled into one regular expression
+    (shared prefixes are tested once), so the scan runs in the re engine
+    rather than character by character in Python. Every keyword end is an
+    empty capture group; the last group a hit closes is the longest
+    keyword starting there, and the keywords that are prefixes of it
+    ("wound" for "wound vac") come from a table built with the trie.
+
+    Build once (e.g. at import) and reuse; scanning is thread-safe.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw})
+
+        trie: dict = {}
+        for keyword in self.keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[_END] = keyword
+
+        # Group number -> the keyword ending there and the shorter keywords
+        # on its trie path, shortest first
+        self._chains: list[tuple[str, ...]] = [()]
+        # Not a lookahead, so the re engine can skip to possible first
+        # characters; scan() restarts after each hit to find overlaps
+        self._pattern = re.compile(self._trie_pattern(trie, ()) if self.keywords else "(?!)")
+
+    def _trie_pattern(self, node: dict, chain: tuple[str, ...]) -> str:
+        prefix = ""
+        if _END in node:
+            chain = chain + (node[_END],)
+            self._chains.append(chain)
+            prefix = "()"
+        branches = [re.escape(ch) + self._trie_pattern(child, chain)
+                    for ch, child in sorted(node.items()) if ch != _END]
+        if not branches:
+            return prefix
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"{prefix}(?:{pattern})?" if prefix else pattern
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    @staticmethod
+    def _lower(text: str) -> str:
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two (e.g. "İ"); keep offsets aligned
+            lowered = "".join(c.lower()[0] for c in text)
+        return lowered
+
+    def scan(self, text: str) -> list[KeywordMatch]:
+        """Every keyword occurrence in text order, overlapping ones included."""
+        lowered = self._lower(text)
+        chains = self._chains
+        search = self._pattern.search
+        matches: list[KeywordMatch] = []
+        hit = search(lowered)
+        while hit is not None:
+            start = hit.start()
+            matches.extend(
+                KeywordMatch(keyword, start, start + len(keyword))
+                for keyword in chains[hit.lastindex]
+            )
+            hit = search(lowered, start + 1)
+        return matches
+
+    def keywords_in(self, text: str) -> set[str]:
+        """The distinct keywords present in the text.
+
+        Without offsets to report, one substring search per keyword (each a
+        single pass in C) is faster than the pattern for sets this size.
+        """
+        lowered = self._lower(text)
+        return {keyword for keyword in self.keywords if keyword in lowered}
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any keyword occurs; stops at the first match."""
+        return self._pattern.search(self._lower(text)) is not None
+
+
+def keyword_snippets(
+    text: str,
+    matches: list[KeywordMatch],
+    context_chars: int = 80,
+    max_snippets: int | None = None,
+) -> list[str]:
+    """Text around keyword matches, with overlapping windows merged.
+
+    Args:
+        text: The text the matches came from.
+        matches: Matches from KeywordAutomaton.scan().
+        context_chars: Characters kept on each side of a match.
+        max_snippets: Keep only the first N snippets.
+
+    Returns:
+        Snippets in text order, whitespace collapsed, "..." where cut.
+    """
+    windows: list[list[int]] = []
+    for match in sorted(matches, key=lambda m: m.start):
+        start = max(0, match.start - context_chars)
+        end = min(len(text), match.end + context_chars)
+        if windows and start <= windows[-1][1]:
+            windows[-1][1] = max(windows[-1][1], end)
+        else:
+            windows.append([start, end])
+
+    snippets = []
+    for start, end in windows[:max_snippets]:
+        snippet = " ".join(text[start:end].split())
+        snippets.append(
+            f"{'...' if start > 0 else ''}{snippet}{'...' if end < len(text) else ''}"
+        )
+    return snippets
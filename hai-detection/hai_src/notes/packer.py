@@ -0,0 +1,186 @@
+"""Relevance-ranked, token-budgeted note context for HAI prompts."""
+
+import logging
+from collections import Counter
+
+from common.context_packer import (
+    ContextChunk,
+    PackedContext,
+    context_token_budget,
+    estimate_tokens,
+    pack_chunks,
+    split_text,
+)
+
+from ..config import Config
+from ..models import ClinicalNote, HAIType
+from .chunker import NoteChunker
+from .keywords import KeywordAutomaton
+from .retriever import HAI_KEYWORD_AUTOMATA, HAI_KEYWORDS
+
+logger = logging.getLogger(__name__)
+
+ALL_HAI_KEYWORD_AUTOMATON = KeywordAutomaton(
+    keyword for keywords in HAI_KEYWORDS.values() for keyword in keywords
+)
+
+SECTION_LABELS = {
+    "assessment_plan": "Assessment/Plan",
+    "id_section": "ID/Microbiology",
+    "wound_assessment": "Wound Assessment",
+    "hospital_course": "Hospital Course",
+    "physical_exam": "Physical Exam",
+    "active_problems": "Active Problems",
+}
+
+# Score added to every chunk of a section, so a clinician's assessment
+# outranks keyword-free boilerplate even when it names no keyword
+SECTION_PRIORS = {
+    "assessment_plan": 1.5,
+    "id_section": 1.5,
+    "wound_assessment": 1.0,
+    "hospital_course": 0.75,
+    "physical_exam": 0.5,
+    "active_problems": 0.25,
+}
+NOTE_TYPE_PRIORS = {"id_consult": 0.5, "discharge_summary": 0.25}
+# Spread over notes from most to least recent
+RECENCY_PRIOR = 0.25
+
+# Context window assumed when no client is given (the factory default)
+DEFAULT_NUM_CTX = 8192
+
+
+class ContextPacker:
+    """Packs the most relevant note chunks for an HAI type into a token budget.
+
+    Notes are split into NoteChunker sections plus paragraph chunks of the
+    remaining text, scored with BM25 over the HAI type's keyword set (see
+    common.context_packer) and packed best-first. Pass notes after
+    NoteRetriever deduplication so copy-forwarded paragraphs are already
+    reduced to markers.
+    """
+
+    def __init__(
+        self,
+        hai_type: str | HAIType | None = None,
+        chunker: NoteChunker | None = None,
+    ):
+        """Initialize packer.
+
+        Args:
+            hai_type: HAI type whose keywords drive scoring. All HAI
+                      keywords are used if None.
+            chunker: Section extractor. A new NoteChunker if None.
+        """
+        type_key = hai_type.value if isinstance(hai_type, HAIType) else hai_type
+        self.automaton = HAI_KEYWORD_AUTOMATA.get(
+            (type_key or "").lower(), ALL_HAI_KEYWORD_AUTOMATON
+        )
+        self.chunker = chunker or NoteChunker()
+
+    def chunk_notes(self, notes: list[ClinicalNote]) -> list[ContextChunk]:
+        """Split notes into scored-ready chunks (terms and priors set)."""
+        order = sorted(range(len(notes)), key=lambda i: notes[i].date, reverse=True)
+        recency = {i: RECENCY_PRIOR * (1 - rank / len(notes)) for rank, i in enumerate(order)}
+
+        chunks = []
+        for index, note in enumerate(notes):
+            author_str = f" by {note.author}" if note.author else ""
+            group = f"[{note.note_type.upper()} - {note.date.strftime('%Y-%m-%d')}{author_str}]"
+            note_prior = NOTE_TYPE_PRIORS.get(note.note_type, 0.0) + recency[index]
+
+            for offset, text, section_type in self._split_note(note):
+                chunks.append(ContextChunk(
+                    text=text,
+                    group=group,
+                    label=SECTION_LABELS.get(section_type, ""),
+                    position=(index, offset),
+                    prior=note_prior + SECTION_PRIORS.get(section_type, 0.0),
+                    terms=Counter(m.keyword for m in self.automaton.scan(text)),
+                ))
+        return chunks
+
+    def _split_note(self, note: ClinicalNote) -> list[tuple[int, str, str | None]]:
+        """(offset, text, section type or None) pieces covering the note."""
+        content = note.content
+        sections = []
+        for section in sorted(self.chunker.extract_sections(note), key=lambda c: c.start_pos):
+            if sections and section.start_pos < sections[-1].end_pos:
+                continue  # Overlaps a section already taken
+            sections.append(section)
+
+        pieces: list[tuple[int, str, str | None]] = []
+        prev_end = 0
+        for section in sections:
+            gap = content[prev_end:section.start_pos].rstrip()
+            # The gap ends with this section's header line
+            gap = gap.rsplit("\n", 1)[0] if "\n" in gap else ""
+            pieces += [(prev_end + off, text, None) for off, text in split_text(gap)]
+            pieces += [
+                (section.start_pos + off, text, section.section_type)
+                for off, text in split_text(section.content)
+            ]
+            prev_end = section.end_pos
+        pieces += [(prev_end + off, text, None) for off, text in split_text(content[prev_end:])]
+        return pieces
+
+    def pack(
+        self,
+        notes: list[ClinicalNote],
+        token_budget: int | None = None,
+        num_ctx: int | None = None,
+        reserved_tokens: int = 0,
+        max_tokens: int | None = None,
+    ) -> PackedContext:
+        """Pack notes into prompt context.
+
+        Args:
+            notes: Notes to pack.
+            token_budget: Explicit budget. Derived from the other
+                          arguments if None.
+            num_ctx: Model context window in tokens.
+            reserved_tokens: Tokens used by the rest of the prompt.
+            max_tokens: Hard cap. Defaults to Config.NOTE_CONTEXT_MAX_TOKENS.
+
+        Returns:
+            PackedContext with the packed text and what was kept or dropped.
+        """
+        if token_budget is None:
+            token_budget = context_token_budget(
+                num_ctx=num_ctx,
+                reserved_tokens=reserved_tokens,
+                max_tokens=max_tokens if max_tokens is not None else Config.NOTE_CONTEXT_MAX_TOKENS,
+            )
+        return pack_chunks(self.chunk_notes(notes), token_budget)
+
+    def pack_for_prompt(
+        self,
+        notes: list[ClinicalNote],
+        prompt_template: str,
+        llm_client=None,
+        max_tokens: int | None = None,
+        candidate_id: str | None = None,
+    ) -> str:
+        """Pack notes for a prompt template and log the candidate's token use.
+
+        Args:
+            notes: Notes to pack.
+            prompt_template: Template the context is inserted into; its
+                             size is reserved from the context window.
+            llm_client: Client whose num_ctx bounds the budget. Assumes
+                        DEFAULT_NUM_CTX if None or it has no num_ctx.
+            max_tokens: Hard cap. Defaults to Config.NOTE_CONTEXT_MAX_TOKENS.
+            candidate_id: Candidate to attribute the token use to in logs.
+
+        Returns:
+            The packed notes text.
+        """
+        packed = self.pack(
+            notes,
+            num_ctx=getattr(llm_client, "num_ctx", DEFAULT_NUM_CTX),
+            reserved_tokens=estimate_tokens(prompt_template),
+            max_tokens=max_tokens,
+        )
+        logger.info(f"Notes context for {candidate_id or 'prompt'}: {packed.summary()}")
+        return packed.text
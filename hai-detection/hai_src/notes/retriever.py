@@ -1,12 +1,13 @@
 """Clinical note retrieval for LLM context."""
 
 import logging
-import re
 from datetime import datetime, timedelta
 
 from ..config import Config
 from ..models import ClinicalNote, HAICandidate, HAIType
 from ..data.factory import get_note_source
+from .deduplicator import NoteDeduplicator
+from .keywords import KeywordAutomaton
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +95,11 @@ HAI_KEYWORDS: dict[str, list[str]] = {
     ],
 }
 
+# One matcher per HAI type, built at import rather than per call
+HAI_KEYWORD_AUTOMATA: dict[str, KeywordAutomaton] = {
+    hai_type: KeywordAutomaton(keywords) for hai_type, keywords in HAI_KEYWORDS.items()
+}
+
 # Always include notes of these types regardless of keywords
 ALWAYS_INCLUDE_NOTE_TYPES = ["id_consult", "discharge_summary"]
 
@@ -127,6 +133,7 @@ class NoteRetriever:
         days_after: int = 3,
         hai_type: str | HAIType | None = None,
         use_keyword_filter: bool = True,
+        deduplicate: bool | None = None,
     ) -> list[ClinicalNote]:
         """Get clinical notes relevant to an HAI candidate.
 
@@ -142,6 +149,8 @@ class NoteRetriever:
                      If None, uses candidate.hai_type if available.
             use_keyword_filter: If True, filter notes by HAI-specific keywords.
                                Set to False to retrieve all notes.
+            deduplicate: Replace copy-forwarded paragraphs with markers.
+                        Defaults to Config.NOTE_DEDUP_ENABLED.
 
         Returns:
             List of relevant clinical notes, sorted by date
@@ -183,6 +192,19 @@ class NoteRetriever:
                 logger.info(f"Limiting to {self.max_notes} most recent notes")
                 notes = notes[:self.max_notes]
 
+            if deduplicate is None:
+                deduplicate = Config.NOTE_DEDUP_ENABLED
+            if deduplicate and len(notes) > 1:
+                deduplicator = NoteDeduplicator()
+                notes = deduplicator.deduplicate_notes(notes, remove_duplicates=True)
+                report = deduplicator.last_report
+                logger.info(
+                    f"Dedup for {candidate.id}: {report['exact_duplicates']} exact and "
+                    f"{report['near_duplicates']} near-duplicate of {report['paragraphs']} "
+                    f"paragraphs, ~{report['tokens_before']} -> ~{report['tokens_after']} tokens "
+                    f"({report['token_reduction_rate']:.0%} saved, {report['elapsed_ms']} ms)"
+                )
+
             return notes
 
         except Exception as e:
@@ -215,18 +237,11 @@ class NoteRetriever:
         else:
             type_key = str(hai_type).lower()
 
-        keywords = HAI_KEYWORDS.get(type_key, [])
-        if not keywords:
+        automaton = HAI_KEYWORD_AUTOMATA.get(type_key)
+        if not automaton:
             logger.warning(f"No keywords defined for HAI type '{type_key}', returning all notes")
             return notes
 
-        # Build regex pattern for efficient matching
-        # Use word boundaries where appropriate
-        pattern = re.compile(
-            "|".join(re.escape(kw) for kw in keywords),
-            re.IGNORECASE
-        )
-
         filtered = []
         skipped = 0
 
@@ -237,7 +252,7 @@ class NoteRetriever:
                 continue
 
             # Check if note contains any keywords
-            if pattern.search(note.content):
+            if automaton.contains_any(note.content):
                 filtered.append(note)
             else:
                 skipped += 1
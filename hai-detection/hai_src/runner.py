@@ -100,6 +100,7 @@ def run_classify(
     monitor: HAIMonitor,
     limit: int | None = None,
     dry_run: bool = False,
+    max_concurrent: int | None = None,
 ) -> dict:
     """Run classification on pending candidates.
 
@@ -107,11 +108,14 @@ def run_classify(
         monitor: The monitor instance.
         limit: Maximum candidates to classify.
         dry_run: If True, don't persist classifications.
+        max_concurrent: Concurrent LLM requests (per-backend config if None).
 
     Returns:
         Classification results dict.
     """
-    return monitor.classify_pending(limit=limit, dry_run=dry_run)
+    return monitor.classify_pending(
+        limit=limit, dry_run=dry_run, max_concurrent=max_concurrent
+    )
 
 
 def run_full_pipeline(monitor: HAIMonitor, dry_run: bool = False) -> dict:
@@ -150,6 +154,20 @@ def show_classification_results(results: dict) -> None:
             )
         print("-" * 80)
 
+    pipeline = results.get('pipeline')
+    if pipeline:
+        print(
+            f"\nPipeline ({pipeline['note_workers']} note workers, "
+            f"{pipeline['llm_workers']} LLM workers):"
+        )
+        for stage in ("notes", "llm"):
+            stats = pipeline[stage]
+            print(
+                f"  {stage:6s} | n={stats['completed']} errors={stats['errors']} | "
+                f"mean={stats['mean_ms']:.0f}ms max={stats['max_ms']:.0f}ms | "
+                f"queue wait={stats['mean_wait_ms']:.0f}ms max depth={stats['max_queue_depth']}"
+            )
+
 
 def main() -> int:
     """Main entry point."""
@@ -213,6 +231,14 @@ Examples:
         help="Limit number of candidates to classify (for testing)",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Concurrent LLM requests during classification "
+             f"(default: {Config.get_llm_concurrency()} for {Config.LLM_BACKEND})",
+    )
+
     parser.add_argument(
         "--lookback",
         type=int,
@@ -302,6 +328,7 @@ Examples:
                 monitor,
                 limit=args.limit,
                 dry_run=args.dry_run,
+                max_concurrent=args.concurrency,
             )
             show_classification_results(results)
             return 0
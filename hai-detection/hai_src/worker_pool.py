@@ -0,0 +1,240 @@
+"""Bounded worker pool for HAI candidate classification.
+
+Classification of a candidate has two stages with very different costs:
+
+1. Note retrieval - FHIR/Clarity I/O, a few hundred milliseconds
+2. LLM classification - triage and full extraction, tens of seconds
+
+Running them back to back leaves the LLM idle while notes are fetched and
+serializes candidates that the backend could process concurrently. The
+pool below runs each stage on its own bounded executor so note retrieval
+for upcoming candidates overlaps with in-flight LLM calls, while the number
+of concurrent LLM requests stays within what the backend can serve.
+
+Outcomes are yielded strictly in submission order so the caller can commit
+results to SQLite from a single thread in a deterministic sequence.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from .llm.base import submit_in_context
+from .models import ClinicalNote, HAICandidate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageStats:
+    """Queue depth and latency counters for one pipeline stage.
+
+    Durations are in milliseconds.
+    """
+
+    name: str
+    completed: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    total_wait_ms: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def enqueued(self) -> None:
+        """Record a task waiting for a worker."""
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def started(self, wait_ms: float) -> None:
+        """Record a task leaving the queue after waiting wait_ms."""
+        with self._lock:
+            self.queue_depth -= 1
+            self.total_wait_ms += wait_ms
+
+    def finished(self, elapsed_ms: float, error: bool = False) -> None:
+        """Record a finished task."""
+        with self._lock:
+            self.completed += 1
+            if error:
+                self.errors += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean task latency."""
+        return self.total_ms / self.completed if self.completed else 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        """Mean time spent queued before a worker picked the task up."""
+        return self.total_wait_ms / self.completed if self.completed else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for logging/serialization."""
+        return {
+            "completed": self.completed,
+            "errors": self.errors,
+            "mean_ms": round(self.mean_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "mean_wait_ms": round(self.mean_wait_ms, 1),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def summary(self) -> str:
+        """Human-readable summary."""
+        return (
+            f"{self.name}: n={self.completed} err={self.errors} "
+            f"mean={self.mean_ms:.0f}ms max={self.max_ms:.0f}ms "
+            f"wait={self.mean_wait_ms:.0f}ms maxq={self.max_queue_depth}"
+        )
+
+
+@dataclass
+class ClassificationOutcome:
+    """Result of running one candidate through the pool."""
+
+    candidate: HAICandidate
+    notes: list[ClinicalNote] = field(default_factory=list)
+    classification: Any = None
+    error: Exception | None = None
+
+
+class ClassificationWorkerPool:
+    """Two-stage (notes -> LLM) bounded worker pool.
+
+    Example:
+        pool = ClassificationWorkerPool(
+            fetch_notes=retriever.get_notes_for_candidate,
+            classify=lambda c, notes: classifier.classify(c, notes),
+            llm_workers=Config.get_llm_concurrency(),
+        )
+        for outcome in pool.run(candidates):
+            ...  # commit outcome in order
+    """
+
+    def __init__(
+        self,
+        fetch_notes: Callable[[HAICandidate], list[ClinicalNote]],
+        classify: Callable[[HAICandidate, list[ClinicalNote]], Any],
+        note_workers: int = 4,
+        llm_workers: int = 1,
+        max_in_flight: int | None = None,
+    ):
+        """Initialize the pool.
+
+        Args:
+            fetch_notes: Retrieves notes for a candidate (I/O bound).
+            classify: Classifies a candidate given its notes (LLM bound).
+            note_workers: Concurrent note retrievals.
+            llm_workers: Concurrent LLM classifications.
+            max_in_flight: Candidates admitted but not yet yielded. Bounds
+                memory held by prefetched notes. Defaults to enough to keep
+                both stages busy.
+        """
+        self.fetch_notes = fetch_notes
+        self.classify = classify
+        self.note_workers = max(1, note_workers)
+        self.llm_workers = max(1, llm_workers)
+        self.max_in_flight = max_in_flight or (self.note_workers + 2 * self.llm_workers)
+
+        self.note_stats = StageStats("notes")
+        self.llm_stats = StageStats("llm")
+
+    def run(self, candidates: Iterable[HAICandidate]) -> Iterator[ClassificationOutcome]:
+        """Classify candidates, yielding outcomes in submission order.
+
+        Exceptions from either stage are captured on the outcome rather than
+        raised, so one failing candidate does not stop the batch.
+        """
+        note_executor = ThreadPoolExecutor(
+            max_workers=self.note_workers, thread_name_prefix="hai-notes"
+        )
+        llm_executor = ThreadPoolExecutor(
+            max_workers=self.llm_workers, thread_name_prefix="hai-llm"
+        )
+        pending: deque[Future] = deque()
+        remaining = iter(candidates)
+
+        def admit() -> None:
+            while len(pending) < self.max_in_flight:
+                candidate = next(remaining, None)
+                if candidate is None:
+                    return
+                pending.append(self._submit(candidate, note_executor, llm_executor))
+
+        try:
+            admit()
+            while pending:
+                outcome = pending.popleft().result()
+                admit()
+                yield outcome
+        finally:
+            # Drop queued work if the caller stops early; running tasks finish
+            for future in pending:
+                future.cancel()
+            note_executor.shutdown(wait=True, cancel_futures=True)
+            llm_executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-stage statistics for the last run."""
+        return {
+            "notes": self.note_stats.to_dict(),
+            "llm": self.llm_stats.to_dict(),
+            "note_workers": self.note_workers,
+            "llm_workers": self.llm_workers,
+        }
+
+    def _submit(
+        self,
+        candidate: HAICandidate,
+        note_executor: ThreadPoolExecutor,
+        llm_executor: ThreadPoolExecutor,
+    ) -> Future:
+        """Chain note retrieval into classification for one candidate."""
+        result: Future = Future()
+        outcome = ClassificationOutcome(candidate=candidate)
+
+        def run_notes(queued_at: float) -> None:
+            started = time.perf_counter()
+            self.note_stats.started((started - queued_at) * 1000)
+            try:
+                outcome.notes = self.fetch_notes(candidate) or []
+                self.note_stats.finished((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                # Still classify without notes; the rules engine lowers confidence
+                logger.warning(f"Note retrieval failed for candidate {candidate.id}: {e}")
+                outcome.notes = []
+                self.note_stats.finished((time.perf_counter() - started) * 1000, error=True)
+
+            self.llm_stats.enqueued()
+            try:
+                submit_in_context(llm_executor, run_classify, time.perf_counter())
+            except RuntimeError as e:
+                # Executor shut down because the caller abandoned the run
+                self.llm_stats.started(0.0)
+                outcome.error = e
+                result.set_result(outcome)
+
+        def run_classify(queued_at: float) -> None:
+            started = time.perf_counter()
+            self.llm_stats.started((started - queued_at) * 1000)
+            error = False
+            try:
+                outcome.classification = self.classify(candidate, outcome.notes)
+            except Exception as e:
+                outcome.error = e
+                error = True
+            self.llm_stats.finished((time.perf_counter() - started) * 1000, error=error)
+            result.set_result(outcome)
+
+        self.note_stats.enqueued()
+        submit_in_context(note_executor, run_notes, time.perf_counter())
+        return result
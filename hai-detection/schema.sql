@@ -19,6 +19,7 @@ CREATE TABLE IF NOT EXISTS hai_candidates (
     nhsn_reported INTEGER DEFAULT 0,
     nhsn_reported_at TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),  -- Re-stamped on every update (trigger in HAIDatabase)
     UNIQUE(hai_type, culture_id)
 );
 
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Benchmark keyword matching: KeywordAutomaton vs the regex and substring paths.
+
+Compares, on the same notes:
+- filter: NoteRetriever's former per-call IGNORECASE alternation regex
+  against KeywordAutomaton.contains_any
+- ssi scan: the former lowercase + `keyword in content` loop (keyword set
+  only), per-keyword finditer (set and offsets), KeywordAutomaton.scan
+  (set and offsets in one pass), KeywordAutomaton.keywords_in (set only),
+  and the detector path (scan until the snippet quota is full, then
+  keywords_in)
+
+Notes are synthetic progress-note text unless --notes-dir points at .txt
+files. A share of notes contain no keywords, the worst case for the filter.
+
+Usage:
+    python scripts/bench_keywords.py
+    python scripts/bench_keywords.py --notes 2000 --note-chars 6000
+    python scripts/bench_keywords.py --notes-dir /path/to/deidentified/notes
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hai_src.candidates.ssi import MAX_KEYWORD_SNIPPETS
+from hai_src.notes.keywords import KeywordAutomaton, keyword_snippets
+from hai_src.notes.retriever import HAI_KEYWORDS
+from hai_src.rules.nhsn_criteria import SSI_DETECTION_KEYWORDS
+
+FILLER = (
+    "Patient seen and examined at bedside. Vitals reviewed, afebrile overnight. "
+    "Tolerating diet, ambulating with assistance. Labs notable for mild anemia. "
+    "Continue current medications and monitor. Discussed plan with family. "
+).split()
+PHRASES = [
+    "wound infection", "purulent drainage", "wound dehiscence", "central line",
+    "blood culture", "foley catheter", "wound vac", "erythema", "fever", "picc",
+]
+
+
+def synthetic_notes(count: int, chars: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    notes = []
+    for i in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < chars:
+            words.append(rng.choice(FILLER))
+            if i % 3 and rng.random() < 0.01:
+                words.append(rng.choice(PHRASES).upper() if rng.random() < 0.3 else rng.choice(PHRASES))
+        notes.append(" ".join(words))
+    return notes
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyword matching benchmark")
+    parser.add_argument("--notes", type=int, default=500, help="Synthetic notes")
+    parser.add_argument("--note-chars", type=int, default=4000, help="Synthetic note length")
+    parser.add_argument("--notes-dir", type=Path, help="Directory of .txt notes instead")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method (best is reported)")
+    args = parser.parse_args()
+
+    if args.notes_dir:
+        notes = [p.read_text(errors="replace") for p in sorted(args.notes_dir.glob("*.txt"))]
+    else:
+        notes = synthetic_notes(args.notes, args.note_chars)
+    total_mb = sum(len(n) for n in notes) / 1e6
+    print(f"{len(notes)} notes, {total_mb:.1f}M chars\n")
+
+    print(f"{'filter_by_keywords':<22} {'regex ms':>10} {'automaton ms':>13} {'speedup':>8}  kept")
+    for hai_type, keywords in HAI_KEYWORDS.items():
+        automaton = KeywordAutomaton(keywords)
+
+        def regex_filter():
+            pattern = re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE)
+            return [n for n in notes if pattern.search(n)]
+
+        def automaton_filter():
+            return [n for n in notes if automaton.contains_any(n)]
+
+        assert len(regex_filter()) == len(automaton_filter())
+        old, new = timed(regex_filter, args.repeat), timed(automaton_filter, args.repeat)
+        print(f"{hai_type:<22} {old:>10.1f} {new:>13.1f} {old / new:>7.1f}x  {len(automaton_filter())}")
+
+    keywords = sorted(SSI_DETECTION_KEYWORDS)
+    automaton = KeywordAutomaton(keywords)
+
+    def substring_scan():
+        found = set()
+        for note in notes:
+            content_lower = note.lower()
+            for keyword in keywords:
+                if keyword in content_lower:
+                    found.add(keyword)
+        return found
+
+    def finditer_scan():
+        found = []
+        for note in notes:
+            content_lower = note.lower()
+            for keyword in keywords:
+                found.extend((keyword, m.start()) for m in re.finditer(re.escape(keyword), content_lower))
+        return found
+
+    def automaton_scan():
+        return [match for note in notes for match in automaton.scan(note)]
+
+    def automaton_keywords_in():
+        found = set()
+        for note in notes:
+            found.update(automaton.keywords_in(note))
+        return found
+
+    def detector_scan():
+        # SSICandidateDetector._scan_notes_for_ssi_keywords over one patient's notes
+        found, snippets = set(), []
+        for note in notes:
+            if len(snippets) >= MAX_KEYWORD_SNIPPETS:
+                found.update(automaton.keywords_in(note))
+                continue
+            matches = automaton.scan(note)
+            found.update(m.keyword for m in matches)
+            snippets.extend(keyword_snippets(
+                note, matches, max_snippets=MAX_KEYWORD_SNIPPETS - len(snippets),
+            ))
+        return found
+
+    assert substring_scan() == {m.keyword for m in automaton_scan()}
+    assert substring_scan() == automaton_keywords_in() == detector_scan()
+    assert len(finditer_scan()) == len(automaton_scan())
+
+    print(f"\n{'ssi keyword scan':<34} {'ms':>8}")
+    for label, fn in [
+        ("substring loop (set only)", substring_scan),
+        ("per-keyword finditer (offsets)", finditer_scan),
+        ("automaton scan (offsets)", automaton_scan),
+        ("automaton keywords_in (set only)", automaton_keywords_in),
+        ("detector path (snippet quota)", detector_scan),
+    ]:
+        print(f"{label:<34} {timed(fn, args.repeat):>8.1f}")
+    print(f"\n{len(automaton_scan())} SSI keyword matches")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
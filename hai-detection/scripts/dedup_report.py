@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Measure how much copy-forward deduplication shrinks LLM note context.
+
+For each recent HAI candidate, retrieves the same notes the classifiers
+see (keyword filter on, deduplication off), runs NoteDeduplicator over
+them and prints exact/near-duplicate paragraph counts and estimated
+prompt tokens before and after.
+
+Usage:
+    python scripts/dedup_report.py
+    python scripts/dedup_report.py --limit 50 --hai-type clabsi
+    python scripts/dedup_report.py --threshold 0.85 --json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hai_src.config import Config
+from hai_src.db import HAIDatabase
+from hai_src.models import HAIType
+from hai_src.notes import NoteDeduplicator, NoteRetriever
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-candidate note deduplication report")
+    parser.add_argument("--limit", type=int, default=20, help="Recent candidates to report on")
+    parser.add_argument("--hai-type", choices=[t.value for t in HAIType], default=None)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Near-duplicate similarity threshold")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    db = HAIDatabase(Config.HAI_DB_PATH)
+    retriever = NoteRetriever()
+    hai_type = HAIType(args.hai_type) if args.hai_type else None
+
+    reports = []
+    for candidate in db.get_recent_candidates(limit=args.limit, hai_type=hai_type):
+        notes = retriever.get_notes_for_candidate(candidate, deduplicate=False)
+        report = NoteDeduplicator(args.threshold).get_token_report(notes)
+        reports.append({
+            "candidate_id": candidate.id,
+            "hai_type": candidate.hai_type.value,
+            "mrn": candidate.patient.mrn,
+            **report,
+        })
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return 0
+
+    if not reports:
+        print("No candidates found.")
+        return 0
+
+    print(f"{'Candidate':<38} {'Type':<6} {'Notes':>5} {'Paras':>5} {'Exact':>5} "
+          f"{'Near':>5} {'Tokens':>7} {'After':>7} {'Saved':>6} {'ms':>6}")
+    for r in reports:
+        print(f"{r['candidate_id']:<38} {r['hai_type']:<6} {r['notes']:>5} {r['paragraphs']:>5} "
+              f"{r['exact_duplicates']:>5} {r['near_duplicates']:>5} {r['tokens_before']:>7} "
+              f"{r['tokens_after']:>7} {r['token_reduction_rate']:>6.0%} {r['elapsed_ms']:>6.1f}")
+
+    before = sum(r["tokens_before"] for r in reports)
+    after = sum(r["tokens_after"] for r in reports)
+    print(f"\nTotal: ~{before} -> ~{after} tokens "
+          f"({(before - after) / max(before, 1):.0%} saved over {len(reports)} candidates)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
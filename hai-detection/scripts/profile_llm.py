@@ -18,6 +18,17 @@ Usage:
 
     # Export profiles to JSON
     python scripts/profile_llm.py export --output profiles.json
+
+    # Benchmark against a recorded cassette instead of a live server
+    python scripts/profile_llm.py --record cassette.jsonl demo -n 3
+    python scripts/profile_llm.py --replay cassette.jsonl benchmark
+
+    # Show routed endpoints (LLM_ENDPOINTS) and pin their models
+    python scripts/profile_llm.py endpoints --warm-up
+
+    # Show (or clear) the LLM response cache
+    python scripts/profile_llm.py cache
+    python scripts/profile_llm.py cache --clear
 """
 
 import argparse
@@ -36,8 +47,9 @@ from hai_src.llm.ollama import (
     get_profile_summary,
     clear_profile_history,
 )
-from hai_src.llm.factory import get_llm_client
+from hai_src.llm.factory import get_llm_client, get_llm_router
 from hai_src.config import Config
+from common.llm_cache import LLMResponseCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -113,6 +125,47 @@ def cmd_clear(args):
     print("Profile history cleared.")
 
 
+def cmd_cache(args):
+    """Show or clear the LLM response cache."""
+    cache = LLMResponseCache()
+
+    if args.clear:
+        removed = cache.clear(args.prompt_version)
+        print(f"Removed {removed} cached response(s).")
+        return
+
+    stats = cache.stats()
+    print("\n=== LLM Response Cache ===\n")
+    print(f"Database:      {cache.db_path}")
+    print(f"Entries:       {stats['entries']}")
+    print(f"Size:          {stats['size_bytes'] / 1024:.1f} KiB "
+          f"of {stats['max_bytes'] / 1024 / 1024:.0f} MiB")
+    print(f"Lifetime hits: {stats['lifetime_hits']}")
+
+
+def cmd_endpoints(args):
+    """Show routed endpoints, optionally loading and pinning their models."""
+    router = get_llm_router()
+    if router is None:
+        print("LLM_ENDPOINTS is not set; all models use OLLAMA_BASE_URL.")
+        return 1
+
+    if args.warm_up:
+        for target, ok in router.warm_up().items():
+            print(f"  {'loaded' if ok else 'FAILED'}: {target}")
+        print()
+
+    for model, urls in router.routes.items():
+        print(f"{model}: {', '.join(urls)}")
+    print()
+    print(f"{'Endpoint':<32} {'In flight':>9} {'Requests':>8} {'Errors':>6} {'Latency':>10}  Loaded")
+    for s in router.stats():
+        latency = f"{s['latency_ms']:.0f}ms" if s["latency_ms"] is not None else "-"
+        print(f"{s['url']:<32} {s['in_flight']:>9} {s['requests']:>8} {s['errors']:>6} "
+              f"{latency:>10}  {', '.join(s['loaded_models']) or '-'}")
+    return 0
+
+
 def cmd_export(args):
     """Export profiles to JSON."""
     history = get_profile_history()
@@ -273,6 +326,14 @@ def main():
     parser = argparse.ArgumentParser(
         description="LLM profiling utilities for HAI detection"
     )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="CASSETTE",
+                          help="Record live LLM calls to a cassette file")
+    cassette.add_argument("--replay", metavar="CASSETTE",
+                          help="Answer from a recorded cassette instead of a live server")
+    parser.add_argument("--latency", choices=["recorded", "rates", "none"],
+                        default=Config.LLM_REPLAY_LATENCY,
+                        help="Simulated latency when replaying")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
     # summary command
@@ -293,6 +354,19 @@ def main():
                      help="Output file path")
     sub.set_defaults(func=cmd_export)
 
+    # cache command
+    sub = subparsers.add_parser("cache", help="Show LLM response cache stats")
+    sub.add_argument("--clear", action="store_true", help="Delete cached responses")
+    sub.add_argument("--prompt-version", default=None,
+                     help="With --clear, only delete this prompt version")
+    sub.set_defaults(func=cmd_cache)
+
+    # endpoints command
+    sub = subparsers.add_parser("endpoints", help="Show routed LLM endpoints")
+    sub.add_argument("--warm-up", action="store_true",
+                     help="Load each model on its endpoints and pin it with keep_alive")
+    sub.set_defaults(func=cmd_endpoints)
+
     # demo command
     sub = subparsers.add_parser("demo", help="Run demo extraction")
     sub.add_argument("--scenario", "-s", default="simple",
@@ -312,6 +386,15 @@ def main():
         parser.print_help()
         return 1
 
+    # get_llm_client() reads these
+    if args.record:
+        Config.LLM_RECORD = True
+        Config.LLM_CASSETTE_PATH = args.record
+    elif args.replay:
+        Config.LLM_BACKEND = "replay"
+        Config.LLM_CASSETTE_PATH = args.replay
+    Config.LLM_REPLAY_LATENCY = args.latency
+
     return args.func(args) or 0
 
 
@@ -259,11 +259,9 @@ def test_full_pipeline(args):
 
         clear_profile_history()
         start = time.time()
-        classification = classifier.classify(candidate, notes)
+        classification, metrics = classifier.classify_with_metrics(candidate, notes)
         elapsed = time.time() - start
 
-        metrics = classifier.last_metrics
-
         print(f"Decision: {classification.decision.value}")
         print(f"Confidence: {classification.confidence:.2f}")
         if metrics:
@@ -0,0 +1,438 @@
+"""Tests for bulk device, culture and encounter resolution in candidate detection."""
+
+import sqlite3
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from hai_src.candidates.cauti import CAUTICandidateDetector
+from hai_src.candidates.cdi import CDICandidateDetector
+from hai_src.candidates.clabsi import CLABSICandidateDetector
+from hai_src.config import Config
+from hai_src.data import fhir_source
+from hai_src.data.base import BaseCultureSource, BaseDeviceSource, patient_batches
+from hai_src.data.clarity_source import ClarityDeviceSource
+from hai_src.data.fhir_source import (
+    FHIRCDITestSource,
+    FHIRCultureSource,
+    FHIRDeviceSource,
+    FHIRUrinaryCatheterSource,
+    FHIRUrineCultureSource,
+)
+from hai_src.models import CDITestResult, CultureResult, DeviceInfo, Patient
+
+
+def _device_statement(statement_id: str, patient_id: str, start: str, end: str | None = None,
+                      status: str = "active") -> dict:
+    period = {"start": start}
+    if end:
+        period["end"] = end
+    return {
+        "resourceType": "DeviceUseStatement",
+        "id": statement_id,
+        "status": status,
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "bodySite": {"coding": [{"code": "20699002", "display": "Right subclavian vein"}]},
+        "timingPeriod": period,
+    }
+
+
+def _foley_statement(statement_id: str, patient_id: str, start: str) -> dict:
+    return {
+        "resourceType": "DeviceUseStatement",
+        "id": statement_id,
+        "status": "active",
+        "subject": {"reference": f"Patient/{patient_id}"},
+        "device": {"concept": {"coding": [{"code": "68135008", "display": "Foley catheter"}]}},
+        "bodySite": {"coding": [{"code": "87953007", "display": "Urinary bladder"}]},
+        "timingPeriod": {"start": start},
+    }
+
+
+def _encounter(start: str, end: str | None = None, facility: str | None = None) -> dict:
+    return {
+        "id": f"enc-{start}",
+        "status": "finished" if end else "in-progress",
+        "class": "IMP",
+        "start": datetime.fromisoformat(start),
+        "end": datetime.fromisoformat(end) if end else None,
+        "facility": facility,
+    }
+
+
+def _fhir_source(monkeypatch, source_class, resources, failing_patients=()):
+    """A FHIR source whose searches return resources of the searched patients.
+
+    Searches for a batch containing any of failing_patients raise.
+    """
+    searches = []
+
+    def fake_search(session, url, params=None, **kwargs):
+        searches.append(params)
+        batch = params["patient"].split(",")
+        if set(batch) & set(failing_patients):
+            raise requests.ConnectionError("connection reset")
+        return iter(r for r in resources if r["subject"]["reference"].split("/")[-1] in batch)
+
+    monkeypatch.setattr(fhir_source, "iter_bundle_resources", fake_search)
+    source = source_class.__new__(source_class)
+    source.base_url = "http://fhir"
+    source.session = Mock()
+    return source, searches
+
+
+class TestPatientBatches:
+    """Tests for the batches bulk FHIR searches and Clarity IN lists share."""
+
+    def test_unique_ids_in_configured_batch_size(self, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 2)
+
+        assert patient_batches(["p1", "p2", "p1", "p3", "p2"]) == [["p1", "p2"], ["p3"]]
+        assert patient_batches([]) == []
+
+
+class TestFHIRBulkDevices:
+    """Tests for batched DeviceUseStatement lookups."""
+
+    def _source(self, monkeypatch, resources, failing_patients=()):
+        return _fhir_source(monkeypatch, FHIRDeviceSource, resources, failing_patients)
+
+    def test_central_lines_for_all_queries_come_from_one_search(self, monkeypatch):
+        source, searches = self._source(monkeypatch, [
+            _device_statement("d1", "p1", "2024-03-01T00:00:00", "2024-03-05T00:00:00"),
+            _device_statement("d2", "p2", "2024-03-10T00:00:00"),
+            _device_statement("d3", "p2", "2024-03-01T00:00:00", status="entered-in-error"),
+        ])
+
+        lines = source.get_central_lines_bulk([
+            ("p1", datetime(2024, 3, 4)),
+            ("p1", datetime(2024, 3, 20)),
+            ("p2", datetime(2024, 3, 4)),
+            ("p2", datetime(2024, 3, 12)),
+        ])
+
+        assert len(searches) == 1
+        assert searches[0]["patient"] == "p1,p2"
+        assert [[line.fhir_id for line in query] for query in lines] == [["d1"], [], [], ["d2"]]
+
+    def test_patients_are_searched_in_configured_batches(self, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 2)
+        source, searches = self._source(monkeypatch, [])
+
+        source.get_central_lines_bulk([(f"p{i}", datetime(2024, 3, 1)) for i in range(5)])
+
+        assert [params["patient"] for params in searches] == ["p0,p1", "p2,p3", "p4"]
+
+    def test_failed_batch_leaves_its_queries_unresolved(self, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 1)
+        source, _ = self._source(monkeypatch, [
+            _device_statement("d1", "p1", "2024-03-01T00:00:00"),
+            _device_statement("d2", "p2", "2024-03-01T00:00:00"),
+        ], failing_patients={"p2"})
+
+        lines = source.get_central_lines_bulk([
+            ("p1", datetime(2024, 3, 4)),
+            ("p2", datetime(2024, 3, 4)),
+        ])
+
+        assert lines[0][0].fhir_id == "d1"
+        assert lines[1] is None
+
+    def test_urinary_catheters_for_all_queries_come_from_one_search(self, monkeypatch):
+        source, searches = _fhir_source(monkeypatch, FHIRUrinaryCatheterSource, [
+            _foley_statement("u1", "p1", "2024-03-01T00:00:00"),
+            _foley_statement("u2", "p2", "2024-03-10T00:00:00"),
+        ])
+
+        catheters = source.get_urinary_catheters_bulk([
+            ("p1", datetime(2024, 3, 4)),
+            ("p2", datetime(2024, 3, 4)),
+            ("p2", datetime(2024, 3, 12)),
+        ])
+
+        assert len(searches) == 1
+        assert [[c.fhir_id for c in query] for query in catheters] == [["u1"], [], ["u2"]]
+        assert catheters[0][0].device_type == "foley_catheter"
+
+
+@pytest.fixture
+def clarity_devices(tmp_path):
+    """ClarityDeviceSource over a SQLite DB with the mock Clarity flowsheet schema."""
+    db_path = tmp_path / "clarity.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE PATIENT (PAT_ID INTEGER PRIMARY KEY, PAT_MRN_ID TEXT UNIQUE NOT NULL);
+        CREATE TABLE PAT_ENC (
+            PAT_ENC_CSN_ID INTEGER PRIMARY KEY, PAT_ID INTEGER, INPATIENT_DATA_ID INTEGER UNIQUE
+        );
+        CREATE TABLE IP_FLWSHT_REC (FSD_ID INTEGER PRIMARY KEY, INPATIENT_DATA_ID INTEGER);
+        CREATE TABLE IP_FLWSHT_MEAS (
+            FLO_MEAS_ID INTEGER, FSD_ID INTEGER, RECORDED_TIME DATETIME, MEAS_VALUE TEXT,
+            PRIMARY KEY (FLO_MEAS_ID, FSD_ID, RECORDED_TIME)
+        );
+        CREATE TABLE IP_FLO_GP_DATA (FLO_MEAS_ID INTEGER PRIMARY KEY, DISP_NAME TEXT);
+        INSERT INTO IP_FLO_GP_DATA VALUES
+            (1001, 'Central Line Present'), (1002, 'Central Line Site');
+    """)
+    for pat_id in range(1, 5):
+        conn.execute("INSERT INTO PATIENT VALUES (?, ?)", (pat_id, f"MRN{pat_id}"))
+        conn.execute("INSERT INTO PAT_ENC VALUES (?, ?, ?)", (100 + pat_id, pat_id, 200 + pat_id))
+        conn.execute("INSERT INTO IP_FLWSHT_REC VALUES (?, ?)", (300 + pat_id, 200 + pat_id))
+    rows = [(1, 1001, f"2026-01-{day:02d} 08:00:00", "Yes") for day in range(1, 11)]
+    rows += [(1, 1002, "2026-01-01 08:00:00", "Right subclavian")]
+    rows += [(2, 1001, f"2026-01-{day:02d} 09:00:00", "Yes") for day in range(3, 6)]
+    rows += [(2, 1001, "2026-01-06 09:00:00", "Removed")]
+    # Line charted long before the lookback and again recently
+    rows += [(3, 1001, "2025-06-01 08:00:00", "Yes"), (3, 1001, "2026-01-05 08:00:00", "Yes")]
+    conn.executemany(
+        "INSERT INTO IP_FLWSHT_MEAS VALUES (?, ?, ?, ?)",
+        [(flo_id, 300 + pat_id, time, value) for pat_id, flo_id, time, value in rows],
+    )
+    conn.commit()
+    conn.close()
+    return ClarityDeviceSource(f"sqlite:///{db_path}")
+
+
+class TestClarityBulkDevices:
+    """Tests for batched flowsheet lookups against a SQLite Clarity DB."""
+
+    QUERIES = [
+        ("MRN1", datetime(2026, 1, 5, 12)),
+        ("MRN1", datetime(2025, 12, 20)),
+        ("MRN2", datetime(2026, 1, 4, 12)),
+        ("MRN2", datetime(2026, 1, 8)),
+        ("MRN3", datetime(2026, 1, 7)),
+        ("MRN4", datetime(2026, 1, 7)),
+    ]
+
+    @staticmethod
+    def _key(lines):
+        return sorted((l.device_type, l.insertion_date, l.removal_date, l.site or "") for l in lines)
+
+    def test_bulk_matches_per_patient_lookups(self, clarity_devices, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 2)
+
+        bulk = clarity_devices.get_central_lines_bulk(self.QUERIES)
+        single = [clarity_devices.get_central_lines(p, as_of) for p, as_of in self.QUERIES]
+
+        assert [self._key(lines) for lines in bulk] == [self._key(lines) for lines in single]
+        assert [len(lines) for lines in bulk] == [2, 0, 1, 0, 1, 0]
+        assert bulk[0][0].insertion_date == datetime(2026, 1, 1, 8)
+        assert bulk[0][0].days_at_date(datetime(2026, 1, 5, 12)) == 4
+
+    def test_rows_before_the_lookback_are_not_read(self, clarity_devices):
+        lines = clarity_devices.get_central_lines_bulk([("MRN3", datetime(2026, 1, 7))])
+
+        assert lines[0][0].insertion_date == datetime(2026, 1, 5, 8)
+
+
+class TestFHIRBulkFailures:
+    """Tests that patients in a failed batch are left out of bulk results."""
+
+    def test_cultures_of_failed_batch_are_left_out(self, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 1)
+        source, _ = _fhir_source(monkeypatch, FHIRCultureSource, [], failing_patients={"p2"})
+
+        cultures = source.get_cultures_for_patients(["p1", "p2"], datetime(2024, 3, 1), datetime(2024, 3, 5))
+
+        assert cultures == {"p1": []}
+
+    def test_cdi_history_and_encounters_of_failed_batch_are_left_out(self, monkeypatch):
+        monkeypatch.setattr(Config, "FHIR_PATIENT_BATCH_SIZE", 1)
+        source, _ = _fhir_source(monkeypatch, FHIRCDITestSource, [], failing_patients={"p1"})
+
+        history = source.get_cdi_history_for_patients(["p1", "p2"], datetime(2024, 1, 1), datetime(2024, 3, 1))
+        encounters = source.get_encounters_for_patients(["p1", "p2"], datetime(2024, 1, 1), datetime(2024, 3, 1))
+
+        assert history == {"p2": []}
+        assert encounters == {"p2": []}
+
+
+class TestCLABSIBulkResolution:
+    """Tests that CLABSI detection resolves context once per run."""
+
+    def test_lines_and_confirmatory_cultures_are_prefetched(self):
+        patients = [Patient(fhir_id=f"p{i}", mrn=f"MRN{i}", name="") for i in range(2)]
+        cultures = [
+            CultureResult(fhir_id="c0", collection_date=datetime(2024, 3, 10), organism="Staphylococcus epidermidis"),
+            CultureResult(fhir_id="c1", collection_date=datetime(2024, 3, 11), organism="Escherichia coli"),
+        ]
+        line = DeviceInfo(device_type="picc", insertion_date=datetime(2024, 3, 1))
+
+        culture_source = Mock(spec=BaseCultureSource)
+        culture_source.get_positive_blood_cultures.return_value = list(zip(patients, cultures))
+        culture_source.get_cultures_for_patients.return_value = {"p0": [
+            cultures[0],
+            CultureResult(fhir_id="c2", collection_date=datetime(2024, 3, 11), organism="Staphylococcus epidermidis"),
+        ]}
+        device_source = Mock(spec=BaseDeviceSource)
+        device_source.get_central_lines_bulk.return_value = [[line], [line]]
+
+        detector = CLABSICandidateDetector(culture_source=culture_source, device_source=device_source)
+        candidates = detector.detect_candidates(datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+        assert [c.meets_initial_criteria for c in candidates] == [True, True]
+        device_source.get_central_lines_bulk.assert_called_once_with(
+            [("p0", datetime(2024, 3, 10)), ("p1", datetime(2024, 3, 11))]
+        )
+        device_source.get_central_lines.assert_not_called()
+        # Only the contaminant's patient needs other cultures
+        assert culture_source.get_cultures_for_patients.call_args.args[0] == ["p0"]
+        culture_source.get_cultures_for_patient.assert_not_called()
+
+    def test_patients_the_bulk_lookups_missed_are_queried_alone(self):
+        patients = [Patient(fhir_id=f"p{i}", mrn=f"MRN{i}", name="") for i in range(2)]
+        cultures = [
+            CultureResult(fhir_id=f"c{i}", collection_date=datetime(2024, 3, 10), organism="Staphylococcus epidermidis")
+            for i in range(2)
+        ]
+        line = DeviceInfo(device_type="picc", insertion_date=datetime(2024, 3, 1))
+
+        culture_source = Mock(spec=BaseCultureSource)
+        culture_source.get_positive_blood_cultures.return_value = list(zip(patients, cultures))
+        culture_source.get_cultures_for_patients.return_value = {"p0": [cultures[0]]}
+        culture_source.get_cultures_for_patient.return_value = [
+            cultures[1],
+            CultureResult(fhir_id="c2", collection_date=datetime(2024, 3, 11), organism="Staphylococcus epidermidis"),
+        ]
+        device_source = Mock(spec=BaseDeviceSource)
+        device_source.get_central_lines_bulk.return_value = [[line], None]
+        device_source.get_central_lines.return_value = [line]
+
+        detector = CLABSICandidateDetector(culture_source=culture_source, device_source=device_source)
+        candidates = detector.detect_candidates(datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+        assert [c.meets_initial_criteria for c in candidates] == [False, True]
+        device_source.get_central_lines.assert_called_once_with("p1", datetime(2024, 3, 10))
+        assert culture_source.get_cultures_for_patient.call_args.args[0] == "p1"
+
+
+class TestCAUTIBulkResolution:
+    """Tests that CAUTI detection resolves urinary catheters once per run."""
+
+    def _detector(self, patients, catheters_bulk):
+        cultures = [
+            CultureResult(fhir_id=f"u{i}", collection_date=datetime(2024, 3, 10), organism="Escherichia coli")
+            for i in range(len(patients))
+        ]
+        culture_source = Mock(spec=FHIRUrineCultureSource)
+        culture_source.get_positive_urine_cultures.return_value = list(zip(patients, cultures))
+        catheter_source = Mock(spec=FHIRUrinaryCatheterSource)
+        catheter_source.get_urinary_catheters_bulk.return_value = catheters_bulk
+        catheter_source.get_urinary_catheters.return_value = [
+            DeviceInfo(device_type="foley_catheter", insertion_date=datetime(2024, 3, 2)),
+        ]
+        detector = CAUTICandidateDetector(catheter_source=catheter_source, culture_source=culture_source)
+        return detector, catheter_source
+
+    def test_catheters_are_prefetched(self):
+        patients = [Patient(fhir_id=f"p{i}", mrn=f"MRN{i}", name="") for i in range(2)]
+        catheter = DeviceInfo(device_type="foley_catheter", insertion_date=datetime(2024, 3, 1))
+        detector, catheter_source = self._detector(patients, [[catheter], []])
+
+        candidates = detector.detect_candidates(datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+        assert [c.patient.fhir_id for c in candidates] == ["p0"]
+        assert candidates[0].device_days_at_culture == 9
+        catheter_source.get_urinary_catheters_bulk.assert_called_once_with(
+            [("p0", datetime(2024, 3, 10)), ("p1", datetime(2024, 3, 10))]
+        )
+        catheter_source.get_urinary_catheters.assert_not_called()
+
+    def test_unresolved_queries_fall_back_per_culture(self):
+        patients = [Patient(fhir_id=f"p{i}", mrn=f"MRN{i}", name="") for i in range(2)]
+        detector, catheter_source = self._detector(patients, [[], None])
+
+        candidates = detector.detect_candidates(datetime(2024, 3, 1), datetime(2024, 3, 31))
+
+        assert [c.patient.fhir_id for c in candidates] == ["p1"]
+        catheter_source.get_urinary_catheters.assert_called_once_with("p1", datetime(2024, 3, 10))
+
+
+class TestCDIBulkResolution:
+    """Tests for CDI admission/discharge selection from prefetched encounters."""
+
+    def test_admission_is_latest_encounter_started_by_test_date(self):
+        encounters = [
+            _encounter("2024-01-02T08:00:00", "2024-01-09T08:00:00"),
+            _encounter("2024-03-01T08:00:00"),
+            _encounter("2024-04-01T08:00:00"),
+        ]
+
+        assert FHIRCDITestSource.admission_date_from_encounters(
+            encounters, datetime(2024, 3, 5)
+        ) == datetime(2024, 3, 1, 8)
+        assert FHIRCDITestSource.admission_date_from_encounters(
+            encounters, datetime(2023, 12, 1)
+        ) is None
+
+    def test_prior_discharge_within_lookback(self):
+        encounters = [
+            _encounter("2024-01-01T08:00:00", "2024-01-05T08:00:00", "Old Hospital"),
+            _encounter("2024-02-10T08:00:00", "2024-02-15T08:00:00", "Other Hospital"),
+        ]
+
+        assert FHIRCDITestSource.prior_discharge_from_encounters(
+            encounters, datetime(2024, 3, 1)
+        ) == (datetime(2024, 2, 15, 8), "Other Hospital")
+        assert FHIRCDITestSource.prior_discharge_from_encounters(
+            encounters, datetime(2024, 4, 1)
+        ) == (None, None)
+
+    def test_detector_classifies_from_prefetched_context(self):
+        patient = Patient(fhir_id="p1", mrn="MRN1", name="")
+        test = CDITestResult(
+            fhir_id="t2", patient_id="p1", test_date=datetime(2024, 3, 2, 10),
+            test_type="pcr", result="positive",
+        )
+        prior = CDITestResult(
+            fhir_id="t1", patient_id="p1", test_date=datetime(2024, 2, 1, 10),
+            test_type="pcr", result="positive",
+        )
+
+        source = Mock(spec=FHIRCDITestSource)
+        source.get_positive_cdi_tests.return_value = [(patient, test)]
+        source.get_cdi_history_for_patients.return_value = {"p1": [test, prior]}
+        source.get_encounters_for_patients.side_effect = [
+            {"p1": [_encounter("2024-03-01T08:00:00")]},
+            {"p1": [_encounter("2024-02-10T08:00:00", "2024-02-15T08:00:00", "Other Hospital")]},
+        ]
+
+        candidates = CDICandidateDetector(cdi_source=source).detect_candidates(
+            datetime(2024, 3, 1), datetime(2024, 3, 31)
+        )
+
+        cdi_data = candidates[0]._cdi_data
+        assert cdi_data.onset_type == "co_hcfa"
+        assert cdi_data.recent_discharge_facility == "Other Hospital"
+        assert [e.id for e in cdi_data.prior_episodes] == ["fhir-t1"]
+        assert cdi_data.is_recurrent
+        source.get_patient_admission_date.assert_not_called()
+        source.get_patient_cdi_history.assert_not_called()
+        source.get_patient_prior_discharge.assert_not_called()
+
+    def test_patients_missing_from_context_are_looked_up_per_test(self):
+        patient = Patient(fhir_id="p1", mrn="MRN1", name="")
+        test = CDITestResult(
+            fhir_id="t2", patient_id="p1", test_date=datetime(2024, 3, 2, 10),
+            test_type="pcr", result="positive",
+        )
+
+        source = Mock(spec=FHIRCDITestSource)
+        source.get_positive_cdi_tests.return_value = [(patient, test)]
+        source.get_cdi_history_for_patients.return_value = {}
+        source.get_encounters_for_patients.return_value = {}
+        source.get_patient_admission_date.return_value = datetime(2024, 3, 1, 8)
+        source.get_patient_cdi_history.return_value = []
+        source.get_patient_prior_discharge.return_value = (None, None)
+
+        candidates = CDICandidateDetector(cdi_source=source).detect_candidates(
+            datetime(2024, 3, 1), datetime(2024, 3, 31)
+        )
+
+        assert candidates[0]._cdi_data.onset_type == "co"
+        source.get_patient_admission_date.assert_called_once_with("p1", test.test_date)
+        source.get_patient_cdi_history.assert_called_once()
+        source.get_patient_prior_discharge.assert_called_once_with("p1", datetime(2024, 3, 1, 8))
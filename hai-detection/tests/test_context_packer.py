@@ -0,0 +1,84 @@
+"""Tests for token-budgeted note context packing."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+from common.context_packer import estimate_tokens
+from hai_src.classifiers import clabsi_classifier
+from hai_src.models import ClinicalNote, CultureResult, HAICandidate, HAIType, Patient
+from hai_src.notes.packer import ContextPacker
+
+BOILERPLATE = (
+    "Patient seen and examined at bedside. Vitals reviewed. Tolerating diet, "
+    "ambulating with assistance. Continue current medications and monitor. "
+) * 6
+
+
+def _note(note_id: str, day: int, content: str, note_type: str = "progress_note") -> ClinicalNote:
+    return ClinicalNote(
+        id=note_id,
+        patient_id="p1",
+        note_type=note_type,
+        date=datetime(2026, 3, day),
+        content=content,
+        source="fhir",
+    )
+
+
+class TestContextPacker:
+    """Tests for ContextPacker."""
+
+    def test_older_assessment_outranks_newer_boilerplate_within_budget(self):
+        notes = [
+            _note(f"n{day}", day, f"SUBJECTIVE:\n{BOILERPLATE}\n\n{BOILERPLATE}")
+            for day in range(10, 4, -1)
+        ] + [
+            _note("old", 2, (
+                f"{BOILERPLATE}\n\nASSESSMENT AND PLAN:\n"
+                "PICC line site with erythema at site and purulence. Blood culture grew "
+                "S. aureus, concern for line infection; plan line removal.\n"
+            )),
+        ]
+
+        packed = ContextPacker(HAIType.CLABSI).pack(notes, token_budget=300)
+
+        assert packed.tokens <= 300
+        assert "plan line removal" in packed.text
+        assert "[PROGRESS_NOTE - 2026-03-02]" in packed.text
+        assert "Assessment/Plan:\nPICC line site" in packed.text
+        assert packed.chunks_packed < packed.chunks_total
+        assert packed.duplicates_dropped > 0
+
+    def test_prompt_context_fits_the_model_window(self):
+        template = "x" * 4000
+        long_notes = [_note(f"n{i}", 1 + i, f"Central line day {i}. " * 400) for i in range(20)]
+        packer = ContextPacker("clabsi")
+        text = packer.pack_for_prompt(long_notes, template, max_tokens=7500)
+
+        assert estimate_tokens(text) <= 8192 - 1000 - 1024
+        packed = packer.pack(
+            long_notes, num_ctx=8192, reserved_tokens=estimate_tokens(template), max_tokens=7500,
+        )
+        assert packed.text == text
+        assert packed.tokens == estimate_tokens(text)
+        assert packed.groups_total == 20
+        assert not hasattr(packer, "last_report")  # Shared packers keep no per-call state
+
+    def test_classifier_budget_uses_the_lazily_loaded_client(self, monkeypatch):
+        client = Mock(num_ctx=2048)
+        monkeypatch.setattr(clabsi_classifier, "get_llm_client", lambda: client)
+        classifier = clabsi_classifier.CLABSIClassifier(culture_source=Mock())
+        classifier.culture_source.find_matching_organisms.return_value = []
+        pack = Mock(wraps=classifier.packer.pack)
+        monkeypatch.setattr(classifier.packer, "pack", pack)
+        candidate = HAICandidate(
+            id="cand-1",
+            hai_type=HAIType.CLABSI,
+            patient=Patient(fhir_id="p1", mrn="MRN1", name="Test"),
+            culture=CultureResult(fhir_id="c1", collection_date=datetime(2026, 3, 5), organism="S. aureus"),
+        )
+
+        classifier.build_prompt(candidate, [_note("n1", 4, "Central line in place. " * 50)])
+
+        assert pack.call_args.kwargs["num_ctx"] == 2048
+
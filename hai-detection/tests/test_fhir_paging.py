@@ -0,0 +1,189 @@
+"""Tests for paginated FHIR Bundle iteration."""
+
+import pytest
+import requests
+from datetime import datetime
+from unittest.mock import Mock
+
+from hai_src.data.fhir_paging import get_next_link, iter_bundle_pages, iter_bundle_resources
+from hai_src.data.fhir_source import FHIRCultureSource
+
+
+BASE_URL = "http://fhir.test/fhir"
+
+
+def _response(payload):
+    """Build a mock requests response returning payload."""
+    response = Mock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+def _bundle(resources, next_url=None):
+    """Build a searchset Bundle page."""
+    bundle = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [{"resource": r} for r in resources],
+        "link": [{"relation": "self", "url": "ignored"}],
+    }
+    if next_url:
+        bundle["link"].append({"relation": "next", "url": next_url})
+    return bundle
+
+
+class FakeSession:
+    """Session stand-in that serves pages keyed by URL."""
+
+    def __init__(self, pages: dict[str, dict]):
+        self.pages = pages
+        self.calls: list[tuple[str, object]] = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        if url not in self.pages:
+            raise requests.ConnectionError(f"no page for {url}")
+        return _response(self.pages[url])
+
+
+class TestGetNextLink:
+    """Tests for next-link extraction."""
+
+    def test_relation_key(self):
+        assert get_next_link(_bundle([], next_url="http://x/page2")) == "http://x/page2"
+
+    def test_legacy_rel_key(self):
+        bundle = {"link": [{"rel": "next", "url": "http://x/page2"}]}
+        assert get_next_link(bundle) == "http://x/page2"
+
+    def test_no_next(self):
+        assert get_next_link(_bundle([])) is None
+        assert get_next_link({}) is None
+
+
+class TestIterBundle:
+    """Tests for page and resource iteration."""
+
+    def _three_page_session(self):
+        return FakeSession({
+            f"{BASE_URL}/Observation": _bundle(
+                [{"resourceType": "Observation", "id": "1"}],
+                next_url=f"{BASE_URL}?_getpages=abc&_offset=1",
+            ),
+            f"{BASE_URL}?_getpages=abc&_offset=1": _bundle(
+                [{"resourceType": "Observation", "id": "2"}],
+                next_url=f"{BASE_URL}?_getpages=abc&_offset=2",
+            ),
+            f"{BASE_URL}?_getpages=abc&_offset=2": _bundle(
+                [{"resourceType": "Observation", "id": "3"}],
+            ),
+        })
+
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_follows_next_links(self, prefetch):
+        session = self._three_page_session()
+
+        ids = [
+            r["id"] for r in iter_bundle_resources(
+                session, f"{BASE_URL}/Observation", {"code": "x"}, prefetch=prefetch,
+            )
+        ]
+
+        assert ids == ["1", "2", "3"]
+        assert len(session.calls) == 3
+        # Only the first request carries the search params
+        assert session.calls[0][1] == {"code": "x"}
+        assert session.calls[1][1] is None
+
+    def test_relative_next_link_resolved(self):
+        session = FakeSession({
+            f"{BASE_URL}/Observation": _bundle(
+                [{"resourceType": "Observation", "id": "1"}],
+                next_url="Observation?page=2",
+            ),
+            f"{BASE_URL}/Observation?page=2": _bundle(
+                [{"resourceType": "Observation", "id": "2"}],
+            ),
+        })
+
+        ids = [r["id"] for r in iter_bundle_resources(session, f"{BASE_URL}/Observation")]
+        assert ids == ["1", "2"]
+
+    def test_resource_type_filter_skips_included(self):
+        session = FakeSession({
+            f"{BASE_URL}/DiagnosticReport": _bundle([
+                {"resourceType": "DiagnosticReport", "id": "dr1"},
+                {"resourceType": "Patient", "id": "p1"},
+            ]),
+        })
+
+        resources = list(iter_bundle_resources(
+            session, f"{BASE_URL}/DiagnosticReport", resource_type="DiagnosticReport",
+        ))
+        assert [r["id"] for r in resources] == ["dr1"]
+
+    def test_max_pages_cap(self):
+        session = self._three_page_session()
+
+        pages = list(iter_bundle_pages(session, f"{BASE_URL}/Observation", max_pages=2))
+        assert len(pages) == 2
+
+    def test_paging_loop_stops(self):
+        loop_url = f"{BASE_URL}?page=loop"
+        session = FakeSession({
+            f"{BASE_URL}/Observation": _bundle([], next_url=loop_url),
+            loop_url: _bundle([], next_url=loop_url),
+        })
+
+        pages = list(iter_bundle_pages(session, f"{BASE_URL}/Observation"))
+        assert len(pages) == 2
+
+    def test_failed_page_keeps_earlier_results(self):
+        session = FakeSession({
+            f"{BASE_URL}/Observation": _bundle(
+                [{"resourceType": "Observation", "id": "1"}],
+                next_url=f"{BASE_URL}?page=missing",
+            ),
+        })
+
+        seen = []
+        with pytest.raises(requests.RequestException):
+            for resource in iter_bundle_resources(session, f"{BASE_URL}/Observation"):
+                seen.append(resource["id"])
+        assert seen == ["1"]
+
+
+class TestCultureSourcePaging:
+    """FHIRCultureSource must not drop cultures beyond the first page."""
+
+    def test_positive_blood_cultures_across_pages(self):
+        def report(report_id, patient_id):
+            return {
+                "resourceType": "DiagnosticReport",
+                "id": report_id,
+                "subject": {"reference": f"Patient/{patient_id}"},
+                "code": {"coding": [{"code": "600-7"}]},
+                "effectiveDateTime": "2024-01-15T10:00:00",
+                "conclusion": "Positive",
+            }
+
+        patient = {"resourceType": "Patient", "id": "p1", "name": [{"family": "Test"}]}
+        source = FHIRCultureSource(base_url=BASE_URL)
+        source.session = FakeSession({
+            f"{BASE_URL}/DiagnosticReport": _bundle(
+                [report("dr1", "p1"), patient],
+                next_url=f"{BASE_URL}?page=2",
+            ),
+            # Patient already included on page 1 is not repeated
+            f"{BASE_URL}?page=2": _bundle([report("dr2", "p1")]),
+        })
+
+        results = source.get_positive_blood_cultures(
+            datetime(2024, 1, 14), datetime(2024, 1, 16),
+        )
+
+        assert [c.fhir_id for _, c in results] == ["dr1", "dr2"]
+        assert all(p.fhir_id == "p1" for p, _ in results)
+        # No fallback Patient read was needed
+        assert len(source.session.calls) == 2
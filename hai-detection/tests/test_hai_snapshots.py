@@ -0,0 +1,76 @@
+"""Tests for HAI candidate change tracking in daily metrics snapshots."""
+
+import sqlite3
+from datetime import date, datetime, timedelta
+
+from common.metrics_store import MetricsAggregator, MetricsStore
+from hai_src.db import HAIDatabase
+from hai_src.models import CandidateStatus, CultureResult, HAICandidate, HAIType, Patient
+
+
+def _candidate(idx: int, created: datetime) -> HAICandidate:
+    return HAICandidate(
+        id=f"cand-{idx}",
+        hai_type=HAIType.CLABSI,
+        patient=Patient(fhir_id=f"p{idx}", mrn=f"MRN{idx}", name="Test"),
+        culture=CultureResult(fhir_id=f"c{idx}", collection_date=created, organism="S. aureus"),
+        created_at=created,
+    )
+
+
+def test_confirmation_refreshes_the_day_the_candidate_was_created(tmp_path):
+    hai_db = HAIDatabase(tmp_path / "hai.db")
+    metrics = MetricsStore(str(tmp_path / "metrics.db"))
+    aggregator = MetricsAggregator(metrics_store=metrics)
+    aggregator._source_db_paths = lambda: {
+        "hai": str(hai_db.db_path),
+        "activity": metrics.db_path,
+    }
+
+    created_day = date.today() - timedelta(days=5)
+    hai_db.save_candidate(_candidate(1, datetime.combine(created_day, datetime.min.time())))
+    # A later candidate moves the creation high-water mark past created_day
+    hai_db.save_candidate(_candidate(2, datetime.now() - timedelta(days=1)))
+    aggregator.backfill(date.today() - timedelta(days=10))
+    assert metrics.get_daily_snapshot(created_day).hai_confirmed == 0
+
+    hai_db.update_candidate_status("cand-1", CandidateStatus.CONFIRMED)
+    refreshed = aggregator.refresh_snapshots()
+
+    assert created_day in [s.snapshot_date for s in refreshed]
+    assert metrics.get_daily_snapshot(created_day).hai_confirmed == 1
+
+
+def test_existing_database_gains_updated_at(tmp_path):
+    path = tmp_path / "hai.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE hai_candidates (
+            id TEXT PRIMARY KEY, hai_type TEXT NOT NULL DEFAULT 'clabsi',
+            patient_id TEXT NOT NULL, patient_mrn TEXT NOT NULL, patient_name TEXT,
+            culture_id TEXT NOT NULL, culture_date TIMESTAMP NOT NULL, organism TEXT,
+            device_info TEXT, device_days_at_culture INTEGER,
+            meets_initial_criteria BOOLEAN NOT NULL DEFAULT 1, exclusion_reason TEXT,
+            status TEXT DEFAULT 'pending', nhsn_reported INTEGER DEFAULT 0,
+            nhsn_reported_at TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(hai_type, culture_id)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO hai_candidates (id, patient_id, patient_mrn, culture_id, culture_date, created_at)
+        VALUES ('old', 'p1', 'MRN1', 'c1', '2024-01-01', '2024-01-01T08:00:00')
+    """)
+    conn.commit()
+    conn.close()
+
+    hai_db = HAIDatabase(path)
+    row = hai_db._get_connection().execute(
+        "SELECT updated_at FROM hai_candidates WHERE id = 'old'"
+    ).fetchone()
+    assert row[0] == "2024-01-01T08:00:00"
+
+    hai_db.update_candidate_status("old", CandidateStatus.CONFIRMED)
+    row = hai_db._get_connection().execute(
+        "SELECT updated_at FROM hai_candidates WHERE id = 'old'"
+    ).fetchone()
+    assert row[0][:10] == date.today().isoformat()
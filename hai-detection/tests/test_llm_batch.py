@@ -0,0 +1,105 @@
+"""Tests for batched structured generation on BaseLLMClient."""
+
+import threading
+import time
+
+import pytest
+
+from hai_src.llm.base import (
+    BaseLLMClient,
+    LLMProfile,
+    StructuredLLMResponse,
+    record_llm_call,
+    track_throughput,
+)
+
+SCHEMA = {"type": "object", "properties": {"n": {"type": "integer"}}}
+
+
+class SlowClient(BaseLLMClient):
+    """Answers after a delay that shrinks with the prompt number, so later prompts finish first."""
+
+    batch_concurrency = 3
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, system_prompt=None, temperature=0.0, max_tokens=4096):
+        raise NotImplementedError
+
+    def generate_structured(self, prompt, output_schema, system_prompt=None, temperature=0.0):
+        return self.generate_structured_with_profile(prompt, output_schema).data
+
+    def generate_structured_with_profile(self, prompt, output_schema, system_prompt=None,
+                                         temperature=0.0, profile_context=""):
+        n = int(prompt)
+        if n == 2:
+            raise ValueError("model returned invalid JSON")
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05 * (6 - n))
+        with self._lock:
+            self.in_flight -= 1
+        profile = LLMProfile(input_tokens=100, output_tokens=20, total_ms=50.0 * (6 - n))
+        record_llm_call(profile)
+        return StructuredLLMResponse(data={"n": n}, profile=profile)
+
+    def is_available(self):
+        return True
+
+    @property
+    def model_name(self):
+        return "slow"
+
+
+class TestStructuredBatch:
+    """Tests for generate_structured_batch and throughput metering."""
+
+    def test_batch_returns_results_in_prompt_order(self):
+        client = SlowClient()
+
+        batch = client.generate_structured_batch([str(n) for n in range(6)], SCHEMA)
+
+        assert batch.data == [{"n": 0}, {"n": 1}, None, {"n": 3}, {"n": 4}, {"n": 5}]
+        assert isinstance(batch.errors[2], ValueError) and batch.failed == 1
+        assert client.peak == 3
+
+    def test_aggregate_throughput_counts_wall_time_not_model_time(self):
+        client = SlowClient()
+
+        with track_throughput() as meter:
+            batch = client.generate_structured_batch(
+                ["0", "1", "3", "4"], SCHEMA, max_concurrent=4,
+            )
+
+        assert batch.throughput.output_tokens == meter.output_tokens == 80
+        assert meter.calls == 4
+        # Calls overlap, so wall time is well under the summed model time
+        assert meter.elapsed_ms < meter.model_ms * 0.6
+        assert meter.tokens_per_second == pytest.approx(80 / (meter.elapsed_ms / 1000))
+
+    def test_concurrent_meters_only_count_their_own_calls(self):
+        client = SlowClient()
+        meters = {}
+        started = threading.Barrier(2)
+
+        def run(name, prompts):
+            with track_throughput() as meter:
+                started.wait()
+                client.generate_structured_batch(prompts, SCHEMA)
+            meters[name] = meter
+
+        threads = [
+            threading.Thread(target=run, args=("monitor", ["0", "1", "3"])),
+            threading.Thread(target=run, args=("validation", ["4"])),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert meters["monitor"].calls == 3
+        assert meters["validation"].calls == 1
@@ -0,0 +1,48 @@
+"""Tests for LLM response caching in the client base class."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from common.llm_cache import LLMResponseCache
+from hai_src.llm.ollama import OllamaClient
+
+SCHEMA = {"type": "object", "properties": {"line_present": {"type": "boolean"}}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(tmp_path / "llm_cache.db")
+
+
+def _ollama(cache) -> OllamaClient:
+    client = OllamaClient(base_url="http://ollama.test", model="llama3.3:70b")
+    client.response_cache = cache
+    response = MagicMock()
+    response.json.return_value = {
+        "message": {"content": '{"line_present": true}'},
+        "total_duration": 90_000_000_000,
+    }
+    client.session = MagicMock()
+    client.session.post.return_value = response
+    return client
+
+
+class TestClientResponseCache:
+    """Tests for the BaseLLMClient cache hook."""
+
+    def test_repeat_structured_call_is_served_from_cache(self, cache):
+        client = _ollama(cache)
+
+        first = client.generate_structured_with_profile("notes", SCHEMA)
+        second = client.generate_structured_with_profile("notes ", SCHEMA)
+        client.generate_structured("notes", SCHEMA, temperature=0.7)
+
+        assert first.data == second.data == {"line_present": True}
+        assert not first.cached and second.cached
+        # One miss, one hit; the sampled call bypasses the cache
+        assert client.session.post.call_count == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["seconds_saved"] == pytest.approx(90.0)
@@ -0,0 +1,121 @@
+"""Tests for the record/replay LLM client."""
+
+import pytest
+
+from hai_src.llm import replay
+from hai_src.llm.base import BaseLLMClient, LLMProfile, LLMResponse, StructuredLLMResponse
+from hai_src.llm.replay import CassetteMissError, ReplayLLMClient
+
+SCHEMA = {"type": "object", "properties": {"line_present": {"type": "boolean"}}}
+
+
+class FakeLiveClient(BaseLLMClient):
+    """Stands in for Ollama: 1000 prompt tokens at 500 tok/s, 40 output tokens at 20 tok/s."""
+
+    def __init__(self):
+        self.calls = 0
+        self.contexts = []
+
+    def generate(self, prompt, system_prompt=None, temperature=0.0, max_tokens=4096,
+                 profile_context=""):
+        self.calls += 1
+        self.contexts.append(profile_context)
+        return LLMResponse(content="CVC noted", input_tokens=1000, output_tokens=4,
+                           profile=LLMProfile(input_tokens=1000, output_tokens=4, total_ms=2200))
+
+    def generate_structured(self, prompt, output_schema, system_prompt=None, temperature=0.0):
+        return self.generate_structured_with_profile(prompt, output_schema).data
+
+    def generate_structured_with_profile(self, prompt, output_schema, system_prompt=None,
+                                         temperature=0.0, profile_context=""):
+        self.calls += 1
+        profile = LLMProfile(
+            input_tokens=1000, output_tokens=40,
+            prefill_ms=2000, generation_ms=2000, total_ms=4100,
+        )
+        return StructuredLLMResponse(data={"line_present": "CVC" in prompt}, profile=profile)
+
+    def is_available(self):
+        return True
+
+    @property
+    def model_name(self):
+        return "llama3.3:70b"
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    recorder = ReplayLLMClient(path, mode="record", inner=FakeLiveClient(), enable_profiling=False)
+    recorder.generate_structured("Notes: CVC in place", SCHEMA)
+    recorder.generate_structured("Notes: peripheral IV only", SCHEMA)
+    return path
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(replay.time, "sleep", slept.append)
+    return slept
+
+
+class TestReplayLLMClient:
+    """Tests for recording and replaying cassettes."""
+
+    def test_replay_returns_recorded_response_with_recorded_latency(self, cassette, sleeps):
+        client = ReplayLLMClient(cassette, enable_profiling=False)
+
+        result = client.generate_structured_with_profile("Notes:  CVC in place\n", SCHEMA)
+
+        assert result.data == {"line_present": True}
+        assert result.profile.total_ms == pytest.approx(4100)
+        assert sleeps == [pytest.approx(4.1)]
+        assert client.model_name == "llama3.3:70b"
+        assert client.recorded_calls == 2
+
+    def test_rate_latency_uses_recorded_rates_and_speed(self, cassette, sleeps):
+        client = ReplayLLMClient(
+            cassette, latency="rates", jitter=0.0, speed=2.0, enable_profiling=False,
+        )
+
+        profile = client.generate_structured_with_profile("Notes: CVC in place", SCHEMA).profile
+
+        # 1000 tokens at 500 tok/s + 40 tokens at 20 tok/s, twice as fast
+        assert (client.prefill_tps, client.decode_tps) == (500, 20)
+        assert profile.total_ms == pytest.approx(2000)
+        assert sleeps == [pytest.approx(2.0)]
+
+    def test_unrecorded_prompt_is_a_miss_unless_lenient(self, cassette, sleeps):
+        with pytest.raises(CassetteMissError):
+            ReplayLLMClient(cassette, enable_profiling=False).generate_structured("new", SCHEMA)
+
+        lenient = ReplayLLMClient(cassette, strict=False, jitter=0.0, enable_profiling=False)
+        result = lenient.generate_structured_with_profile("x" * 2000, SCHEMA)
+
+        # Latest response for the schema, prefill estimated from prompt length
+        assert result.data == {"line_present": False}
+        assert result.profile.input_tokens == 500
+        assert lenient.stats["fallbacks"] == 1
+
+    def test_auto_mode_only_records_new_requests(self, cassette, sleeps):
+        live = FakeLiveClient()
+        client = ReplayLLMClient(cassette, mode="auto", inner=live, enable_profiling=False)
+
+        client.generate_structured("Notes: CVC in place", SCHEMA)
+        client.generate_structured("Notes: PICC removed", SCHEMA)
+
+        assert live.calls == 1
+        assert ReplayLLMClient(cassette).recorded_calls == 3
+
+    def test_record_mode_calls_the_live_client_for_recorded_requests(self, cassette, sleeps):
+        live = FakeLiveClient()
+        client = ReplayLLMClient(cassette, mode="record", inner=live, enable_profiling=False)
+
+        client.generate_structured("Notes: CVC in place", SCHEMA)
+        client.generate("Summarize: CVC in place", profile_context="summary")
+        client.generate("Summarize: CVC in place", profile_context="summary")
+
+        assert live.calls == 3
+        assert live.contexts == ["summary", "summary"]
+        assert client.stats["replayed"] == 0
+        assert sleeps == []
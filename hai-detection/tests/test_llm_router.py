@@ -0,0 +1,150 @@
+"""Tests for the multi-endpoint LLM router against stub Ollama servers."""
+
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from hai_src.llm.router import LLMRouter, RoutedOllamaClient, parse_endpoints
+
+MODEL = "llama3.3:70b"
+SCHEMA = {"type": "object", "properties": {"ok": {"type": "boolean"}}}
+
+
+class _StubOllamaHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        models = [{"name": name} for name in self.server.loaded]
+        self._reply({"models": models})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.payloads.append((self.path, payload))
+        cold = payload["model"] not in self.server.loaded
+        self.server.loaded.add(payload["model"])
+        if self.path == "/api/chat":
+            time.sleep(self.server.delay)
+        self._reply({
+            "message": {"content": '{"ok": true}'},
+            "total_duration": int(self.server.delay * 1e9),
+            "load_duration": int(5e9) if cold else 0,
+        })
+
+
+class StubOllama:
+    """Minimal Ollama server: /api/chat, /api/generate, /api/ps, /api/tags."""
+
+    def __init__(self, loaded=(), delay=0.0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllamaHandler)
+        self.server.loaded = set(loaded)
+        self.server.payloads = []
+        self.server.delay = delay
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def chats(self) -> list[dict]:
+        return [p for path, p in self.server.payloads if path == "/api/chat"]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    started = []
+
+    def start(**kwargs):
+        stub = StubOllama(**kwargs)
+        started.append(stub)
+        return stub
+
+    yield start
+    for stub in started:
+        stub.close()
+
+
+def _client(router: LLMRouter) -> RoutedOllamaClient:
+    client = RoutedOllamaClient(router, MODEL, enable_profiling=False)
+    client.use_response_cache = False
+    return client
+
+
+def _unused_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+class TestLLMRouter:
+    """Tests for endpoint selection, load tracking and failover."""
+
+    def test_parse_endpoints(self):
+        routes = parse_endpoints(
+            f"{MODEL}=http://gpu1:11434/, http://gpu2:11434;qwen2.5:7b=http://gpu3:11434"
+        )
+
+        assert routes == {
+            MODEL: ["http://gpu1:11434", "http://gpu2:11434"],
+            "qwen2.5:7b": ["http://gpu3:11434"],
+        }
+
+    def test_request_goes_to_warm_endpoint_with_keep_alive(self, stubs):
+        cold, warm = stubs(), stubs(loaded={MODEL})
+        router = LLMRouter({MODEL: [cold.url, warm.url]}, keep_alive="-1")
+
+        result = _client(router).generate_structured_with_profile("notes", SCHEMA)
+
+        assert result.data == {"ok": True}
+        assert not result.profile.model_was_cold
+        assert cold.chats == []
+        assert warm.chats[0]["keep_alive"] == -1
+
+    def test_concurrent_requests_spread_over_busy_endpoints(self, stubs):
+        first, second = stubs(loaded={MODEL}, delay=0.3), stubs(loaded={MODEL}, delay=0.3)
+        router = LLMRouter({MODEL: [first.url, second.url]}, slots=1)
+        client = _client(router)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda i: client.generate_structured(f"notes {i}", SCHEMA), range(4)))
+
+        assert sorted([len(first.chats), len(second.chats)]) == [2, 2]
+        stats = router.stats()
+        assert all(s["in_flight"] == 0 and s["latency_ms"] > 0 for s in stats)
+
+    def test_unreachable_endpoint_fails_over_and_cools_down(self, stubs):
+        down_url, healthy = _unused_port_url(), stubs(loaded={MODEL})
+        router = LLMRouter({MODEL: [down_url, healthy.url]})
+        router._endpoints[down_url].loaded_models.add(MODEL)  # looked warm before it died
+        router._endpoints[down_url].loaded_checked_at = time.monotonic()
+        client = _client(router)
+
+        client.generate_structured("notes", SCHEMA)
+        client.generate_structured("more notes", SCHEMA)
+
+        assert len(healthy.chats) == 2
+        down = next(s for s in router.stats() if s["url"] == down_url)
+        assert down["errors"] == 1 and down["down"]
+
+    def test_warm_up_loads_and_pins_models(self, stubs):
+        stub = stubs()
+        router = LLMRouter({MODEL: [stub.url]}, keep_alive="24h")
+
+        assert router.warm_up() == {f"{MODEL}@{stub.url}": True}
+        assert stub.server.payloads == [("/api/generate", {"model": MODEL, "keep_alive": "24h"})]
+        assert router.stats()[0]["loaded_models"] == [MODEL]
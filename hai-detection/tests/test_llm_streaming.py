@@ -0,0 +1,166 @@
+"""Tests for streamed structured output with early termination."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from hai_src.llm.ollama import OllamaClient
+from hai_src.llm.streaming import IncrementalJSONParser
+
+SCHEMA = {"type": "object", "properties": {"quality": {"type": "string"}}}
+RESPONSE = {
+    "documentation_quality": "adequate",
+    "contamination_mentioned": True,
+    "mbi_factors_present": False,
+    "quick_reasoning": "Notes call the coag-negative staph a likely skin contaminant, " * 3,
+}
+
+
+class _StreamingOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, body: dict) -> None:
+        data = (json.dumps(body) + "\n").encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        text = json.dumps(RESPONSE)
+        tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+        if self.server.truncate_at:
+            tokens = tokens[:self.server.truncate_at]
+        try:
+            for token in tokens:
+                self._chunk({"message": {"content": token}, "done": False})
+                self.server.sent += 1
+                time.sleep(0.005)
+            self._chunk({"done": True, "eval_count": len(tokens), "prompt_eval_count": 50})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingOllamaHandler)
+    httpd.sent = 0
+    httpd.truncate_at = None
+    httpd.total = -(-len(json.dumps(RESPONSE)) // 4)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server) -> OllamaClient:
+    client = OllamaClient(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        model="qwen2.5:7b",
+        enable_profiling=False,
+    )
+    client.use_response_cache = False
+    return client
+
+
+class TestIncrementalJSONParser:
+    """Tests for field-by-field parsing of chunked JSON."""
+
+    def test_fields_complete_in_order_regardless_of_chunking(self):
+        text = 'Here: {"a": "x, \\"y\\" }", "b": [1, {"c": "]"}], "d": -1.5e3, "e": null}\n  '
+        rng = random.Random(0)
+        for _ in range(50):
+            parser, completed, i = IncrementalJSONParser(), [], 0
+            while i < len(text):
+                step = rng.randint(1, 6)
+                completed += parser.feed(text[i:i + step])
+                i += step
+
+            assert [name for name, _ in completed] == ["a", "b", "d", "e"]
+            assert parser.closed
+            assert parser.result() == {"a": 'x, "y" }', "b": [1, {"c": "]"}], "d": -1500.0, "e": None}
+
+    def test_partial_object_exposes_completed_fields_only(self):
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"a": true, "b": "unfin') == [("a", True)]
+        assert not parser.closed and parser.result() == {"a": True}
+
+    def test_token_stream_keeps_only_the_open_value(self):
+        reasoning = "Blood culture grew coag-negative staph in one of two sets. " * 200
+        text = json.dumps({"quick_reasoning": reasoning, "contamination_mentioned": True})
+        parser = IncrementalJSONParser()
+
+        for i in range(0, len(text) - 30, 4):
+            parser.feed(text[i:i + 4])
+        # Only the unfinished value is held back for parsing, not the stream
+        assert "".join(parser._partial) == text[parser._start:parser._pos]
+        parser.feed(text[parser._pos:])
+
+        assert parser.result() == json.loads(text)
+        assert parser._partial == []
+
+
+class TestStructuredStream:
+    """Tests for OllamaClient.generate_structured_stream."""
+
+    def test_full_stream_returns_whole_object(self, server):
+        seen = []
+        result = _client(server).generate_structured_stream(
+            "notes", SCHEMA, on_field=lambda name, value: seen.append(name),
+        )
+
+        assert result.data == RESPONSE
+        assert seen == list(RESPONSE)
+        assert result.profile.time_to_first_field_ms > 0
+        assert result.profile.tokens_saved == 0
+
+    def test_stops_once_required_fields_arrive_and_reports_savings(self, server):
+        client = _client(server)
+        client.generate_structured_stream("notes", SCHEMA)  # learns the full length
+        server.sent = 0
+
+        result = client.generate_structured_stream(
+            "notes", SCHEMA, required_fields=["documentation_quality", "contamination_mentioned"],
+        )
+        time.sleep(0.1)
+
+        assert result.data == {"documentation_quality": "adequate", "contamination_mentioned": True}
+        assert server.sent < server.total
+        assert 0 < result.profile.output_tokens < server.total
+        assert result.profile.tokens_saved == server.total - result.profile.output_tokens
+
+    def test_stop_when_predicate_cancels_generation(self, server):
+        result = _client(server).generate_structured_stream(
+            "notes", SCHEMA, stop_when=lambda fields: fields.get("contamination_mentioned") is True,
+        )
+
+        assert "quick_reasoning" not in result.data
+        assert result.data["contamination_mentioned"] is True
+
+    def test_truncated_stream_raises_and_is_not_cached(self, server, tmp_path):
+        from common.llm_cache import LLMResponseCache
+
+        server.truncate_at = server.total - 3
+        client = _client(server)
+        client.use_response_cache = True
+        client.response_cache = LLMResponseCache(tmp_path / "llm_cache.db")
+
+        with pytest.raises(ValueError, match="Truncated"):
+            client.generate_structured_stream("notes", SCHEMA)
+
+        server.truncate_at = None
+        result = client.generate_structured_stream("notes", SCHEMA)
+        assert not result.cached
+        assert result.data == RESPONSE
@@ -0,0 +1,96 @@
+"""Tests for exact and near-duplicate note paragraph detection."""
+
+from datetime import datetime, timedelta
+
+from hai_src.models import ClinicalNote
+from hai_src.notes.deduplicator import CHANGED_MARKER, COPIED_MARKER, NoteDeduplicator
+
+ASSESSMENT = (
+    "Patient is a 4 year old with ALL on induction chemotherapy, day {line_day} of "
+    "central line. Febrile overnight to {temp}, blood cultures drawn from CVC. "
+    "Hemodynamically stable on room air."
+)
+PLAN = (
+    "Continue cefepime 50 mg/kg q8h. Follow up blood cultures. Monitor line site for "
+    "erythema or drainage. Daily CBC and CMP while inpatient."
+)
+
+
+def _note(note_id: str, day: int, content: str) -> ClinicalNote:
+    return ClinicalNote(
+        id=note_id,
+        patient_id="patient-1",
+        note_type="progress_note",
+        date=datetime(2026, 1, 1) + timedelta(days=day),
+        content=content,
+        source="fhir",
+    )
+
+
+class TestNoteDeduplicator:
+    """Tests for NoteDeduplicator."""
+
+    def test_copy_forward_with_edited_vital_is_near_duplicate(self):
+        notes = [
+            _note("n1", 0, ASSESSMENT.format(line_day=12, temp="38.4") + "\n\n" + PLAN),
+            _note("n2", 1, ASSESSMENT.format(line_day=12, temp="38.9") + "\n\n" + PLAN),
+        ]
+        dedup = NoteDeduplicator()
+
+        result = dedup.deduplicate_notes(notes, remove_duplicates=True)
+
+        latest = result[0].content
+        assert latest.startswith(CHANGED_MARKER)
+        # Only the edited sentence survives, the rest becomes markers
+        assert "Febrile overnight to 38.9" in latest
+        assert "Hemodynamically stable" not in latest
+        assert latest.endswith(COPIED_MARKER)
+        assert dedup.last_report["exact_duplicates"] == 1
+        assert dedup.last_report["near_duplicates"] == 1
+        assert dedup.last_report["tokens_saved"] > 0
+
+    def test_unrelated_paragraphs_are_kept(self):
+        other = (
+            "Wound assessment: incision along the left flank is well approximated with "
+            "staples in place, no purulent drainage, mild induration at the inferior pole."
+        )
+        notes = [
+            _note("n1", 0, ASSESSMENT.format(line_day=3, temp="37.0")),
+            _note("n2", 1, other),
+        ]
+
+        result = NoteDeduplicator().deduplicate_notes(notes, remove_duplicates=True)
+
+        assert result[0].content == other
+
+    def test_stats_count_near_duplicates(self):
+        notes = [
+            _note(f"n{day}", day, ASSESSMENT.format(line_day=10 + day, temp=f"38.{day}"))
+            for day in range(4)
+        ]
+
+        stats = NoteDeduplicator().get_duplication_stats(notes)
+
+        assert stats["total_paragraphs"] == 4
+        assert stats["near_duplicate_paragraphs"] == 3
+
+    def test_explicit_zero_threshold_is_kept(self):
+        assert NoteDeduplicator(similarity_threshold=0.0).similarity_threshold == 0.0
+        assert NoteDeduplicator().similarity_threshold == NoteDeduplicator.SIMILARITY_THRESHOLD
+
+    def test_removed_negation_is_kept_as_a_changed_line(self):
+        site = (
+            "Central line site assessed at the bedside this morning with the dressing "
+            "changed per protocol. {finding} Line flushes and draws without difficulty."
+        )
+        notes = [
+            _note("n1", 0, site.format(finding="No signs of infection at the insertion site.")),
+            _note("n2", 1, site.format(finding="Signs of infection at the insertion site.")),
+        ]
+
+        result = NoteDeduplicator().deduplicate_notes(notes, remove_duplicates=True)
+
+        latest = result[0].content
+        assert latest.startswith(CHANGED_MARKER)
+        assert "Signs of infection at the insertion site." in latest
+        assert "Line flushes" not in latest
@@ -0,0 +1,97 @@
+"""Tests for the shared keyword automaton and its note-scanning callers."""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+from hai_src.candidates.ssi import SSICandidateDetector
+from hai_src.models import ClinicalNote, HAIType
+from hai_src.notes.keywords import KeywordAutomaton, KeywordMatch, keyword_snippets
+from hai_src.notes.retriever import NoteRetriever
+
+
+def _note(content: str, note_type: str = "progress_note") -> ClinicalNote:
+    return ClinicalNote(
+        id=str(hash(content)),
+        patient_id="p1",
+        note_type=note_type,
+        date=datetime(2026, 3, 2),
+        content=content,
+        source="fhir",
+    )
+
+
+class TestKeywordAutomaton:
+    """Tests for KeywordAutomaton matching."""
+
+    def test_scan_finds_overlapping_and_prefix_matches_case_insensitively(self):
+        automaton = KeywordAutomaton(["wound", "wound vac", "deep wound infection", "wound infection"])
+
+        matches = automaton.scan("Deep WOUND infection; wound vac placed")
+
+        assert matches == [
+            KeywordMatch("deep wound infection", 0, 20),
+            KeywordMatch("wound", 5, 10),
+            KeywordMatch("wound infection", 5, 20),
+            KeywordMatch("wound", 22, 27),
+            KeywordMatch("wound vac", 22, 31),
+        ]
+        assert automaton.contains_any("no keywords here") is False
+
+    def test_snippets_reuse_offsets_and_merge_nearby_matches(self):
+        text = "Afebrile. Incision with purulent drainage and erythema. " + "Stable. " * 20 + "Wound vac changed."
+        automaton = KeywordAutomaton(["purulent drainage", "erythema", "wound vac"])
+
+        snippets = keyword_snippets(text, automaton.scan(text), context_chars=10)
+
+        assert snippets == [
+            "...sion with purulent drainage and erythema. Stable....",
+            ".... Stable. Wound vac changed.",
+        ]
+
+
+class TestKeywordCallers:
+    """Tests for note filtering and SSI keyword scanning."""
+
+    def test_filter_by_keywords_keeps_matches_and_always_included_types(self):
+        retriever = NoteRetriever(note_source=Mock())
+        notes = [
+            _note("PICC line in place, site clean"),
+            _note("Ate breakfast"),
+            _note("Recommend 14 days", note_type="id_consult"),
+        ]
+
+        kept = retriever.filter_by_keywords(notes, HAIType.CLABSI)
+
+        assert [n.content for n in kept] == [notes[0].content, notes[2].content]
+
+    def test_ssi_scan_returns_keywords_and_labelled_snippets(self):
+        note_source = Mock()
+        note_source.get_notes_for_patient.return_value = [
+            _note("POD 6. Wound dehiscence noted with purulent drainage from incision."),
+            _note("Pain controlled."),
+        ]
+        detector = SSICandidateDetector(Mock(), Mock(), note_source)
+
+        keywords, snippets = detector._scan_notes_for_ssi_keywords(
+            "p1", datetime(2026, 2, 24), datetime(2026, 3, 3),
+        )
+
+        assert keywords == ["purulent drainage", "wound dehiscence"]
+        assert snippets == [
+            "[progress_note 2026-03-02] POD 6. Wound dehiscence noted with purulent drainage from incision."
+        ]
+
+    def test_ssi_scan_collects_keywords_after_snippet_quota_is_full(self):
+        note_source = Mock()
+        note_source.get_notes_for_patient.return_value = (
+            [_note(f"Day {i}: purulent drainage from incision.") for i in range(12)]
+            + [_note("Now cellulitis around incision.")]
+        )
+        detector = SSICandidateDetector(Mock(), Mock(), note_source)
+
+        keywords, snippets = detector._scan_notes_for_ssi_keywords(
+            "p1", datetime(2026, 2, 24), datetime(2026, 3, 3),
+        )
+
+        assert keywords == ["cellulitis around incision", "purulent drainage"]
+        assert len(snippets) == 10
@@ -0,0 +1,296 @@
+"""Tests for the local incremental note store."""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from hai_src.config import Config
+from hai_src.data.base import BaseNoteSource, NoteFetchError
+from hai_src.data.factory import CompositeNoteSource
+from hai_src.data.note_store import LocalNoteStore
+from hai_src.models import ClinicalNote
+
+
+def _note(note_id: str, date: datetime, content: str = "Stable.", note_type: str = "progress_note") -> ClinicalNote:
+    return ClinicalNote(
+        id=note_id,
+        patient_id="p1",
+        note_type=note_type,
+        date=date,
+        content=content,
+        source="fhir",
+    )
+
+
+class FakeEHR(BaseNoteSource):
+    """Note source that filters a fixed note list by day, recording each call."""
+
+    def __init__(self, notes):
+        self.notes = notes
+        self.calls = []
+
+    def get_notes_for_patient(self, patient_id, start_date, end_date, note_types=None):
+        self.calls.append((start_date.date(), end_date.date()))
+        return [
+            n for n in self.notes
+            if start_date.date() <= n.date.date() <= end_date.date()
+            and (not note_types or n.note_type in note_types)
+        ]
+
+    def fetch_notes_for_patient(self, patient_id, start_date, end_date, note_types=None, max_notes=None):
+        notes = self.get_notes_for_patient(patient_id, start_date, end_date, note_types)
+        notes.sort(key=lambda n: n.date, reverse=True)
+        return notes[:Config.MAX_NOTES_PER_PATIENT if max_notes is None else max_notes]
+
+    def get_note_by_id(self, note_id):
+        return next((n for n in self.notes if n.id == note_id), None)
+
+
+class FlakyEHR(FakeEHR):
+    """FakeEHR that, while down, fails like the FHIR and Clarity sources do."""
+
+    def __init__(self, notes):
+        super().__init__(notes)
+        self.down = False
+
+    def fetch_notes_for_patient(self, patient_id, start_date, end_date, note_types=None, max_notes=None):
+        if self.down:
+            self.calls.append((start_date.date(), end_date.date()))
+            raise NoteFetchError("connection refused")
+        return super().fetch_notes_for_patient(patient_id, start_date, end_date, note_types, max_notes)
+
+
+@pytest.fixture
+def ehr():
+    return FakeEHR([_note(f"n{day}", datetime(2026, 3, day, 9)) for day in range(1, 11)])
+
+
+@pytest.fixture
+def store(ehr, tmp_path):
+    return LocalNoteStore(ehr, db_path=str(tmp_path / "notes.db"), refresh_seconds=900, overlap_hours=24)
+
+
+class TestLocalNoteStore:
+    """Tests for LocalNoteStore sync and queries."""
+
+    def test_repeat_requests_are_local_and_refresh_starts_at_watermark(self, store, ehr):
+        start, end = datetime(2026, 3, 1), datetime(2026, 3, 10)
+
+        first = store.get_notes_for_patient("p1", start, end)
+        again = store.get_notes_for_patient("p1", datetime(2026, 3, 4), datetime(2026, 3, 8))
+
+        assert [n.id for n in first] == [f"n{day}" for day in range(10, 0, -1)]
+        assert [n.id for n in again] == ["n8", "n7", "n6", "n5", "n4"]
+        assert len(ehr.calls) == 1
+
+        # A later addendum edits n10 and a new note arrives; the refresh only
+        # re-reads from a day before the watermark, and n10 is replaced by id
+        ehr.notes[-1] = _note("n10", datetime(2026, 3, 10, 9), "Stable. Addendum: febrile.")
+        ehr.notes.append(_note("n11", datetime(2026, 3, 11, 9)))
+        store.refresh_seconds = 0
+        latest = store.get_notes_for_patient("p1", start, datetime(2026, 3, 11))
+
+        assert ehr.calls[-1] == (datetime(2026, 3, 9).date(), datetime(2026, 3, 11).date())
+        assert [n.id for n in latest][:2] == ["n11", "n10"]
+        assert latest[1].content.endswith("febrile.")
+        assert len(latest) == 11
+        assert store.get_stats()["stored_notes"] == 11
+
+    def test_search_matches_substrings_like_the_keyword_scans(self, store, ehr):
+        ehr.notes[2] = _note("n3", datetime(2026, 3, 3, 9), "Incision with PURULENT drainage.")
+        ehr.notes[6] = _note("n7", datetime(2026, 3, 7, 9), "Wound dehiscence noted.")
+
+        found = store.search_notes(
+            "p1", ["purulent drainage", "dehiscence"], datetime(2026, 3, 1), datetime(2026, 3, 10),
+        )
+        short = store.search_notes("p1", ["i&d", "wo"], datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert [n.id for n in found] == ["n7", "n3"]
+        assert [n.id for n in short] == ["n7"]
+        assert len(ehr.calls) == 1
+
+    def test_empty_upstream_reply_marks_the_range_covered(self, store, ehr):
+        ehr.notes = []
+        assert store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10)) == []
+
+        again = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert again == []
+        assert len(ehr.calls) == 1
+
+        # Once stale, the whole range is checked again for new notes
+        ehr.notes = [_note("n1", datetime(2026, 3, 1, 9))]
+        store.refresh_seconds = 0
+        notes = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert [n.id for n in notes] == ["n1"]
+        assert ehr.calls[-1] == (datetime(2026, 3, 1).date(), datetime(2026, 3, 10).date())
+
+    def test_upstream_failure_is_not_marked_covered(self, store, ehr):
+        ehr.get_notes_for_patient = Mock(side_effect=ConnectionError("EHR down"))
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+        del ehr.get_notes_for_patient
+
+        notes = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert len(notes) == 10
+
+    def test_outage_does_not_widen_the_synced_range(self, tmp_path):
+        ehr = FlakyEHR([_note(f"j{day}", datetime(2026, 1, day, 9)) for day in range(1, 29)])
+        store = LocalNoteStore(ehr, db_path=str(tmp_path / "notes.db"), refresh_seconds=900)
+        assert len(store.get_notes_for_patient("p1", datetime(2026, 1, 20), datetime(2026, 1, 28))) == 9
+
+        ehr.down = True
+        assert len(store.get_notes_for_patient("p1", datetime(2026, 1, 1), datetime(2026, 1, 28))) == 9
+        ehr.down = False
+        store.get_notes_for_patient("p1", datetime(2026, 1, 1), datetime(2026, 1, 28))
+
+        assert store.get_stats()["stored_notes"] == 28
+        assert ehr.calls[-1] == (datetime(2026, 1, 1).date(), datetime(2026, 1, 19).date())
+
+    def test_empty_days_are_checked_again_after_the_ttl(self, store, ehr):
+        store.get_notes_for_patient("p1", datetime(2026, 3, 5), datetime(2026, 3, 10))
+        store.get_notes_for_patient("p1", datetime(2026, 2, 20), datetime(2026, 3, 10))
+        ehr.notes.append(_note("late", datetime(2026, 2, 25, 9)))
+
+        cached = store.get_notes_for_patient("p1", datetime(2026, 2, 20), datetime(2026, 3, 10))
+        assert "late" not in [n.id for n in cached]
+        assert len(ehr.calls) == 2
+
+        store.empty_ttl_seconds = 0
+        notes = store.get_notes_for_patient("p1", datetime(2026, 2, 20), datetime(2026, 3, 10))
+
+        assert ehr.calls[-1] == (datetime(2026, 2, 20).date(), datetime(2026, 2, 28).date())
+        assert [n.id for n in notes][-1] == "late"
+
+        # The earlier note moves the empty days back; the rest is not re-read
+        store.get_notes_for_patient("p1", datetime(2026, 2, 20), datetime(2026, 3, 10))
+        assert ehr.calls[-1] == (datetime(2026, 2, 20).date(), datetime(2026, 2, 24).date())
+
+    def test_window_at_the_sync_limit_is_not_marked_covered(self, store, ehr, monkeypatch):
+        monkeypatch.setattr(Config, "NOTE_STORE_SYNC_MAX_NOTES", 10)
+
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert len(ehr.calls) == 2
+
+    def test_notes_no_longer_returned_are_removed_on_refetch(self, store, ehr):
+        ehr.notes.append(_note("d10", datetime(2026, 3, 10, 12), note_type="discharge_summary"))
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        # n10 is marked entered-in-error; a progress-note-only refresh must not
+        # touch the discharge summary it didn't ask for
+        ehr.notes = [n for n in ehr.notes if n.id != "n10"]
+        store.refresh_seconds = 0
+        progress = store.get_notes_for_patient(
+            "p1", datetime(2026, 3, 1), datetime(2026, 3, 10), note_types=["progress_note"],
+        )
+        store.refresh_seconds = 900
+        everything = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert "n10" not in [n.id for n in progress]
+        assert [n.id for n in everything][:2] == ["d10", "n9"]
+        assert store.get_stats()["stored_notes"] == 10
+
+    def test_truncated_window_keeps_notes_it_did_not_return(self, store, ehr, monkeypatch):
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+        ehr.notes.append(_note("n10b", datetime(2026, 3, 10, 12)))
+        monkeypatch.setattr(Config, "NOTE_STORE_SYNC_MAX_NOTES", 2)
+
+        # The refresh window returns only n10b and n10; n9 is still upstream
+        store.refresh_seconds = 0
+        store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert ehr.calls[-1] == (datetime(2026, 3, 9).date(), datetime(2026, 3, 10).date())
+        assert store.get_stats()["stored_notes"] == 11
+
+    def test_window_over_the_read_limit_is_synced_once_and_read_capped(self, store, ehr, monkeypatch):
+        monkeypatch.setattr(Config, "MAX_NOTES_PER_PATIENT", 4)
+
+        first = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+        again = store.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 10))
+        found = store.search_notes("p1", ["stable"], datetime(2026, 3, 1), datetime(2026, 3, 10))
+
+        assert [n.id for n in first] == ["n10", "n9", "n8", "n7"]
+        assert [n.id for n in again] == ["n10", "n9", "n8", "n7"]
+        assert len(found) == 10
+        assert len(ehr.calls) == 1
+        assert store.get_stats()["stored_notes"] == 10
+
+    def test_purge_expired_drops_notes_past_retention(self, ehr, tmp_path):
+        today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+        ehr.notes = [_note("old", today - timedelta(days=40)), _note("new", today - timedelta(days=5))]
+        store = LocalNoteStore(ehr, db_path=str(tmp_path / "notes.db"), retention_days=30)
+        store.get_notes_for_patient("p1", today - timedelta(days=60), today)
+
+        assert store.purge_expired() == 1
+        assert store.get_stats()["stored_notes"] == 1
+        assert LocalNoteStore(ehr, db_path=str(tmp_path / "notes.db"), retention_days=0).purge_expired() == 0
+
+
+def test_monitor_purges_the_note_store_each_cycle():
+    from hai_src.monitor import HAIMonitor
+
+    store = Mock(spec=LocalNoteStore)
+    monitor = HAIMonitor.__new__(HAIMonitor)
+    monitor.lookback_hours = 24
+    monitor.detectors = {}
+    monitor._note_retriever = Mock(note_source=store)
+
+    monitor.run_once()
+
+    store.purge_expired.assert_called_once_with()
+
+
+def test_composite_source_dedupes_by_note_id():
+    same_time = datetime(2026, 3, 2, 8)
+    source = CompositeNoteSource.__new__(CompositeNoteSource)
+    source.fhir_source = Mock()
+    source.fhir_source.fetch_notes_for_patient.return_value = [
+        _note("a", same_time), _note("b", same_time), _note("a", same_time),
+    ]
+    source.clarity_source = Mock()
+    source.clarity_source.fetch_notes_for_patient.return_value = [
+        _note("clarity-1", same_time), _note("clarity-2", same_time + timedelta(hours=1)),
+    ]
+
+    notes = source.get_notes_for_patient("p1", same_time, same_time)
+
+    assert sorted(n.id for n in notes) == ["a", "b", "clarity-2"]
+
+
+def test_composite_source_reports_a_failed_source():
+    same_time = datetime(2026, 3, 2, 8)
+    source = CompositeNoteSource.__new__(CompositeNoteSource)
+    source.fhir_source = Mock()
+    source.fhir_source.fetch_notes_for_patient.side_effect = NoteFetchError("timeout", [_note("a", same_time)])
+    source.clarity_source = Mock()
+    source.clarity_source.fetch_notes_for_patient.return_value = [_note("clarity-1", same_time)]
+
+    with pytest.raises(NoteFetchError) as failed:
+        source.fetch_notes_for_patient("p1", same_time, same_time)
+
+    assert [n.id for n in failed.value.notes] == ["a"]
+    assert [n.id for n in source.get_notes_for_patient("p1", same_time, same_time)] == ["a"]
+
+
+def test_fhir_note_search_failure_raises_from_fetch_only(monkeypatch):
+    import requests
+
+    from hai_src.data import fhir_source
+    from hai_src.data.fhir_source import FHIRNoteSource
+
+    def failing_search(*args, **kwargs):
+        raise requests.ConnectionError("connection reset")
+        yield
+
+    monkeypatch.setattr(fhir_source, "iter_bundle_resources", failing_search)
+    source = FHIRNoteSource.__new__(FHIRNoteSource)
+    source.base_url = "http://fhir"
+    source.session = Mock()
+
+    with pytest.raises(NoteFetchError):
+        source.fetch_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 2))
+    assert source.get_notes_for_patient("p1", datetime(2026, 3, 1), datetime(2026, 3, 2)) == []
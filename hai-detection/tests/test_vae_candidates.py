@@ -0,0 +1,99 @@
+"""Tests for VAE (VAC) candidate detection and ventilator parameter retrieval."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from hai_src.candidates.vae import VAECandidateDetector
+from hai_src.data import fhir_source
+from hai_src.data.fhir_source import FHIRVentilatorSource
+from hai_src.models import DailyVentParameters
+
+
+def _days(fio2: list, peep: list, start: date = date(2024, 3, 1)) -> list[DailyVentParameters]:
+    return [
+        DailyVentParameters(
+            episode_id="p1:2024-03-01",
+            date=start + timedelta(days=i),
+            ventilator_day=i + 1,
+            min_fio2=f,
+            min_peep=p,
+        )
+        for i, (f, p) in enumerate(zip(fio2, peep))
+    ]
+
+
+@pytest.fixture
+def detector():
+    return VAECandidateDetector(ventilator_source=Mock())
+
+
+class TestDetectVAC:
+    """Tests for the rolling-window VAC algorithm."""
+
+    def test_fio2_worsening_after_stable_baseline(self, detector):
+        params = _days([40, 40, 40, 65, 70, 70], [5, 5, 5, 5, 5, 5])
+
+        onset, baseline_start, baseline_end, fio2, peep, fio2_rise, peep_rise = detector._detect_vac(params)
+
+        assert onset == date(2024, 3, 4)
+        assert (baseline_start, baseline_end) == (date(2024, 3, 2), date(2024, 3, 3))
+        assert (fio2, peep) == (40.0, 5.0)
+        assert fio2_rise == 30.0
+        assert peep_rise is None
+
+    def test_peep_worsening_uses_first_recorded_baseline_value(self, detector):
+        # Day 1 has no PEEP, so the baseline PEEP is day 2's
+        params = _days([30, 30, 30, 30], [None, 6, 9, 9])
+
+        result = detector._detect_vac(params)
+
+        assert result[0] == date(2024, 3, 3)
+        assert result[4] == 6.0
+        assert result[6] == 3.0
+
+    def test_single_day_of_worsening_or_missing_day_is_not_vac(self, detector):
+        assert detector._detect_vac(_days([40, 40, 70, 40, 40], [5] * 5)) is None
+        assert detector._detect_vac(_days([40, 40, 70, None], [5] * 4)) is None
+        assert detector._detect_vac(_days([40, 40, 70], [5, 5, 5])) is None
+
+
+def test_daily_parameters_come_from_one_combined_observation_search(monkeypatch):
+    searches = []
+
+    def fake_search(session, url, params=None, **kwargs):
+        searches.append(params)
+        return iter([
+            _observation("f1", "3150-0", "2024-03-01T06:00:00Z", 50),
+            _observation("f2", "19994-3", "2024-03-01T18:00:00Z", 40),
+            _observation("p1", "76530-5", "2024-03-01T06:00:00Z", 8),
+            _observation("p2", "20077-4", "2024-03-02T06:00:00Z", 6),
+        ])
+
+    monkeypatch.setattr(fhir_source, "iter_bundle_resources", fake_search)
+    source = FHIRVentilatorSource.__new__(FHIRVentilatorSource)
+    source.base_url = "http://fhir"
+    source.session = Mock()
+
+    params = source.get_daily_vent_parameters("pat1:2024-03-01", date(2024, 3, 1), date(2024, 3, 2))
+
+    assert len(searches) == 1
+    assert set(searches[0]["code"].split(",")) == set(
+        FHIRVentilatorSource.FIO2_LOINC_CODES + FHIRVentilatorSource.PEEP_LOINC_CODES
+    )
+    assert [(p.date.day, p.ventilator_day, p.min_fio2, p.min_peep) for p in params] == [
+        (1, 1, 40, 8),
+        (2, 2, None, 6),
+    ]
+    assert params[0].fio2_observation_id == "f2"
+
+
+def _observation(obs_id: str, loinc: str, effective: str, value: float) -> dict:
+    return {
+        "resourceType": "Observation",
+        "id": obs_id,
+        "code": {"coding": [{"system": "http://loinc.org", "code": loinc}]},
+        "effectiveDateTime": effective,
+        "valueQuantity": {"value": value},
+    }
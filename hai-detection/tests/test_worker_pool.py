@@ -0,0 +1,175 @@
+"""Tests for the classification worker pool."""
+
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+from hai_src.classifiers import clabsi_classifier_v2
+from hai_src.classifiers.clabsi_classifier_v2 import CLABSIClassifierV2
+from hai_src.llm.base import LLMProfile, record_llm_call, track_throughput
+from hai_src.models import CultureResult, HAICandidate, HAIType, Patient
+from hai_src.worker_pool import ClassificationWorkerPool
+
+
+def _candidate(idx: int) -> HAICandidate:
+    """Build a minimal candidate."""
+    return HAICandidate(
+        id=f"cand-{idx}",
+        hai_type=HAIType.CLABSI,
+        patient=Patient(fhir_id=f"p{idx}", mrn=f"MRN{idx}", name="Test"),
+        culture=CultureResult(
+            fhir_id=f"c{idx}",
+            collection_date=datetime(2024, 1, 15),
+            organism="S. aureus",
+        ),
+    )
+
+
+class TestClassificationWorkerPool:
+    """Tests for ClassificationWorkerPool."""
+
+    def test_outcomes_yielded_in_submission_order(self):
+        candidates = [_candidate(i) for i in range(8)]
+
+        def classify(candidate, notes):
+            # Earlier candidates finish last
+            time.sleep(0.005 * (8 - int(candidate.id.split("-")[1])))
+            return candidate.id
+
+        pool = ClassificationWorkerPool(
+            fetch_notes=lambda c: [],
+            classify=classify,
+            note_workers=4,
+            llm_workers=4,
+        )
+        outcomes = list(pool.run(candidates))
+
+        assert [o.candidate.id for o in outcomes] == [c.id for c in candidates]
+        assert [o.classification for o in outcomes] == [c.id for c in candidates]
+
+    def test_llm_concurrency_bounded(self):
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def classify(candidate, notes):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return "ok"
+
+        pool = ClassificationWorkerPool(
+            fetch_notes=lambda c: [],
+            classify=classify,
+            note_workers=4,
+            llm_workers=2,
+        )
+        list(pool.run([_candidate(i) for i in range(10)]))
+
+        assert peak <= 2
+        assert pool.llm_stats.completed == 10
+        assert pool.note_stats.completed == 10
+
+    def test_notes_passed_to_classifier(self):
+        pool = ClassificationWorkerPool(
+            fetch_notes=lambda c: [f"note-for-{c.id}"],
+            classify=lambda c, notes: notes,
+        )
+        outcome = next(pool.run([_candidate(1)]))
+        assert outcome.classification == ["note-for-cand-1"]
+
+    def test_errors_captured_per_candidate(self):
+        def classify(candidate, notes):
+            if candidate.id == "cand-1":
+                raise ValueError("LLM timeout")
+            return "ok"
+
+        def fetch_notes(candidate):
+            if candidate.id == "cand-2":
+                raise ConnectionError("FHIR down")
+            return []
+
+        pool = ClassificationWorkerPool(fetch_notes=fetch_notes, classify=classify)
+        outcomes = list(pool.run([_candidate(i) for i in range(3)]))
+
+        assert outcomes[0].error is None
+        assert isinstance(outcomes[1].error, ValueError)
+        # Note failures still classify, without notes
+        assert outcomes[2].error is None
+        assert outcomes[2].notes == []
+        assert pool.llm_stats.errors == 1
+        assert pool.note_stats.errors == 1
+
+    def test_stats_report_queue_depth(self):
+        pool = ClassificationWorkerPool(
+            fetch_notes=lambda c: [],
+            classify=lambda c, notes: time.sleep(0.005),
+            note_workers=4,
+            llm_workers=1,
+        )
+        list(pool.run([_candidate(i) for i in range(6)]))
+
+        stats = pool.stats()
+        assert stats["llm_workers"] == 1
+        assert stats["llm"]["completed"] == 6
+        assert stats["llm"]["max_queue_depth"] >= 1
+        assert pool.llm_stats.queue_depth == 0
+
+    def test_llm_calls_on_workers_count_toward_callers_meter(self):
+        def classify(candidate, notes):
+            record_llm_call(LLMProfile(input_tokens=100, output_tokens=10))
+
+        pool = ClassificationWorkerPool(
+            fetch_notes=lambda c: [], classify=classify, note_workers=2, llm_workers=2,
+        )
+        with track_throughput() as meter:
+            list(pool.run([_candidate(i) for i in range(4)]))
+
+        assert meter.calls == 4
+        assert meter.output_tokens == 40
+
+
+def test_shared_classifier_logs_each_candidates_own_metrics(monkeypatch):
+    """Concurrent classify() calls on one instance must not swap metrics."""
+    monkeypatch.setattr(clabsi_classifier_v2, "should_escalate", lambda triage: triage.escalate)
+
+    classifier = CLABSIClassifierV2(llm_client=Mock(), use_triage=False, collect_training_data=False)
+    classifier.use_triage = True
+    classifier.collect_training_data = True
+    classifier._training_collector = Mock()
+    # Escalated candidates finish triage first but log slowly, so the
+    # fast-path candidates finish in the middle of their logging
+    slow_extraction = Mock(to_dict=lambda: time.sleep(0.03) or {})
+    classifier.extractor = Mock(extract=lambda candidate, notes: slow_extraction)
+    classifier.rules_engine = Mock()
+    classifier._triage_to_extraction = Mock(return_value=Mock(to_dict=lambda: {}))
+    classifier._build_classification = lambda *args: Mock(reasoning="", confidence=0.9)
+
+    def triage(candidate, notes, hai_type):
+        idx = int(candidate.id.split("-")[1])
+        time.sleep(0.002 if idx % 2 else 0.01)
+        return Mock(escalate=bool(idx % 2), quick_reasoning="")
+
+    classifier._triage_extractor = Mock(extract=triage)
+
+    pool = ClassificationWorkerPool(
+        fetch_notes=lambda c: [],
+        classify=classifier.classify,
+        note_workers=8,
+        llm_workers=8,
+    )
+    list(pool.run([_candidate(i) for i in range(8)]))
+
+    logged = {
+        call.kwargs["case_id"]: call.kwargs["classification_path"]
+        for call in classifier._training_collector.log_extraction.call_args_list
+    }
+    assert logged == {
+        f"cand-{i}": "triage_escalated" if i % 2 else "triage_only"
+        for i in range(8)
+    }
@@ -3,16 +3,34 @@
 Queries microbiology cultures with susceptibility results to identify MDROs.
 """
 
+import logging
+import sys
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
 import requests
 
 from .config import config
 
+# Add common module to path
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir_client import get_shared_fhir_client
+
+logger = logging.getLogger(__name__)
+
+# Ids per _id / derived-from search when resolving Observations in bulk
+SEARCH_CHUNK_SIZE = 50
+
+# Observation statuses of a released result; these win over preliminary ones
+FINAL_STATUSES = {"final", "amended", "corrected"}
+
 
 @dataclass
 class CultureResult:
@@ -56,20 +74,12 @@ class HAPIFHIRClient(FHIRClient):
 
     def __init__(self, base_url: str | None = None):
         self.base_url = base_url or config.FHIR_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request to FHIR server."""
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(resource_path, params)
 
 
 class EpicFHIRClient(FHIRClient):
@@ -88,11 +98,8 @@ class EpicFHIRClient(FHIRClient):
         self.access_token: str | None = None
         self.token_expires_at: datetime | None = None
 
-        self.session = requests.Session()
-        self.session.headers.update({
-            "Accept": "application/fhir+json",
-            "Content-Type": "application/fhir+json",
-        })
+        self.client = get_shared_fhir_client(self.base_url)
+        self.session = self.client.session
 
         self.private_key: str | None = None
         if self.private_key_path:
@@ -148,14 +155,11 @@ class EpicFHIRClient(FHIRClient):
     def get(self, resource_path: str, params: dict | None = None) -> dict:
         """GET request with OAuth authentication."""
         token = self._get_access_token()
-
-        response = self.session.get(
-            f"{self.base_url}/{resource_path}",
-            params=params,
+        return self.client.get(
+            resource_path,
+            params,
             headers={"Authorization": f"Bearer {token}"},
         )
-        response.raise_for_status()
-        return response.json()
 
 
 def get_fhir_client() -> FHIRClient:
@@ -186,26 +190,130 @@ class MDROFHIRClient:
         cultures = []
         date_from = datetime.now() - timedelta(hours=hours_back)
 
-        # Query microbiology DiagnosticReports
+        # Query microbiology DiagnosticReports, pulling their result
+        # Observations into the same Bundle
         params = {
             "category": "MB",  # Microbiology
             "status": "final",
             "date": f"ge{date_from.strftime('%Y-%m-%dT%H:%M:%S')}",
             "_count": "500",
+            "_include": "DiagnosticReport:result",
+        }
+        reports = []
+        observations: dict[str, dict] = {}
+        for resource in self._search("DiagnosticReport", params):
+            if resource.get("resourceType") == "DiagnosticReport":
+                reports.append(resource)
+            elif resource.get("resourceType") == "Observation":
+                observations[resource.get("id", "")] = resource
+
+        # Only reports with an organism can yield MDRO cases
+        reports = [r for r in reports if self._extract_organism(r)]
+
+        # Resolve result references the server did not include, members of
+        # panel Observations, and susceptibilities linked only via
+        # derived-from, in bulk
+        missing = {
+            obs_id
+            for report in reports
+            for obs_id in self._result_observation_ids(report)
+            if obs_id not in observations
         }
-        response = self.fhir.get("DiagnosticReport", params)
-        reports = self.fhir._extract_entries(response)
+        observations.update(self._fetch_observations(missing))
+        members = {
+            obs_id
+            for report in reports
+            for obs_id in self._member_observation_ids(report, observations)
+            if obs_id not in observations
+        }
+        observations.update(self._fetch_observations(members))
+        derived = self._fetch_derived_observations(
+            [r["id"] for r in reports if r.get("id")]
+        )
 
         for report in reports:
-            culture = self._parse_culture_report(report)
+            culture = self._parse_culture_report(report, observations, derived)
             if culture and culture.organism and culture.susceptibilities:
                 cultures.append(culture)
 
         return cultures
 
-    def _parse_culture_report(self, report: dict) -> Optional[CultureResult]:
-        """Parse a DiagnosticReport into CultureResult with susceptibilities."""
-        # Extract organism from conclusion or conclusionCode
+    def _search(self, resource_type: str, params: dict) -> Iterator[dict]:
+        """Yield resources from a search, following Bundle next links."""
+        response = self.fhir.get(resource_type, params)
+        seen_urls: set[str] = set()
+        while True:
+            yield from self.fhir._extract_entries(response)
+            next_url = next(
+                (
+                    link.get("url")
+                    for link in response.get("link", [])
+                    if link.get("relation") == "next"
+                ),
+                None,
+            )
+            if not next_url or next_url in seen_urls:
+                break
+            seen_urls.add(next_url)
+            response = self.fhir.get(next_url)
+
+    def _fetch_observations(self, observation_ids: Iterable[str]) -> dict[str, dict]:
+        """Read Observations by id with chunked _id searches."""
+        observations = {}
+        ids = sorted(set(observation_ids))
+        for i in range(0, len(ids), SEARCH_CHUNK_SIZE):
+            chunk = ids[i:i + SEARCH_CHUNK_SIZE]
+            try:
+                for obs in self._search("Observation", {
+                    "_id": ",".join(chunk),
+                    "_count": str(len(chunk)),
+                }):
+                    observations[obs.get("id", "")] = obs
+            except requests.HTTPError as e:
+                logger.warning(f"Failed to fetch {len(chunk)} Observations: {e}")
+        return observations
+
+    def _fetch_derived_observations(self, report_ids: list[str]) -> dict[str, list[dict]]:
+        """Find Observations derived from reports, grouped by report id."""
+        derived: dict[str, list[dict]] = {}
+        for i in range(0, len(report_ids), SEARCH_CHUNK_SIZE):
+            chunk = report_ids[i:i + SEARCH_CHUNK_SIZE]
+            wanted = set(chunk)
+            try:
+                for obs in self._search("Observation", {
+                    "derived-from": ",".join(f"DiagnosticReport/{rid}" for rid in chunk),
+                    "_count": "1000",
+                }):
+                    for ref in obs.get("derivedFrom", []):
+                        report_id = ref.get("reference", "").replace("DiagnosticReport/", "")
+                        if report_id in wanted:
+                            derived.setdefault(report_id, []).append(obs)
+            except requests.HTTPError as e:
+                logger.warning(f"Failed to fetch derived Observations: {e}")
+        return derived
+
+    @staticmethod
+    def _result_observation_ids(report: dict) -> list[str]:
+        """Observation ids referenced by a report's result array."""
+        return [
+            ref.replace("Observation/", "")
+            for ref in (r.get("reference", "") for r in report.get("result", []))
+            if ref
+        ]
+
+    @staticmethod
+    def _member_observation_ids(report: dict, observations: dict[str, dict]) -> list[str]:
+        """Observation ids in the hasMember of a report's result panels."""
+        return [
+            ref.get("reference", "").replace("Observation/", "")
+            for obs_id in MDROFHIRClient._result_observation_ids(report)
+            for ref in observations.get(obs_id, {}).get("hasMember", [])
+            if ref.get("reference")
+        ]
+
+    @staticmethod
+    def _extract_organism(report: dict) -> Optional[str]:
+        """Extract organism from conclusion or conclusionCode."""
         organism = None
         conclusion = report.get("conclusion", "")
         if conclusion:
@@ -228,6 +336,24 @@ class MDROFHIRClient:
 
         if not organism or "no growth" in organism.lower():
             return None
+        return organism
+
+    def _parse_culture_report(
+        self,
+        report: dict,
+        observations: dict[str, dict] | None = None,
+        derived: dict[str, list[dict]] | None = None,
+    ) -> Optional[CultureResult]:
+        """Parse a DiagnosticReport into CultureResult with susceptibilities.
+
+        Args:
+            report: DiagnosticReport resource
+            observations: Prefetched Observations by id
+            derived: Prefetched derived-from Observations by report id
+        """
+        organism = self._extract_organism(report)
+        if not organism:
+            return None
 
         # Extract patient reference
         patient_ref = report.get("subject", {}).get("reference", "")
@@ -276,7 +402,7 @@ class MDROFHIRClient:
             unit = encounter_data.get("unit")
 
         # Get susceptibility observations
-        susceptibilities = self._get_susceptibilities(report)
+        susceptibilities = self._get_susceptibilities(report, observations, derived)
 
         return CultureResult(
             fhir_id=report.get("id", ""),
@@ -318,41 +444,58 @@ class MDROFHIRClient:
 
         return None
 
-    def _get_susceptibilities(self, report: dict) -> list[dict]:
-        """Get susceptibility results for a culture report."""
-        susceptibilities = []
-
-        # Check result array for observation references
-        for result in report.get("result", []):
-            obs_ref = result.get("reference", "")
-            if obs_ref:
-                obs_id = obs_ref.replace("Observation/", "")
-                try:
-                    obs = self.fhir.get(f"Observation/{obs_id}")
-                    susc = self._parse_susceptibility(obs)
-                    if susc:
-                        susceptibilities.append(susc)
-                except requests.HTTPError:
-                    pass
-
-        # Also query for linked observations
+    def _get_susceptibilities(
+        self,
+        report: dict,
+        observations: dict[str, dict] | None = None,
+        derived: dict[str, list[dict]] | None = None,
+    ) -> list[dict]:
+        """Get susceptibility results for a culture report, one per antibiotic.
+
+        Susceptibilities come from the report's result Observations, the
+        members of result panels (hasMember) and Observations derived from
+        the report. Per antibiotic a final result wins over a preliminary
+        one, then the latest; ties go to result references.
+
+        Uses the prefetched Observations when given; otherwise resolves this
+        report's Observations with _id searches and one derived-from search.
+        """
         report_id = report.get("id")
-        if report_id:
-            try:
-                response = self.fhir.get("Observation", {
-                    "derived-from": f"DiagnosticReport/{report_id}",
-                    "_count": "100",
-                })
-                for obs in self.fhir._extract_entries(response):
-                    susc = self._parse_susceptibility(obs)
-                    if susc:
-                        # Avoid duplicates
-                        if not any(s["antibiotic"] == susc["antibiotic"] for s in susceptibilities):
-                            susceptibilities.append(susc)
-            except requests.HTTPError:
-                pass
+        result_ids = self._result_observation_ids(report)
+        if observations is None:
+            observations = self._fetch_observations(result_ids)
+            observations.update(self._fetch_observations(
+                i for i in self._member_observation_ids(report, observations)
+                if i not in observations
+            ))
+        if derived is None:
+            derived = self._fetch_derived_observations([report_id] if report_id else [])
+
+        linked_ids = result_ids + self._member_observation_ids(report, observations)
+        linked = [observations[i] for i in dict.fromkeys(linked_ids) if i in observations]
+        linked.extend(derived.get(report_id, []))
+
+        best: dict[str, tuple[tuple, dict]] = {}
+        for obs in linked:
+            susc = self._parse_susceptibility(obs)
+            if not susc:
+                continue
+            rank = self._result_rank(obs)
+            current = best.get(susc["antibiotic"])
+            if current is None or rank > current[0]:
+                best[susc["antibiotic"]] = (rank, susc)
+
+        return [susc for _, susc in best.values()]
 
-        return susceptibilities
+    @staticmethod
+    def _result_rank(observation: dict) -> tuple:
+        """Sort key for competing results: final before preliminary, then latest."""
+        timestamp = observation.get("issued") or observation.get("effectiveDateTime") or ""
+        try:
+            when = datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+        except (ValueError, TypeError):
+            when = float("-inf")
+        return (observation.get("status") in FINAL_STATUSES, when)
 
     def _parse_susceptibility(self, observation: dict) -> Optional[dict]:
         """Parse a susceptibility Observation into dict."""
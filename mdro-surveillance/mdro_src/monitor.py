@@ -16,6 +16,8 @@ from .db import MDRODatabase
 from .fhir_client import MDROFHIRClient, CultureResult
 from .models import MDROCase, TransmissionStatus
 
+from common.fhir_client import end_fhir_cycle
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,6 +86,7 @@ class MDROMonitor:
                 "error": str(e),
             })
 
+        result["fhir_cache"] = end_fhir_cycle("mdro")
         result["completed_at"] = datetime.now().isoformat()
         return result
 
@@ -0,0 +1,8 @@
+"""Make the repo-level common/ package importable for MDRO surveillance tests."""
+
+import sys
+from pathlib import Path
+
+_project_root = Path(__file__).parent.parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
@@ -0,0 +1,210 @@
+"""Tests for bulk susceptibility resolution in MDROFHIRClient."""
+
+import pytest
+
+from mdro_src import fhir_client
+from mdro_src.fhir_client import FHIRClient, MDROFHIRClient
+
+
+def _bundle(resources: list[dict], next_url: str | None = None) -> dict:
+    bundle = {
+        "resourceType": "Bundle",
+        "type": "searchset",
+        "entry": [{"resource": r} for r in resources],
+    }
+    if next_url:
+        bundle["link"] = [{"relation": "next", "url": next_url}]
+    return bundle
+
+
+def _report(report_id: str, result_ids: list[str] = (), organism: str = "Staphylococcus aureus") -> dict:
+    return {
+        "resourceType": "DiagnosticReport",
+        "id": report_id,
+        "status": "final",
+        "subject": {"reference": "Patient/p1"},
+        "effectiveDateTime": "2026-03-01T08:00:00Z",
+        "conclusion": organism,
+        "result": [{"reference": f"Observation/{i}"} for i in result_ids],
+    }
+
+
+def _susceptibility(obs_id: str, antibiotic: str, result: str, status: str = "final",
+                    issued: str = "2026-03-02T08:00:00Z", derived_from: str | None = None) -> dict:
+    obs = {
+        "resourceType": "Observation",
+        "id": obs_id,
+        "status": status,
+        "issued": issued,
+        "code": {"text": f"{antibiotic} [Susceptibility]"},
+        "interpretation": [{"coding": [{"code": result}]}],
+    }
+    if derived_from:
+        obs["derivedFrom"] = [{"reference": f"DiagnosticReport/{derived_from}"}]
+    return obs
+
+
+def _panel(obs_id: str, member_ids: list[str]) -> dict:
+    return {
+        "resourceType": "Observation",
+        "id": obs_id,
+        "status": "final",
+        "code": {"text": "Susceptibility panel"},
+        "hasMember": [{"reference": f"Observation/{i}"} for i in member_ids],
+    }
+
+
+class FakeFHIR(FHIRClient):
+    """FHIR client serving searches from fixed resources, recording each GET."""
+
+    def __init__(self, observations: list[dict] = (), reports: list[dict] = (), pages: dict | None = None):
+        self.observations = {o["id"]: o for o in observations}
+        self.reports = list(reports)
+        self.pages = pages or {}
+        self.requests: list[tuple[str, dict | None]] = []
+
+    def get(self, resource_path: str, params: dict | None = None) -> dict:
+        self.requests.append((resource_path, params))
+        if resource_path in self.pages:
+            return self.pages[resource_path]
+        if resource_path == "DiagnosticReport":
+            return _bundle(self.reports)
+        if resource_path == "Observation" and "_id" in params:
+            ids = params["_id"].split(",")
+            return _bundle([self.observations[i] for i in ids if i in self.observations])
+        if resource_path == "Observation" and "derived-from" in params:
+            refs = set(params["derived-from"].split(","))
+            return _bundle([
+                o for o in self.observations.values()
+                if {d["reference"] for d in o.get("derivedFrom", [])} & refs
+            ])
+        if resource_path.startswith("Patient/"):
+            return {"resourceType": "Patient", "id": "p1"}
+        return {}
+
+    def searches(self, kind: str) -> list[dict]:
+        return [params for path, params in self.requests if path == "Observation" and kind in params]
+
+
+class TestSearchPaging:
+    """Tests for following Bundle next links."""
+
+    def test_follows_next_links_until_the_last_page(self):
+        fhir = FakeFHIR(pages={
+            "Observation": _bundle([{"id": "o1"}], "http://fhir/Observation?page=2"),
+            "http://fhir/Observation?page=2": _bundle([{"id": "o2"}], "http://fhir/Observation?page=3"),
+            "http://fhir/Observation?page=3": _bundle([{"id": "o3"}]),
+        })
+
+        ids = [r["id"] for r in MDROFHIRClient(fhir)._search("Observation", {})]
+
+        assert ids == ["o1", "o2", "o3"]
+        assert len(fhir.requests) == 3
+
+    def test_stops_when_a_next_link_repeats(self):
+        fhir = FakeFHIR(pages={
+            "Observation": _bundle([{"id": "o1"}], "http://fhir/Observation?page=2"),
+            "http://fhir/Observation?page=2": _bundle([{"id": "o2"}], "http://fhir/Observation?page=2"),
+        })
+
+        ids = [r["id"] for r in MDROFHIRClient(fhir)._search("Observation", {})]
+
+        assert ids == ["o1", "o2"]
+        assert len(fhir.requests) == 2
+
+
+class TestBulkObservations:
+    """Tests for chunked Observation reads and grouping."""
+
+    def test_observations_are_read_in_chunks(self, monkeypatch):
+        monkeypatch.setattr(fhir_client, "SEARCH_CHUNK_SIZE", 2)
+        fhir = FakeFHIR([_susceptibility(f"o{i}", "oxacillin", "R") for i in range(5)])
+
+        found = MDROFHIRClient(fhir)._fetch_observations(["o3", "o0", "o1", "o4", "o2", "o1"])
+
+        assert sorted(found) == ["o0", "o1", "o2", "o3", "o4"]
+        assert [p["_id"] for p in fhir.searches("_id")] == ["o0,o1", "o2,o3", "o4"]
+
+    def test_derived_observations_are_grouped_by_report(self, monkeypatch):
+        monkeypatch.setattr(fhir_client, "SEARCH_CHUNK_SIZE", 2)
+        fhir = FakeFHIR([
+            _susceptibility("a", "oxacillin", "R", derived_from="r1"),
+            _susceptibility("b", "vancomycin", "S", derived_from="r1"),
+            _susceptibility("c", "meropenem", "R", derived_from="r3"),
+            _susceptibility("d", "cefazolin", "S", derived_from="other"),
+        ])
+
+        derived = MDROFHIRClient(fhir)._fetch_derived_observations(["r1", "r2", "r3"])
+
+        assert {rid: [o["id"] for o in obs] for rid, obs in derived.items()} == {
+            "r1": ["a", "b"],
+            "r3": ["c"],
+        }
+        assert len(fhir.searches("derived-from")) == 2
+
+    def test_panel_members_are_resolved_for_every_report_in_one_search(self):
+        fhir = FakeFHIR(
+            observations=[
+                _panel("panel1", ["m1", "m2"]),
+                _panel("panel2", ["m3"]),
+                _susceptibility("m1", "oxacillin", "R"),
+                _susceptibility("m2", "vancomycin", "S"),
+                _susceptibility("m3", "meropenem", "R"),
+            ],
+            reports=[_report("r1", ["panel1"]), _report("r2", ["panel2"], "Klebsiella pneumoniae")],
+        )
+
+        cultures = MDROFHIRClient(fhir).get_recent_cultures()
+
+        by_report = {
+            c.fhir_id: sorted(s["antibiotic"] for s in c.susceptibilities) for c in cultures
+        }
+        assert by_report == {"r1": ["oxacillin", "vancomycin"], "r2": ["meropenem"]}
+        assert [p["_id"] for p in fhir.searches("_id")] == ["panel1,panel2", "m1,m2,m3"]
+
+
+class TestSusceptibilityPrecedence:
+    """Tests for choosing one result per antibiotic."""
+
+    @pytest.fixture
+    def client(self):
+        return MDROFHIRClient(FakeFHIR())
+
+    def _results(self, client, report, observations, derived=()):
+        susceptibilities = client._get_susceptibilities(
+            report, {o["id"]: o for o in observations}, {report["id"]: list(derived)},
+        )
+        return {s["antibiotic"]: s["result"] for s in susceptibilities}
+
+    def test_final_result_wins_over_a_later_preliminary_one(self, client):
+        report = _report("r1", ["prelim", "final"])
+
+        results = self._results(client, report, [
+            _susceptibility("prelim", "oxacillin", "S", status="preliminary", issued="2026-03-03T08:00:00Z"),
+            _susceptibility("final", "oxacillin", "R", issued="2026-03-02T08:00:00Z"),
+        ])
+
+        assert results == {"oxacillin": "R"}
+
+    def test_latest_final_result_wins(self, client):
+        report = _report("r1", ["first"])
+
+        results = self._results(
+            client, report,
+            [_susceptibility("first", "vancomycin", "S", issued="2026-03-02T08:00:00Z")],
+            derived=[_susceptibility("corrected", "vancomycin", "R", status="corrected",
+                                     issued="2026-03-04T08:00:00Z", derived_from="r1")],
+        )
+
+        assert results == {"vancomycin": "R"}
+
+    def test_result_reference_wins_a_tie_with_derived_from(self, client):
+        report = _report("r1", ["linked"])
+
+        results = self._results(
+            client, report,
+            [_susceptibility("linked", "meropenem", "R")],
+            derived=[_susceptibility("derived", "meropenem", "S", derived_from="r1")],
+        )
+
+        assert results == {"meropenem": "R"}
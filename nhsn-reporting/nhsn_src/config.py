@@ -39,6 +39,11 @@ class Config:
     AU_LOCATION_TYPES: str = os.getenv("AU_LOCATION_TYPES", "ICU,Ward,NICU,BMT")
     # Include oral antibiotics in AU reporting
     AU_INCLUDE_ORAL: bool = os.getenv("AU_INCLUDE_ORAL", "true").lower() == "true"
+    # "facts" rolls DOT/DDD up from the incrementally maintained
+    # au_drug_day_facts table; "sql" queries Clarity MAR rows directly
+    AU_ENGINE: str = os.getenv("NHSN_AU_ENGINE", "facts")
+    # Minimum seconds between incremental fact refreshes from Clarity
+    AU_FACT_REFRESH_SECONDS: int = int(os.getenv("NHSN_AU_FACT_REFRESH_SECONDS", "60"))
 
     # --- AR Reporting ---
     # Specimen types to include in AR reporting
@@ -46,6 +51,11 @@ class Config:
     # Only count first isolate per patient per quarter (NHSN requirement)
     AR_FIRST_ISOLATE_ONLY: bool = os.getenv("AR_FIRST_ISOLATE_ONLY", "true").lower() == "true"
 
+    # --- Denominators ---
+    # "vectorized" computes patient/device days in pandas/NumPy from one
+    # stays query and one flowsheet query; "sql" uses the per-metric queries
+    DENOMINATOR_ENGINE: str = os.getenv("NHSN_DENOMINATOR_ENGINE", "vectorized")
+
     # --- Database ---
     NHSN_DB_PATH: str = os.getenv(
         "NHSN_DB_PATH",
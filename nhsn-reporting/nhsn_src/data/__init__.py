@@ -2,10 +2,12 @@
 
 from .denominator import DenominatorCalculator
 from .au_extractor import AUDataExtractor
+from .au_facts import AUFactTable
 from .ar_extractor import ARDataExtractor
 
 __all__ = [
     "DenominatorCalculator",
     "AUDataExtractor",
+    "AUFactTable",
     "ARDataExtractor",
 ]
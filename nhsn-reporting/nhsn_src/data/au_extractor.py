@@ -11,7 +11,9 @@ NHSN AU Reporting Requirements:
 Reference: CDC NHSN Antimicrobial Use and Resistance Module Protocol
 """
 
+import hashlib
 import logging
+import time
 from dataclasses import dataclass
 from datetime import date
 from typing import Any
@@ -19,9 +21,47 @@ from typing import Any
 import pandas as pd
 
 from ..config import Config
+from .au_facts import FACT_COLUMNS, AUFactTable
 
 logger = logging.getLogger(__name__)
 
+# Administrations charted since the last fact refresh, already reduced to one
+# row per patient-drug-day. {date_expr} is the dialect's date-of-TAKEN_TIME.
+NEW_ADMINISTRATIONS_QUERY = """
+SELECT
+    pat.PAT_MRN_ID as patient_mrn,
+    MIN(pe.PAT_ENC_CSN_ID) as encounter_id,
+    loc.NHSN_LOCATION_CODE as location_code,
+    {date_expr} as admin_date,
+    nm.NHSN_CODE as antimicrobial_code,
+    nm.NHSN_CATEGORY as antimicrobial_class,
+    rx.GENERIC_NAME as antimicrobial_name,
+    om.ADMIN_ROUTE as route,
+    nm.DDD as ddd_standard,
+    nm.DDD_UNIT as ddd_unit,
+    SUM(CASE
+        WHEN mar.DOSE_UNIT IN ('g', 'gram', 'grams') THEN mar.DOSE_GIVEN
+        WHEN mar.DOSE_UNIT IN ('mg', 'milligram', 'milligrams') THEN mar.DOSE_GIVEN / 1000.0
+        WHEN mar.DOSE_UNIT IN ('mcg', 'microgram', 'micrograms') THEN mar.DOSE_GIVEN / 1000000.0
+        ELSE 0
+    END) as total_grams,
+    COUNT(*) as doses_administered,
+    MAX(mar.MAR_ADMIN_ID) as last_mar_id
+FROM MAR_ADMIN_INFO mar
+JOIN ORDER_MED om ON mar.ORDER_MED_ID = om.ORDER_MED_ID
+JOIN RX_MED_ONE rx ON om.MEDICATION_ID = rx.MEDICATION_ID
+JOIN NHSN_ANTIMICROBIAL_MAP nm ON rx.MEDICATION_ID = nm.MEDICATION_ID
+JOIN PAT_ENC pe ON om.PAT_ENC_CSN_ID = pe.PAT_ENC_CSN_ID
+JOIN PATIENT pat ON pe.PAT_ID = pat.PAT_ID
+JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+WHERE mar.MAR_ADMIN_ID > :after_id
+    AND mar.MAR_ADMIN_ID <= :through_id
+    AND mar.ACTION_NAME = 'Given'
+    AND mar.TAKEN_TIME IS NOT NULL
+GROUP BY pat.PAT_MRN_ID, loc.NHSN_LOCATION_CODE, {date_expr}, nm.NHSN_CODE,
+    nm.NHSN_CATEGORY, rx.GENERIC_NAME, om.ADMIN_ROUTE, nm.DDD, nm.DDD_UNIT
+"""
+
 
 @dataclass
 class AntimicrobialUsage:
@@ -71,15 +111,29 @@ class AUDataExtractor:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(
+        self,
+        connection_string: str | None = None,
+        engine: str | None = None,
+        fact_table: AUFactTable | None = None,
+    ):
         """Initialize the extractor.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            engine: "facts" (roll up from the patient-drug-day fact table)
+                or "sql" (query MAR directly). Defaults to Config.AU_ENGINE.
+            fact_table: Fact table to use. Defaults to one in Config.NHSN_DB_PATH.
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.engine = engine or Config.AU_ENGINE
         self._engine = None
+        self._fact_table = fact_table
+        self.fact_source = "clarity:" + hashlib.sha256(
+            (self.connection_string or "").encode()
+        ).hexdigest()[:16]
+        self._facts_refreshed_at: float | None = None
 
     def _get_engine(self):
         """Lazy initialization of SQLAlchemy engine."""
@@ -101,6 +155,134 @@ class AUDataExtractor:
         """Check if using SQLite (mock) database."""
         return "sqlite" in (self.connection_string or "").lower()
 
+    @property
+    def facts(self) -> AUFactTable:
+        """Patient-drug-day fact table (created on first use)."""
+        if self._fact_table is None:
+            self._fact_table = AUFactTable()
+        return self._fact_table
+
+    def refresh_facts(self, rebuild: bool = False) -> int:
+        """Fold MAR administrations charted since the last refresh into the facts.
+
+        Only rows with MAR_ADMIN_ID above the stored watermark are read, so
+        a refresh costs a range scan on the MAR primary key rather than the
+        whole reporting period. Changes to already-processed MAR rows (or to
+        the antimicrobial/location maps) need rebuild_facts().
+
+        Args:
+            rebuild: Read every MAR row and replace the whole table with the
+                result in one transaction.
+
+        Returns:
+            Number of patient-drug-day rows inserted or updated.
+        """
+        from sqlalchemy import text
+
+        after_id = 0 if rebuild else self.facts.get_watermark(self.fact_source)
+        # A rebuild replaces whatever a concurrent refresh wrote meanwhile
+        apply_after = None if rebuild else after_id
+        date_expr = "date(mar.TAKEN_TIME)" if self._is_sqlite() else "CONVERT(DATE, mar.TAKEN_TIME)"
+
+        engine = self._get_engine()
+        with engine.connect() as conn:
+            through_id = conn.execute(
+                text("SELECT MAX(MAR_ADMIN_ID) FROM MAR_ADMIN_INFO")
+            ).scalar()
+            if through_id is None or through_id <= after_id:
+                if after_id == 0:
+                    # Nothing charted yet; still claim the table for this source
+                    self.facts.apply(
+                        pd.DataFrame(columns=FACT_COLUMNS), 0, self.fact_source,
+                        apply_after, replace=rebuild,
+                    )
+                self._facts_refreshed_at = time.monotonic()
+                return 0
+            df = pd.read_sql(
+                text(NEW_ADMINISTRATIONS_QUERY.format(date_expr=date_expr)),
+                conn,
+                params={"after_id": after_id, "through_id": through_id},
+            )
+
+        df.columns = df.columns.str.lower()
+        if not df.empty:
+            df["admin_date"] = pd.to_datetime(df["admin_date"]).dt.strftime("%Y-%m-%d")
+            df["month"] = df["admin_date"].str[:7]
+            df["encounter_id"] = df["encounter_id"].astype(str)
+        written = self.facts.apply(
+            df.reindex(columns=FACT_COLUMNS), through_id, self.fact_source,
+            apply_after, replace=rebuild,
+        )
+        self._facts_refreshed_at = time.monotonic()
+        logger.info(f"AU facts refreshed through MAR_ADMIN_ID {through_id}: {written} patient-drug-days")
+        return written
+
+    def rebuild_facts(self) -> int:
+        """Rebuild the fact table from all MAR rows.
+
+        The old facts keep being served until the rebuilt table commits. If
+        the rebuild fails, the next DOT/DDD request refreshes again instead
+        of waiting out AU_FACT_REFRESH_SECONDS.
+        """
+        try:
+            return self.refresh_facts(rebuild=True)
+        except Exception:
+            self._facts_refreshed_at = None
+            raise
+
+    def _refresh_facts_if_stale(self) -> bool:
+        """Refresh the facts at most every AU_FACT_REFRESH_SECONDS.
+
+        Returns:
+            False if the facts could not be refreshed and have never been
+            built, i.e. they cannot stand in for a direct MAR query.
+        """
+        if (
+            self._facts_refreshed_at is not None
+            and time.monotonic() - self._facts_refreshed_at < Config.AU_FACT_REFRESH_SECONDS
+        ):
+            return True
+        try:
+            self.refresh_facts()
+        except Exception as e:
+            if self.facts.get_watermark(self.fact_source) == 0:
+                logger.error(f"AU fact refresh failed: {e}")
+                return False
+            logger.warning(f"AU fact refresh failed, using facts as of last refresh: {e}")
+        return True
+
+    def _use_facts(self) -> bool:
+        """Whether DOT/DDD should roll up from the fact table."""
+        return self.engine == "facts" and self._refresh_facts_if_stale()
+
+    def get_patient_drug_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        nhsn_code: str | None = None,
+        route: str | None = None,
+    ) -> pd.DataFrame:
+        """Get the patient-drug-days behind a DOT figure (drill-down).
+
+        Args:
+            locations: List of NHSN location codes.
+            start_date: Start of date range.
+            end_date: End of date range.
+            nhsn_code: Restrict to one NHSN antimicrobial code.
+            route: Restrict to one administration route.
+
+        Returns:
+            DataFrame with one row per patient, location, day, drug and route.
+        """
+        if start_date is None:
+            start_date = date.today().replace(day=1)
+        if end_date is None:
+            end_date = date.today()
+
+        self._refresh_facts_if_stale()
+        return self.facts.patient_days(locations, start_date, end_date, nhsn_code, route)
+
     def get_antimicrobial_administrations(
         self,
         locations: list[str] | None = None,
@@ -230,6 +412,9 @@ class AUDataExtractor:
         if include_oral is None:
             include_oral = Config.AU_INCLUDE_ORAL
 
+        if self._use_facts():
+            return self.facts.dot(locations, start_date, end_date, include_oral)
+
         # Build filters
         location_filter = ""
         if locations:
@@ -320,6 +505,9 @@ class AUDataExtractor:
         if end_date is None:
             end_date = date.today()
 
+        if self._use_facts():
+            return self.facts.ddd(locations, start_date, end_date)
+
         location_filter = ""
         if locations:
             location_list = ", ".join(f"'{loc}'" for loc in locations)
@@ -0,0 +1,293 @@
+"""Materialized patient-drug-day facts for NHSN AU reporting.
+
+Computing DOT and DDD straight from Clarity scans and joins every MAR row in
+the reporting range each time the dashboard or an export asks. This module
+keeps one row per patient, location, day, NHSN drug and route in the local
+NHSN database instead, so monthly summaries are a GROUP BY over a small
+indexed table and individual patient-days stay available for drill-downs.
+
+The table is fed by AUDataExtractor.refresh_facts(), which only reads MAR
+rows newer than the stored watermark and adds them to existing rows. A
+batch is only applied if the watermark is still the one it was read after,
+so overlapping refreshes cannot add the same administrations twice. DOT is
+the number of fact rows; DDD is the summed grams over the standard dose.
+"""
+
+import logging
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from ..config import Config
+from ..db import NHSNDatabase
+
+logger = logging.getLogger(__name__)
+
+FACT_COLUMNS = [
+    "patient_mrn",
+    "encounter_id",
+    "location_code",
+    "admin_date",
+    "month",
+    "antimicrobial_code",
+    "antimicrobial_class",
+    "antimicrobial_name",
+    "route",
+    "ddd_standard",
+    "ddd_unit",
+    "total_grams",
+    "doses_administered",
+    "last_mar_id",
+]
+
+# New administrations add to the patient-day they fall on
+FACT_UPSERT_SQL = f"""
+    INSERT INTO au_drug_day_facts ({", ".join(FACT_COLUMNS)})
+    VALUES ({", ".join("?" for _ in FACT_COLUMNS)})
+    ON CONFLICT (patient_mrn, location_code, admin_date, antimicrobial_code,
+                 antimicrobial_name, route)
+    DO UPDATE SET
+        total_grams = total_grams + excluded.total_grams,
+        doses_administered = doses_administered + excluded.doses_administered,
+        encounter_id = COALESCE(encounter_id, excluded.encounter_id),
+        last_mar_id = MAX(last_mar_id, excluded.last_mar_id)
+"""
+
+DOT_COLUMNS = [
+    "nhsn_location_code",
+    "month",
+    "nhsn_code",
+    "nhsn_category",
+    "medication_name",
+    "route",
+    "days_of_therapy",
+]
+
+DDD_COLUMNS = [
+    "nhsn_location_code",
+    "month",
+    "nhsn_code",
+    "nhsn_category",
+    "medication_name",
+    "ddd_standard",
+    "ddd_unit",
+    "total_grams",
+    "defined_daily_doses",
+]
+
+ORAL_ROUTES = ("PO", "ORAL")
+
+
+def _fact_filter(
+    locations: list[str] | None,
+    start_date: date,
+    end_date: date,
+    exclude_oral: bool = False,
+) -> tuple[str, list]:
+    """WHERE clause and parameters shared by the rollups."""
+    clauses = ["admin_date >= ?", "admin_date <= ?"]
+    params: list = [start_date.isoformat(), end_date.isoformat()]
+    if locations:
+        clauses.append(f"location_code IN ({', '.join('?' for _ in locations)})")
+        params.extend(locations)
+    if exclude_oral:
+        clauses.append(f"route NOT IN ({', '.join('?' for _ in ORAL_ROUTES)})")
+        params.extend(ORAL_ROUTES)
+    return " AND ".join(clauses), params
+
+
+class AUFactTable:
+    """Patient-drug-day AU fact table in the local NHSN database."""
+
+    def __init__(self, db_path: str | Path | None = None):
+        """Initialize the fact table.
+
+        Args:
+            db_path: NHSN SQLite database. Defaults to Config.NHSN_DB_PATH.
+        """
+        self.db = NHSNDatabase(db_path or Config.NHSN_DB_PATH)
+
+    def _connect(self):
+        """Connection that is closed when the ``with`` block exits."""
+        return closing(self.db._get_connection())
+
+    # --- Maintenance ---
+
+    def get_watermark(self, source: str) -> int:
+        """Highest MAR_ADMIN_ID folded in from ``source``.
+
+        Returns 0 when the table is empty or was built from another Clarity
+        database.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT last_mar_id FROM au_fact_watermark WHERE source = ?",
+                (source,),
+            ).fetchone()
+        return row["last_mar_id"] if row else 0
+
+    def apply(
+        self,
+        facts: pd.DataFrame,
+        high_water: int,
+        source: str,
+        after_id: int | None = None,
+        replace: bool = False,
+    ) -> int:
+        """Add newly administered patient-drug-days and advance the watermark.
+
+        Facts built from a different source are discarded first, in the same
+        transaction, so the table never mixes two Clarity databases. The
+        transaction takes the write lock before reading the watermark: if
+        another refresh moved it past ``after_id`` meanwhile, the batch
+        overlaps rows already added and is dropped; the next refresh reads
+        whatever it had beyond them.
+
+        Args:
+            facts: One row per new patient-drug-day with FACT_COLUMNS.
+            high_water: Highest MAR_ADMIN_ID included in ``facts``.
+            source: Identifier of the Clarity database the rows came from.
+            after_id: Watermark the batch was read after. None applies it
+                unconditionally.
+            replace: Discard all existing facts in the same transaction, for
+                a rebuild; readers see the old table until it commits.
+
+        Returns:
+            Number of fact rows written.
+        """
+        rows = [
+            tuple(None if pd.isna(value) else value for value in row)
+            for row in facts[FACT_COLUMNS].itertuples(index=False, name=None)
+        ]
+        with self._connect() as conn:
+            conn.isolation_level = None  # Explicit BEGIN IMMEDIATE below
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                stale = conn.execute(
+                    "SELECT 1 FROM au_fact_watermark WHERE source != ? LIMIT 1", (source,)
+                ).fetchone()
+                if replace or stale:
+                    conn.execute("DELETE FROM au_drug_day_facts")
+                    conn.execute("DELETE FROM au_fact_watermark")
+                current = conn.execute(
+                    "SELECT last_mar_id FROM au_fact_watermark WHERE source = ?", (source,)
+                ).fetchone()
+                current = current["last_mar_id"] if current else 0
+                if after_id is not None and current != after_id:
+                    logger.info(
+                        f"AU fact watermark moved from {after_id} to {current} during refresh, "
+                        f"dropping batch through MAR_ADMIN_ID {high_water}"
+                    )
+                    conn.execute("ROLLBACK")
+                    return 0
+                if rows:
+                    conn.executemany(FACT_UPSERT_SQL, rows)
+                conn.execute(
+                    """
+                    INSERT INTO au_fact_watermark (source, last_mar_id, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT (source) DO UPDATE SET
+                        last_mar_id = MAX(last_mar_id, excluded.last_mar_id),
+                        updated_at = excluded.updated_at
+                    """,
+                    (source, int(high_water)),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    # --- Rollups ---
+
+    def dot(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+        include_oral: bool = True,
+    ) -> pd.DataFrame:
+        """DOT by location, month, drug and route (AUDataExtractor.calculate_dot shape)."""
+        where, params = _fact_filter(locations, start_date, end_date, not include_oral)
+        query = f"""
+            SELECT location_code AS nhsn_location_code,
+                   month,
+                   antimicrobial_code AS nhsn_code,
+                   antimicrobial_class AS nhsn_category,
+                   antimicrobial_name AS medication_name,
+                   route,
+                   COUNT(*) AS days_of_therapy
+            FROM au_drug_day_facts
+            WHERE {where}
+            GROUP BY location_code, month, antimicrobial_code, antimicrobial_class,
+                     antimicrobial_name, route
+            ORDER BY month, location_code, antimicrobial_class, antimicrobial_code
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params).reindex(columns=DOT_COLUMNS)
+
+    def ddd(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+    ) -> pd.DataFrame:
+        """DDD by location, month and drug (AUDataExtractor.calculate_ddd shape)."""
+        where, params = _fact_filter(locations, start_date, end_date)
+        query = f"""
+            SELECT location_code AS nhsn_location_code,
+                   month,
+                   antimicrobial_code AS nhsn_code,
+                   antimicrobial_class AS nhsn_category,
+                   antimicrobial_name AS medication_name,
+                   ddd_standard,
+                   ddd_unit,
+                   SUM(total_grams) AS total_grams,
+                   CASE WHEN ddd_standard > 0
+                        THEN SUM(total_grams) / ddd_standard
+                        ELSE NULL
+                   END AS defined_daily_doses
+            FROM au_drug_day_facts
+            WHERE {where}
+            GROUP BY location_code, month, antimicrobial_code, antimicrobial_class,
+                     antimicrobial_name, ddd_standard, ddd_unit
+            ORDER BY month, location_code, antimicrobial_class, antimicrobial_code
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params).reindex(columns=DDD_COLUMNS)
+
+    def patient_days(
+        self,
+        locations: list[str] | None,
+        start_date: date,
+        end_date: date,
+        nhsn_code: str | None = None,
+        route: str | None = None,
+    ) -> pd.DataFrame:
+        """Individual patient-drug-days behind a DOT figure, for drill-downs."""
+        where, params = _fact_filter(locations, start_date, end_date)
+        if nhsn_code:
+            where += " AND antimicrobial_code = ?"
+            params.append(nhsn_code)
+        if route:
+            where += " AND route = ?"
+            params.append(route)
+        query = f"""
+            SELECT patient_mrn AS patient_id,
+                   encounter_id,
+                   location_code AS nhsn_location_code,
+                   admin_date,
+                   antimicrobial_code AS nhsn_code,
+                   antimicrobial_class AS nhsn_category,
+                   antimicrobial_name AS medication_name,
+                   route,
+                   doses_administered,
+                   total_grams
+            FROM au_drug_day_facts
+            WHERE {where}
+            ORDER BY admin_date, location_code, patient_mrn, antimicrobial_code
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
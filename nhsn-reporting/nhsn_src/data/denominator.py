@@ -10,12 +10,175 @@ from datetime import date
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+DENOMINATOR_COLUMNS = [
+    "patient_days",
+    "central_line_days",
+    "urinary_catheter_days",
+    "ventilator_days",
+]
+
+# Stays overlapping the date range. Uses the same bounds as the recursive
+# CTE it replaces so both engines select the same encounters.
+STAYS_QUERY = """
+SELECT
+    loc.NHSN_LOCATION_CODE,
+    pe.HOSP_ADMIT_DTTM,
+    pe.HOSP_DISCH_DTTM
+FROM PAT_ENC pe
+JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+WHERE pe.HOSP_ADMIT_DTTM <= :end_date
+    AND (pe.HOSP_DISCH_DTTM IS NULL OR pe.HOSP_DISCH_DTTM >= :start_date)
+    {location_filter}
+"""
+
+# Flowsheet rows (IP_FLO_GP_DATA, a handful of rows) documenting each
+# device, matched with the same name filters as the per-device queries
+DEVICE_FLOWSHEET_QUERY = """
+SELECT
+    FLO_MEAS_ID,
+    CASE WHEN DISP_NAME LIKE '%central%line%' OR DISP_NAME LIKE '%PICC%'
+         THEN 1 ELSE 0 END AS central_line,
+    CASE WHEN DISP_NAME LIKE '%foley%'
+              OR DISP_NAME LIKE '%urinary%catheter%'
+              OR DISP_NAME LIKE '%indwelling%catheter%'
+         THEN 1 ELSE 0 END AS urinary_catheter,
+    CASE WHEN DISP_NAME LIKE '%ventilator%'
+              OR DISP_NAME LIKE '%mechanical%vent%'
+              OR DISP_NAME LIKE '%vent%mode%'
+              OR DISP_NAME LIKE '%intubat%'
+         THEN 1 ELSE 0 END AS ventilator
+FROM IP_FLO_GP_DATA
+"""
+
+# Patient-days with device documentation, one row per location/patient/day
+# flagged per device. Value exclusions match the per-device queries; the
+# flowsheet IDs come from DEVICE_FLOWSHEET_QUERY so the measurement scan
+# never pattern-matches names, and grouping in the database keeps the
+# transfer to one row per patient-day instead of one per measurement.
+DEVICE_PATIENT_DAYS_QUERY = """
+SELECT
+    loc.NHSN_LOCATION_CODE,
+    pe.PAT_ID,
+    {date_expr} AS census_date,
+    MAX(CASE WHEN fm.FLO_MEAS_ID IN ({central_line_ids})
+                  AND fm.MEAS_VALUE NOT LIKE '%removed%'
+             THEN 1 ELSE 0 END) AS central_line,
+    MAX(CASE WHEN fm.FLO_MEAS_ID IN ({urinary_catheter_ids})
+                  AND fm.MEAS_VALUE NOT LIKE '%removed%'
+                  AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+             THEN 1 ELSE 0 END) AS urinary_catheter,
+    MAX(CASE WHEN fm.FLO_MEAS_ID IN ({ventilator_ids})
+                  AND fm.MEAS_VALUE NOT LIKE '%removed%'
+                  AND fm.MEAS_VALUE NOT LIKE '%extubat%'
+                  AND fm.MEAS_VALUE NOT LIKE '%discontinued%'
+             THEN 1 ELSE 0 END) AS ventilator
+FROM IP_FLWSHT_MEAS fm
+JOIN IP_FLWSHT_REC rec ON fm.FSD_ID = rec.FSD_ID
+JOIN PAT_ENC pe ON rec.INPATIENT_DATA_ID = pe.INPATIENT_DATA_ID
+JOIN NHSN_LOCATION_MAP loc ON pe.DEPARTMENT_ID = loc.EPIC_DEPT_ID
+WHERE fm.FLO_MEAS_ID IN ({device_ids})
+    AND fm.RECORDED_TIME >= :start_date
+    AND fm.RECORDED_TIME <= :end_date
+    {location_filter}
+GROUP BY loc.NHSN_LOCATION_CODE, pe.PAT_ID, {date_expr}
+"""
+
+DEVICE_COLUMNS = {
+    "central_line": "central_line_days",
+    "urinary_catheter": "urinary_catheter_days",
+    "ventilator": "ventilator_days",
+}
+
+
+def _location_filter(locations: list[str] | None) -> str:
+    if not locations:
+        return ""
+    location_list = ", ".join(f"'{loc}'" for loc in locations)
+    return f"AND loc.NHSN_LOCATION_CODE IN ({location_list})"
+
+
+def _to_days(values: pd.Series) -> np.ndarray:
+    """Convert timestamps (strings or datetimes) to datetime64[D]."""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    return values.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+
+
+def _patient_days_by_month(stays: pd.DataFrame, start_date: date, end_date: date) -> pd.DataFrame:
+    """Split each stay's census interval at month boundaries and sum days.
+
+    Each stay contributes every calendar day from admission (or start_date)
+    through discharge (or end_date), both inclusive, to the month the day
+    falls in.
+    """
+    columns = ["nhsn_location_code", "month", "patient_days"]
+    if stays.empty:
+        return pd.DataFrame(columns=columns)
+
+    admit = _to_days(stays["hosp_admit_dttm"])
+    discharge = _to_days(stays["hosp_disch_dttm"])
+    range_start = np.datetime64(start_date, "D")
+    range_end = np.datetime64(end_date, "D")
+
+    valid = ~np.isnat(admit)
+    first = np.maximum(admit[valid], range_start)
+    last = np.where(np.isnat(discharge[valid]), range_end, discharge[valid])
+    last = np.minimum(last, range_end)
+    # A stay always counts its first census day
+    last = np.maximum(last, first)
+    locations = stays["nhsn_location_code"].to_numpy()[valid]
+
+    # One segment per (stay, month touched)
+    first_month = first.astype("datetime64[M]")
+    months_per_stay = (last.astype("datetime64[M]") - first_month).astype(np.int64) + 1
+    stay_idx = np.repeat(np.arange(len(first)), months_per_stay)
+    offsets = np.arange(len(stay_idx)) - np.repeat(
+        np.cumsum(months_per_stay) - months_per_stay, months_per_stay
+    )
+    month = first_month[stay_idx] + offsets
+
+    segment_start = np.maximum(first[stay_idx], month.astype("datetime64[D]"))
+    segment_end = np.minimum(last[stay_idx], (month + 1).astype("datetime64[D]") - 1)
+    days = (segment_end - segment_start).astype(np.int64) + 1
+
+    segments = pd.DataFrame({
+        "nhsn_location_code": locations[stay_idx],
+        "month": np.datetime_as_string(month, unit="M"),
+        "patient_days": days,
+    })
+    return segments.groupby(["nhsn_location_code", "month"], as_index=False)["patient_days"].sum()
+
+
+def _device_days_by_month(patient_days: pd.DataFrame) -> pd.DataFrame:
+    """Sum flagged device patient-days per location and month."""
+    keys = ["nhsn_location_code", "month"]
+    if patient_days.empty:
+        return pd.DataFrame(columns=keys + list(DEVICE_COLUMNS.values()))
+
+    days = _to_days(patient_days["census_date"])
+    valid = ~np.isnat(days)
+    flags = patient_days.loc[valid, list(DEVICE_COLUMNS)].astype("int64")
+    flags.columns = list(DEVICE_COLUMNS.values())
+    flags.insert(0, "nhsn_location_code", patient_days["nhsn_location_code"].to_numpy()[valid])
+    flags.insert(1, "month", np.datetime_as_string(days[valid].astype("datetime64[M]"), unit="M"))
+    return flags.groupby(keys, as_index=False).sum()
+
+
+def _metric_frame(denominators: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Select one metric, keeping only rows where it is non-zero."""
+    frame = denominators.loc[
+        denominators[column] > 0, ["nhsn_location_code", "month", column]
+    ]
+    return frame.reset_index(drop=True)
+
+
 
 class DenominatorCalculator:
     """Calculate device-days and patient-days from Clarity data.
@@ -36,14 +199,16 @@ class DenominatorCalculator:
         )
     """
 
-    def __init__(self, connection_string: str | None = None):
+    def __init__(self, connection_string: str | None = None, engine: str | None = None):
         """Initialize the calculator.
 
         Args:
             connection_string: Database connection string. If not provided,
                 uses Config.get_clarity_connection_string().
+            engine: "vectorized" or "sql". Defaults to Config.DENOMINATOR_ENGINE.
         """
         self.connection_string = connection_string or Config.get_clarity_connection_string()
+        self.engine = engine or Config.DENOMINATOR_ENGINE
         self._engine = None
 
     def _get_engine(self):
@@ -88,6 +253,218 @@ class DenominatorCalculator:
             - month: Year-month string (YYYY-MM)
             - central_line_days: Count of patient-days with line present
         """
+        if self.engine == "sql":
+            return self._sql_central_line_days(locations, start_date, end_date)
+        df = self.get_denominators(
+            locations, start_date, end_date,
+            patient_days=False, device_days=True,
+        )
+        return _metric_frame(df, "central_line_days")
+
+    def get_urinary_catheter_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Calculate urinary catheter days by location and month.
+
+        Urinary catheter days = count of distinct patient-days with an
+        indwelling urinary catheter documented as present. This is the
+        denominator for CAUTI rate calculation.
+
+        Args:
+            locations: List of NHSN location codes (e.g., ['T5A', 'T5B']).
+                      If None, includes all locations.
+            start_date: Start of date range (inclusive). Defaults to 1 year ago.
+            end_date: End of date range (inclusive). Defaults to today.
+
+        Returns:
+            DataFrame with columns:
+            - nhsn_location_code: NHSN location identifier
+            - month: Year-month string (YYYY-MM)
+            - urinary_catheter_days: Count of patient-days with catheter present
+        """
+        if self.engine == "sql":
+            return self._sql_urinary_catheter_days(locations, start_date, end_date)
+        df = self.get_denominators(
+            locations, start_date, end_date,
+            patient_days=False, device_days=True,
+        )
+        return _metric_frame(df, "urinary_catheter_days")
+
+    def get_ventilator_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Calculate ventilator days by location and month.
+
+        Ventilator days = count of distinct patient-days with mechanical
+        ventilation documented. This is the denominator for VAE/VAP rate
+        calculation.
+
+        Args:
+            locations: List of NHSN location codes (e.g., ['T5A', 'T5B']).
+                      If None, includes all locations.
+            start_date: Start of date range (inclusive). Defaults to 1 year ago.
+            end_date: End of date range (inclusive). Defaults to today.
+
+        Returns:
+            DataFrame with columns:
+            - nhsn_location_code: NHSN location identifier
+            - month: Year-month string (YYYY-MM)
+            - ventilator_days: Count of patient-days on mechanical ventilation
+        """
+        if self.engine == "sql":
+            return self._sql_ventilator_days(locations, start_date, end_date)
+        df = self.get_denominators(
+            locations, start_date, end_date,
+            patient_days=False, device_days=True,
+        )
+        return _metric_frame(df, "ventilator_days")
+
+    def get_patient_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Calculate patient days by location and month.
+
+        Patient days = sum of days patients were admitted to each unit.
+        Each day is attributed to its correct calendar month (not admission month).
+        This provides context for HAI rates (device utilization ratio).
+
+        Args:
+            locations: List of NHSN location codes. If None, includes all.
+            start_date: Start of date range. Defaults to 1 year ago.
+            end_date: End of date range. Defaults to today.
+
+        Returns:
+            DataFrame with columns:
+            - nhsn_location_code: NHSN location identifier
+            - month: Year-month string (YYYY-MM)
+            - patient_days: Sum of patient census days
+        """
+        if self.engine == "sql":
+            return self._sql_patient_days(locations, start_date, end_date)
+        df = self.get_denominators(
+            locations, start_date, end_date,
+            patient_days=True, device_days=False,
+        )
+        return _metric_frame(df, "patient_days")
+
+    def get_denominators(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        patient_days: bool = True,
+        device_days: bool = True,
+    ) -> pd.DataFrame:
+        """Calculate patient days and all device days in one pass.
+
+        Stays are read once and their admit/discharge intervals are split
+        at month boundaries with NumPy interval arithmetic, so the cost
+        depends on the number of stays and months rather than on the number
+        of patient-days. Central line, urinary catheter and ventilator
+        flowsheet rows are collapsed to flagged patient-days by a single
+        query and summed per month.
+
+        Args:
+            locations: List of NHSN location codes. If None, includes all.
+            start_date: Start of date range (inclusive). Defaults to 1 year ago.
+            end_date: End of date range (inclusive). Defaults to today.
+            patient_days: Include patient days.
+            device_days: Include central line, urinary catheter and
+                ventilator days.
+
+        Returns:
+            DataFrame with columns nhsn_location_code, month (YYYY-MM),
+            patient_days, central_line_days, urinary_catheter_days and
+            ventilator_days, one row per location and month with any days.
+        """
+        if start_date is None:
+            start_date = date.today().replace(year=date.today().year - 1)
+        if end_date is None:
+            end_date = date.today()
+
+        frames = []
+        try:
+            from sqlalchemy import text
+            engine = self._get_engine()
+            params = {"start_date": start_date, "end_date": end_date}
+            location_filter = _location_filter(locations)
+            with engine.connect() as conn:
+                if patient_days:
+                    stays = pd.read_sql(
+                        text(STAYS_QUERY.format(location_filter=location_filter)),
+                        conn, params=params,
+                    )
+                    stays.columns = stays.columns.str.lower()
+                    frames.append(_patient_days_by_month(stays, start_date, end_date))
+                if device_days:
+                    device_days_df = self._read_device_patient_days(
+                        conn, location_filter, params
+                    )
+                    frames.append(_device_days_by_month(device_days_df))
+        except Exception as e:
+            logger.error(f"Denominator query failed: {e}")
+            frames = []
+
+        keys = ["nhsn_location_code", "month"]
+        result = pd.DataFrame(columns=keys + DENOMINATOR_COLUMNS)
+        for frame in frames:
+            if not frame.empty:
+                result = frame if result.empty else result.merge(frame, on=keys, how="outer")
+        for col in DENOMINATOR_COLUMNS:
+            if col not in result.columns:
+                result[col] = 0
+        result[DENOMINATOR_COLUMNS] = result[DENOMINATOR_COLUMNS].fillna(0).astype("int64")
+        return result.sort_values(["month", "nhsn_location_code"]).reset_index(drop=True)
+
+    def _read_device_patient_days(self, conn, location_filter: str, params: dict) -> pd.DataFrame:
+        """Query patient-days flagged per device, one row per location/patient/day."""
+        from sqlalchemy import text
+
+        flowsheets = pd.read_sql(text(DEVICE_FLOWSHEET_QUERY), conn)
+        flowsheets.columns = flowsheets.columns.str.lower()
+
+        ids = {}
+        for flag in DEVICE_COLUMNS:
+            matched = flowsheets.loc[flowsheets[flag] == 1, "flo_meas_id"]
+            # NULL keeps "IN ()" valid when no flowsheet row matches
+            ids[flag] = ", ".join(str(int(i)) for i in matched) or "NULL"
+        device_ids = ", ".join(v for v in ids.values() if v != "NULL")
+        if not device_ids:
+            return pd.DataFrame()
+
+        # SQLite uses date(), SQL Server uses CONVERT
+        date_expr = (
+            "date(fm.RECORDED_TIME)" if self._is_sqlite()
+            else "CONVERT(DATE, fm.RECORDED_TIME)"
+        )
+        query = DEVICE_PATIENT_DAYS_QUERY.format(
+            date_expr=date_expr,
+            central_line_ids=ids["central_line"],
+            urinary_catheter_ids=ids["urinary_catheter"],
+            ventilator_ids=ids["ventilator"],
+            device_ids=device_ids,
+            location_filter=location_filter,
+        )
+        df = pd.read_sql(text(query), conn, params=params)
+        df.columns = df.columns.str.lower()
+        return df
+
+    def _sql_central_line_days(
+        self,
+        locations: list[str] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> pd.DataFrame:
+        """Central line days computed in the database (legacy per-metric query)."""
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
@@ -141,30 +518,13 @@ class DenominatorCalculator:
             logger.error(f"Central line days query failed: {e}")
             return pd.DataFrame(columns=["nhsn_location_code", "month", "central_line_days"])
 
-    def get_urinary_catheter_days(
+    def _sql_urinary_catheter_days(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
     ) -> pd.DataFrame:
-        """Calculate urinary catheter days by location and month.
-
-        Urinary catheter days = count of distinct patient-days with an
-        indwelling urinary catheter documented as present. This is the
-        denominator for CAUTI rate calculation.
-
-        Args:
-            locations: List of NHSN location codes (e.g., ['T5A', 'T5B']).
-                      If None, includes all locations.
-            start_date: Start of date range (inclusive). Defaults to 1 year ago.
-            end_date: End of date range (inclusive). Defaults to today.
-
-        Returns:
-            DataFrame with columns:
-            - nhsn_location_code: NHSN location identifier
-            - month: Year-month string (YYYY-MM)
-            - urinary_catheter_days: Count of patient-days with catheter present
-        """
+        """Urinary catheter days computed in the database (legacy per-metric query)."""
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
@@ -221,30 +581,13 @@ class DenominatorCalculator:
             logger.error(f"Urinary catheter days query failed: {e}")
             return pd.DataFrame(columns=["nhsn_location_code", "month", "urinary_catheter_days"])
 
-    def get_ventilator_days(
+    def _sql_ventilator_days(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
     ) -> pd.DataFrame:
-        """Calculate ventilator days by location and month.
-
-        Ventilator days = count of distinct patient-days with mechanical
-        ventilation documented. This is the denominator for VAE/VAP rate
-        calculation.
-
-        Args:
-            locations: List of NHSN location codes (e.g., ['T5A', 'T5B']).
-                      If None, includes all locations.
-            start_date: Start of date range (inclusive). Defaults to 1 year ago.
-            end_date: End of date range (inclusive). Defaults to today.
-
-        Returns:
-            DataFrame with columns:
-            - nhsn_location_code: NHSN location identifier
-            - month: Year-month string (YYYY-MM)
-            - ventilator_days: Count of patient-days on mechanical ventilation
-        """
+        """Ventilator days computed in the database (legacy per-metric query)."""
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
@@ -303,29 +646,13 @@ class DenominatorCalculator:
             logger.error(f"Ventilator days query failed: {e}")
             return pd.DataFrame(columns=["nhsn_location_code", "month", "ventilator_days"])
 
-    def get_patient_days(
+    def _sql_patient_days(
         self,
         locations: list[str] | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
     ) -> pd.DataFrame:
-        """Calculate patient days by location and month.
-
-        Patient days = sum of days patients were admitted to each unit.
-        Each day is attributed to its correct calendar month (not admission month).
-        This provides context for HAI rates (device utilization ratio).
-
-        Args:
-            locations: List of NHSN location codes. If None, includes all.
-            start_date: Start of date range. Defaults to 1 year ago.
-            end_date: End of date range. Defaults to today.
-
-        Returns:
-            DataFrame with columns:
-            - nhsn_location_code: NHSN location identifier
-            - month: Year-month string (YYYY-MM)
-            - patient_days: Sum of patient census days
-        """
+        """Patient days computed in the database (legacy per-metric query)."""
         if start_date is None:
             start_date = date.today().replace(year=date.today().year - 1)
         if end_date is None:
@@ -452,10 +779,17 @@ class DenominatorCalculator:
                 - totals: Aggregate totals for the period
         """
         # Fetch all denominator data
-        line_days_df = self.get_central_line_days(locations, start_date, end_date)
-        catheter_days_df = self.get_urinary_catheter_days(locations, start_date, end_date)
-        vent_days_df = self.get_ventilator_days(locations, start_date, end_date)
-        patient_days_df = self.get_patient_days(locations, start_date, end_date)
+        if self.engine == "sql":
+            line_days_df = self.get_central_line_days(locations, start_date, end_date)
+            catheter_days_df = self.get_urinary_catheter_days(locations, start_date, end_date)
+            vent_days_df = self.get_ventilator_days(locations, start_date, end_date)
+            patient_days_df = self.get_patient_days(locations, start_date, end_date)
+        else:
+            combined = self.get_denominators(locations, start_date, end_date)
+            line_days_df = _metric_frame(combined, "central_line_days")
+            catheter_days_df = _metric_frame(combined, "urinary_catheter_days")
+            vent_days_df = _metric_frame(combined, "ventilator_days")
+            patient_days_df = _metric_frame(combined, "patient_days")
 
         # Check if all empty
         all_empty = (
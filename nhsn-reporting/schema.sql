@@ -146,6 +146,36 @@ CREATE INDEX IF NOT EXISTS idx_au_patient_encounter ON au_patient_level(encounte
 CREATE INDEX IF NOT EXISTS idx_au_patient_antimicrobial ON au_patient_level(antimicrobial_code);
 CREATE INDEX IF NOT EXISTS idx_au_patient_dates ON au_patient_level(start_date, end_date);
 
+-- Patient-drug-day facts (one row per patient, location, day, drug and route).
+-- Maintained incrementally from Clarity MAR rows; DOT and DDD roll up from here.
+CREATE TABLE IF NOT EXISTS au_drug_day_facts (
+    patient_mrn TEXT NOT NULL,
+    encounter_id TEXT,
+    location_code TEXT NOT NULL,  -- NHSN location code
+    admin_date DATE NOT NULL,  -- YYYY-MM-DD
+    month TEXT NOT NULL,  -- YYYY-MM
+    antimicrobial_code TEXT NOT NULL,  -- NHSN antimicrobial code
+    antimicrobial_class TEXT,  -- NHSN category
+    antimicrobial_name TEXT NOT NULL,
+    route TEXT NOT NULL,
+    ddd_standard REAL,
+    ddd_unit TEXT,
+    total_grams REAL NOT NULL DEFAULT 0,
+    doses_administered INTEGER NOT NULL DEFAULT 0,
+    last_mar_id INTEGER,
+    PRIMARY KEY (patient_mrn, location_code, admin_date, antimicrobial_code, antimicrobial_name, route)
+);
+
+CREATE INDEX IF NOT EXISTS idx_au_facts_month_location ON au_drug_day_facts(month, location_code);
+CREATE INDEX IF NOT EXISTS idx_au_facts_date ON au_drug_day_facts(admin_date);
+
+-- Last MAR administration folded into au_drug_day_facts
+CREATE TABLE IF NOT EXISTS au_fact_watermark (
+    source TEXT PRIMARY KEY,
+    last_mar_id INTEGER NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ============================================================
 -- Antimicrobial Resistance (AR) Reporting Tables
 -- ============================================================
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized denominator engine against the SQL queries.
+
+Runs DenominatorCalculator with engine="sql" (recursive CTE for patient
+days, one query per device type) and engine="vectorized" (one stays query
+and one flowsheet query, interval arithmetic in NumPy) on the mock Clarity
+database, checks both produce identical DataFrames and prints timings.
+
+Usage:
+    python scripts/benchmark_denominators.py
+    python scripts/benchmark_denominators.py --generate --patients 500 --months 24
+    python scripts/benchmark_denominators.py --db-path /tmp/mock_clarity.db --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+
+from nhsn_src.config import Config
+from nhsn_src.data.denominator import DenominatorCalculator
+
+METRICS = {
+    "patient_days": "get_patient_days",
+    "central_line_days": "get_central_line_days",
+    "urinary_catheter_days": "get_urinary_catheter_days",
+    "ventilator_days": "get_ventilator_days",
+}
+
+
+def run_engine(calc: DenominatorCalculator, start: date, end: date) -> tuple[float, dict]:
+    """Compute every metric the way get_denominator_summary() does."""
+    started = time.perf_counter()
+    if calc.engine == "sql":
+        frames = {
+            column: getattr(calc, method)(None, start, end)
+            for column, method in METRICS.items()
+        }
+    else:
+        combined = calc.get_denominators(None, start, end)
+        frames = {
+            column: combined.loc[combined[column] > 0, ["nhsn_location_code", "month", column]]
+            for column in METRICS
+        }
+    return time.perf_counter() - started, frames
+
+
+def normalize(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    df = df[["nhsn_location_code", "month", column]].copy()
+    df[column] = df[column].astype("int64")
+    return df.sort_values(["month", "nhsn_location_code"]).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NHSN denominator engines")
+    parser.add_argument("--db-path", type=Path, default=Path(Config.MOCK_CLARITY_DB_PATH))
+    parser.add_argument("--generate", action="store_true", help="Generate mock data first")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.generate:
+        from mock_clarity.generate_data import MockClarityGenerator
+
+        generator = MockClarityGenerator(args.db_path)
+        generator.initialize_database()
+        generator.generate_providers()
+        generator.generate_random_patients(args.patients, args.months)
+        generator.load_to_database()
+
+    if not args.db_path.exists():
+        print(f"Mock Clarity database not found: {args.db_path} (use --generate)")
+        return 1
+
+    end = args.end or date.today()
+    start = args.start or end.replace(year=end.year - 1)
+    connection_string = f"sqlite:///{args.db_path}"
+
+    print(f"Database: {args.db_path}")
+    print(f"Range:    {start} to {end}\n")
+
+    results = {}
+    for engine in ("sql", "vectorized"):
+        calc = DenominatorCalculator(connection_string, engine=engine)
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, frames = run_engine(calc, start, end)
+            timings.append(elapsed)
+        results[engine] = frames
+        print(f"{engine:>10}: best {min(timings) * 1000:8.1f} ms  "
+              f"(mean {sum(timings) / len(timings) * 1000:8.1f} ms over {args.repeat})")
+
+    mismatches = 0
+    for column in METRICS:
+        expected = normalize(results["sql"][column], column)
+        actual = normalize(results["vectorized"][column], column)
+        if not expected.equals(actual):
+            mismatches += 1
+            print(f"\nMISMATCH in {column}:")
+            print(expected.merge(actual, on=["nhsn_location_code", "month"],
+                                 how="outer", suffixes=("_sql", "_vectorized")))
+        else:
+            print(f"{column:>22}: {len(actual)} rows, {int(actual[column].sum())} total - match")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
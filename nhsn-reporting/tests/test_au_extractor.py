@@ -68,7 +68,7 @@ class TestAUDataExtractor:
             );
 
             CREATE TABLE MAR_ADMIN_INFO (
-                MAR_ADMIN_INFO_ID INTEGER PRIMARY KEY,
+                MAR_ADMIN_ID INTEGER PRIMARY KEY,
                 ORDER_MED_ID INTEGER,
                 TAKEN_TIME DATETIME,
                 ACTION_NAME TEXT,
@@ -167,11 +167,14 @@ class TestAUDataExtractor:
         os.unlink(db_path)
 
     @pytest.fixture
-    def extractor(self, temp_db):
+    def extractor(self, temp_db, tmp_path):
         """Create extractor with temp database."""
         from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
 
-        return AUDataExtractor(f"sqlite:///{temp_db}")
+        return AUDataExtractor(
+            f"sqlite:///{temp_db}", fact_table=AUFactTable(tmp_path / "nhsn.db")
+        )
 
     def test_get_antimicrobial_administrations(self, extractor):
         """Test raw administration data retrieval."""
@@ -225,6 +228,96 @@ class TestAUDataExtractor:
         assert len(cro_ward) == 1
         assert cro_ward.iloc[0]["days_of_therapy"] == 2
 
+    def test_overlapping_fact_refreshes_add_administrations_once(self, temp_db, tmp_path):
+        """A refresh that finishes while another is in flight is not double-counted."""
+        from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
+
+        facts = AUFactTable(tmp_path / "nhsn.db")
+        first = AUDataExtractor(f"sqlite:///{temp_db}", engine="facts", fact_table=facts)
+        second = AUDataExtractor(f"sqlite:///{temp_db}", engine="facts", fact_table=facts)
+
+        # The second refresh completes after the first has read the
+        # watermark but before it applies its batch
+        apply = facts.apply
+
+        def apply_after_second_refresh(*args, **kwargs):
+            del facts.apply
+            assert second.refresh_facts() > 0
+            return apply(*args, **kwargs)
+
+        facts.apply = apply_after_second_refresh
+        assert first.refresh_facts() == 0
+        assert first.refresh_facts() == 0
+
+        ddd = facts.ddd(None, date(2026, 1, 1), date(2026, 1, 31))
+        van_icu = ddd[(ddd["nhsn_code"] == "VAN") & (ddd["nhsn_location_code"] == "ICU-A")]
+        assert van_icu.iloc[0]["total_grams"] == pytest.approx(5.5, rel=0.01)
+        dot = facts.dot(None, date(2026, 1, 1), date(2026, 1, 31))
+        van_dot = dot[(dot["nhsn_code"] == "VAN") & (dot["nhsn_location_code"] == "ICU-A")]
+        assert van_dot["days_of_therapy"].sum() == 4
+
+    def test_rebuild_serves_old_facts_until_it_commits(self, temp_db, tmp_path):
+        """A rebuild never exposes an empty table, even when it fails."""
+        import sqlite3
+        from unittest.mock import Mock
+
+        from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
+
+        facts = AUFactTable(tmp_path / "nhsn.db")
+        extractor = AUDataExtractor(f"sqlite:///{temp_db}", engine="facts", fact_table=facts)
+        extractor.refresh_facts()
+
+        def total_dot():
+            return facts.dot(None, date(2026, 1, 1), date(2026, 1, 31))["days_of_therapy"].sum()
+
+        before = total_dot()
+        apply = facts.apply
+        seen = []
+
+        def apply_after_reading(*args, **kwargs):
+            seen.append(total_dot())
+            return apply(*args, **kwargs)
+
+        facts.apply = apply_after_reading
+        assert extractor.rebuild_facts() > 0
+        assert seen == [before]
+        assert total_dot() == before
+
+        facts.apply = Mock(side_effect=sqlite3.OperationalError("database is locked"))
+        with pytest.raises(sqlite3.OperationalError):
+            extractor.rebuild_facts()
+
+        assert extractor._facts_refreshed_at is None
+        assert total_dot() == before
+
+    def test_fact_engine_matches_sql_engine(self, temp_db, tmp_path):
+        """DOT and DDD rolled up from the facts match the direct MAR queries."""
+        from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
+
+        facts = AUDataExtractor(
+            f"sqlite:///{temp_db}", engine="facts", fact_table=AUFactTable(tmp_path / "nhsn.db")
+        )
+        sql = AUDataExtractor(f"sqlite:///{temp_db}", engine="sql")
+        start, end = date(2026, 1, 1), date(2026, 1, 31)
+        assert facts.refresh_facts() > 0
+
+        keys = ["nhsn_location_code", "month", "nhsn_code"]
+        dot_facts = facts.calculate_dot(start_date=start, end_date=end)
+        dot_sql = sql.calculate_dot(start_date=start, end_date=end)
+        merged = dot_facts.merge(dot_sql, on=keys + ["route"], suffixes=("_facts", "_sql"))
+        assert len(merged) == len(dot_sql) == len(dot_facts) == 3
+        assert (merged["days_of_therapy_facts"] == merged["days_of_therapy_sql"]).all()
+
+        ddd_facts = facts.calculate_ddd(start_date=start, end_date=end)
+        ddd_sql = sql.calculate_ddd(start_date=start, end_date=end)
+        merged = ddd_facts.merge(ddd_sql, on=keys, suffixes=("_facts", "_sql"))
+        assert len(merged) == len(ddd_sql) == len(ddd_facts) == 3
+        for col in ("total_grams", "defined_daily_doses"):
+            assert merged[f"{col}_facts"].tolist() == pytest.approx(merged[f"{col}_sql"].tolist())
+
     def test_calculate_ddd(self, extractor):
         """Test DDD calculation."""
         df = extractor.calculate_ddd(
@@ -356,7 +449,7 @@ class TestAUDataExtractorEdgeCases:
                 ADMIN_ROUTE TEXT
             );
             CREATE TABLE MAR_ADMIN_INFO (
-                MAR_ADMIN_INFO_ID INTEGER PRIMARY KEY,
+                MAR_ADMIN_ID INTEGER PRIMARY KEY,
                 ORDER_MED_ID INTEGER,
                 TAKEN_TIME DATETIME,
                 ACTION_NAME TEXT,
@@ -371,22 +464,28 @@ class TestAUDataExtractorEdgeCases:
         yield db_path
         os.unlink(db_path)
 
-    def test_empty_database(self, minimal_db):
+    def test_empty_database(self, minimal_db, tmp_path):
         """Test with completely empty tables."""
         from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
 
-        extractor = AUDataExtractor(f"sqlite:///{minimal_db}")
+        extractor = AUDataExtractor(
+            f"sqlite:///{minimal_db}", fact_table=AUFactTable(tmp_path / "nhsn.db")
+        )
         df = extractor.calculate_dot(
             start_date=date(2026, 1, 1),
             end_date=date(2026, 1, 31),
         )
         assert df.empty
 
-    def test_monthly_summary_empty(self, minimal_db):
+    def test_monthly_summary_empty(self, minimal_db, tmp_path):
         """Test monthly summary with no data."""
         from nhsn_src.data.au_extractor import AUDataExtractor
+        from nhsn_src.data.au_facts import AUFactTable
 
-        extractor = AUDataExtractor(f"sqlite:///{minimal_db}")
+        extractor = AUDataExtractor(
+            f"sqlite:///{minimal_db}", fact_table=AUFactTable(tmp_path / "nhsn.db")
+        )
         summary = extractor.get_monthly_summary(
             start_date=date(2026, 1, 1),
             end_date=date(2026, 1, 31),
@@ -0,0 +1,109 @@
+"""Tests for the AU patient-drug-day fact table."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from nhsn_src.data.au_facts import FACT_COLUMNS, AUFactTable
+
+
+def _facts(*rows):
+    """Build a facts frame from (mrn, location, day, code, route, grams) tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "patient_mrn": mrn,
+                "encounter_id": "1",
+                "location_code": loc,
+                "admin_date": day,
+                "month": day[:7],
+                "antimicrobial_code": code,
+                "antimicrobial_class": "Glycopeptides" if code == "VAN" else "Other",
+                "antimicrobial_name": code.lower(),
+                "route": route,
+                "ddd_standard": 2.0,
+                "ddd_unit": "g",
+                "total_grams": grams,
+                "doses_administered": 1,
+                "last_mar_id": i + 1,
+            }
+            for i, (mrn, loc, day, code, route, grams) in enumerate(rows)
+        ],
+        columns=FACT_COLUMNS,
+    )
+
+
+@pytest.fixture
+def facts(tmp_path):
+    return AUFactTable(tmp_path / "nhsn.db")
+
+
+class TestAUFactTable:
+    """Tests for incremental application and rollups."""
+
+    def test_new_doses_add_to_existing_patient_day(self, facts):
+        facts.apply(_facts(("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0)), 10, "src")
+        facts.apply(_facts(
+            ("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0),
+            ("MRN1", "ICU-A", "2026-01-03", "VAN", "IV", 1.0),
+        ), 12, "src")
+
+        dot = facts.dot(None, date(2026, 1, 1), date(2026, 1, 31))
+        ddd = facts.ddd(None, date(2026, 1, 1), date(2026, 1, 31))
+
+        assert facts.get_watermark("src") == 12
+        assert dot.iloc[0]["days_of_therapy"] == 2
+        assert ddd.iloc[0]["total_grams"] == pytest.approx(3.0)
+        assert ddd.iloc[0]["defined_daily_doses"] == pytest.approx(1.5)
+
+    def test_rollup_filters(self, facts):
+        facts.apply(_facts(
+            ("MRN1", "ICU-A", "2026-01-31", "VAN", "IV", 1.0),
+            ("MRN2", "ICU-A", "2026-02-01", "VAN", "IV", 1.0),
+            ("MRN3", "WARD-B", "2026-01-05", "LZD", "PO", 0.6),
+        ), 3, "src")
+
+        dot = facts.dot(None, date(2026, 1, 1), date(2026, 1, 31), include_oral=False)
+        assert dot[["nhsn_location_code", "month", "days_of_therapy"]].values.tolist() == [
+            ["ICU-A", "2026-01", 1],
+        ]
+        assert len(facts.dot(["WARD-B"], date(2026, 1, 1), date(2026, 2, 28))) == 1
+
+        drill = facts.patient_days(["ICU-A"], date(2026, 1, 1), date(2026, 2, 28), "VAN")
+        assert drill["patient_id"].tolist() == ["MRN1", "MRN2"]
+
+    def test_facts_from_another_source_are_replaced(self, facts):
+        facts.apply(_facts(("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0)), 50, "prod")
+        assert facts.get_watermark("mock") == 0
+
+        facts.apply(_facts(("MRN9", "ICU-A", "2026-01-02", "VAN", "IV", 1.0)), 5, "mock")
+
+        assert facts.get_watermark("prod") == 0
+        drill = facts.patient_days(None, date(2026, 1, 1), date(2026, 1, 31))
+        assert drill["patient_id"].tolist() == ["MRN9"]
+
+    def test_batch_read_before_another_refresh_is_dropped(self, facts):
+        facts.apply(_facts(("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0)), 10, "src", after_id=0)
+        # A second refresh that also read watermark 0 overlaps those rows
+        written = facts.apply(_facts(
+            ("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0),
+            ("MRN1", "ICU-A", "2026-01-03", "VAN", "IV", 1.0),
+        ), 12, "src", after_id=0)
+
+        assert written == 0
+        assert facts.get_watermark("src") == 10
+        ddd = facts.ddd(None, date(2026, 1, 1), date(2026, 1, 31))
+        assert ddd.iloc[0]["total_grams"] == pytest.approx(1.0)
+
+        facts.apply(_facts(("MRN1", "ICU-A", "2026-01-03", "VAN", "IV", 1.0)), 12, "src", after_id=10)
+        assert facts.get_watermark("src") == 12
+
+    def test_replace_discards_existing_facts(self, facts):
+        facts.apply(_facts(("MRN1", "ICU-A", "2026-01-02", "VAN", "IV", 1.0)), 10, "src")
+
+        facts.apply(_facts(("MRN2", "ICU-A", "2026-01-02", "VAN", "IV", 2.0)), 8, "src", replace=True)
+
+        assert facts.get_watermark("src") == 8
+        drill = facts.patient_days(None, date(2026, 1, 1), date(2026, 1, 31))
+        assert drill["patient_id"].tolist() == ["MRN2"]
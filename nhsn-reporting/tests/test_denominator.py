@@ -0,0 +1,67 @@
+"""Tests for the vectorized denominator engine."""
+
+from datetime import date
+
+import pandas as pd
+
+from nhsn_src.data.denominator import (
+    _device_days_by_month,
+    _metric_frame,
+    _patient_days_by_month,
+)
+
+
+class TestPatientDaysByMonth:
+    """Tests for splitting stays at month boundaries."""
+
+    def test_stay_split_across_months(self):
+        stays = pd.DataFrame({
+            "nhsn_location_code": ["T5A"],
+            "hosp_admit_dttm": ["2025-01-30 08:00:00"],
+            "hosp_disch_dttm": ["2025-02-02 11:00:00"],
+        })
+
+        df = _patient_days_by_month(stays, date(2025, 1, 1), date(2025, 3, 31))
+
+        # Admit and discharge days both count, like the recursive CTE
+        assert df.to_dict("records") == [
+            {"nhsn_location_code": "T5A", "month": "2025-01", "patient_days": 2},
+            {"nhsn_location_code": "T5A", "month": "2025-02", "patient_days": 2},
+        ]
+
+    def test_long_open_stay_clipped_to_range(self):
+        stays = pd.DataFrame({
+            "nhsn_location_code": ["NICU", "NICU"],
+            "hosp_admit_dttm": ["2024-06-01 00:00:00", "2025-02-10 00:00:00"],
+            "hosp_disch_dttm": [None, "2025-02-10 12:00:00"],
+        })
+
+        df = _patient_days_by_month(stays, date(2025, 1, 15), date(2025, 3, 10))
+
+        assert df.set_index("month")["patient_days"].to_dict() == {
+            "2025-01": 17,
+            "2025-02": 28 + 1,
+            "2025-03": 10,
+        }
+
+
+class TestDeviceDaysByMonth:
+    """Tests for summing flagged device patient-days."""
+
+    def test_flags_summed_per_location_and_month(self):
+        patient_days = pd.DataFrame({
+            "nhsn_location_code": ["T5A", "T5A", "T5A", "G3P"],
+            "pat_id": [1, 1, 2, 3],
+            "census_date": ["2025-01-31", "2025-02-01", "2025-01-31", "2025-01-31"],
+            "central_line": [1, 1, 0, 1],
+            "urinary_catheter": [0, 1, 1, 0],
+            "ventilator": [0, 0, 0, 0],
+        })
+
+        df = _device_days_by_month(patient_days)
+
+        t5a_jan = df[(df["nhsn_location_code"] == "T5A") & (df["month"] == "2025-01")].iloc[0]
+        assert t5a_jan["central_line_days"] == 1
+        assert t5a_jan["urinary_catheter_days"] == 1
+        assert len(_metric_frame(df, "ventilator_days")) == 0
+        assert len(_metric_frame(df, "central_line_days")) == 3
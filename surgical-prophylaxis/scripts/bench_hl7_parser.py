@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Benchmark HL7 parsing: the former eager parser vs the lazy parser.
+
+Each run parses ADT^A02, ORM^O01 and SIU^S12 samples and reads what the
+real-time service reads from them (message type/event/control ID, MSH-7,
+then the extract_*_data fields), so the lazy parser pays for every field
+it is asked for. The former parser split every segment and field up front
+and tried strptime formats in turn, building a throwaway
+datetime.now().strftime() per format to get lengths.
+
+Usage:
+    python scripts/bench_hl7_parser.py
+    python scripts/bench_hl7_parser.py --messages 20000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.realtime import hl7_parser
+from src.realtime.hl7_load_test import sample_message
+from src.realtime.hl7_parser import (
+    COMPONENT_DELIMITER,
+    FIELD_DELIMITER,
+    SEGMENT_DELIMITER,
+    HL7Message,
+    HL7Segment,
+    extract_adt_a02_data,
+    extract_orm_o01_data,
+    extract_siu_s12_data,
+    parse_hl7_message,
+)
+
+EXTRACTORS = {
+    "ADT": extract_adt_a02_data,
+    "ORM": extract_orm_o01_data,
+    "SIU": extract_siu_s12_data,
+}
+
+
+def former_parse_hl7_datetime(dt_string):
+    """parse_hl7_datetime as it was before the fixed-width decoder."""
+    if not dt_string:
+        return None
+    dt_string = dt_string.split("+")[0].split("-")[0]
+    for fmt in ("%Y%m%d%H%M%S", "%Y%m%d%H%M%S.%f", "%Y%m%d%H%M", "%Y%m%d"):
+        try:
+            expected_len = len(datetime.now().strftime(fmt).replace(".", ""))
+            truncated = dt_string[:expected_len] if "." not in fmt else dt_string
+            return datetime.strptime(truncated, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def former_parse_hl7_message(raw_message):
+    """parse_hl7_message as it was before lazy parsing: split everything."""
+    raw_message = raw_message.replace("\r\n", "\r").replace("\n", "\r")
+    raw_message = raw_message.strip("\x0b\x1c\r")
+
+    segments = {}
+    for line in raw_message.split(SEGMENT_DELIMITER):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("MSH"):
+            segment_type = "MSH"
+            fields = ["", FIELD_DELIMITER] + line[4:].split(FIELD_DELIMITER)
+        else:
+            fields = line.split(FIELD_DELIMITER)
+            segment_type = fields[0]
+        segments.setdefault(segment_type, []).append(
+            HL7Segment(segment_type=segment_type, fields=fields)
+        )
+
+    # Build with the eager segment lists in place of the boundary index
+    message = HL7Message(raw=raw_message)
+    message._segments = segments
+    message._segment_index = dict.fromkeys(segments, ())
+    msh = message.get_segment("MSH")
+    if msh:
+        type_parts = msh.get_field(9).split(COMPONENT_DELIMITER)
+        message.message_type = type_parts[0] if type_parts else ""
+        message.message_event = type_parts[1] if len(type_parts) > 1 else ""
+        message.message_control_id = msh.get_field(10)
+        message.message_datetime = former_parse_hl7_datetime(msh.get_field(7))
+    return message
+
+
+def sample_messages(count: int) -> list[str]:
+    """Samples with distinct timestamps so the datetime cache is not flattering."""
+    messages = []
+    for i in range(count):
+        _, message = sample_message(i)
+        stamp = f"2026{1 + i % 12:02d}{1 + i % 28:02d}{i % 24:02d}{i % 60:02d}{(i * 7) % 60:02d}"
+        messages.append(message.replace(message.split(FIELD_DELIMITER, 7)[6], stamp))
+    return messages
+
+
+def consume(message) -> None:
+    """Read what the service reads from a message."""
+    message.message_datetime
+    extractor = EXTRACTORS.get(message.message_type)
+    if extractor:
+        extractor(message)
+
+
+def run(parse, messages: list[str], repeat: int, former_datetimes: bool = False) -> float:
+    """Best messages/sec over repeat runs."""
+    original = hl7_parser.parse_hl7_datetime
+    if former_datetimes:
+        hl7_parser.parse_hl7_datetime = former_parse_hl7_datetime
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            hl7_parser._decode_hl7_datetime.cache_clear()
+            start = time.perf_counter()
+            for raw in messages:
+                consume(parse(raw))
+            best = min(best, time.perf_counter() - start)
+    finally:
+        hl7_parser.parse_hl7_datetime = original
+    return len(messages) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HL7 parser benchmark")
+    parser.add_argument("--messages", type=int, default=10000, help="Messages per run (ADT/ORM/SIU mix)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    messages = sample_messages(args.messages)
+    print(f"{len(messages)} messages (ADT^A02 / ORM^O01 / SIU^S12)\n")
+
+    before = run(former_parse_hl7_message, messages, args.repeat, former_datetimes=True)
+    after = run(parse_hl7_message, messages, args.repeat)
+    header_only = len(messages) / min(
+        _timed_header_only(messages) for _ in range(args.repeat)
+    )
+
+    print(f"{'before (eager split, strptime)':<40} {before:>10,.0f} msg/s")
+    print(f"{'after (lazy, fixed-width datetimes)':<40} {after:>10,.0f} msg/s  ({after / before:.1f}x)")
+    print(f"{'after, MSH routing fields only':<40} {header_only:>10,.0f} msg/s  ({header_only / before:.1f}x)")
+
+
+def _timed_header_only(messages: list[str]) -> float:
+    start = time.perf_counter()
+    for raw in messages:
+        parse_hl7_message(raw).message_type
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
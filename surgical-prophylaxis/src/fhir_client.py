@@ -10,12 +10,20 @@ Queries Epic FHIR API for:
 """
 
 import os
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, Optional
-from urllib.parse import urljoin
 
 import requests
 
+# Add project root to path for common module imports
+_project_root = Path(__file__).resolve().parents[2]
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.fhir_client import get_shared_fhir_client
+
 from .config import FHIR_BASE_URL, CPT_CATEGORY_HINTS
 from .models import (
     MedicationAdministration,
@@ -31,18 +39,15 @@ class FHIRClient:
     def __init__(self, base_url: Optional[str] = None, timeout: int = 30):
         self.base_url = base_url or FHIR_BASE_URL
         self.timeout = timeout
-        self.session = requests.Session()
         # Add auth headers if needed
         auth_token = os.getenv("FHIR_AUTH_TOKEN")
-        if auth_token:
-            self.session.headers["Authorization"] = f"Bearer {auth_token}"
+        headers = {"Authorization": f"Bearer {auth_token}"} if auth_token else None
+        self.client = get_shared_fhir_client(self.base_url, headers=headers)
+        self.session = self.client.session
 
     def _get(self, endpoint: str, params: Optional[dict] = None) -> dict:
         """Make GET request to FHIR endpoint."""
-        url = urljoin(self.base_url.rstrip("/") + "/", endpoint.lstrip("/"))
-        response = self.session.get(url, params=params, timeout=self.timeout)
-        response.raise_for_status()
-        return response.json()
+        return self.client.get(endpoint.lstrip("/"), params, timeout=self.timeout)
 
     def _get_all_pages(self, endpoint: str, params: Optional[dict] = None) -> list[dict]:
         """Get all pages of a FHIR search result."""
@@ -62,7 +67,7 @@ class FHIRClient:
                 break
 
             # Fetch next page
-            response = self.session.get(next_link["url"], timeout=self.timeout).json()
+            response = self.client.get(next_link["url"], timeout=self.timeout)
 
         return results
 
@@ -17,6 +17,7 @@ sys.path.insert(0, str(__file__).rsplit("/", 3)[0])
 
 from common.alert_store.models import AlertType, AlertStatus
 from common.alert_store.store import AlertStore
+from common.fhir_client import end_fhir_cycle
 
 from .config import ALERT_DB_PATH, get_config
 from .database import ProphylaxisDatabase
@@ -130,6 +131,7 @@ class SurgicalProphylaxisMonitor:
             f"Completed: {len(evaluations)} evaluations, "
             f"{alerts_created} alerts created"
         )
+        end_fhir_cycle("surgical-prophylaxis")
 
         return evaluations
 
@@ -23,7 +23,7 @@ from .preop_checker import PreOpCheckResult, PreOpChecker
 from .escalation_engine import EscalationRule, EscalationEngine, AlertTrigger
 from .state_manager import StateManager, SurgicalJourney
 from .epic_chat import EpicSecureChat
-from .hl7_listener import HL7MLLPServer, MessageHandler
+from .hl7_listener import HL7MLLPServer, MessageHandler, MLLPFramer
 from .service import RealtimeProphylaxisService
 
 __all__ = [
@@ -53,6 +53,7 @@ __all__ = [
     # HL7 Server
     "HL7MLLPServer",
     "MessageHandler",
+    "MLLPFramer",
     # Main Service
     "RealtimeProphylaxisService",
 ]
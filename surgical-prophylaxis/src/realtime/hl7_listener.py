@@ -19,6 +19,103 @@ logger = logging.getLogger(__name__)
 MLLP_START = b"\x0b"  # VT (vertical tab)
 MLLP_END = b"\x1c\r"  # FS CR (file separator + carriage return)
 
+# Socket read size and per-message limit
+READ_CHUNK_SIZE = 64 * 1024
+MAX_MESSAGE_BYTES = 1024 * 1024  # 1MB
+
+
+class MLLPFramer:
+    """
+    Incremental MLLP frame decoder.
+
+    Bytes are appended to one reusable bytearray and every complete frame
+    in it is returned, so back-to-back (pipelined) messages arriving in the
+    same read are all delivered, in order. Bytes outside a frame are
+    skipped; a frame exceeding max_message_bytes is dropped and decoding
+    resumes at the next start byte.
+
+    Usage:
+        framer = MLLPFramer()
+        for payload in framer.feed(chunk):
+            ...
+    """
+
+    def __init__(self, max_message_bytes: int = MAX_MESSAGE_BYTES):
+        self.max_message_bytes = max_message_bytes
+        self._buffer = bytearray()
+        self._in_frame = False
+        self._scan_from = 0  # Where to resume searching for the end frame
+
+        # Statistics
+        self.frames = 0
+        self.bytes_skipped = 0
+        self.frames_oversized = 0
+
+    @property
+    def buffered(self) -> int:
+        """Bytes of an incomplete frame held in the buffer."""
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """
+        Add received bytes and return the payloads of all completed frames.
+
+        Args:
+            data: Bytes read from the connection
+
+        Returns:
+            Message payloads (framing removed), in arrival order
+        """
+        buffer = self._buffer
+        buffer += data
+        messages: list[bytes] = []
+        pos = 0
+
+        while pos < len(buffer):
+            if not self._in_frame:
+                start = buffer.find(MLLP_START, pos)
+                if start < 0:
+                    self.bytes_skipped += len(buffer) - pos
+                    pos = len(buffer)
+                    break
+                self.bytes_skipped += start - pos
+                pos = start + 1
+                self._in_frame = True
+                self._scan_from = pos
+
+            end = buffer.find(MLLP_END, self._scan_from)
+            if end < 0:
+                if len(buffer) - pos > self.max_message_bytes:
+                    logger.error("Message too large, discarding")
+                    self.frames_oversized += 1
+                    self.bytes_skipped += len(buffer) - pos
+                    self._in_frame = False
+                    pos = len(buffer)
+                else:
+                    # FS may be the last byte, with CR in the next read
+                    self._scan_from = max(pos, len(buffer) - len(MLLP_END) + 1)
+                break
+
+            if end - pos > self.max_message_bytes:
+                logger.error("Message too large, discarding")
+                self.frames_oversized += 1
+                self.bytes_skipped += end - pos
+            else:
+                messages.append(bytes(buffer[pos:end]))
+                self.frames += 1
+            pos = end + len(MLLP_END)
+            self._in_frame = False
+
+        # Drop consumed bytes once per feed; the bytearray keeps its storage
+        del buffer[:pos]
+        self._scan_from = max(0, self._scan_from - pos)
+        return messages
+
+
+def frame_mllp_message(message: str) -> bytes:
+    """Wrap an HL7 message string in MLLP framing."""
+    return MLLP_START + message.encode("utf-8") + MLLP_END
+
 
 @dataclass
 class HL7ListenerConfig:
@@ -30,6 +127,7 @@ class HL7ListenerConfig:
     max_connections: int = 10
     receive_timeout: float = 30.0
     send_ack: bool = True
+    queue_size: int = 100  # Parsed messages waiting for the handler, per connection
 
     @classmethod
     def from_env(cls) -> "HL7ListenerConfig":
@@ -43,6 +141,7 @@ class HL7ListenerConfig:
             max_connections=int(os.getenv("HL7_MAX_CONNECTIONS", "10")),
             receive_timeout=float(os.getenv("HL7_RECEIVE_TIMEOUT", "30.0")),
             send_ack=os.getenv("HL7_SEND_ACK", "true").lower() == "true",
+            queue_size=int(os.getenv("HL7_QUEUE_SIZE", "100")),
         )
 
 
@@ -151,12 +250,22 @@ class HL7MLLPServer:
         # Statistics
         self.connections_total = 0
         self.connections_active = 0
+        self.bytes_received = 0
+        self.frames_oversized = 0
+        self.queue_high_water = 0
 
     @property
     def is_running(self) -> bool:
         """Check if server is running."""
         return self._running
 
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Port the server is listening on (differs from config.port when that is 0)."""
+        if not self._server or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
     async def start(self) -> None:
         """Start the MLLP server."""
         if not self.config.enabled:
@@ -171,7 +280,7 @@ class HL7MLLPServer:
             self._handle_client,
             self.config.host,
             self.config.port,
-            limit=64 * 1024,  # 64KB buffer
+            limit=READ_CHUNK_SIZE,
         )
 
         self._running = True
@@ -214,7 +323,15 @@ class HL7MLLPServer:
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
     ) -> None:
-        """Handle a client connection."""
+        """
+        Handle a client connection.
+
+        A reader task frames and parses incoming messages into a bounded
+        queue while this task handles them and sends ACKs one at a time,
+        so messages are processed and acknowledged in arrival order. When
+        the queue is full the reader stops reading, pushing back on the
+        sender through TCP.
+        """
         self.connections_total += 1
         self.connections_active += 1
 
@@ -225,19 +342,22 @@ class HL7MLLPServer:
         task = asyncio.current_task()
         self._connections.add(task)
 
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.queue_size))
+        read_task = asyncio.create_task(self._read_messages(reader, queue, peer))
+
         try:
             while self._running:
-                # Read message with MLLP framing
-                message_bytes = await self._read_mllp_message(reader)
-
-                if not message_bytes:
+                item = await queue.get()
+                if item is None:
                     break  # Connection closed
 
-                # Parse message
-                try:
-                    message_str = message_bytes.decode("utf-8", errors="replace")
-                    message = parse_hl7_message(message_str)
+                message, error = item
+                if message is None:
+                    # Unparseable: there is no control ID to acknowledge
+                    logger.error(f"Error processing message from {peer}: {error}")
+                    continue
 
+                try:
                     logger.debug(
                         f"Received {message.message_type}^{message.message_event} "
                         f"from {peer}"
@@ -258,7 +378,6 @@ class HL7MLLPServer:
                     # Send error ACK
                     if self.config.send_ack:
                         try:
-                            message = parse_hl7_message(message_bytes.decode("utf-8", errors="replace"))
                             ack = build_ack_message(message, "AE", str(e))
                             await self._send_mllp_message(writer, ack)
                         except Exception:
@@ -269,6 +388,8 @@ class HL7MLLPServer:
         except Exception as e:
             logger.error(f"Connection error from {peer}: {e}")
         finally:
+            read_task.cancel()
+            await asyncio.gather(read_task, return_exceptions=True)
             self.connections_active -= 1
             self._connections.discard(task)
 
@@ -280,51 +401,53 @@ class HL7MLLPServer:
 
             logger.debug(f"HL7 connection closed from {peer}")
 
-    async def _read_mllp_message(
+    async def _read_messages(
         self,
         reader: asyncio.StreamReader,
-    ) -> Optional[bytes]:
-        """Read a single MLLP-framed message."""
-        try:
-            # Read until we find the start byte
-            while True:
-                byte = await asyncio.wait_for(
-                    reader.read(1),
-                    timeout=self.config.receive_timeout,
-                )
-
-                if not byte:
-                    return None  # Connection closed
-
-                if byte == MLLP_START:
-                    break
+        queue: asyncio.Queue,
+        peer: Any,
+    ) -> None:
+        """
+        Frame and parse messages from a connection into its queue.
 
-            # Read until end frame
-            data = b""
+        Queues (message or None, parse error or None) per message, then
+        None when the connection closes or goes idle for receive_timeout.
+        """
+        framer = MLLPFramer()
+        try:
             while True:
-                chunk = await asyncio.wait_for(
-                    reader.read(4096),
-                    timeout=self.config.receive_timeout,
-                )
-
+                chunk = await self._read_chunk(reader)
                 if not chunk:
-                    return None
-
-                data += chunk
-
-                # Check for end frame
-                if MLLP_END in data:
-                    # Extract message (remove end frame)
-                    end_pos = data.index(MLLP_END)
-                    return data[:end_pos]
+                    break  # Connection closed or idle
+
+                self.bytes_received += len(chunk)
+                for message_bytes in framer.feed(chunk):
+                    try:
+                        item = (parse_hl7_message(message_bytes.decode("utf-8", errors="replace")), None)
+                    except Exception as e:
+                        item = (None, e)
+                    await queue.put(item)
+                    self.queue_high_water = max(self.queue_high_water, queue.qsize())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Read error from {peer}: {e}")
+        finally:
+            self.frames_oversized += framer.frames_oversized
+            if framer.buffered:
+                logger.warning(f"Connection from {peer} closed mid-message ({framer.buffered} bytes)")
 
-                # Prevent unbounded growth
-                if len(data) > 1024 * 1024:  # 1MB limit
-                    logger.error("Message too large, discarding")
-                    return None
+        await queue.put(None)
 
+    async def _read_chunk(self, reader: asyncio.StreamReader) -> bytes:
+        """Read whatever is available, up to READ_CHUNK_SIZE; b"" on close or timeout."""
+        try:
+            return await asyncio.wait_for(
+                reader.read(READ_CHUNK_SIZE),
+                timeout=self.config.receive_timeout,
+            )
         except asyncio.TimeoutError:
-            return None
+            return b""
 
     async def _send_mllp_message(
         self,
@@ -332,8 +455,7 @@ class HL7MLLPServer:
         message: str,
     ) -> None:
         """Send an MLLP-framed message."""
-        framed = MLLP_START + message.encode("utf-8") + MLLP_END
-        writer.write(framed)
+        writer.write(frame_mllp_message(message))
         await writer.drain()
 
     def get_stats(self) -> dict:
@@ -344,6 +466,10 @@ class HL7MLLPServer:
             "port": self.config.port,
             "connections_total": self.connections_total,
             "connections_active": self.connections_active,
+            "bytes_received": self.bytes_received,
+            "frames_oversized": self.frames_oversized,
+            "queue_size": self.config.queue_size,
+            "queue_high_water": self.queue_high_water,
             "handler_stats": self.handler.get_stats(),
         }
 
@@ -401,28 +527,22 @@ class HL7TestClient:
             reader, writer = await asyncio.open_connection(self.host, self.port)
 
             # Send MLLP-framed message
-            framed = MLLP_START + message.encode("utf-8") + MLLP_END
-            writer.write(framed)
+            writer.write(frame_mllp_message(message))
             await writer.drain()
 
             # Read ACK
-            data = b""
-            while MLLP_END not in data:
+            framer = MLLPFramer()
+            acks: list[bytes] = []
+            while not acks:
                 chunk = await asyncio.wait_for(reader.read(4096), timeout=10.0)
                 if not chunk:
                     break
-                data += chunk
+                acks = framer.feed(chunk)
 
             writer.close()
             await writer.wait_closed()
 
-            # Parse response
-            if MLLP_START in data and MLLP_END in data:
-                start = data.index(MLLP_START) + 1
-                end = data.index(MLLP_END)
-                return data[start:end].decode("utf-8")
-
-            return None
+            return acks[0].decode("utf-8") if acks else None
 
         except Exception as e:
             logger.error(f"Error sending HL7 message: {e}")
@@ -0,0 +1,250 @@
+"""
+Load-test client for the HL7 MLLP listener.
+
+Sends ADT^A02, ORM^O01 and SIU^S12 messages over one or more connections,
+keeping a window of unacknowledged messages in flight the way an interface
+engine pipelines them. Every ACK is checked against the message it should
+answer (same control ID, same order), and sustained messages/sec and ACK
+latency are reported.
+
+Usage:
+    # Against a running listener
+    python -m src.realtime.hl7_load_test --host localhost --port 2575
+
+    # Self-contained: starts an in-process listener with no-op handlers
+    python -m src.realtime.hl7_load_test --self-host --messages 20000 --window 50
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .hl7_listener import (
+    HL7ListenerConfig,
+    HL7MLLPServer,
+    MessageHandler,
+    MLLPFramer,
+    frame_mllp_message,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def sample_message(index: int) -> tuple[str, str]:
+    """
+    Build a test message, cycling through ADT^A02, ORM^O01 and SIU^S12.
+
+    Returns:
+        (message control ID, message string)
+    """
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    control_id = f"LOAD{index:08d}"
+    mrn = f"{100000 + index % 5000}"
+    kind = index % 3
+
+    msh = f"MSH|^~\\&|LOADTEST|AEGIS|AEGIS|AEGIS|{timestamp}||"
+    if kind == 0:
+        return control_id, (
+            f"{msh}ADT^A02|{control_id}|P|2.5\r"
+            f"EVN|A02|{timestamp}\r"
+            f"PID|||{mrn}^^^HOSPITAL^MR||DOE^JANE|||||||||||\r"
+            f"PV1||I|PREOP^01^A||||||||||||||||V{index}|||||||||||||||||||||||||||OR^02^A\r"
+        )
+    if kind == 1:
+        return control_id, (
+            f"{msh}ORM^O01|{control_id}|P|2.5\r"
+            f"PID|||{mrn}^^^HOSPITAL^MR||DOE^JANE|||||||||||\r"
+            f"ORC|NW|ORD{index}|||||^^^{timestamp}\r"
+            f"OBR|1|ORD{index}||47562^LAP CHOLECYSTECTOMY^CPT|||{timestamp}\r"
+        )
+    return control_id, (
+        f"{msh}SIU^S12|{control_id}|P|2.5\r"
+        f"SCH|APT{index}||||||||60|MIN|^^60^{timestamp}\r"
+        f"PID|||{mrn}^^^HOSPITAL^MR||DOE^JANE|||||||||||\r"
+        f"AIL|1||OR^03^A\r"
+    )
+
+
+def _ack_control_id(ack: bytes) -> tuple[str, str]:
+    """(acknowledgment code, control ID) from an ACK's MSA segment."""
+    for segment in ack.decode("utf-8", errors="replace").split("\r"):
+        if segment.startswith("MSA|"):
+            fields = segment.split("|")
+            return (fields[1] if len(fields) > 1 else "", fields[2] if len(fields) > 2 else "")
+    return "", ""
+
+
+@dataclass
+class LoadTestResult:
+    """Outcome of a load test run."""
+
+    messages: int = 0
+    acked: int = 0
+    rejected: int = 0  # ACKs with a code other than AA
+    out_of_order: int = 0  # ACKs whose control ID was not the next one expected
+    elapsed_seconds: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.acked / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def latency_percentile(self, pct: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def summary(self) -> str:
+        return (
+            f"{self.acked}/{self.messages} acknowledged in {self.elapsed_seconds:.2f}s "
+            f"= {self.messages_per_second:,.0f} msg/s; ACK latency p50 "
+            f"{self.latency_percentile(50):.1f} ms, p99 {self.latency_percentile(99):.1f} ms; "
+            f"{self.rejected} not AA, {self.out_of_order} out of order"
+        )
+
+
+async def _run_connection(
+    host: str,
+    port: int,
+    first_index: int,
+    count: int,
+    window: int,
+    result: LoadTestResult,
+) -> None:
+    """Send count messages on one connection with up to window unacknowledged."""
+    reader, writer = await asyncio.open_connection(host, port)
+    in_flight = asyncio.Semaphore(window)
+    expected: deque[tuple[str, float]] = deque()
+
+    async def send() -> None:
+        for index in range(first_index, first_index + count):
+            await in_flight.acquire()
+            control_id, message = sample_message(index)
+            expected.append((control_id, time.perf_counter()))
+            writer.write(frame_mllp_message(message))
+            if in_flight.locked():
+                await writer.drain()
+        await writer.drain()
+
+    async def receive() -> None:
+        framer = MLLPFramer()
+        remaining = count
+        while remaining:
+            chunk = await asyncio.wait_for(reader.read(64 * 1024), timeout=30.0)
+            if not chunk:
+                raise ConnectionError(f"Connection closed with {remaining} ACKs outstanding")
+            for ack in framer.feed(chunk):
+                control_id, sent_at = expected.popleft()
+                code, acked_id = _ack_control_id(ack)
+                result.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+                result.acked += 1
+                if code != "AA":
+                    result.rejected += 1
+                if acked_id != control_id:
+                    result.out_of_order += 1
+                remaining -= 1
+                in_flight.release()
+
+    try:
+        await asyncio.gather(send(), receive())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(
+    host: str = "localhost",
+    port: int = 2575,
+    messages: int = 10000,
+    connections: int = 1,
+    window: int = 50,
+) -> LoadTestResult:
+    """
+    Send messages to an MLLP listener and measure sustained throughput.
+
+    Args:
+        host: Listener host
+        port: Listener port
+        messages: Total messages, split evenly over connections
+        connections: Concurrent connections
+        window: Unacknowledged messages allowed in flight per connection
+            (1 = send, wait for ACK, send next)
+
+    Returns:
+        LoadTestResult with throughput, latency and ACK checks
+    """
+    result = LoadTestResult(messages=messages)
+    per_connection = [
+        messages // connections + (1 if i < messages % connections else 0)
+        for i in range(connections)
+    ]
+    starts = [sum(per_connection[:i]) for i in range(connections)]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _run_connection(host, port, first, count, max(1, window), result)
+        for first, count in zip(starts, per_connection) if count
+    ))
+    result.elapsed_seconds = time.perf_counter() - start
+    return result
+
+
+async def _self_hosted(args) -> LoadTestResult:
+    """Run the load test against an in-process listener with no-op handlers."""
+
+    async def noop(message) -> None:
+        pass
+
+    handler = MessageHandler()
+    handler.on_adt = handler.on_orm = handler.on_siu = noop
+    server = HL7MLLPServer(
+        handler=handler,
+        config=HL7ListenerConfig(host="127.0.0.1", port=0, queue_size=args.queue_size),
+    )
+    await server.start()
+    try:
+        result = await run_load_test(
+            "127.0.0.1", server.bound_port, args.messages, args.connections, args.window,
+        )
+        stats = server.get_stats()
+        print(
+            f"Server: {stats['handler_stats']['messages_received']} handled, "
+            f"queue high water {stats['queue_high_water']}/{stats['queue_size']}"
+        )
+        return result
+    finally:
+        await server.stop()
+
+
+def main():
+    """Entry point for the load test."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HL7 MLLP listener load test")
+    parser.add_argument("--host", default="localhost", help="Listener host")
+    parser.add_argument("--port", type=int, default=2575, help="Listener port")
+    parser.add_argument("--messages", type=int, default=10000, help="Total messages to send")
+    parser.add_argument("--connections", type=int, default=1, help="Concurrent connections")
+    parser.add_argument("--window", type=int, default=50, help="Unacknowledged messages in flight per connection")
+    parser.add_argument("--self-host", action="store_true", help="Start an in-process listener to test against")
+    parser.add_argument("--queue-size", type=int, default=100, help="Listener queue size with --self-host")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.self_host:
+        result = asyncio.run(_self_hosted(args))
+    else:
+        result = asyncio.run(run_load_test(
+            args.host, args.port, args.messages, args.connections, args.window,
+        ))
+    print(result.summary())
+    return 0 if result.acked == result.messages and not result.out_of_order else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
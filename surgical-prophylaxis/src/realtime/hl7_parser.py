@@ -2,11 +2,13 @@
 HL7 v2.x message parsing utilities.
 
 Parses ADT (patient tracking) and ORM (scheduling) messages
-for real-time surgical prophylaxis monitoring.
+for real-time surgical prophylaxis monitoring. Parsing is lazy:
+segment boundaries are indexed up front and fields are split
+only when read.
 """
 
-from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 import logging
 
@@ -21,30 +23,53 @@ ESCAPE_CHAR = "\\"
 SUBCOMPONENT_DELIMITER = "&"
 
 
-@dataclass
 class HL7Segment:
-    """Represents a single HL7 segment."""
+    """
+    Represents a single HL7 segment.
+
+    Fields are split from the raw segment text the first time they are
+    accessed, so segments that are never read cost nothing beyond a slice.
+    """
 
-    segment_type: str
-    fields: list[str] = field(default_factory=list)
+    __slots__ = ("segment_type", "raw", "_fields")
+
+    def __init__(self, segment_type: str, fields: Optional[list[str]] = None, raw: str = ""):
+        self.segment_type = segment_type
+        self.raw = raw
+        self._fields = fields
+
+    @property
+    def fields(self) -> list[str]:
+        """All fields, split on first access."""
+        if self._fields is None:
+            if self.segment_type == "MSH":
+                # MSH-1 is the field separator itself; fields start after "MSH|"
+                self._fields = ["", FIELD_DELIMITER] + self.raw[4:].split(FIELD_DELIMITER)
+            else:
+                self._fields = self.raw.split(FIELD_DELIMITER)
+        return self._fields
+
+    def __repr__(self) -> str:
+        return f"HL7Segment(segment_type={self.segment_type!r}, raw={self.raw!r})"
 
     def get_field(self, index: int, default: str = "") -> str:
         """Get field by 1-based index (HL7 convention)."""
         # HL7 fields are 1-indexed, but segment type is "field 0"
-        actual_index = index
-        if actual_index < len(self.fields):
-            return self.fields[actual_index] or default
+        fields = self.fields
+        if index < len(fields):
+            return fields[index] or default
         return default
 
     def get_component(
         self, field_index: int, component_index: int, default: str = ""
     ) -> str:
         """Get component within a field (both 1-based)."""
-        field_value = self.get_field(field_index)
-        components = field_value.split(COMPONENT_DELIMITER)
-        comp_idx = component_index - 1
-        if 0 <= comp_idx < len(components):
-            return components[comp_idx] or default
+        if component_index < 1:
+            return default
+        # Split only as far as the component asked for
+        components = self.get_field(field_index).split(COMPONENT_DELIMITER, component_index)
+        if component_index <= len(components):
+            return components[component_index - 1] or default
         return default
 
     def get_all_components(self, field_index: int) -> list[str]:
@@ -53,27 +78,78 @@ class HL7Segment:
         return field_value.split(COMPONENT_DELIMITER)
 
 
-@dataclass
+# Sentinel for HL7Message.message_datetime before MSH-7 is decoded
+_UNSET = object()
+
+
 class HL7Message:
-    """Parsed HL7 message with easy field access."""
+    """
+    Parsed HL7 message with easy field access.
+
+    Parsing only records where each segment starts and ends in the raw
+    text. HL7Segment objects are built per segment type when first asked
+    for, and their fields split when first read, so a message routed on
+    its MSH header and a handful of PID/PV1 fields never splits the rest.
+    """
+
+    def __init__(
+        self,
+        raw: str,
+        segment_index: Optional[dict[str, list[tuple[int, int]]]] = None,
+    ):
+        self.raw = raw
+        self._segment_index = segment_index if segment_index is not None else {}
+        self._segments: dict[str, list[HL7Segment]] = {}
+        self._message_datetime = _UNSET
+        self.message_type = ""
+        self.message_event = ""
+        self.message_control_id = ""
+
+    def __repr__(self) -> str:
+        return (
+            f"HL7Message(message_type={self.message_type!r}, "
+            f"message_event={self.message_event!r}, "
+            f"message_control_id={self.message_control_id!r})"
+        )
+
+    @property
+    def segments(self) -> dict[str, list[HL7Segment]]:
+        """All segments by type, in message order (builds every segment)."""
+        return {
+            segment_type: self.get_all_segments(segment_type)
+            for segment_type in self._segment_index
+        }
+
+    @property
+    def message_datetime(self) -> Optional[datetime]:
+        """MSH-7 message date/time, decoded on first access."""
+        if self._message_datetime is _UNSET:
+            msh = self.get_segment("MSH")
+            self._message_datetime = parse_hl7_datetime(msh.get_field(7)) if msh else None
+        return self._message_datetime
 
-    raw: str
-    segments: dict[str, list[HL7Segment]] = field(default_factory=dict)
-    message_type: str = ""
-    message_event: str = ""
-    message_control_id: str = ""
-    message_datetime: Optional[datetime] = None
+    @message_datetime.setter
+    def message_datetime(self, value: Optional[datetime]) -> None:
+        self._message_datetime = value
 
     def get_segment(self, segment_type: str, index: int = 0) -> Optional[HL7Segment]:
         """Get a segment by type and occurrence index."""
-        segments = self.segments.get(segment_type, [])
+        segments = self.get_all_segments(segment_type)
         if index < len(segments):
             return segments[index]
         return None
 
     def get_all_segments(self, segment_type: str) -> list[HL7Segment]:
         """Get all segments of a given type."""
-        return self.segments.get(segment_type, [])
+        segments = self._segments.get(segment_type)
+        if segments is None:
+            raw = self.raw
+            segments = [
+                HL7Segment(segment_type, raw=raw[start:end])
+                for start, end in self._segment_index.get(segment_type, ())
+            ]
+            self._segments[segment_type] = segments
+        return segments
 
     @property
     def patient_mrn(self) -> str:
@@ -165,6 +241,9 @@ def parse_hl7_message(raw_message: str) -> HL7Message:
     """
     Parse a raw HL7 v2.x message into structured format.
 
+    Only segment boundaries and the MSH routing fields are read here;
+    everything else is split on access (see HL7Message).
+
     Args:
         raw_message: Raw HL7 message string
 
@@ -172,61 +251,110 @@ def parse_hl7_message(raw_message: str) -> HL7Message:
         Parsed HL7Message object
     """
     # Normalize line endings
-    raw_message = raw_message.replace("\r\n", "\r").replace("\n", "\r")
+    if "\n" in raw_message:
+        raw_message = raw_message.replace("\r\n", "\r").replace("\n", "\r")
 
     # Remove MLLP framing if present
     raw_message = raw_message.strip("\x0b\x1c\r")
 
-    message = HL7Message(raw=raw_message)
-    lines = raw_message.split(SEGMENT_DELIMITER)
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # MSH segment is special - field delimiter IS the first field
-        if line.startswith("MSH"):
-            segment_type = "MSH"
-            # MSH-1 is the field separator itself
-            # Fields start after "MSH|"
-            fields = ["", FIELD_DELIMITER] + line[4:].split(FIELD_DELIMITER)
-        else:
-            parts = line.split(FIELD_DELIMITER)
-            segment_type = parts[0]
-            fields = parts
-
-        segment = HL7Segment(segment_type=segment_type, fields=fields)
-
-        if segment_type not in message.segments:
-            message.segments[segment_type] = []
-        message.segments[segment_type].append(segment)
-
-    # Extract common fields from MSH
+    # Index segment boundaries: type -> [(start, end)] into raw_message
+    segment_index: dict[str, list[tuple[int, int]]] = {}
+    find = raw_message.find
+    length = len(raw_message)
+    start = 0
+    while start < length:
+        end = find(SEGMENT_DELIMITER, start)
+        if end == -1:
+            end = length
+        # Trim surrounding whitespace without copying the line
+        while start < end and raw_message[start].isspace():
+            start += 1
+        stop = end
+        while stop > start and raw_message[stop - 1].isspace():
+            stop -= 1
+        if stop > start:
+            type_end = find(FIELD_DELIMITER, start, stop)
+            segment_type = raw_message[start:stop if type_end == -1 else type_end]
+            if segment_type.startswith("MSH"):
+                segment_type = "MSH"
+            spans = segment_index.get(segment_type)
+            if spans is None:
+                segment_index[segment_type] = [(start, stop)]
+            else:
+                spans.append((start, stop))
+        start = end + 1
+
+    message = HL7Message(raw=raw_message, segment_index=segment_index)
+
+    # Extract routing fields from MSH; MSH-7 is decoded on access
     msh = message.get_segment("MSH")
     if msh:
         # MSH-9: Message type (MessageType^TriggerEvent)
-        msg_type_field = msh.get_field(9)
-        type_parts = msg_type_field.split(COMPONENT_DELIMITER)
-        message.message_type = type_parts[0] if type_parts else ""
-        message.message_event = type_parts[1] if len(type_parts) > 1 else ""
+        message.message_type = msh.get_component(9, 1)
+        message.message_event = msh.get_component(9, 2)
 
         # MSH-10: Message control ID
         message.message_control_id = msh.get_field(10)
 
-        # MSH-7: Message date/time
-        dt_str = msh.get_field(7)
-        message.message_datetime = parse_hl7_datetime(dt_str)
-
     return message
 
 
-def parse_hl7_datetime(dt_string: str) -> Optional[datetime]:
+# Padding that completes a truncated yyyy[MM[dd[HH[mm[ss]]]]] to 14 digits
+_DTM_PAD = "0101000000"
+
+
+@lru_cache(maxsize=4096)
+def _decode_hl7_datetime(value: str) -> datetime:
+    """
+    Decode an HL7 DTM value by fixed positions.
+
+    Format: yyyy[MM[dd[HH[mm[ss[.S[S[S[S]]]]]]]]][+/-ZZZZ]. Returns an aware
+    datetime when an offset is present, otherwise naive (sender local time).
+    Raises ValueError for anything else. Cached because MSH-7 and schedule
+    times repeat heavily across a feed.
+    """
+    tzinfo = None
+    if len(value) > 5 and value[-5] in "+-":
+        offset = value[-4:]
+        if not offset.isdigit():
+            raise ValueError(f"bad timezone offset: {value}")
+        minutes = int(offset[:2]) * 60 + int(offset[2:])
+        tzinfo = timezone(timedelta(minutes=-minutes if value[-5] == "-" else minutes))
+        value = value[:-5]
+
+    digits, _, fraction = value.partition(".")
+    if len(digits) < 4 or not digits.isdigit() or (fraction and not fraction.isdigit()):
+        raise ValueError(f"not an HL7 datetime: {value}")
+
+    # Like the strptime formats this replaced, a partial trailing unit or
+    # extra digits are ignored rather than rejected
+    width = min(len(digits), 14) & ~1
+    padded = digits[:width] + _DTM_PAD[width - 4:]
+    return datetime(
+        int(padded[0:4]),
+        int(padded[4:6]),
+        int(padded[6:8]),
+        int(padded[8:10]),
+        int(padded[10:12]),
+        int(padded[12:14]),
+        int(fraction[:6].ljust(6, "0")) if fraction else 0,
+        tzinfo,
+    )
+
+
+def parse_hl7_datetime(dt_string: str, aware: bool = False) -> Optional[datetime]:
     """
     Parse HL7 datetime format (yyyyMMddHHmmss or variations).
 
+    Accepts any DTM precision from yyyy to yyyyMMddHHmmss.SSSS, with an
+    optional +/-ZZZZ offset. An offset is applied rather than dropped, so
+    "20240115143000-0500" is 19:30 UTC.
+
     Args:
         dt_string: HL7 datetime string
+        aware: Return a timezone-aware datetime. By default the result is
+            naive local time, matching the datetime.now() comparisons made
+            throughout the real-time service.
 
     Returns:
         datetime object or None if parsing fails
@@ -234,28 +362,16 @@ def parse_hl7_datetime(dt_string: str) -> Optional[datetime]:
     if not dt_string:
         return None
 
-    # Remove timezone suffix if present
-    dt_string = dt_string.split("+")[0].split("-")[0]
-
-    # Try various formats
-    formats = [
-        "%Y%m%d%H%M%S",     # yyyyMMddHHmmss
-        "%Y%m%d%H%M%S.%f",  # With fractional seconds
-        "%Y%m%d%H%M",       # yyyyMMddHHmm
-        "%Y%m%d",           # yyyyMMdd
-    ]
-
-    for fmt in formats:
-        try:
-            # Truncate string to expected length
-            expected_len = len(datetime.now().strftime(fmt).replace(".", ""))
-            truncated = dt_string[:expected_len] if "." not in fmt else dt_string
-            return datetime.strptime(truncated, fmt)
-        except ValueError:
-            continue
-
-    logger.warning(f"Failed to parse HL7 datetime: {dt_string}")
-    return None
+    try:
+        dt = _decode_hl7_datetime(dt_string.strip())
+    except ValueError:
+        logger.warning(f"Failed to parse HL7 datetime: {dt_string}")
+        return None
+
+    if dt.tzinfo is None:
+        # No offset: the sender's local time, assumed to be ours
+        return dt.astimezone() if aware else dt
+    return dt if aware else dt.astimezone().replace(tzinfo=None)
 
 
 def extract_adt_a02_data(message: HL7Message) -> dict:
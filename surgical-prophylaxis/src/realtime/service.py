@@ -40,6 +40,7 @@ class ServiceConfig:
     hl7_enabled: bool = True
     hl7_host: str = "0.0.0.0"
     hl7_port: int = 2575
+    hl7_queue_size: int = 100
 
     # FHIR polling settings
     fhir_schedule_poll_interval: int = 15  # minutes
@@ -70,6 +71,7 @@ class ServiceConfig:
             hl7_enabled=os.getenv("HL7_ENABLED", "true").lower() == "true",
             hl7_host=os.getenv("HL7_LISTENER_HOST", "0.0.0.0"),
             hl7_port=int(os.getenv("HL7_LISTENER_PORT", "2575")),
+            hl7_queue_size=int(os.getenv("HL7_QUEUE_SIZE", "100")),
             fhir_schedule_poll_interval=int(os.getenv("FHIR_SCHEDULE_POLL_INTERVAL", "15")),
             fhir_prophylaxis_poll_interval=int(os.getenv("FHIR_PROPHYLAXIS_POLL_INTERVAL", "5")),
             fhir_lookahead_hours=int(os.getenv("FHIR_LOOKAHEAD_HOURS", "48")),
@@ -153,6 +155,7 @@ class RealtimeProphylaxisService:
                 host=self.config.hl7_host,
                 port=self.config.hl7_port,
                 enabled=self.config.hl7_enabled,
+                queue_size=self.config.hl7_queue_size,
             )
             handler = MessageHandler()
             handler.on_adt = self._handle_adt_message
@@ -8,12 +8,20 @@ to maintain the complete patient journey through the surgical workflow.
 import json
 import logging
 import sqlite3
+import sys
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Any
 
+# Add project root to path for common module imports
+_project_root = Path(__file__).resolve().parents[3]
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+
+from common.sqlite_pool import get_connection_manager
+
 from .location_tracker import LocationState, PatientLocationUpdate
 from .schedule_monitor import ScheduledSurgery
 from .preop_checker import PreOpCheckResult, AlertTrigger
@@ -119,6 +127,7 @@ class StateManager:
             db_path = str(aegis_dir / "surgical_prophylaxis.db")
 
         self.db_path = db_path
+        self._db = get_connection_manager(db_path)
         self._init_db()
 
         # In-memory cache of active journeys (patient_mrn -> journey)
@@ -128,19 +137,16 @@ class StateManager:
         self._journeys_by_case: dict[str, SurgicalJourney] = {}
 
     def _init_db(self) -> None:
-        """Initialize realtime schema."""
+        """Initialize realtime schema (once per process)."""
         schema_path = Path(__file__).parent.parent.parent / "schema_realtime.sql"
         if schema_path.exists():
             with open(schema_path) as f:
                 schema = f.read()
-            with sqlite3.connect(self.db_path) as conn:
-                conn.executescript(schema)
+            self._db.ensure_schema("surgical_realtime", schema)
 
     def _get_conn(self) -> sqlite3.Connection:
-        """Get database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's pooled connection with row factory."""
+        return self._db.connect()
 
     def create_journey(self, surgery: ScheduledSurgery) -> SurgicalJourney:
         """
@@ -0,0 +1,8 @@
+"""Make the surgical-prophylaxis src package importable for its tests."""
+
+import sys
+from pathlib import Path
+
+_module_root = Path(__file__).parent.parent
+if str(_module_root) not in sys.path:
+    sys.path.insert(0, str(_module_root))
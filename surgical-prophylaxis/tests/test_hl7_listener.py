@@ -0,0 +1,60 @@
+"""Tests for MLLP framing in the HL7 listener."""
+
+from src.realtime.hl7_listener import MLLP_END, MLLP_START, MLLPFramer, frame_mllp_message
+
+ADT = "MSH|^~\\&|EPIC|CCHMC|AEGIS|CCHMC|20240115143000||ADT^A02|MSG001|P|2.5\rPID|||MRN123^^^CCHMC^MR"
+ORM = "MSH|^~\\&|EPIC|CCHMC|AEGIS|CCHMC|20240115143100||ORM^O01|MSG002|P|2.5"
+
+
+class TestMLLPFramer:
+    """Tests for MLLPFramer.feed."""
+
+    def test_frame_split_across_reads_is_delivered_once_complete(self):
+        framer = MLLPFramer()
+        data = frame_mllp_message(ADT)
+
+        assert framer.feed(data[:10]) == []
+        assert framer.feed(data[10:-2]) == []
+        assert framer.buffered > 0
+        assert framer.feed(data[-2:]) == [ADT.encode()]
+        assert framer.buffered == 0
+
+    def test_end_marker_split_between_reads(self):
+        framer = MLLPFramer()
+        data = frame_mllp_message(ADT)
+
+        # FS arrives last in one read, CR first in the next
+        assert framer.feed(data[:-1]) == []
+        assert framer.feed(data[-1:]) == [ADT.encode()]
+
+    def test_pipelined_frames_in_one_read_are_all_delivered_in_order(self):
+        framer = MLLPFramer()
+        data = frame_mllp_message(ADT) + frame_mllp_message(ORM) + frame_mllp_message(ADT)[:20]
+
+        assert framer.feed(data) == [ADT.encode(), ORM.encode()]
+        assert framer.frames == 2
+        assert framer.feed(frame_mllp_message(ADT)[20:]) == [ADT.encode()]
+
+    def test_bytes_outside_frames_are_skipped(self):
+        framer = MLLPFramer()
+
+        messages = framer.feed(b"noise" + frame_mllp_message(ORM) + b"\r\n")
+
+        assert messages == [ORM.encode()]
+        assert framer.bytes_skipped == len(b"noise") + 2
+
+    def test_oversize_frame_is_dropped_and_decoding_resumes(self):
+        framer = MLLPFramer(max_message_bytes=50)
+        big = MLLP_START + b"x" * 80 + MLLP_END
+
+        assert framer.feed(big + frame_mllp_message("MSH|ok")) == [b"MSH|ok"]
+        assert framer.frames_oversized == 1
+
+    def test_oversize_frame_without_end_is_discarded_as_it_streams(self):
+        framer = MLLPFramer(max_message_bytes=50)
+
+        assert framer.feed(MLLP_START + b"x" * 60) == []
+        assert framer.frames_oversized == 1
+        assert framer.buffered == 0
+        # The tail of the dropped frame is skipped until the next start byte
+        assert framer.feed(b"x" * 10 + MLLP_END + frame_mllp_message("MSH|ok")) == [b"MSH|ok"]
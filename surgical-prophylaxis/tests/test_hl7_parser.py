@@ -0,0 +1,96 @@
+"""Tests for lazy HL7 v2 parsing and timestamp decoding."""
+
+from datetime import datetime, timedelta, timezone
+
+from src.realtime.hl7_parser import HL7Segment, parse_hl7_datetime, parse_hl7_message
+
+ADT_A02 = "\r".join([
+    "MSH|^~\\&|EPIC|CCHMC|AEGIS|CCHMC|20240115143000||ADT^A02|MSG001|P|2.5",
+    "EVN|A02|20240115143000",
+    "PID|||111^^^CCHMC^PI~MRN123^^^CCHMC^MR||DOE^JANE^Q",
+    "PV1||I|OR3^01^A^CCHMC|||PACU^02^B^CCHMC|1234^SMITH^JOHN||||||||||||VN789",
+    "OBX|1|TX|NOTE||first",
+    "OBX|2|TX|NOTE||second",
+])
+
+
+class TestLazyParsing:
+    """Tests that segments and fields are split only when read."""
+
+    def test_routing_fields_are_parsed_without_splitting_other_segments(self):
+        message = parse_hl7_message(ADT_A02)
+
+        assert (message.message_type, message.message_event, message.message_control_id) == (
+            "ADT", "A02", "MSG001",
+        )
+        # Only MSH has been built; PID/PV1/OBX are still (start, end) spans
+        assert list(message._segments) == ["MSH"]
+        assert set(message._segment_index) == {"MSH", "EVN", "PID", "PV1", "OBX"}
+
+    def test_fields_are_split_on_first_read(self):
+        message = parse_hl7_message(ADT_A02)
+
+        pv1 = message.get_segment("PV1")
+        assert pv1._fields is None
+        assert message.current_location_code == "OR3"
+        assert pv1._fields is not None
+        assert message.get_segment("PID")._fields is None
+
+    def test_accessors_match_eager_values(self):
+        message = parse_hl7_message(ADT_A02)
+
+        assert message.patient_mrn == "MRN123"
+        assert message.patient_name == "JANE DOE"
+        assert message.visit_number == "VN789"
+        assert message.current_location == "OR3^01^A^CCHMC"
+        assert message.prior_location == "PACU^02^B^CCHMC"
+        assert message.attending_physician == ("1234", "JOHN SMITH")
+        assert [s.get_field(5) for s in message.get_all_segments("OBX")] == ["first", "second"]
+        assert message.get_segment("OBX", 2) is None
+        assert message.get_segment("ZZZ") is None
+
+    def test_msh_field_numbering_counts_the_separator(self):
+        msh = HL7Segment("MSH", raw="MSH|^~\\&|EPIC|CCHMC")
+
+        assert msh.get_field(1) == "|"
+        assert msh.get_field(2) == "^~\\&"
+        assert msh.get_field(3) == "EPIC"
+
+    def test_mllp_framing_and_newlines_are_normalized(self):
+        raw = "\x0b" + ADT_A02.replace("\r", "\r\n") + "\x1c\r"
+
+        message = parse_hl7_message(raw)
+
+        assert message.message_control_id == "MSG001"
+        assert message.patient_mrn == "MRN123"
+
+    def test_message_datetime_is_decoded_on_access(self):
+        message = parse_hl7_message(ADT_A02)
+
+        assert message.message_datetime == datetime(2024, 1, 15, 14, 30)
+        message.message_datetime = None
+        assert message.message_datetime is None
+
+
+class TestHL7Datetime:
+    """Tests for fixed-width DTM decoding."""
+
+    def test_every_precision(self):
+        assert parse_hl7_datetime("2024") == datetime(2024, 1, 1)
+        assert parse_hl7_datetime("202401") == datetime(2024, 1, 1)
+        assert parse_hl7_datetime("20240115") == datetime(2024, 1, 15)
+        assert parse_hl7_datetime("202401151430") == datetime(2024, 1, 15, 14, 30)
+        assert parse_hl7_datetime("20240115143005") == datetime(2024, 1, 15, 14, 30, 5)
+        assert parse_hl7_datetime("20240115143005.25") == datetime(2024, 1, 15, 14, 30, 5, 250000)
+
+    def test_offset_is_applied(self):
+        aware = parse_hl7_datetime("20240115143000-0500", aware=True)
+
+        assert aware == datetime(2024, 1, 15, 19, 30, tzinfo=timezone.utc)
+        assert aware.utcoffset() == timedelta(hours=-5)
+
+    def test_invalid_values_return_none(self):
+        assert parse_hl7_datetime("") is None
+        assert parse_hl7_datetime("garbage") is None
+        assert parse_hl7_datetime("20241315") is None
+        assert parse_hl7_datetime("20240115-05XX") is None
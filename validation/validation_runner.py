@@ -20,6 +20,9 @@ import argparse
 import json
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -28,6 +31,9 @@ from typing import Any
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# hai-detection provides the LLM clients the extractors run on
+HAI_DETECTION_PATH = Path(__file__).parent.parent / "hai-detection"
+
 
 # =============================================================================
 # Metrics and Scoring
@@ -93,6 +99,10 @@ class ValidationReport:
     hallucinations_caught: int = 0
     hallucinations_total: int = 0
 
+    # Extraction throughput across all cases
+    extraction_wall_ms: float = 0.0
+    llm_throughput: dict[str, Any] = field(default_factory=dict)
+
     @property
     def overall_accuracy(self) -> float:
         if self.total_fields == 0:
@@ -110,6 +120,8 @@ class ValidationReport:
                 "total_matches": self.total_matches,
                 "overall_accuracy": round(self.overall_accuracy, 4),
                 "hallucination_detection_rate": round(self.hallucination_detection_rate, 4),
+                "extraction_wall_ms": round(self.extraction_wall_ms, 1),
+                "llm_throughput": self.llm_throughput,
             },
             "field_metrics": self.field_metrics,
             "case_details": [
@@ -127,6 +139,14 @@ class ValidationReport:
         }
 
 
+@dataclass
+class _Extraction:
+    """Outcome of running an extractor on one case."""
+    result: dict | None = None
+    elapsed_ms: float = 0.0
+    error: str | None = None
+
+
 # =============================================================================
 # Field Comparison Logic
 # =============================================================================
@@ -547,6 +567,7 @@ class ValidationRunner:
         extractor_factory=None,
         llm_client=None,
         model: str = "llama3.3:70b",
+        max_concurrent: int = 4,
     ):
         """Initialize the validation runner.
 
@@ -554,10 +575,12 @@ class ValidationRunner:
             extractor_factory: Factory function to create extractors by HAI type
             llm_client: LLM client for running extractions
             model: Model name for reporting
+            max_concurrent: Cases extracted at once by validate_all
         """
         self.extractor_factory = extractor_factory
         self.llm_client = llm_client
         self.model = model
+        self.max_concurrent = max_concurrent
         self.comparator = FieldComparator()
 
     def validate_case(
@@ -565,6 +588,7 @@ class ValidationRunner:
         gold_standard: dict,
         hai_type: str,
         notes: list[str] | None = None,
+        extraction: "_Extraction | None" = None,
     ) -> CaseScore:
         """Validate a single case against gold standard.
 
@@ -572,6 +596,8 @@ class ValidationRunner:
             gold_standard: Gold standard case dictionary
             hai_type: HAI type (clabsi, cauti, vae, ssi, cdi)
             notes: Clinical notes (if not provided, will try to load from files)
+            extraction: Extraction already run for this case (validate_all
+                runs them as a batch); runs the extractor on notes if None
 
         Returns:
             CaseScore with validation results
@@ -586,17 +612,16 @@ class ValidationRunner:
             return case_score
 
         # If we have an extractor, run extraction
+        if extraction is None and self.extractor_factory and notes:
+            extraction = self._run_extraction(hai_type, notes)
+
         extraction_result = None
-        if self.extractor_factory and notes:
-            try:
-                import time
-                start = time.time()
-                extractor = self.extractor_factory(hai_type)
-                extraction_result = extractor.extract(notes)
-                case_score.extraction_time_ms = (time.time() - start) * 1000
-            except Exception as e:
-                case_score.error = f"Extraction failed: {e}"
+        if extraction is not None:
+            if extraction.error:
+                case_score.error = f"Extraction failed: {extraction.error}"
                 return case_score
+            extraction_result = extraction.result
+            case_score.extraction_time_ms = extraction.elapsed_ms
 
         # Compare each field
         signs_symptoms = gold_standard.get("signs_symptoms", {})
@@ -652,7 +677,8 @@ class ValidationRunner:
             logger.warning(f"No gold standard cases found in {gold_dir}")
             return report
 
-        # Validate each case
+        # Resolve each case's HAI type and notes
+        items = []
         for case in cases:
             case_hai_type = hai_type
             if hai_type == "all":
@@ -668,7 +694,14 @@ class ValidationRunner:
             if notes_dir:
                 notes = self._load_notes(case, notes_dir)
 
-            case_score = self.validate_case(case, case_hai_type, notes)
+            items.append((case, case_hai_type, notes))
+
+        # Run every extraction up front as one concurrent batch
+        extractions = self._run_extractions(items, report)
+
+        # Validate each case
+        for (case, case_hai_type, notes), extraction in zip(items, extractions):
+            case_score = self.validate_case(case, case_hai_type, notes, extraction)
             report.case_scores.append(case_score)
 
             # Aggregate metrics
@@ -688,6 +721,63 @@ class ValidationRunner:
 
         return report
 
+    def _run_extraction(self, hai_type: str, notes: list[str]) -> "_Extraction":
+        """Run the HAI type's extractor on one case's notes."""
+        start = time.time()
+        try:
+            result = self.extractor_factory(hai_type).extract(notes)
+        except Exception as e:
+            return _Extraction(error=str(e))
+        return _Extraction(result=result, elapsed_ms=(time.time() - start) * 1000)
+
+    def _run_extractions(
+        self,
+        items: list[tuple[dict, str, list[str] | None]],
+        report: ValidationReport,
+    ) -> list["_Extraction | None"]:
+        """Extract all cases with notes, max_concurrent at a time, in case order.
+
+        LLM clients serve concurrent requests as a batch (vLLM continuous
+        batching, OLLAMA_NUM_PARALLEL), so extractions overlap instead of
+        running one case at a time. Aggregate LLM tokens/sec goes in the
+        report when the hai-detection clients are importable.
+        """
+        todo = [i for i, (_, _, notes) in enumerate(items) if self.extractor_factory and notes]
+        extractions: list[_Extraction | None] = [None] * len(items)
+        if not todo:
+            return extractions
+
+        # Meter the LLM calls the extractors make
+        if str(HAI_DETECTION_PATH) not in sys.path:
+            sys.path.insert(0, str(HAI_DETECTION_PATH))
+        try:
+            from hai_src.llm.base import submit_in_context, track_throughput
+            meter_context = track_throughput()
+        except ImportError:
+            meter_context = nullcontext()
+
+            def submit_in_context(executor, fn, *args):
+                return executor.submit(fn, *args)
+
+        def run(index: int) -> None:
+            _, hai_type, notes = items[index]
+            extractions[index] = self._run_extraction(hai_type, notes)
+
+        start = time.time()
+        with meter_context as meter:
+            workers = max(1, min(self.max_concurrent, len(todo)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [submit_in_context(pool, run, index) for index in todo]:
+                    future.result()
+        report.extraction_wall_ms = (time.time() - start) * 1000
+
+        if meter is not None:
+            report.llm_throughput = meter.to_dict()
+            logger.info(f"Extracted {len(todo)} cases: {meter.summary()}")
+        else:
+            logger.info(f"Extracted {len(todo)} cases in {report.extraction_wall_ms:.0f}ms")
+        return extractions
+
     def _load_notes(self, case: dict, notes_dir: Path) -> list[str]:
         """Load clinical notes for a case."""
         notes = []
@@ -772,6 +862,12 @@ def main():
         default="llama3.3:70b",
         help="Model name for reporting",
     )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=4,
+        help="Cases extracted concurrently",
+    )
     parser.add_argument(
         "--summary",
         action="store_true",
@@ -797,6 +893,7 @@ def main():
     runner = ValidationRunner(
         extractor_factory=None if args.report_only else None,  # TODO: wire up extractors
         model=args.model,
+        max_concurrent=args.max_concurrent,
     )
 
     # Run validation
@@ -826,6 +923,8 @@ def main():
     print(f"Correct extractions: {report.total_matches}")
     print(f"Overall accuracy: {report.overall_accuracy:.1%}")
     print(f"Hallucination detection: {report.hallucination_detection_rate:.1%}")
+    if report.llm_throughput:
+        print(f"LLM throughput: {report.llm_throughput['tokens_per_second']:.1f} tok/s aggregate")
     print("=" * 60)
 
     # Return exit code based on accuracy threshold